@@ -42,6 +42,66 @@ class Settings(BaseSettings):
     CONTRACT_ADDRESS: str = "0x0000000000000000000000000000000000000000"
     CHAIN_PRIVATE_KEY: str = ""
 
+    # Automated verification checks
+    VERIFICATION_AUTO_CHECKS: bool = True
+    VERIFICATION_CHECK_WORKERS: int = 8
+
+    # Background jobs
+    JOB_WORKERS_ENABLED: bool = True
+    JOB_WORKER_THREADS: int = 4
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_LOCK_TIMEOUT_SECONDS: int = 900
+    JOB_DRAIN_TIMEOUT_SECONDS: int = 30
+
+    # Monte Carlo simulation
+    SIMULATION_CACHE_SIZE: int = 256
+    SIMULATION_PROCESS_WORKERS: int = 0  # 0 = one per CPU
+
+    # FX rates
+    FX_RATES_CSV: str = ""  # Imported at startup when set
+    FX_CACHE_TTL_SECONDS: int = 300
+
+    # Columnar project snapshot for dashboard analytics
+    PROJECT_SNAPSHOT_ENABLED: bool = True
+    PROJECT_SNAPSHOT_REFRESH_SECONDS: float = 30.0
+
+    # Per-request SQL statistics (X-DB-* headers in development, app.sql log always)
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10  # A statement shape repeated this often logs a warning
+
+    # Slow-query log (app.sql.slow) and /admin/slow-queries report
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0  # 0 turns the log off
+    SLOW_QUERY_EXPLAIN: bool = True  # Capture the plan the first time a statement shape is slow
+    SLOW_QUERY_MAX_SHAPES: int = 200  # Statement fingerprints kept in the report
+
+    # Response compression (brotli when installed, else gzip)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+
+    # Serialized single-entity read responses
+    RESPONSE_CACHE_SIZE: int = 2048
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+
+    # Project browser facet counts
+    FACET_CACHE_SIZE: int = 512
+    FACET_CACHE_TTL_SECONDS: int = 60
+
+    # Project map tiles
+    MAP_TILE_MAX_ZOOM: int = 16
+    MAP_TILE_PRECOMPUTE_ZOOM: int = 6  # Tiles up to this zoom are built at startup; -1 disables
+    MAP_TILE_MAX_AGE_SECONDS: int = 60
+
+    # Streaming table exports
+    EXPORT_BATCH_SIZE: int = 1000  # Rows fetched and encoded per chunk
+
+    # Bulk project import
+    BULK_IMPORT_CHUNK_SIZE: int = 500  # Rows validated and inserted per transaction
+    BULK_IMPORT_SPOOL_BYTES: int = 8 * 1024 * 1024  # Uploads larger than this spool to disk
+
+    # On-demand stack sampling (/admin/profile and the X-Profile request header)
+    PROFILER_ENABLED: bool = True
+    PROFILER_INTERVAL_MS: float = 5.0  # Time between stack samples
+    PROFILER_MAX_SECONDS: int = 60  # Longest /admin/profile run
+    PROFILER_KEEP: int = 20  # Per-request profiles kept for /admin/profiles/{id}
+
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins into list."""
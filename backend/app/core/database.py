@@ -3,6 +3,7 @@ from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
+from app.utils.metrics import TimedQueuePool
 from .config import settings
 
 # Create engine with appropriate settings
@@ -18,6 +19,7 @@ else:
     # PostgreSQL configuration
     engine = create_engine(
         settings.DATABASE_URL,
+        poolclass=TimedQueuePool,
         pool_pre_ping=True,
         pool_size=10,
         max_overflow=20,
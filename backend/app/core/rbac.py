@@ -41,6 +41,7 @@ class Permission:
     # Admin permissions
     MANAGE_USERS = "manage_users"
     VIEW_AUDIT_LOGS = "view_audit_logs"
+    MANAGE_SYSTEM = "manage_system"
 
 
 # Role-to-permissions mapping
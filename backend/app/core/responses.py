@@ -0,0 +1,109 @@
+"""Fast JSON responses for hot read endpoints.
+
+FastAPI's default path validates every returned ORM object into its
+``response_model`` and then walks the result again to make it JSON-safe. For
+objects loaded straight from our own tables that validation is redundant.
+Routes opt in by returning ``FastJSONResponse(trusted_dump(Model, data))``:
+``trusted_dump`` copies the model's fields off the objects without validating
+them, and the response encodes with orjson when it is installed (stdlib
+``json`` otherwise).
+
+Output matches Pydantic's JSON mode: ``Decimal`` as a string, ``datetime``
+in ISO 8601. Compare with ``python -m benchmarks.bench_serialization``.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Collection, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+# Field kinds in a dump plan
+_VALUE, _MODEL, _MODEL_LIST = range(3)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "tolist"):  # numpy scalars and arrays
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(
+            content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when available; content is not validated."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _model_in(annotation: Any) -> Tuple[int, Any]:
+    """Classify a field annotation as a plain value, a model, or a list of models."""
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        return _model_in(args[0]) if len(args) == 1 else (_VALUE, None)
+    if origin in (list, List):
+        args = get_args(annotation)
+        if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            return _MODEL_LIST, args[0]
+        return _VALUE, None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _MODEL, annotation
+    return _VALUE, None
+
+
+@lru_cache(maxsize=None)
+def _plan(model: Type[BaseModel]) -> Tuple[Tuple[str, Any, int, Any], ...]:
+    return tuple(
+        (name, field.get_default(call_default_factory=True), *_model_in(field.annotation))
+        for name, field in model.model_fields.items()
+    )
+
+
+def trusted_dump(model: Type[BaseModel], obj: Any, fields: Optional[Collection[str]] = None) -> Any:
+    """
+    Copy `model`'s fields from an ORM object or dict into plain dicts and lists.
+
+    Nothing is validated or coerced, so only pass objects that already satisfy
+    the model (rows from our own tables); the JSON matches ``model.model_dump_json``.
+    `fields` keeps only those top-level fields (a sparse fieldset).
+    """
+    if obj is None:
+        return None
+    is_dict = isinstance(obj, dict)
+    # Loaded ORM attributes sit in the instance dict; reading it skips the descriptor
+    loaded = obj if is_dict else getattr(obj, "__dict__", {})
+    result = {}
+    for name, default, kind, submodel in _plan(model):
+        if fields is not None and name not in fields:
+            continue
+        if name in loaded:
+            value = loaded[name]
+        else:
+            # Lazy or expired attributes load through getattr
+            value = default if is_dict else getattr(obj, name, default)
+        if kind == _MODEL:
+            value = trusted_dump(submodel, value)
+        elif kind == _MODEL_LIST and value is not None:
+            value = [trusted_dump(submodel, item) for item in value]
+        result[name] = value
+    return result
@@ -1,10 +1,13 @@
 """AIP Platform - FastAPI Application Entry Point."""
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.database import Base, engine
+from app.core.database import Base, engine, get_db, SessionLocal
+from app.core.rbac import Permission
 from app.routers import (
     auth_router,
     users_router,
@@ -14,7 +17,24 @@ from app.routers import (
     verifications_router,
     investors_router,
     dealrooms_router,
+    admin_router,
+    fx_router,
+    search_router,
 )
+from app.routers.auth import token_grants
+from app.services.job_service import collect_metrics as collect_job_metrics, job_worker
+from app.services.simulation_service import shutdown_pool
+from app.services.fx_service import load_csv
+from app.services.project_snapshot import snapshot_refresher
+from app.services.search_service import ensure_index as ensure_search_index
+from app.services.geo_service import ensure_locations
+from app.services.tile_service import precompute_tiles
+from app.utils.compression import CompressionMiddleware
+from app.utils.metrics import MetricsMiddleware, metrics_response, pool_collector, registry, threadpool_collector
+from app.utils.profiler import ProfilerMiddleware
+from app.utils.query_stats import QueryStatsMiddleware
+from app.utils import slow_queries
+from app.services.suggest_service import build_index as build_suggest_index
 
 
 @asynccontextmanager
@@ -22,9 +42,24 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown events."""
     # Startup: Create database tables
     Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        ensure_search_index(db)
+        build_suggest_index(db)
+        ensure_locations(db)
+        if settings.MAP_TILE_PRECOMPUTE_ZOOM >= 0:
+            precompute_tiles(db, settings.MAP_TILE_PRECOMPUTE_ZOOM)
+    if settings.FX_RATES_CSV:
+        with SessionLocal() as db:
+            load_csv(db, settings.FX_RATES_CSV)
+    if settings.JOB_WORKERS_ENABLED:
+        job_worker.start()
+    if settings.PROJECT_SNAPSHOT_ENABLED:
+        snapshot_refresher.start(settings.PROJECT_SNAPSHOT_REFRESH_SECONDS)
     yield
-    # Shutdown: Cleanup if needed
-    pass
+    # Shutdown: let running jobs finish; anything left is re-queued after its lock expires
+    job_worker.stop(drain=True, timeout=settings.JOB_DRAIN_TIMEOUT_SECONDS)
+    shutdown_pool()
+    snapshot_refresher.stop()
 
 
 # Create FastAPI application
@@ -37,6 +72,32 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Compress large JSON responses (brotli or gzip, per Accept-Encoding)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+# Count SQL statements per request (X-DB-* headers in development, app.sql log)
+app.add_middleware(
+    QueryStatsMiddleware,
+    expose_headers=settings.is_development,
+    n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+)
+
+# Log statements over the threshold with their plan (app.sql.slow, /admin/slow-queries)
+slow_queries.configure(
+    settings.SLOW_QUERY_THRESHOLD_MS / 1000,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+    max_shapes=settings.SLOW_QUERY_MAX_SHAPES,
+)
+
+# Per-request stack sampling for admins sending X-Profile: 1 (see /admin/profile)
+if settings.PROFILER_ENABLED:
+    app.add_middleware(
+        ProfilerMiddleware,
+        authorize=lambda headers: token_grants(headers.get("authorization"), Permission.MANAGE_SYSTEM),
+        interval=settings.PROFILER_INTERVAL_MS / 1000,
+        keep=settings.PROFILER_KEEP,
+    )
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -46,6 +107,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request counts and latency per route for /metrics (outermost, so it times everything)
+app.add_middleware(MetricsMiddleware)
+registry.add_collector(pool_collector(engine))
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(users_router)
@@ -55,6 +120,9 @@ app.include_router(documents_router)
 app.include_router(verifications_router)
 app.include_router(investors_router)
 app.include_router(dealrooms_router)
+app.include_router(admin_router)
+app.include_router(fx_router)
+app.include_router(search_router)
 
 
 @app.get("/")
@@ -74,6 +142,15 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(db: Session = Depends(get_db)):
+    """Prometheus text exposition of request, pool, threadpool, job and cache metrics."""
+    # Read the threadpool before borrowing a thread for the job-queue queries
+    threadpool = list(threadpool_collector())
+    jobs = await run_in_threadpool(lambda: list(collect_job_metrics(db)))
+    return metrics_response([lambda: threadpool, lambda: jobs])
+
+
 # For running with uvicorn directly
 if __name__ == "__main__":
     import uvicorn
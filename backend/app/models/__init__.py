@@ -8,6 +8,9 @@ from .blockchain import BlockchainRecord
 from .investor import InvestorPreferences, Match
 from .dealroom import DealRoom, Message, Meeting, TermSheet, Signature
 from .audit import AuditLog
+from .job import BackgroundJob
+from .fx import FxRate
+from .geo import ProjectLocation, MapTile
 
 __all__ = [
     # User
@@ -41,4 +44,11 @@ __all__ = [
     "Signature",
     # Audit
     "AuditLog",
+    # Jobs
+    "BackgroundJob",
+    # FX
+    "FxRate",
+    # Geo
+    "ProjectLocation",
+    "MapTile",
 ]
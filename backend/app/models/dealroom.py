@@ -86,7 +86,7 @@ class Meeting(Base):
     meeting_type = Column(String(50), default="video_call")  # video_call, in_person, phone
 
     # Scheduling
-    scheduled_at = Column(DateTime, nullable=False)
+    scheduled_at = Column(DateTime, nullable=False, index=True)
     duration_minutes = Column(Integer, default=60)
     timezone = Column(String(50), default="UTC")
 
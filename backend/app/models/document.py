@@ -79,7 +79,7 @@ class DataRoomAccess(Base):
     __tablename__ = "data_room_access"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    project_id = Column(Integer, ForeignKey("aip_projects.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(Integer, ForeignKey("aip_projects.id", ondelete="CASCADE"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     org_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"))
 
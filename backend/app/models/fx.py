@@ -0,0 +1,25 @@
+"""Foreign exchange rate model."""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, UniqueConstraint
+from app.core.database import Base
+
+
+class FxRate(Base):
+    """Daily exchange rate of a currency against USD."""
+
+    __tablename__ = "fx_rates"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    currency = Column(String(3), nullable=False)  # ISO 4217, e.g. KES
+    rate_date = Column(Date, nullable=False)
+    usd_per_unit = Column(Float, nullable=False)  # 1 unit of currency = usd_per_unit USD
+    source = Column(String(100))  # e.g. csv file name, central bank feed
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("currency", "rate_date", name="uq_fx_rates_currency_date"),
+    )
+
+    def __repr__(self):
+        return f"<FxRate {self.currency} {self.rate_date} {self.usd_per_unit}>"
@@ -0,0 +1,34 @@
+"""Spatial index of project coordinates and cached map tiles."""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Text, DateTime
+from app.core.database import Base
+
+
+class ProjectLocation(Base):
+    """Geohash-indexed copy of a project's coordinates, kept in step by app.services.geo_service."""
+
+    __tablename__ = "project_locations"
+
+    project_id = Column(Integer, ForeignKey("aip_projects.id", ondelete="CASCADE"), primary_key=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    geohash = Column(String(12), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<ProjectLocation {self.project_id} {self.geohash}>"
+
+
+class MapTile(Base):
+    """Precomputed project clusters for one web-map tile, cached by app.services.tile_service."""
+
+    __tablename__ = "map_tiles"
+
+    z = Column(Integer, primary_key=True)
+    x = Column(Integer, primary_key=True)
+    y = Column(Integer, primary_key=True)
+    payload = Column(Text, nullable=False)
+    etag = Column(String(32), nullable=False)
+    generated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<MapTile {self.z}/{self.x}/{self.y}>"
@@ -0,0 +1,44 @@
+"""Background job model."""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, Index
+from app.core.database import Base
+
+
+class BackgroundJob(Base):
+    """Durable unit of work executed by the in-process job workers."""
+
+    __tablename__ = "background_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    uuid = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()), nullable=False)
+
+    # What to run
+    job_type = Column(String(100), nullable=False)  # e.g. verification.run_checks
+    payload_json = Column(JSON)
+    idempotency_key = Column(String(255), unique=True)  # Duplicate enqueues return the existing job
+    priority = Column(Integer, default=0, nullable=False)  # Higher runs first
+
+    # State
+    status = Column(String(20), default="queued", nullable=False)  # queued, running, succeeded, dead, cancelled
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=5, nullable=False)
+    run_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # Not eligible before this time
+    last_error = Column(Text)
+    result_json = Column(JSON)
+
+    # Execution
+    locked_by = Column(String(100))  # worker id holding the job
+    locked_at = Column(DateTime)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_background_jobs_status_run_at", "status", "run_at"),
+    )
+
+    def __repr__(self):
+        return f"<BackgroundJob {self.job_type} ({self.status}, attempt {self.attempts})>"
@@ -1,7 +1,7 @@
 """Verification workflow models."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Index, Text, JSON
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -13,7 +13,7 @@ class VerificationRequest(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     uuid = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()), nullable=False)
-    project_id = Column(Integer, ForeignKey("aip_projects.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(Integer, ForeignKey("aip_projects.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Request details
     from_level = Column(String(10), nullable=False)  # V0, V1, V2, V3, V4
@@ -21,7 +21,7 @@ class VerificationRequest(Base):
     status = Column(String(50), default="pending", nullable=False)  # pending, in_review, approved, rejected
 
     # Assignment
-    assigned_to = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+    assigned_to = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
     assigned_org_id = Column(Integer, ForeignKey("organizations.id", ondelete="SET NULL"))
 
     # Results
@@ -40,6 +40,11 @@ class VerificationRequest(Base):
     checks = relationship("VerificationCheck", back_populates="request", cascade="all, delete-orphan")
     events = relationship("VerificationEvent", back_populates="request", cascade="all, delete-orphan")
 
+    # Request listings filter on status and sort newest first
+    __table_args__ = (
+        Index("ix_verification_requests_status_created_at", "status", "created_at"),
+    )
+
     def __repr__(self):
         return f"<VerificationRequest {self.from_level}->{self.to_level} ({self.status})>"
 
@@ -7,6 +7,9 @@ from .documents import router as documents_router
 from .verifications import router as verifications_router
 from .investors import router as investors_router
 from .dealrooms import router as dealrooms_router
+from .admin import router as admin_router
+from .fx import router as fx_router
+from .search import router as search_router
 
 __all__ = [
     "auth_router",
@@ -17,4 +20,7 @@ __all__ = [
     "verifications_router",
     "investors_router",
     "dealrooms_router",
+    "admin_router",
+    "fx_router",
+    "search_router",
 ]
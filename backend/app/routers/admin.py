@@ -0,0 +1,177 @@
+"""Admin router for operational endpoints."""
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.rbac import Permission, require_permission
+from app.models.user import User
+from app.models.job import BackgroundJob
+from app.schemas.job import BackgroundJobResponse, JobStatsResponse
+from app.schemas.slow_query import SlowQueryResponse
+from app.services import export_service
+from app.services.job_service import job_worker, queue_stats
+from app.utils import profiler, slow_queries
+from .auth import get_user_role, permission_required, require_auth
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/jobs/stats", response_model=JobStatsResponse)
+def get_job_stats(
+    current_user: User = Depends(permission_required(Permission.MANAGE_SYSTEM)),
+    db: Session = Depends(get_db)
+):
+    """Get background job queue depth, throughput and latency."""
+    return {"queue": queue_stats(db), "worker": job_worker.stats()}
+
+
+@router.get("/jobs", response_model=List[BackgroundJobResponse])
+def list_jobs(
+    status_filter: Optional[str] = None,
+    job_type: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(permission_required(Permission.MANAGE_SYSTEM)),
+    db: Session = Depends(get_db)
+):
+    """List background jobs, most recent first."""
+    query = db.query(BackgroundJob)
+    if status_filter:
+        query = query.filter(BackgroundJob.status == status_filter)
+    if job_type:
+        query = query.filter(BackgroundJob.job_type == job_type)
+    return query.order_by(BackgroundJob.created_at.desc(), BackgroundJob.id.desc()).limit(limit).all()
+
+
+@router.post("/jobs/{job_id}/retry", response_model=BackgroundJobResponse)
+def retry_job(
+    job_id: int,
+    current_user: User = Depends(permission_required(Permission.MANAGE_SYSTEM)),
+    db: Session = Depends(get_db)
+):
+    """Re-queue a dead or cancelled job with a fresh attempt budget."""
+    job = db.query(BackgroundJob).filter(BackgroundJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status not in ("dead", "cancelled"):
+        raise HTTPException(status_code=400, detail=f"Cannot retry a job with status '{job.status}'")
+
+    job.status = "queued"
+    job.attempts = 0
+    job.run_at = datetime.utcnow()
+    job.finished_at = None
+    db.commit()
+    db.refresh(job)
+    job_worker.notify()
+    return job
+
+
+@router.get("/exports/{dataset}", response_class=StreamingResponse)
+def export_table(
+    dataset: str,
+    export_format: str = Query("csv", alias="format", description="csv, ndjson or arrow"),
+    after: int = Query(0, ge=0, description="Resume after this id"),
+    until: Optional[int] = Query(None, ge=0, description="Last id to include (X-Export-Until of the first request)"),
+    current_user: User = Depends(require_auth),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream a full table export (projects, matches or audit_logs) in id order.
+
+    The X-Export-Until header fixes the export's upper bound; to resume an
+    interrupted download, repeat the request with `after` set to the last id
+    received and `until` set to that header.
+    """
+    spec = export_service.DATASETS.get(dataset)
+    if spec is None:
+        raise HTTPException(status_code=404, detail="Unknown dataset")
+    require_permission(get_user_role(current_user, db), spec.permission)
+    try:
+        export_service.check_format(export_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if until is None:
+        until = export_service.high_water_mark(db, spec)
+
+    filename = f"{dataset}{f'-after-{after}' if after else ''}.{export_service.EXTENSIONS[export_format]}"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Export-Until": str(until),
+    }
+    return StreamingResponse(
+        export_service.export(db, spec, export_format, after, until, settings.EXPORT_BATCH_SIZE),
+        media_type=export_service.MEDIA_TYPES[export_format],
+        headers=headers,
+    )
+
+
+@router.get("/profile", response_class=Response)
+def profile_process(
+    seconds: float = Query(10, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    interval_ms: float = Query(settings.PROFILER_INTERVAL_MS, ge=1, le=1000),
+    current_user: User = Depends(permission_required(Permission.MANAGE_SYSTEM)),
+):
+    """
+    Sample every thread's stack for `seconds` and return collapsed stacks.
+
+    The ``.folded`` file loads in speedscope or renders with flamegraph.pl.
+    Add ``X-Profile: 1`` to any request instead to profile just that request;
+    its response's ``X-Profile-Id`` is read back from ``/admin/profiles/{id}``.
+    """
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    try:
+        counts = profiler.sample(seconds, interval_ms / 1000)
+    except profiler.SamplerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    filename = f"profile-{datetime.utcnow():%Y%m%dT%H%M%S}.folded"
+    return Response(
+        profiler.collapse(counts),
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/profiles/{profile_id}", response_class=Response)
+def get_request_profile(
+    profile_id: str,
+    current_user: User = Depends(permission_required(Permission.MANAGE_SYSTEM)),
+):
+    """Collapsed stacks recorded for a request sent with ``X-Profile: 1``."""
+    text = profiler.get_profile(profile_id)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return Response(
+        text,
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'},
+    )
+
+
+@router.get("/slow-queries", response_model=List[SlowQueryResponse])
+def list_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    sort: str = Query("total", description="total, max, mean or count"),
+    current_user: User = Depends(permission_required(Permission.MANAGE_SYSTEM)),
+):
+    """
+    Statement shapes that ran over SLOW_QUERY_THRESHOLD_MS in this process, slowest first.
+
+    Each entry has the normalised SQL, parameter types, the routes it came
+    from and the plan captured the first time it was slow.
+    """
+    try:
+        return slow_queries.top(limit, sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def reset_slow_queries(
+    current_user: User = Depends(permission_required(Permission.MANAGE_SYSTEM)),
+):
+    """Clear the slow-query report (e.g. after adding an index)."""
+    slow_queries.reset()
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.security import verify_password, get_password_hash, create_access_token, decode_access_token
 from app.core.config import settings
+from app.core.rbac import check_permission, require_permission
 from app.models.user import User
 from app.models.organization import OrgMember
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
@@ -64,6 +65,40 @@ def get_user_role(current_user: User, db: Session) -> str:
     return membership.role if membership else "user"
 
 
+def permission_required(permission: str):
+    """
+    Dependency factory requiring the current user's role to grant a permission.
+
+    Usage:
+        @router.post("/queue/claim")
+        def claim(current_user: User = Depends(permission_required(Permission.VERIFY_PROJECTS))):
+            ...
+    """
+    def dependency(
+        current_user: User = Depends(require_auth),
+        db: Session = Depends(get_db)
+    ) -> User:
+        require_permission(get_user_role(current_user, db), permission)
+        return current_user
+
+    return dependency
+
+
+def token_grants(authorization: Optional[str], permission: str) -> bool:
+    """
+    Whether an ``Authorization: Bearer`` header's token grants a permission.
+
+    Uses the signed role claim, without a database lookup, for checks made
+    outside the dependency system (middleware). A role change takes effect
+    when the user's token is reissued.
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    payload = decode_access_token(token)
+    return bool(payload) and check_permission(payload.get("role", ""), permission)
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user."""
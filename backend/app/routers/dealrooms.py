@@ -1,7 +1,7 @@
 """Deal rooms router."""
-from typing import List
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional, Sequence
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -11,7 +11,12 @@ from app.models.dealroom import DealRoom, Message, Meeting
 from app.schemas.dealroom import (
     DealRoomCreate, DealRoomResponse, DealRoomUpdate,
     MessageCreate, MessageResponse,
-    MeetingCreate, MeetingResponse, MeetingUpdate
+    MeetingCreate, MeetingResponse, MeetingUpdate,
+    MeetingSlotCheck, MeetingConflict, MeetingConflictResponse,
+    FreeBusyResponse, AttendeeFreeBusy, BusyBlock, MeetingSlotSuggestion
+)
+from app.services.scheduling_service import (
+    MeetingScheduler, as_naive_utc
 )
 from .auth import require_auth
 
@@ -136,10 +141,129 @@ def get_messages(
 
 
 # Meetings
+def _find_conflicts(
+    db: Session,
+    attendee_ids: Sequence[int],
+    start: datetime,
+    duration_minutes: int,
+    exclude_meeting_id: Optional[int] = None,
+) -> List[MeetingConflict]:
+    """Find meetings in any deal room that overlap a slot for the given attendees."""
+    start = as_naive_utc(start)
+    end = start + timedelta(minutes=duration_minutes)
+    scheduler = MeetingScheduler.load(
+        db, attendee_ids, start, end, exclude_meeting_id=exclude_meeting_id
+    )
+    return [
+        MeetingConflict(
+            attendee_id=attendee_id,
+            meeting_id=interval.meeting_id,
+            deal_room_id=interval.deal_room_id,
+            title=interval.title,
+            start=interval.start,
+            end=interval.end,
+        )
+        for attendee_id, intervals in scheduler.conflicts(attendee_ids, start, end).items()
+        for interval in intervals
+    ]
+
+
+def _raise_on_conflicts(conflicts: List[MeetingConflict]):
+    """Raise HTTP 409 listing the conflicting meetings."""
+    if conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": "Meeting conflicts with existing meetings",
+                "conflicts": [c.model_dump(mode="json") for c in conflicts],
+            },
+        )
+
+
+@router.post("/meetings/conflicts", response_model=MeetingConflictResponse)
+def check_meeting_conflicts(
+    slot: MeetingSlotCheck,
+    current_user: User = Depends(require_auth),
+    db: Session = Depends(get_db)
+):
+    """Check whether a proposed slot conflicts with attendees' meetings in any deal room."""
+    conflicts = _find_conflicts(
+        db, slot.attendees, slot.scheduled_at, slot.duration_minutes, slot.exclude_meeting_id
+    )
+    return MeetingConflictResponse(has_conflict=bool(conflicts), conflicts=conflicts)
+
+
+@router.get("/meetings/free-busy", response_model=FreeBusyResponse)
+def get_free_busy(
+    attendees: List[int] = Query(..., min_length=1),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    current_user: User = Depends(require_auth),
+    db: Session = Depends(get_db)
+):
+    """Get busy periods for attendees across all deal rooms (defaults to the next 7 days)."""
+    start = as_naive_utc(start) if start else datetime.utcnow()
+    end = as_naive_utc(end) if end else start + timedelta(days=7)
+    if end <= start:
+        raise HTTPException(status_code=422, detail="end must be after start")
+
+    scheduler = MeetingScheduler.load(db, attendees, start, end)
+    busy = scheduler.free_busy(attendees, start, end)
+    return FreeBusyResponse(
+        start=start,
+        end=end,
+        attendees=[
+            AttendeeFreeBusy(
+                attendee_id=attendee_id,
+                busy=[BusyBlock(start=s, end=e) for s, e in busy[attendee_id]],
+            )
+            for attendee_id in attendees
+        ],
+    )
+
+
+@router.get("/meetings/suggest-slot", response_model=MeetingSlotSuggestion)
+def suggest_meeting_slot(
+    attendees: List[int] = Query(..., min_length=1),
+    duration_minutes: int = Query(60, ge=1, le=1440),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    step_minutes: int = Query(15, ge=1, le=240),
+    work_start_hour: Optional[int] = Query(None, ge=0, le=23),
+    work_end_hour: Optional[int] = Query(None, ge=1, le=24),
+    current_user: User = Depends(require_auth),
+    db: Session = Depends(get_db)
+):
+    """Propose the earliest slot in which all attendees are free (defaults to the next 7 days)."""
+    start = as_naive_utc(start) if start else datetime.utcnow()
+    end = as_naive_utc(end) if end else start + timedelta(days=7)
+    working_hours = None
+    if work_start_hour is not None and work_end_hour is not None:
+        if work_end_hour <= work_start_hour:
+            raise HTTPException(status_code=422, detail="work_end_hour must be after work_start_hour")
+        working_hours = (work_start_hour, work_end_hour)
+
+    scheduler = MeetingScheduler.load(db, attendees, start, end)
+    slot = scheduler.earliest_common_slot(
+        attendees,
+        timedelta(minutes=duration_minutes),
+        start,
+        end,
+        step_minutes=step_minutes,
+        working_hours=working_hours,
+    )
+    return MeetingSlotSuggestion(
+        scheduled_at=slot,
+        duration_minutes=duration_minutes,
+        found=slot is not None,
+    )
+
+
 @router.post("/{room_id}/meetings", response_model=MeetingResponse)
 def schedule_meeting(
     room_id: int,
     meeting_data: MeetingCreate,
+    allow_conflicts: bool = False,
     current_user: User = Depends(require_auth),
     db: Session = Depends(get_db)
 ):
@@ -148,6 +272,12 @@ def schedule_meeting(
     if not room:
         raise HTTPException(status_code=404, detail="Deal room not found")
 
+    if not allow_conflicts:
+        participants = set(meeting_data.attendees or []) | {current_user.id}
+        _raise_on_conflicts(_find_conflicts(
+            db, sorted(participants), meeting_data.scheduled_at, meeting_data.duration_minutes
+        ))
+
     meeting = Meeting(
         deal_room_id=room_id,
         title=meeting_data.title,
@@ -185,6 +315,7 @@ def update_meeting(
     room_id: int,
     meeting_id: int,
     meeting_data: MeetingUpdate,
+    allow_conflicts: bool = False,
     current_user: User = Depends(require_auth),
     db: Session = Depends(get_db)
 ):
@@ -196,7 +327,25 @@ def update_meeting(
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
-    for field, value in meeting_data.model_dump(exclude_unset=True).items():
+    updates = meeting_data.model_dump(exclude_unset=True)
+    if "attendees" in updates:
+        updates["attendees"] = updates["attendees"] or []
+    # Re-check when the slot or the people in it change, or a meeting is reinstated
+    reinstated = updates.get("status") == "scheduled" and meeting.status != "scheduled"
+    changed = reinstated or bool({"scheduled_at", "duration_minutes", "attendees"} & updates.keys())
+    if changed and not allow_conflicts and updates.get("status", meeting.status) == "scheduled":
+        participants = set(updates.get("attendees", meeting.attendees) or [])
+        if meeting.created_by is not None:
+            participants.add(meeting.created_by)
+        _raise_on_conflicts(_find_conflicts(
+            db,
+            sorted(participants),
+            updates.get("scheduled_at") or meeting.scheduled_at,
+            updates.get("duration_minutes") or meeting.duration_minutes or 0,
+            exclude_meeting_id=meeting.id,
+        ))
+
+    for field, value in updates.items():
         setattr(meeting, field, value)
 
     db.commit()
@@ -0,0 +1,77 @@
+"""FX router."""
+from typing import List, Optional
+from datetime import date
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.rbac import Permission
+from app.models.user import User
+from app.models.fx import FxRate
+from app.schemas.fx import (
+    FxRateResponse, FxImportResult, FxCurrencyCoverage,
+    FxConvertRequest, FxConvertResponse
+)
+from app.services import fx_service
+from app.utils.finance import to_optional
+from .auth import require_auth, permission_required
+
+router = APIRouter(prefix="/fx", tags=["FX"])
+
+
+@router.get("/currencies", response_model=List[FxCurrencyCoverage])
+def list_currencies(db: Session = Depends(get_db)):
+    """List currencies with loaded rates and their date coverage."""
+    coverage = fx_service.get_rate_table(db).coverage()
+    return [{"currency": currency, **info} for currency, info in coverage.items()]
+
+
+@router.get("/rates", response_model=List[FxRateResponse])
+def list_rates(
+    currency: str = Query(..., min_length=3, max_length=3),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = Query(366, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """Get daily rate history for a currency, most recent first."""
+    query = db.query(FxRate).filter(FxRate.currency == currency.upper())
+    if start:
+        query = query.filter(FxRate.rate_date >= start)
+    if end:
+        query = query.filter(FxRate.rate_date <= end)
+    return query.order_by(FxRate.rate_date.desc()).limit(limit).all()
+
+
+@router.post("/rates/import", response_model=FxImportResult)
+def import_rates(
+    csv_text: str = Body(..., media_type="text/csv"),
+    source: Optional[str] = None,
+    current_user: User = Depends(permission_required(Permission.MANAGE_SYSTEM)),
+    db: Session = Depends(get_db)
+):
+    """Import daily rates from a CSV body with date,currency,usd_per_unit columns."""
+    try:
+        return fx_service.load_csv_text(db, csv_text, source or "api-import")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/convert", response_model=FxConvertResponse)
+def convert_amounts(
+    conversion: FxConvertRequest,
+    current_user: User = Depends(require_auth),
+    db: Session = Depends(get_db)
+):
+    """Convert many amounts in one vectorized pass."""
+    table = fx_service.get_rate_table(db)
+    try:
+        converted = table.convert(
+            [item.amount for item in conversion.items],
+            [item.currency for item in conversion.items],
+            [item.rate_date or date.today() for item in conversion.items],
+            to_currency=conversion.to_currency,
+        )
+    except fx_service.UnknownCurrencyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"to_currency": conversion.to_currency.upper(), "amounts": to_optional(converted)}
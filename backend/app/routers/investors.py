@@ -1,7 +1,7 @@
 """Investors router."""
 from typing import List
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -12,10 +12,14 @@ from app.schemas.investor import (
     InvestorPreferencesCreate, InvestorPreferencesResponse,
     MatchResponse, MatchInterest
 )
+from app.services.response_cache import cached_response
 from .auth import require_auth
 
 router = APIRouter(prefix="/investors", tags=["Investors"])
 
+# Preferences are only shown to signed-in users: no shared caches, always revalidate
+PREFERENCES_CACHE_CONTROL = "private, no-cache"
+
 
 @router.post("/preferences", response_model=InvestorPreferencesResponse)
 def create_or_update_preferences(
@@ -81,16 +85,20 @@ def get_my_preferences(
 @router.get("/preferences/{org_id}", response_model=InvestorPreferencesResponse)
 def get_org_preferences(
     org_id: int,
+    request: Request,
     current_user: User = Depends(require_auth),
     db: Session = Depends(get_db)
 ):
-    """Get investor preferences by organization ID."""
-    prefs = db.query(InvestorPreferences).filter(
-        InvestorPreferences.org_id == org_id
-    ).first()
-    if not prefs:
-        raise HTTPException(status_code=404, detail="Preferences not found")
-    return prefs
+    """Get investor preferences by organization ID (served from the response cache)."""
+    def load():
+        prefs = db.query(InvestorPreferences).filter(
+            InvestorPreferences.org_id == org_id
+        ).first()
+        if not prefs:
+            raise HTTPException(status_code=404, detail="Preferences not found")
+        return InvestorPreferencesResponse.model_validate(prefs), prefs.updated_at
+
+    return cached_response(request, ("preferences", org_id), load, PREFERENCES_CACHE_CONTROL)
 
 
 # Match endpoints
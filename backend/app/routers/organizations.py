@@ -1,19 +1,25 @@
 """Organizations router."""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse, trusted_dump
 from app.models.user import User
 from app.models.organization import Organization, OrgMember
 from app.schemas.organization import (
     OrganizationCreate, OrganizationUpdate, OrganizationResponse,
     OrgMemberCreate, OrgMemberResponse
 )
+from app.services.response_cache import cached_response
+from app.utils.fieldsets import load_options, parse_fields
 from .auth import require_auth
 
 router = APIRouter(prefix="/organizations", tags=["Organizations"])
 
+# Organization profiles change rarely; clients revalidate with the ETag after this
+ORGANIZATION_CACHE_CONTROL = "public, max-age=300"
+
 
 @router.post("/", response_model=OrganizationResponse, status_code=status.HTTP_201_CREATED)
 def create_organization(
@@ -32,10 +38,9 @@ def create_organization(
         created_by=current_user.id,
     )
     db.add(org)
-    db.commit()
-    db.refresh(org)
+    db.flush()
 
-    # Add creator as owner
+    # Add creator as owner, in the same transaction
     member = OrgMember(
         org_id=org.id,
         user_id=current_user.id,
@@ -44,31 +49,42 @@ def create_organization(
     )
     db.add(member)
     db.commit()
+    db.refresh(org)
 
     return org
 
 
-@router.get("/", response_model=List[OrganizationResponse])
+@router.get("/", response_model=List[OrganizationResponse], response_class=FastJSONResponse)
 def list_organizations(
     skip: int = 0,
     limit: int = 100,
     org_type: str = None,
+    fields: Optional[str] = Query(None, description="Comma-separated organization fields to return"),
     db: Session = Depends(get_db)
 ):
     """List all organizations."""
-    query = db.query(Organization)
+    try:
+        selected = parse_fields(OrganizationResponse, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    query = db.query(Organization).options(*load_options(Organization, selected, OrganizationResponse))
     if org_type:
         query = query.filter(Organization.org_type == org_type)
-    return query.offset(skip).limit(limit).all()
+    return FastJSONResponse([
+        trusted_dump(OrganizationResponse, org, selected) for org in query.offset(skip).limit(limit)
+    ])
 
 
 @router.get("/{org_id}", response_model=OrganizationResponse)
-def get_organization(org_id: int, db: Session = Depends(get_db)):
-    """Get organization by ID."""
-    org = db.query(Organization).filter(Organization.id == org_id).first()
-    if not org:
-        raise HTTPException(status_code=404, detail="Organization not found")
-    return org
+def get_organization(org_id: int, request: Request, db: Session = Depends(get_db)):
+    """Get organization by ID (served from the response cache, with ETag revalidation)."""
+    def load():
+        org = db.query(Organization).filter(Organization.id == org_id).first()
+        if not org:
+            raise HTTPException(status_code=404, detail="Organization not found")
+        return OrganizationResponse.model_validate(org), org.updated_at
+
+    return cached_response(request, ("organization", org_id), load, ORGANIZATION_CACHE_CONTROL)
 
 
 @router.put("/{org_id}", response_model=OrganizationResponse)
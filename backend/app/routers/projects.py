@@ -1,19 +1,41 @@
 """Projects router."""
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import time
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse, trusted_dump
+from app.core.rbac import Permission
 from app.models.user import User
 from app.models.project import Project, ProjectFinancials
 from app.schemas.project import (
     ProjectCreate, ProjectUpdate, ProjectResponse, ProjectListResponse,
-    ProjectFinancialsCreate, ProjectFinancialsResponse
+    ProjectFinancialsCreate, ProjectFinancialsResponse,
+    ProjectRiskAssessmentResponse, RiskScoringRequest, RiskScoringResponse,
+    FinancialsRecomputeRequest, FinancialsRecomputeResponse,
+    SimulationRequest, SimulationResponse,
+    PortfolioSimulationRequest, PortfolioSimulationResponse,
+    ProjectAggregateResponse, ProjectFilterResponse, ProjectSearchResponse,
+    ProjectGeoResponse, ProjectClusterResponse
 )
-from .auth import require_auth
+from app.services import (
+    facet_service, financial_metrics, fx_service, geo_service, project_import, project_snapshot, risk_service,
+    search_service, simulation_service, tile_service
+)
+from app.services.job_service import enqueue, job_worker
+from app.services.response_cache import cached_response, etag_matches
+from app.utils import bulk_import
+from app.utils.fieldsets import load_options, parse_fields
+from .auth import require_auth, permission_required
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+# Cache-Control for cached single-project reads; clients revalidate with the ETag
+PROJECT_CACHE_CONTROL = "public, max-age=30"
+
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 def create_project(
@@ -48,7 +70,42 @@ def create_project(
     return project
 
 
-@router.get("/", response_model=ProjectListResponse)
+@router.post("/bulk", response_class=StreamingResponse)
+async def bulk_import_projects(
+    request: Request,
+    current_user: User = Depends(require_auth),
+    db: Session = Depends(get_db)
+):
+    """
+    Import projects from a CSV (text/csv) or NDJSON (application/x-ndjson) body.
+
+    Columns or keys are ``ProjectCreate`` fields. Rows are validated and
+    inserted BULK_IMPORT_CHUNK_SIZE at a time, one transaction per chunk; the
+    response streams an NDJSON result line per row and a closing summary.
+    """
+    try:
+        fmt, charset = bulk_import.import_format(request.headers.get("content-type"))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+    upload = await bulk_import.spool(request.stream(), settings.BULK_IMPORT_SPOOL_BYTES)
+    try:
+        records = bulk_import.open_records(upload, fmt, charset, ProjectCreate)
+    except ValueError as e:
+        upload.close()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    user_id = current_user.id
+
+    def report():
+        with upload:
+            yield from bulk_import.run_import(
+                records, lambda rows: project_import.insert_projects(db, user_id, rows), settings.BULK_IMPORT_CHUNK_SIZE
+            )
+
+    return StreamingResponse(report(), media_type="application/x-ndjson")
+
+
+@router.get("/", response_model=ProjectListResponse, response_class=FastJSONResponse)
 def list_projects(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
@@ -56,9 +113,17 @@ def list_projects(
     country: Optional[str] = None,
     verification_level: Optional[str] = None,
     status_filter: Optional[str] = Query(None, alias="status"),
+    min_capex_usd: Optional[float] = Query(None, ge=0),
+    max_capex_usd: Optional[float] = Query(None, ge=0),
+    facets: bool = Query(False, description="Include counts per sector, country, status and verification level"),
+    fields: Optional[str] = Query(None, description="Comma-separated project fields to return (id is always included)"),
     db: Session = Depends(get_db)
 ):
-    """List projects with pagination and filters."""
+    """List projects with pagination and filters (capex compared in USD at today's rates)."""
+    try:
+        selected = parse_fields(ProjectResponse, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     query = db.query(Project)
 
     if sector:
@@ -69,26 +134,317 @@ def list_projects(
         query = query.filter(Project.verification_level == verification_level)
     if status_filter:
         query = query.filter(Project.status == status_filter)
+    if min_capex_usd is not None or max_capex_usd is not None:
+        capex = fx_service.capex_usd_expression()
+        query = query.join(ProjectFinancials, ProjectFinancials.project_id == Project.id)
+        if min_capex_usd is not None:
+            query = query.filter(capex >= min_capex_usd)
+        if max_capex_usd is not None:
+            query = query.filter(capex <= max_capex_usd)
 
-    total = query.count()
-    items = query.offset((page - 1) * page_size).limit(page_size).all()
+    facet_counts = None
+    if facets:
+        signature = (sector, country, verification_level, status_filter, min_capex_usd, max_capex_usd)
+        result = facet_service.get_facets(query, signature)
+        total, facet_counts = result["total"], result["facets"]
+    else:
+        total = query.count()
+    items = (
+        query.options(*load_options(Project, selected, ProjectResponse))
+        .offset((page - 1) * page_size).limit(page_size).all()
+    )
+
+    return FastJSONResponse({
+        "items": [trusted_dump(ProjectResponse, item, selected) for item in items],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "pages": (total + page_size - 1) // page_size,
+        "facets": facet_counts,
+    })
+
+
+@router.get("/search", response_model=ProjectSearchResponse)
+def search_projects(
+    q: str = Query(..., min_length=1, max_length=500),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    sector: Optional[str] = None,
+    country: Optional[str] = None,
+    verification_level: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    highlight: bool = True,
+    db: Session = Depends(get_db)
+):
+    """Ranked full-text search over name, summary, description, impact statement and SDG tags."""
+    try:
+        result = search_service.search_projects(
+            db,
+            q,
+            filters={
+                "sector": sector,
+                "country": country,
+                "verification_level": verification_level,
+                "status": status_filter,
+            },
+            offset=(page - 1) * page_size,
+            limit=page_size,
+            with_highlights=highlight,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return ProjectListResponse(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        pages=(total + page_size - 1) // page_size
+    ids = [hit["project_id"] for hit in result["hits"]]
+    projects = {
+        p.id: p for p in db.query(Project).options(*load_options(Project, None, ProjectResponse)).filter(Project.id.in_(ids))
+    }
+    total = result["total"]
+    return {
+        "items": [
+            {"project": projects[hit["project_id"]], "score": hit["score"], "highlights": hit["highlights"]}
+            for hit in result["hits"] if hit["project_id"] in projects
+        ],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "pages": (total + page_size - 1) // page_size,
+        "backend": result["backend"],
+    }
+
+
+@router.post("/risk/score", response_model=RiskScoringResponse)
+def score_project_risk(
+    response: Response,
+    scoring: Optional[RiskScoringRequest] = None,
+    current_user: User = Depends(permission_required(Permission.UPDATE_ANY_PROJECT)),
+    db: Session = Depends(get_db)
+):
+    """Score project risk in batch; queued as a background job when workers are running."""
+    scoring = scoring or RiskScoringRequest()
+    payload = {"project_ids": scoring.project_ids, "force": scoring.force, "user_id": current_user.id}
+    if job_worker.is_running:
+        job = enqueue(db, "risk.score_projects", payload=payload)
+        job_worker.notify()
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {"model_version": risk_service.MODEL_VERSION, "job_id": job.id}
+    return risk_service.score_projects(db, **payload)
+
+
+@router.post("/financials/recompute", response_model=FinancialsRecomputeResponse)
+def recompute_financials(
+    recompute: Optional[FinancialsRecomputeRequest] = None,
+    current_user: User = Depends(permission_required(Permission.UPDATE_ANY_PROJECT)),
+    db: Session = Depends(get_db)
+):
+    """Re-derive IRR, ROI and payback from timeline cash flows for many projects at once."""
+    recompute = recompute or FinancialsRecomputeRequest()
+    return financial_metrics.recompute_financials(
+        db,
+        project_ids=recompute.project_ids,
+        dry_run=recompute.dry_run,
+        include_results=recompute.include_results,
     )
 
 
+@router.post("/financials/simulate-portfolio", response_model=PortfolioSimulationResponse)
+def simulate_portfolio(
+    simulation: PortfolioSimulationRequest,
+    current_user: User = Depends(require_auth),
+    db: Session = Depends(get_db)
+):
+    """Simulate IRR/NPV for several projects and the combined portfolio NPV."""
+    financials = db.query(ProjectFinancials).filter(
+        ProjectFinancials.project_id.in_(simulation.project_ids)
+    ).all()
+    missing = set(simulation.project_ids) - {f.project_id for f in financials}
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Financials not found for projects {sorted(missing)}")
+
+    try:
+        return simulation_service.simulate_portfolio(financials, n_scenarios=simulation.n_scenarios)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    return [v.strip() for v in value.split(",") if v.strip()] if value else None
+
+
+def snapshot_filters(
+    sector: Optional[str] = Query(None, description="Comma-separated sectors"),
+    country: Optional[str] = Query(None, description="Comma-separated countries"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Comma-separated statuses"),
+    verification_level: Optional[str] = Query(None, description="Comma-separated levels"),
+    sponsor_org_id: Optional[int] = None,
+    is_featured: Optional[bool] = None,
+    min_investment_usd: Optional[float] = None,
+    max_investment_usd: Optional[float] = None,
+    min_risk_score: Optional[float] = Query(None, ge=0, le=100),
+    max_risk_score: Optional[float] = Query(None, ge=0, le=100),
+) -> Dict[str, Any]:
+    """Filters shared by the snapshot-backed analytics endpoints."""
+    return {
+        "sector": _split(sector),
+        "country": _split(country),
+        "status": _split(status_filter),
+        "verification_level": _split(verification_level),
+        "sponsor_org_id": sponsor_org_id,
+        "is_featured": is_featured,
+        "min_investment_usd": min_investment_usd,
+        "max_investment_usd": max_investment_usd,
+        "min_risk_score": min_risk_score,
+        "max_risk_score": max_risk_score,
+    }
+
+
+def _snapshot_info(snapshot: project_snapshot.ProjectSnapshot) -> Dict[str, Any]:
+    return {
+        "rows": snapshot.size,
+        "refreshed_at": snapshot.refreshed_at,
+        "watermark": snapshot.watermark,
+        "memory_bytes": snapshot.nbytes,
+    }
+
+
+@router.get("/analytics/aggregate", response_model=ProjectAggregateResponse)
+def aggregate_projects(
+    group_by: str = Query("sector", pattern="^(sector|country|status|verification_level)$"),
+    fresh: bool = Query(False, description="Apply pending changes before answering"),
+    filters: Dict[str, Any] = Depends(snapshot_filters),
+    db: Session = Depends(get_db)
+):
+    """Project counts, investment and mean ROI/risk per group, served from the columnar snapshot."""
+    started = time.perf_counter()
+    snapshot = project_snapshot.get_snapshot(db, fresh=fresh)
+    mask = snapshot.mask(**filters)
+    totals = snapshot.aggregate(None, mask)
+    return {
+        "group_by": group_by,
+        "groups": snapshot.aggregate(group_by, mask),
+        "totals": totals[0] if totals else {"count": 0, "investment_usd_total": 0.0},
+        "snapshot": _snapshot_info(snapshot),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+@router.get("/analytics/filter", response_model=ProjectFilterResponse)
+def filter_projects(
+    sort: str = Query("id", pattern="^(id|updated_at|investment_usd|expected_roi_pct|payback_years|risk_score)$"),
+    descending: bool = False,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=10_000),
+    fresh: bool = Query(False, description="Apply pending changes before answering"),
+    filters: Dict[str, Any] = Depends(snapshot_filters),
+    db: Session = Depends(get_db)
+):
+    """Ids of projects matching the filters, sorted, served from the columnar snapshot."""
+    started = time.perf_counter()
+    snapshot = project_snapshot.get_snapshot(db, fresh=fresh)
+    mask = snapshot.mask(**filters)
+    return {
+        "total": int(mask.sum()),
+        "ids": snapshot.select_ids(mask, sort=sort, descending=descending, offset=offset, limit=limit),
+        "snapshot": _snapshot_info(snapshot),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+def geo_filters(
+    sector: Optional[str] = None,
+    country: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    verification_level: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Filters shared by the map endpoints."""
+    return {
+        "sector": sector,
+        "country": country,
+        "status": status_filter,
+        "verification_level": verification_level,
+    }
+
+
+def viewport(
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+):
+    """Map bounds; west > east means the viewport crosses the antimeridian."""
+    if south > north:
+        raise HTTPException(status_code=400, detail="south must not be greater than north")
+    return south, west, north, east
+
+
+@router.get("/geo/bbox", response_model=ProjectGeoResponse)
+def projects_in_bbox(
+    limit: int = Query(500, ge=1, le=5000),
+    bbox: tuple = Depends(viewport),
+    filters: Dict[str, Any] = Depends(geo_filters),
+    db: Session = Depends(get_db)
+):
+    """Located projects inside a bounding box."""
+    return geo_service.projects_in_bbox(db, bbox, filters=filters, limit=limit)
+
+
+@router.get("/geo/nearby", response_model=ProjectGeoResponse)
+def projects_nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(..., gt=0, le=5000),
+    limit: int = Query(500, ge=1, le=5000),
+    filters: Dict[str, Any] = Depends(geo_filters),
+    db: Session = Depends(get_db)
+):
+    """Located projects within a radius of a point, nearest first."""
+    return geo_service.projects_near(db, lat, lon, radius_km, filters=filters, limit=limit)
+
+
+@router.get("/geo/clusters", response_model=ProjectClusterResponse)
+def project_clusters(
+    zoom: int = Query(..., ge=0, le=22),
+    bbox: tuple = Depends(viewport),
+    filters: Dict[str, Any] = Depends(geo_filters),
+    db: Session = Depends(get_db)
+):
+    """Project counts per map cell sized for the zoom level, so maps never load the full catalogue."""
+    return {"zoom": zoom, **geo_service.clusters(db, bbox, zoom, filters=filters)}
+
+
+@router.get("/tiles/{z}/{x}/{y}")
+def project_tile(
+    z: int,
+    x: int,
+    y: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Precomputed project clusters for a web-map tile.
+
+    Features are [x, y, count, project_id, status] in tile units of `extent`;
+    project_id and status are only set for single projects.
+    """
+    if not tile_service.tile_exists(z, x, y):
+        raise HTTPException(status_code=404, detail="Tile not found")
+    tile = tile_service.get_tile(db, z, x, y)
+    etag = f'"{tile.etag}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.MAP_TILE_MAX_AGE_SECONDS}"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=tile.payload, media_type="application/json", headers=headers)
+
+
 @router.get("/{project_id}", response_model=ProjectResponse)
-def get_project(project_id: int, db: Session = Depends(get_db)):
-    """Get project by ID."""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return project
+def get_project(project_id: int, request: Request, db: Session = Depends(get_db)):
+    """Get project by ID (served from the response cache, with ETag revalidation)."""
+    def load():
+        project = db.query(Project).filter(Project.id == project_id).first()
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return ProjectResponse.model_validate(project), project.updated_at
+
+    return cached_response(request, ("project", project_id), load, PROJECT_CACHE_CONTROL)
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
@@ -158,11 +514,46 @@ def create_or_update_financials(
 
 
 @router.get("/{project_id}/financials", response_model=ProjectFinancialsResponse)
-def get_financials(project_id: int, db: Session = Depends(get_db)):
-    """Get project financials."""
+def get_financials(project_id: int, request: Request, db: Session = Depends(get_db)):
+    """Get project financials (served from the response cache, with ETag revalidation)."""
+    def load():
+        financials = db.query(ProjectFinancials).filter(
+            ProjectFinancials.project_id == project_id
+        ).first()
+        if not financials:
+            raise HTTPException(status_code=404, detail="Financials not found")
+        return ProjectFinancialsResponse.model_validate(financials), financials.updated_at
+
+    return cached_response(request, ("financials", project_id), load, PROJECT_CACHE_CONTROL)
+
+
+@router.post("/{project_id}/financials/simulate", response_model=SimulationResponse)
+def simulate_financials(
+    project_id: int,
+    simulation: Optional[SimulationRequest] = None,
+    current_user: User = Depends(require_auth),
+    db: Session = Depends(get_db)
+):
+    """Run a Monte Carlo simulation over the distributions in assumptions_json."""
+    simulation = simulation or SimulationRequest()
     financials = db.query(ProjectFinancials).filter(
         ProjectFinancials.project_id == project_id
     ).first()
     if not financials:
         raise HTTPException(status_code=404, detail="Financials not found")
-    return financials
+
+    try:
+        return simulation_service.simulate_project(
+            financials, n_scenarios=simulation.n_scenarios, seed=simulation.seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{project_id}/risk", response_model=ProjectRiskAssessmentResponse)
+def get_risk_assessment(project_id: int, db: Session = Depends(get_db)):
+    """Get the project's effective risk assessment (human override first)."""
+    assessment = risk_service.effective_assessment(db, project_id)
+    if not assessment:
+        raise HTTPException(status_code=404, detail="Risk assessment not found")
+    return assessment
@@ -0,0 +1,27 @@
+"""Search router."""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.schemas.search import SuggestResponse
+from app.services import suggest_service
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    types: Optional[str] = Query(None, description="Comma-separated: project, organization"),
+    limit: int = Query(10, ge=1, le=25),
+    db: Session = Depends(get_db)
+):
+    """Typeahead completions for project and organization names, tolerant of typos."""
+    kinds = tuple(t.strip() for t in types.split(",") if t.strip()) if types else suggest_service.KINDS
+    unknown = set(kinds) - set(suggest_service.KINDS)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown suggestion types: {sorted(unknown)}")
+
+    suggest_service.ensure_index(db)
+    return {"query": q, "suggestions": suggest_service.suggest_index.suggest(q, kinds=kinds, limit=limit)}
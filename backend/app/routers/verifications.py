@@ -1,19 +1,26 @@
 """Verifications router."""
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.rbac import Permission
 from app.models.user import User
+from app.models.organization import OrgMember
 from app.models.project import Project
 from app.models.verification import VerificationRequest, VerificationCheck, VerificationEvent
 from app.schemas.verification import (
     VerificationRequestCreate, VerificationRequestResponse,
     VerificationCheckCreate, VerificationCheckResponse,
-    VerificationDecision, VerificationCheckUpdate
+    VerificationDecision, VerificationCheckUpdate,
+    VerificationQueueItem, VerificationQueueMetrics
 )
-from .auth import require_auth
+from app.services import verification_queue
+from app.services.job_service import enqueue, job_worker
+from app.services.verification_service import run_automated_checks
+from .auth import require_auth, permission_required
 
 router = APIRouter(prefix="/verifications", tags=["Verifications"])
 
@@ -36,10 +43,9 @@ def create_verification_request(
         requested_by=current_user.id,
     )
     db.add(verification)
-    db.commit()
-    db.refresh(verification)
+    db.flush()
 
-    # Log event
+    # Log event, in the same transaction
     event = VerificationEvent(
         request_id=verification.id,
         event_type="created",
@@ -48,6 +54,22 @@ def create_verification_request(
     )
     db.add(event)
     db.commit()
+    db.refresh(verification)
+
+    if settings.VERIFICATION_AUTO_CHECKS:
+        if job_worker.is_running:
+            # Hand off to the background workers so the request returns immediately
+            enqueue(
+                db,
+                "verification.run_checks",
+                payload={"request_id": verification.id, "user_id": current_user.id},
+                idempotency_key=f"verification-checks:{verification.id}",
+                priority=1,
+            )
+            job_worker.notify()
+        else:
+            run_automated_checks(db, verification, user_id=current_user.id)
+        db.refresh(verification)
 
     return verification
 
@@ -56,6 +78,7 @@ def create_verification_request(
 def list_verification_requests(
     status_filter: str = None,
     project_id: int = None,
+    assigned_to: int = None,
     current_user: User = Depends(require_auth),
     db: Session = Depends(get_db)
 ):
@@ -66,10 +89,60 @@ def list_verification_requests(
         query = query.filter(VerificationRequest.status == status_filter)
     if project_id:
         query = query.filter(VerificationRequest.project_id == project_id)
+    if assigned_to:
+        query = query.filter(VerificationRequest.assigned_to == assigned_to)
 
     return query.order_by(VerificationRequest.created_at.desc()).all()
 
 
+# Verifier work queue
+@router.get("/queue", response_model=List[VerificationQueueItem])
+def peek_queue(
+    limit: int = Query(50, ge=1, le=200),
+    to_level: Optional[str] = Query(None, pattern="^V[1-5]$"),
+    current_user: User = Depends(permission_required(Permission.VERIFY_PROJECTS)),
+    db: Session = Depends(get_db)
+):
+    """List queued verification requests in priority order."""
+    return verification_queue.peek_queue(db, limit=limit, to_level=to_level)
+
+
+@router.post(
+    "/queue/claim",
+    response_model=VerificationRequestResponse,
+    responses={204: {"description": "Queue is empty"}},
+)
+def claim_next_request(
+    to_level: Optional[str] = Query(None, pattern="^V[1-5]$"),
+    current_user: User = Depends(permission_required(Permission.VERIFY_PROJECTS)),
+    db: Session = Depends(get_db)
+):
+    """Atomically claim the highest-priority queued verification request."""
+    membership = db.query(OrgMember).filter(
+        OrgMember.user_id == current_user.id,
+        OrgMember.status == "active"
+    ).first()
+    verification = verification_queue.claim_next(
+        db,
+        verifier_id=current_user.id,
+        verifier_org_id=membership.org_id if membership else None,
+        to_level=to_level,
+    )
+    if verification is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return verification
+
+
+@router.get("/queue/metrics", response_model=VerificationQueueMetrics)
+def get_queue_metrics(
+    window_days: int = Query(7, ge=1, le=90),
+    current_user: User = Depends(permission_required(Permission.VERIFY_PROJECTS)),
+    db: Session = Depends(get_db)
+):
+    """Queue depth and time-in-queue metrics."""
+    return verification_queue.queue_metrics(db, window_days=window_days)
+
+
 @router.get("/{request_id}", response_model=VerificationRequestResponse)
 def get_verification_request(
     request_id: int,
@@ -111,6 +184,40 @@ def add_verification_check(
     return check
 
 
+@router.post("/{request_id}/release", response_model=VerificationRequestResponse)
+def release_request(
+    request_id: int,
+    current_user: User = Depends(permission_required(Permission.VERIFY_PROJECTS)),
+    db: Session = Depends(get_db)
+):
+    """Return a claimed verification request to the queue."""
+    verification = db.query(VerificationRequest).filter(
+        VerificationRequest.id == request_id
+    ).first()
+    if not verification:
+        raise HTTPException(status_code=404, detail="Verification request not found")
+    if verification.status != "in_review" or verification.assigned_to != current_user.id:
+        raise HTTPException(status_code=409, detail="Request is not claimed by you")
+
+    return verification_queue.release(db, verification, current_user.id)
+
+
+@router.post("/{request_id}/checks/run", response_model=List[VerificationCheckResponse])
+def run_checks(
+    request_id: int,
+    current_user: User = Depends(require_auth),
+    db: Session = Depends(get_db)
+):
+    """Run (or re-run) the automated checks for a verification request."""
+    verification = db.query(VerificationRequest).filter(
+        VerificationRequest.id == request_id
+    ).first()
+    if not verification:
+        raise HTTPException(status_code=404, detail="Verification request not found")
+
+    return run_automated_checks(db, verification, user_id=current_user.id)
+
+
 @router.put("/{request_id}/checks/{check_id}", response_model=VerificationCheckResponse)
 def update_verification_check(
     request_id: int,
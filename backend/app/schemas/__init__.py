@@ -22,6 +22,14 @@ from .project import (
     ProjectFinancialsCreate,
     ProjectFinancialsResponse,
     ProjectRiskAssessmentResponse,
+    RiskScoringRequest,
+    RiskScoringResponse,
+    FinancialsRecomputeRequest,
+    FinancialsRecomputeResponse,
+    SimulationRequest,
+    SimulationResponse,
+    PortfolioSimulationRequest,
+    PortfolioSimulationResponse,
 )
 from .document import (
     DocumentCreate,
@@ -34,6 +42,8 @@ from .verification import (
     VerificationRequestResponse,
     VerificationCheckCreate,
     VerificationCheckResponse,
+    VerificationQueueItem,
+    VerificationQueueMetrics,
 )
 from .investor import (
     InvestorPreferencesCreate,
@@ -47,7 +57,22 @@ from .dealroom import (
     MessageResponse,
     MeetingCreate,
     MeetingResponse,
+    MeetingSlotCheck,
+    MeetingConflictResponse,
+    FreeBusyResponse,
+    MeetingSlotSuggestion,
 )
+from .fx import (
+    FxRateResponse,
+    FxImportResult,
+    FxConvertRequest,
+    FxConvertResponse,
+)
+from .job import (
+    BackgroundJobResponse,
+    JobStatsResponse,
+)
+from .slow_query import SlowQueryResponse
 
 __all__ = [
     # User
@@ -71,6 +96,14 @@ __all__ = [
     "ProjectFinancialsCreate",
     "ProjectFinancialsResponse",
     "ProjectRiskAssessmentResponse",
+    "RiskScoringRequest",
+    "RiskScoringResponse",
+    "FinancialsRecomputeRequest",
+    "FinancialsRecomputeResponse",
+    "SimulationRequest",
+    "SimulationResponse",
+    "PortfolioSimulationRequest",
+    "PortfolioSimulationResponse",
     # Document
     "DocumentCreate",
     "DocumentResponse",
@@ -81,6 +114,8 @@ __all__ = [
     "VerificationRequestResponse",
     "VerificationCheckCreate",
     "VerificationCheckResponse",
+    "VerificationQueueItem",
+    "VerificationQueueMetrics",
     # Investor
     "InvestorPreferencesCreate",
     "InvestorPreferencesResponse",
@@ -92,4 +127,18 @@ __all__ = [
     "MessageResponse",
     "MeetingCreate",
     "MeetingResponse",
+    "MeetingSlotCheck",
+    "MeetingConflictResponse",
+    "FreeBusyResponse",
+    "MeetingSlotSuggestion",
+    # FX
+    "FxRateResponse",
+    "FxImportResult",
+    "FxConvertRequest",
+    "FxConvertResponse",
+    # Jobs
+    "BackgroundJobResponse",
+    "JobStatsResponse",
+    # Diagnostics
+    "SlowQueryResponse",
 ]
@@ -60,7 +60,7 @@ class MeetingCreate(BaseModel):
     description: Optional[str] = None
     meeting_type: str = "video_call"
     scheduled_at: datetime
-    duration_minutes: int = 60
+    duration_minutes: int = Field(60, ge=1, le=1440)
     timezone: str = "UTC"
     location: Optional[str] = Field(None, max_length=500)
     video_link: Optional[str] = Field(None, max_length=500)
@@ -107,9 +107,60 @@ class MeetingUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
     scheduled_at: Optional[datetime] = None
-    duration_minutes: Optional[int] = None
+    duration_minutes: Optional[int] = Field(None, ge=1, le=1440)
     location: Optional[str] = Field(None, max_length=500)
     video_link: Optional[str] = Field(None, max_length=500)
+    attendees: Optional[List[int]] = None
     status: Optional[str] = Field(None, pattern="^(scheduled|cancelled|completed)$")
     agenda: Optional[str] = None
     meeting_notes: Optional[str] = None
+
+
+class MeetingSlotCheck(BaseModel):
+    """Schema for checking a proposed meeting slot for conflicts."""
+    attendees: List[int] = Field(..., min_length=1)
+    scheduled_at: datetime
+    duration_minutes: int = Field(60, ge=1, le=1440)
+    exclude_meeting_id: Optional[int] = None
+
+
+class MeetingConflict(BaseModel):
+    """A meeting that conflicts with a proposed slot for one attendee."""
+    attendee_id: int
+    meeting_id: Optional[int] = None
+    deal_room_id: Optional[int] = None
+    title: Optional[str] = None
+    start: datetime
+    end: datetime
+
+
+class MeetingConflictResponse(BaseModel):
+    """Schema for conflict check result."""
+    has_conflict: bool
+    conflicts: List[MeetingConflict]
+
+
+class BusyBlock(BaseModel):
+    """A merged busy period."""
+    start: datetime
+    end: datetime
+
+
+class AttendeeFreeBusy(BaseModel):
+    """Busy periods for one attendee."""
+    attendee_id: int
+    busy: List[BusyBlock]
+
+
+class FreeBusyResponse(BaseModel):
+    """Schema for free/busy lookup across deal rooms."""
+    start: datetime
+    end: datetime
+    attendees: List[AttendeeFreeBusy]
+
+
+class MeetingSlotSuggestion(BaseModel):
+    """Schema for the earliest common free slot."""
+    scheduled_at: Optional[datetime] = None
+    duration_minutes: int
+    found: bool
@@ -0,0 +1,49 @@
+"""FX schemas."""
+from datetime import date, datetime
+from typing import Optional, List
+from pydantic import BaseModel, Field
+
+
+class FxRateResponse(BaseModel):
+    """Schema for FX rate response."""
+    currency: str
+    rate_date: date
+    usd_per_unit: float
+    source: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FxImportResult(BaseModel):
+    """Schema for CSV import result."""
+    inserted: int
+    updated: int
+    unchanged: int
+
+
+class FxCurrencyCoverage(BaseModel):
+    """Loaded history for one currency."""
+    currency: str
+    first_date: date
+    last_date: date
+    rates: int
+
+
+class FxConvertItem(BaseModel):
+    """Amount to convert."""
+    amount: Optional[float] = None
+    currency: str = Field(..., min_length=3, max_length=3)
+    rate_date: Optional[date] = None  # Defaults to today
+
+
+class FxConvertRequest(BaseModel):
+    """Schema for batch conversion."""
+    items: List[FxConvertItem] = Field(..., max_length=100_000)
+    to_currency: str = Field("USD", min_length=3, max_length=3)
+
+
+class FxConvertResponse(BaseModel):
+    """Schema for batch conversion result, in request order."""
+    to_currency: str
+    amounts: List[Optional[float]]
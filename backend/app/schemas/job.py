@@ -0,0 +1,33 @@
+"""Background job schemas."""
+from datetime import datetime
+from typing import Optional, Dict, Any
+from pydantic import BaseModel
+
+
+class BackgroundJobResponse(BaseModel):
+    """Schema for background job response."""
+    id: int
+    uuid: str
+    job_type: str
+    payload_json: Optional[Dict[str, Any]] = None
+    idempotency_key: Optional[str] = None
+    priority: int
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    last_error: Optional[str] = None
+    result_json: Optional[Dict[str, Any]] = None
+    locked_by: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class JobStatsResponse(BaseModel):
+    """Queue contents from the database plus this process's worker statistics."""
+    queue: Dict[str, Any]
+    worker: Dict[str, Any]
@@ -45,6 +45,7 @@ class ProjectRiskAssessmentResponse(BaseModel):
     overall_score: int
     category_scores: Dict[str, Any]
     model_version: str
+    inputs_json: Optional[Dict[str, Any]] = None
     narrative: Optional[str] = None
     mitigations_json: Optional[Dict[str, Any]] = None
     is_human_override: bool
@@ -55,6 +56,128 @@ class ProjectRiskAssessmentResponse(BaseModel):
         from_attributes = True
 
 
+class RiskScoringRequest(BaseModel):
+    """Schema for triggering batch risk scoring."""
+    project_ids: Optional[List[int]] = None
+    force: bool = False
+
+
+class RiskScoringResponse(BaseModel):
+    """Schema for batch risk scoring result (or the queued job)."""
+    model_version: str
+    job_id: Optional[int] = None
+    projects: Optional[int] = None
+    scored: Optional[int] = None
+    unchanged: Optional[int] = None
+    overridden: Optional[int] = None
+    elapsed_ms: Optional[float] = None
+
+
+class FinancialsRecomputeRequest(BaseModel):
+    """Schema for batch recomputation of financial metrics."""
+    project_ids: Optional[List[int]] = None
+    dry_run: bool = False
+    include_results: bool = True
+
+
+class FinancialMetrics(BaseModel):
+    """Metrics derived from a project's cash flows."""
+    project_id: int
+    irr_pct: Optional[float] = None
+    roi_pct: Optional[float] = None
+    payback_years: Optional[float] = None
+    npv_usd: Optional[float] = None
+    discounted_payback_years: Optional[float] = None
+    discount_rate_pct: float
+
+
+class FinancialsRecomputeResponse(BaseModel):
+    """Schema for batch recomputation result."""
+    processed: int
+    updated: int
+    skipped_project_ids: List[int]
+    results: Optional[List[FinancialMetrics]] = None
+    elapsed_ms: float
+
+
+class SimulationRequest(BaseModel):
+    """Schema for a Monte Carlo simulation run."""
+    n_scenarios: int = Field(100_000, ge=1_000, le=500_000)
+    seed: Optional[int] = None
+
+
+class DistributionSummary(BaseModel):
+    """Percentiles of a simulated metric."""
+    p10: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    mean: Optional[float] = None
+
+
+class SimulationResponse(BaseModel):
+    """Schema for a project's simulated IRR/NPV distribution."""
+    project_id: int
+    n_scenarios: int
+    irr_pct: DistributionSummary
+    npv_usd: DistributionSummary
+    prob_npv_negative: float
+    prob_irr_below_hurdle: float
+    irr_undefined_share: float
+    elapsed_ms: float
+    assumptions_hash: Optional[str] = None
+    cached: bool = False
+
+
+class PortfolioSimulationRequest(BaseModel):
+    """Schema for simulating several projects together."""
+    project_ids: List[int] = Field(..., min_length=1, max_length=200)
+    n_scenarios: int = Field(20_000, ge=1_000, le=100_000)
+
+
+class PortfolioSimulationResponse(BaseModel):
+    """Schema for portfolio simulation result."""
+    n_scenarios: int
+    projects: List[SimulationResponse]
+    portfolio_npv_usd: DistributionSummary
+    prob_portfolio_npv_negative: Optional[float] = None
+    elapsed_ms: float
+
+
+class SnapshotInfo(BaseModel):
+    """Freshness of the in-memory project snapshot that served a query."""
+    rows: int
+    refreshed_at: datetime
+    watermark: Optional[datetime] = None
+    memory_bytes: int
+
+
+class ProjectAggregateGroup(BaseModel):
+    """Aggregates for one group of projects."""
+    key: Optional[str] = None
+    count: int
+    investment_usd_total: float
+    investment_usd_mean: Optional[float] = None
+    expected_roi_pct_mean: Optional[float] = None
+    risk_score_mean: Optional[float] = None
+
+
+class ProjectAggregateResponse(BaseModel):
+    """Schema for grouped project aggregates."""
+    group_by: str
+    groups: List[ProjectAggregateGroup]
+    totals: ProjectAggregateGroup
+    snapshot: SnapshotInfo
+    elapsed_ms: float
+
+
+class ProjectFilterResponse(BaseModel):
+    """Schema for ids of projects matching analytical filters."""
+    total: int
+    ids: List[int]
+    snapshot: SnapshotInfo
+    elapsed_ms: float
+
+
 class ProjectCreate(BaseModel):
     """Schema for creating a project."""
     sponsor_org_id: int
@@ -133,6 +256,12 @@ class ProjectResponse(BaseModel):
         from_attributes = True
 
 
+class FacetCount(BaseModel):
+    """Number of matching projects with one facet value."""
+    value: Optional[str] = None
+    count: int
+
+
 class ProjectListResponse(BaseModel):
     """Schema for paginated project list."""
     items: List[ProjectResponse]
@@ -140,3 +269,58 @@ class ProjectListResponse(BaseModel):
     page: int
     page_size: int
     pages: int
+    facets: Optional[Dict[str, List[FacetCount]]] = None
+
+
+class ProjectSearchHit(BaseModel):
+    """A ranked search result with highlighted snippets per matching field."""
+    project: ProjectResponse
+    score: float
+    # Safe HTML: project text is escaped; matches are wrapped in <mark></mark>
+    highlights: Dict[str, str] = {}
+
+
+class ProjectSearchResponse(BaseModel):
+    """Schema for paginated search results, best match first."""
+    items: List[ProjectSearchHit]
+    total: int
+    page: int
+    page_size: int
+    pages: int
+    backend: str
+
+
+class ProjectMapPoint(BaseModel):
+    """A located project as drawn on the map."""
+    id: int
+    name: str
+    sector: str
+    status: str
+    verification_level: str
+    latitude: float
+    longitude: float
+    distance_km: Optional[float] = None
+
+
+class ProjectGeoResponse(BaseModel):
+    """Schema for projects inside a viewport or radius."""
+    items: List[ProjectMapPoint]
+    truncated: bool
+
+
+class ProjectCluster(BaseModel):
+    """Projects sharing a geohash cell; bounds are [south, west, north, east]."""
+    geohash: str
+    count: int
+    latitude: float
+    longitude: float
+    bounds: List[float]
+    project_id: Optional[int] = None
+
+
+class ProjectClusterResponse(BaseModel):
+    """Schema for server-side map clusters at one zoom level."""
+    zoom: int
+    precision: int
+    total: int
+    clusters: List[ProjectCluster]
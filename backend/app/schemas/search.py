@@ -0,0 +1,17 @@
+"""Search schemas."""
+from typing import List
+from pydantic import BaseModel
+
+
+class Suggestion(BaseModel):
+    """A typeahead completion."""
+    type: str  # project, organization
+    id: int
+    name: str
+    match: str  # prefix, fuzzy
+
+
+class SuggestResponse(BaseModel):
+    """Schema for typeahead suggestions, best first."""
+    query: str
+    suggestions: List[Suggestion]
@@ -0,0 +1,17 @@
+"""Slow-query report schemas."""
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+
+class SlowQueryResponse(BaseModel):
+    """One statement fingerprint's slow executions since start (or the last reset)."""
+    fingerprint: str
+    statement: str
+    parameters: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    last_seen: float
+    routes: Dict[str, int]
+    plan: Optional[str] = None
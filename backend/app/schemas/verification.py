@@ -74,3 +74,37 @@ class VerificationCheckUpdate(BaseModel):
     score: Optional[int] = Field(None, ge=0, le=100)
     notes: Optional[str] = None
     evidence_json: Optional[Dict[str, Any]] = None
+
+
+class VerificationQueueItem(BaseModel):
+    """A queued verification request with its computed priority."""
+    request: VerificationRequestResponse
+    priority: float
+    age_hours: float
+    sponsor_tier: str
+
+
+class QueueWaitingStats(BaseModel):
+    """Waiting time of requests still in the queue, in seconds."""
+    oldest: Optional[float] = None
+    mean: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+
+
+class QueueClaimStats(BaseModel):
+    """Time from creation to claim for recently claimed requests, in seconds."""
+    window_days: int
+    claimed: int
+    mean: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+
+
+class VerificationQueueMetrics(BaseModel):
+    """Schema for verifier queue metrics."""
+    depth: int
+    depth_by_level: Dict[str, int]
+    in_review: int
+    waiting_seconds: QueueWaitingStats
+    time_to_claim_seconds: QueueClaimStats
@@ -0,0 +1,201 @@
+"""Streaming table exports (CSV, NDJSON, Arrow).
+
+Rows are read in primary-key order with ``yield_per``, which streams from a
+server-side cursor on PostgreSQL, and encoded one batch at a time, so memory
+stays at one batch however large the table is. Formats:
+
+- ``csv``: a header row, then one row per record; JSON columns are JSON text.
+- ``ndjson``: one JSON object per record.
+- ``arrow``: an Arrow IPC stream with one record batch per read batch
+  (requires ``pyarrow``). Readers such as pandas, polars and DuckDB load it
+  column by column.
+
+Exports are keyset-paginated on ``id``. Every format leads with the id, and
+an export covers ``after < id <= until``. ``until`` defaults to the table's
+highest id when the export starts. An interrupted download resumes by asking
+again with ``after`` set to the last id received and the same ``until``.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+from sqlalchemy import JSON, Boolean, Date, DateTime, Float, Integer, Numeric, func, select
+from sqlalchemy.orm import Session
+
+from app.core.rbac import Permission
+from app.core.responses import dumps
+from app.models.audit import AuditLog
+from app.models.investor import Match
+from app.models.project import Project
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # optional: pip install pyarrow
+    pyarrow = None
+
+
+@dataclass(frozen=True)
+class Dataset:
+    model: Any
+    permission: str
+
+    @property
+    def columns(self) -> List[Any]:
+        return list(self.model.__table__.columns)
+
+
+DATASETS: Dict[str, Dataset] = {
+    "projects": Dataset(Project, Permission.VIEW_ALL_PROJECTS),
+    "matches": Dataset(Match, Permission.MANAGE_SYSTEM),
+    "audit_logs": Dataset(AuditLog, Permission.VIEW_AUDIT_LOGS),
+}
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "arrow": "arrows"}
+
+
+def high_water_mark(db: Session, dataset: Dataset) -> int:
+    """Highest id currently in the table (0 when empty)."""
+    return db.execute(select(func.max(dataset.model.id))).scalar() or 0
+
+
+def read_batches(
+    db: Session, dataset: Dataset, after: int, until: int, batch_size: int
+) -> Iterator[Sequence[Any]]:
+    """Rows with ``after < id <= until`` in id order, `batch_size` at a time."""
+    model = dataset.model
+    statement = (
+        select(*dataset.columns)
+        .where(model.id > after, model.id <= until)
+        .order_by(model.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = db.execute(statement)
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+# Encoders: column list and batches in, bytes out
+
+def _csv_cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"), default=str)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(columns: List[Any], batches: Iterator[Sequence[Any]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([c.name for c in columns])
+    for batch in batches:
+        writer.writerows([_csv_cell(v) for v in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # An empty export is still a header row
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(columns: List[Any], batches: Iterator[Sequence[Any]]) -> Iterator[bytes]:
+    names = [c.name for c in columns]
+    for batch in batches:
+        yield b"".join(dumps(dict(zip(names, row))) + b"\n" for row in batch)
+
+
+def _arrow_type(column: Any):
+    sql_type = column.type
+    if isinstance(sql_type, Boolean):
+        return pyarrow.bool_()
+    if isinstance(sql_type, Integer):
+        return pyarrow.int64()
+    if isinstance(sql_type, DateTime):
+        return pyarrow.timestamp("us")
+    if isinstance(sql_type, Date):
+        return pyarrow.date32()
+    if isinstance(sql_type, Float):
+        return pyarrow.float64()
+    if isinstance(sql_type, Numeric):
+        return pyarrow.decimal128(sql_type.precision or 38, sql_type.scale or 0)
+    return pyarrow.string()
+
+
+class _Drain:
+    """Write-only file object whose contents are taken after each batch."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _encode_arrow(columns: List[Any], batches: Iterator[Sequence[Any]]) -> Iterator[bytes]:
+    schema = pyarrow.schema([(c.name, _arrow_type(c)) for c in columns])
+    is_json = [isinstance(c.type, JSON) for c in columns]
+    sink = _Drain()
+    writer = pyarrow.ipc.new_stream(pyarrow.PythonFile(sink, mode="w"), schema)
+    yield sink.take()
+    for batch in batches:
+        arrays = []
+        for i, field in enumerate(schema):
+            values = [row[i] for row in batch]
+            if is_json[i]:
+                values = [None if v is None else json.dumps(v, separators=(",", ":"), default=str) for v in values]
+            arrays.append(pyarrow.array(values, type=field.type))
+        writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=schema))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+ENCODERS: Dict[str, Callable[[List[Any], Iterator[Sequence[Any]]], Iterator[bytes]]] = {
+    "csv": _encode_csv,
+    "ndjson": _encode_ndjson,
+    "arrow": _encode_arrow,
+}
+
+
+def check_format(fmt: str) -> None:
+    """
+    Raises:
+        ValueError: If the format is unknown or its library is not installed
+    """
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unknown export format {fmt!r}; use one of {', '.join(ENCODERS)}")
+    if fmt == "arrow" and pyarrow is None:
+        raise ValueError("Arrow exports need pyarrow (pip install pyarrow)")
+
+
+def export(
+    db: Session, dataset: Dataset, fmt: str, after: int, until: int, batch_size: int
+) -> Iterator[bytes]:
+    """Encoded export of ``after < id <= until``, one chunk per batch."""
+    return ENCODERS[fmt](dataset.columns, read_batches(db, dataset, after, until, batch_size))
@@ -0,0 +1,119 @@
+"""Facet counts for the project browser.
+
+All facets come from one ``GROUP BY sector, country, status,
+verification_level`` over the filtered query: the grouped rows (one per
+distinct combination, far fewer than projects) are summed per facet in Python,
+and their grand total doubles as the result count. That replaces one
+``COUNT ... GROUP BY`` per facet plus the page's ``count()`` with a single
+scan, and works on every dialect (SQLite has no ``GROUPING SETS``).
+
+Results are cached in-process by filter signature. ORM events on ``Project``
+(and ``projects_inserted`` for bulk inserts) clear the cache when a writing
+session commits; entries also expire after
+``FACET_CACHE_TTL_SECONDS`` to pick up writes made by other processes.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Query, Session, object_session
+
+from app.core.config import settings
+from app.models.project import Project
+from app.utils.metrics import cache_requests
+
+FACETS = ("sector", "country", "status", "verification_level")
+
+_cache: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+# Bumped on every committed project write so in-flight computations are not cached
+_generation = 0
+
+
+def compute_facets(query: Query) -> Dict[str, Any]:
+    """
+    Count matching projects per value of every facet in one grouped query.
+
+    Args:
+        query: Filtered query over Project (ordering and paging are ignored)
+
+    Returns:
+        Dict with the total and, per facet, values with counts, largest first
+    """
+    columns = [getattr(Project, name) for name in FACETS]
+    rows = query.order_by(None).with_entities(*columns, func.count(Project.id)).group_by(*columns).all()
+
+    counts: Dict[str, Dict[Optional[str], int]] = {name: {} for name in FACETS}
+    total = 0
+    for row in rows:
+        n = row[-1]
+        total += n
+        for name, value in zip(FACETS, row[:-1]):
+            counts[name][value] = counts[name].get(value, 0) + n
+
+    facets: Dict[str, List[Dict[str, Any]]] = {
+        name: [
+            {"value": value, "count": n}
+            for value, n in sorted(values.items(), key=lambda item: (-item[1], item[0] or ""))
+        ]
+        for name, values in counts.items()
+    }
+    return {"total": total, "facets": facets}
+
+
+def get_facets(query: Query, signature: Hashable) -> Dict[str, Any]:
+    """Facet counts for a filtered query, cached under the caller's filter signature."""
+    with _cache_lock:
+        entry = _cache.get(signature)
+        if entry is not None and time.monotonic() - entry[0] <= settings.FACET_CACHE_TTL_SECONDS:
+            _cache.move_to_end(signature)
+            cache_requests.inc(cache="facets", result="hit")
+            return entry[1]
+        generation = _generation
+    cache_requests.inc(cache="facets", result="miss")
+
+    result = compute_facets(query)
+
+    with _cache_lock:
+        if generation == _generation:
+            _cache[signature] = (time.monotonic(), result)
+            _cache.move_to_end(signature)
+            while len(_cache) > settings.FACET_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return result
+
+
+def clear_cache() -> None:
+    global _generation
+    with _cache_lock:
+        _generation += 1
+        _cache.clear()
+
+
+def projects_inserted(db: Session, projects: List[Any]) -> None:
+    """Clear the cache when the session commits a bulk ``insert()`` of projects."""
+    if projects:
+        db.info["facets_dirty"] = True
+
+
+def _mark(mapper, connection, target: Project) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info["facets_dirty"] = True
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(Project, _event, _mark)
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_on_commit(session: Session) -> None:
+    if session.info.pop("facets_dirty", False):
+        clear_cache()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop("facets_dirty", None)
@@ -0,0 +1,126 @@
+"""Batch re-derivation of IRR, ROI and payback from cash flows.
+
+User-entered ``irr_pct``, ``roi_pct`` and ``payback_years`` can drift from the
+cash flows in ``timeline_json``. ``recompute_financials`` loads a batch of
+projects, stacks their cash flows into one matrix and derives every metric in
+a single vectorized pass (see ``app.utils.finance``), then writes the results
+back with bulk updates.
+"""
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.project import Project, ProjectFinancials
+from app.services import response_cache
+from app.utils import finance
+
+DEFAULT_DISCOUNT_RATE_PCT = 10.0
+
+# Projects per vectorized pass
+BATCH_SIZE = 5000
+
+
+def _discount_rate(assumptions: Any) -> float:
+    """A project's discount rate as a fraction; raises TypeError/ValueError when malformed."""
+    pct = float((assumptions or {}).get("discount_rate_pct", DEFAULT_DISCOUNT_RATE_PCT))
+    if not np.isfinite(pct) or pct <= -100:
+        raise ValueError(f"Invalid discount_rate_pct: {pct}")
+    return pct / 100
+
+
+def recompute_financials(
+    db: Session,
+    project_ids: Optional[Sequence[int]] = None,
+    dry_run: bool = False,
+    include_results: bool = True,
+) -> Dict[str, Any]:
+    """
+    Re-derive IRR, NPV, ROI and payback for projects with timeline cash flows.
+
+    ``payback_years`` keeps its meaning of simple (undiscounted) payback;
+    discounted payback and NPV use each project's
+    ``assumptions_json["discount_rate_pct"]`` (default 10%) and are returned
+    but not stored. Projects whose timeline or discount rate cannot be parsed
+    are skipped.
+
+    Args:
+        db: Database session (committed once per batch unless dry_run)
+        project_ids: Limit to these projects; defaults to all with financials
+        dry_run: Compute without writing
+        include_results: Return per-project metrics
+
+    Returns:
+        Counts, skipped project ids and optionally per-project metrics
+    """
+    started = time.perf_counter()
+    query = db.query(
+        ProjectFinancials.id, ProjectFinancials.project_id,
+        ProjectFinancials.timeline_json, ProjectFinancials.assumptions_json,
+    ).order_by(ProjectFinancials.project_id)
+    if project_ids is not None:
+        query = query.filter(ProjectFinancials.project_id.in_(project_ids))
+    rows = query.all()
+
+    results: List[Dict[str, Any]] = []
+    skipped: List[int] = []
+    updated = 0
+    for offset in range(0, len(rows), BATCH_SIZE):
+        batch = []
+        series = []
+        row_rates = []
+        for row in rows[offset:offset + BATCH_SIZE]:
+            try:
+                flows = finance.cash_flows_from_timeline(row.timeline_json)
+                rate = _discount_rate(row.assumptions_json)
+            except (AttributeError, KeyError, TypeError, ValueError):
+                flows = None
+            if not flows:
+                skipped.append(row.project_id)
+                continue
+            batch.append(row)
+            series.append(flows)
+            row_rates.append(rate)
+        if not batch:
+            continue
+
+        flows = finance.pad_cash_flows(series)
+        rates = np.array(row_rates)
+        irr = finance.to_optional(finance.irr(flows), scale=100)
+        roi = finance.to_optional(finance.roi(flows), scale=100)
+        payback = finance.to_optional(finance.discounted_payback(flows))
+        discounted_payback = finance.to_optional(finance.discounted_payback(flows, rates))
+        npv = finance.to_optional(finance.npv(flows, rates))
+
+        financial_updates = []
+        project_updates = []
+        for i, row in enumerate(batch):
+            financial_updates.append({"id": row.id, "irr_pct": irr[i], "roi_pct": roi[i], "payback_years": payback[i]})
+            project_updates.append({"id": row.project_id, "expected_roi_pct": roi[i], "payback_years": payback[i]})
+            if include_results:
+                results.append({
+                    "project_id": row.project_id,
+                    "irr_pct": irr[i],
+                    "roi_pct": roi[i],
+                    "payback_years": payback[i],
+                    "npv_usd": npv[i],
+                    "discounted_payback_years": discounted_payback[i],
+                    "discount_rate_pct": round(rates[i] * 100, 4),
+                })
+
+        if not dry_run:
+            db.execute(update(ProjectFinancials), financial_updates)
+            db.execute(update(Project), project_updates)
+            response_cache.projects_changed(db, (u["id"] for u in project_updates), financials=True)
+            db.commit()
+            updated += len(batch)
+
+    return {
+        "processed": len(rows) - len(skipped),
+        "updated": updated,
+        "skipped_project_ids": skipped,
+        "results": results if include_results else None,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -0,0 +1,261 @@
+"""FX normalization.
+
+Daily rates against USD live in ``fx_rates`` and are loaded from CSV files
+(``date,currency,usd_per_unit``). For conversions, the whole table is held in
+memory as one sorted NumPy array of dates and rates per currency, so converting
+an array of amounts is a ``searchsorted`` per currency instead of a lookup
+per row. The in-memory table is rebuilt after an import and otherwise at most
+every ``FX_CACHE_TTL_SECONDS``. Project list filters do not use the table:
+``capex_usd_expression`` converts capex in SQL, so the filter stays in the query.
+
+The rate for a date is the latest rate on or before it (weekends and
+holidays carry the previous close forward). Dates before a currency's first
+rate use that first rate.
+"""
+import csv
+import io
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Tuple, Union
+
+import numpy as np
+from sqlalchemy import case, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.fx import FxRate
+from app.models.project import ProjectFinancials
+from app.utils.metrics import cache_requests
+
+BASE_CURRENCY = "USD"
+
+# Accepted header names for the rate column
+RATE_COLUMNS = ("usd_per_unit", "rate_to_usd", "rate")
+
+DateLike = Union[date, datetime, str, np.datetime64]
+
+
+class UnknownCurrencyError(ValueError):
+    """Raised when no rates are loaded for a currency."""
+
+
+def _to_day(value: DateLike) -> np.datetime64:
+    if isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, "D")
+
+
+class RateTable:
+    """Immutable in-memory index of daily rates per currency."""
+
+    def __init__(self, rows: Iterable[Tuple[str, date, float]]):
+        by_currency: Dict[str, List[Tuple[date, float]]] = {}
+        for currency, rate_date, rate in rows:
+            by_currency.setdefault(currency.upper(), []).append((rate_date, rate))
+
+        self._dates: Dict[str, np.ndarray] = {}
+        self._rates: Dict[str, np.ndarray] = {}
+        for currency, entries in by_currency.items():
+            entries.sort()
+            self._dates[currency] = np.array([d for d, _ in entries], dtype="datetime64[D]")
+            self._rates[currency] = np.array([r for _, r in entries], dtype=float)
+
+    @property
+    def currencies(self) -> List[str]:
+        return sorted(set(self._dates) | {BASE_CURRENCY})
+
+    def coverage(self) -> Dict[str, Dict[str, object]]:
+        """First date, last date and number of rates per currency."""
+        return {
+            currency: {
+                "first_date": str(dates[0]),
+                "last_date": str(dates[-1]),
+                "rates": int(dates.size),
+            }
+            for currency, dates in sorted(self._dates.items())
+        }
+
+    def usd_per_unit(self, currency: str, dates: np.ndarray) -> np.ndarray:
+        """USD value of one unit of `currency` on each date (datetime64[D] array)."""
+        currency = currency.upper()
+        if currency == BASE_CURRENCY:
+            return np.ones(dates.shape)
+        if currency not in self._dates:
+            raise UnknownCurrencyError(f"No FX rates loaded for {currency}")
+        idx = np.searchsorted(self._dates[currency], dates, side="right") - 1
+        return self._rates[currency][np.clip(idx, 0, None)]
+
+    def convert(
+        self,
+        amounts: Sequence[float],
+        currencies: Union[str, Sequence[str]],
+        dates: Union[DateLike, Sequence[DateLike], None] = None,
+        to_currency: str = BASE_CURRENCY,
+        strict: bool = True,
+    ) -> np.ndarray:
+        """
+        Convert many amounts at once.
+
+        Args:
+            amounts: Amounts (NaN/None pass through as NaN)
+            currencies: One currency for all amounts, or one per amount
+            dates: One date for all, one per amount, or None for today
+            to_currency: Target currency
+            strict: Raise for unknown source currencies instead of returning NaN
+
+        Returns:
+            Converted amounts as a float array
+
+        Raises:
+            UnknownCurrencyError: If a currency has no rates
+        """
+        values = np.array([np.nan if a is None else a for a in amounts], dtype=float)
+        n = values.size
+
+        if dates is None or isinstance(dates, (date, datetime, str, np.datetime64)):
+            days = np.full(n, _to_day(dates or date.today()), dtype="datetime64[D]")
+        else:
+            days = np.array([_to_day(d) for d in dates], dtype="datetime64[D]")
+
+        if isinstance(currencies, str):
+            codes = np.full(n, currencies.upper(), dtype=object)
+        else:
+            codes = np.array([(c or BASE_CURRENCY).upper() for c in currencies], dtype=object)
+
+        usd = np.empty(n)
+        for currency in np.unique(codes) if n else []:
+            mask = codes == currency
+            try:
+                usd[mask] = values[mask] * self.usd_per_unit(currency, days[mask])
+            except UnknownCurrencyError:
+                if strict:
+                    raise
+                usd[mask] = np.nan
+
+        if to_currency.upper() != BASE_CURRENCY:
+            usd = usd / self.usd_per_unit(to_currency, days)
+        return usd
+
+
+_table: Optional[RateTable] = None
+_table_loaded_at = 0.0
+_table_lock = threading.Lock()
+
+
+def get_rate_table(db: Session) -> RateTable:
+    """The cached rate table, rebuilt from the database when stale."""
+    global _table, _table_loaded_at
+    with _table_lock:
+        stale = _table is None or time.monotonic() - _table_loaded_at > settings.FX_CACHE_TTL_SECONDS
+        cache_requests.inc(cache="fx_rates", result="miss" if stale else "hit")
+        if stale:
+            rows = db.query(FxRate.currency, FxRate.rate_date, FxRate.usd_per_unit).all()
+            _table = RateTable(rows)
+            _table_loaded_at = time.monotonic()
+        return _table
+
+
+def invalidate_cache() -> None:
+    global _table
+    with _table_lock:
+        _table = None
+
+
+def parse_csv(stream: TextIO) -> List[Tuple[str, date, float]]:
+    """
+    Parse ``date,currency,usd_per_unit`` rows (ISO dates; header required).
+
+    Raises:
+        ValueError: On missing columns or malformed rows, with the line number
+    """
+    reader = csv.DictReader(stream)
+    fields = {f.strip().lower(): f for f in reader.fieldnames or []}
+    rate_field = next((fields[c] for c in RATE_COLUMNS if c in fields), None)
+    if "date" not in fields or "currency" not in fields or rate_field is None:
+        raise ValueError(f"CSV needs date, currency and one of {', '.join(RATE_COLUMNS)} columns")
+
+    rows = []
+    for line_no, record in enumerate(reader, start=2):
+        try:
+            currency = record[fields["currency"]].strip().upper()
+            rate = float(record[rate_field])
+            if len(currency) != 3 or rate <= 0:
+                raise ValueError("invalid currency or non-positive rate")
+            rows.append((currency, date.fromisoformat(record[fields["date"]].strip()), rate))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Line {line_no}: {e}")
+    return rows
+
+
+def import_rates(db: Session, rows: List[Tuple[str, date, float]], source: Optional[str] = None) -> Dict[str, int]:
+    """
+    Upsert parsed rates; later rows win for duplicate (currency, date) keys.
+
+    Returns:
+        Counts of inserted and updated rates
+    """
+    latest = {(currency, rate_date): rate for currency, rate_date, rate in rows}
+    existing = {}
+    keys = list(latest)
+    for offset in range(0, len(keys), 500):
+        chunk = keys[offset:offset + 500]
+        existing.update({
+            (r.currency, r.rate_date): r
+            for r in db.query(FxRate).filter(tuple_(FxRate.currency, FxRate.rate_date).in_(chunk)).all()
+        })
+
+    updated = 0
+    for key, record in existing.items():
+        if record.usd_per_unit != latest[key]:
+            record.usd_per_unit = latest[key]
+            record.source = source
+            updated += 1
+
+    new_rows = [
+        {"currency": currency, "rate_date": rate_date, "usd_per_unit": rate, "source": source,
+         "created_at": datetime.utcnow()}
+        for (currency, rate_date), rate in latest.items() if (currency, rate_date) not in existing
+    ]
+    if new_rows:
+        db.execute(insert(FxRate), new_rows)
+    db.commit()
+    invalidate_cache()
+    return {"inserted": len(new_rows), "updated": updated, "unchanged": len(existing) - updated}
+
+
+def load_csv(db: Session, source: Union[str, TextIO], name: Optional[str] = None) -> Dict[str, int]:
+    """Import rates from a CSV file path or text stream."""
+    if isinstance(source, str):
+        with open(source, newline="", encoding="utf-8") as f:
+            return import_rates(db, parse_csv(f), name or source)
+    return import_rates(db, parse_csv(source), name)
+
+
+def load_csv_text(db: Session, text: str, name: Optional[str] = None) -> Dict[str, int]:
+    return load_csv(db, io.StringIO(text), name)
+
+
+def capex_usd_expression(on: Optional[DateLike] = None):
+    """
+    SQL expression for ``ProjectFinancials`` capex in USD, so filters run in the database.
+
+    Uses the same rate as ``RateTable``: the latest on or before `on` (today by
+    default), else the currency's first rate. Each rate is an indexed lookup on
+    ``(currency, rate_date)``. NULL where capex or the currency's rates are missing.
+    """
+    day = _to_day(on or date.today()).item()
+    currency = func.upper(func.coalesce(ProjectFinancials.currency, BASE_CURRENCY))
+
+    def rate(*criteria, order):
+        return (
+            select(FxRate.usd_per_unit).where(FxRate.currency == currency, *criteria)
+            .order_by(order).limit(1).scalar_subquery()
+        )
+
+    usd_per_unit = case(
+        (currency == BASE_CURRENCY, 1.0),
+        else_=func.coalesce(rate(FxRate.rate_date <= day, order=FxRate.rate_date.desc()),
+                            rate(order=FxRate.rate_date)),
+    )
+    return ProjectFinancials.capex_usd * usd_per_unit
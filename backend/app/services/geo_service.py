@@ -0,0 +1,227 @@
+"""Spatial queries over project coordinates.
+
+Coordinates are mirrored into ``project_locations`` with a geohash under a
+B-tree index. A bounding box becomes a few geohash prefix ranges (see
+``app.utils.geo.covering_cells``) plus an exact lat/lon check, so viewport
+and radius queries read only nearby rows. Map clustering groups by a geohash
+prefix whose length follows the zoom level, inside the database, so the map
+receives one row per cluster rather than the catalogue.
+
+``project_locations`` is written by ORM events on ``Project`` in the same
+transaction as the project; bulk Core writes bypass them, so
+``projects_inserted`` adds the rows for a bulk insert and
+``rebuild_locations`` re-syncs after anything else.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, delete, event, func, insert, or_, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, attributes
+
+from app.models.geo import ProjectLocation
+from app.models.project import Project
+from app.utils import geo
+
+# Cells in a bounding-box covering (per side of the antimeridian)
+MAX_COVERING_CELLS = 32
+
+FILTER_FIELDS = ("sector", "country", "status", "verification_level")
+
+_locations = ProjectLocation.__table__
+
+
+def _location_values(project: Project) -> Optional[Dict[str, Any]]:
+    if project.latitude is None or project.longitude is None:
+        return None
+    latitude, longitude = float(project.latitude), float(project.longitude)
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return {
+        "project_id": project.id,
+        "latitude": latitude,
+        "longitude": longitude,
+        "geohash": geo.encode(latitude, longitude),
+    }
+
+
+def _write_location(connection: Connection, project: Project) -> None:
+    connection.execute(delete(_locations).where(_locations.c.project_id == project.id))
+    values = _location_values(project)
+    if values is not None:
+        connection.execute(insert(_locations).values(**values))
+
+
+@event.listens_for(Project, "after_insert")
+def _project_inserted(mapper, connection: Connection, target: Project) -> None:
+    if target.latitude is not None and target.longitude is not None:
+        _write_location(connection, target)
+
+
+@event.listens_for(Project, "after_update")
+def _project_updated(mapper, connection: Connection, target: Project) -> None:
+    if any(attributes.get_history(target, f).has_changes() for f in ("latitude", "longitude")):
+        _write_location(connection, target)
+
+
+@event.listens_for(Project, "after_delete")
+def _project_deleted(mapper, connection: Connection, target: Project) -> None:
+    connection.execute(delete(_locations).where(_locations.c.project_id == target.id))
+
+
+def projects_inserted(db: Session, projects: List[Any]) -> None:
+    """Add location rows for projects inserted with a bulk ``insert()``."""
+    rows = [v for v in map(_location_values, projects) if v is not None]
+    if rows:
+        db.execute(insert(_locations), rows)
+
+
+def rebuild_locations(db: Session) -> int:
+    """Re-derive every location row from project coordinates; returns the count."""
+    projects = db.query(Project.id, Project.latitude, Project.longitude).filter(
+        Project.latitude.isnot(None), Project.longitude.isnot(None)
+    ).all()
+    rows = [v for v in map(_location_values, projects) if v is not None]
+    db.execute(delete(_locations))
+    if rows:
+        db.execute(insert(_locations), rows)
+    db.commit()
+    return len(rows)
+
+
+def ensure_locations(db: Session) -> None:
+    """Rebuild if the index and the project coordinates disagree (e.g. after upgrading)."""
+    located = db.query(func.count(Project.id)).filter(
+        Project.latitude.isnot(None), Project.longitude.isnot(None)
+    ).scalar()
+    if db.query(func.count(ProjectLocation.project_id)).scalar() != located:
+        rebuild_locations(db)
+
+
+def bbox_condition(bbox: geo.BBox):
+    """SQL condition for locations inside the box, using geohash prefix ranges."""
+    parts = []
+    for south, west, north, east in geo.split_antimeridian(bbox):
+        ranges = [
+            and_(ProjectLocation.geohash >= cell, ProjectLocation.geohash < cell + "{")  # "{" sorts after "z"
+            for cell in geo.covering_cells((south, west, north, east), MAX_COVERING_CELLS)
+        ]
+        parts.append(and_(
+            or_(*ranges),
+            ProjectLocation.latitude.between(south, north),
+            ProjectLocation.longitude.between(west, east),
+        ))
+    return or_(*parts)
+
+
+def _apply_filters(query, filters: Optional[Dict[str, Any]]):
+    for field in FILTER_FIELDS:
+        value = (filters or {}).get(field)
+        if value:
+            query = query.where(getattr(Project, field) == value)
+    return query
+
+
+def _points_query(condition, filters):
+    query = (
+        select(
+            Project.id, Project.name, Project.sector, Project.status, Project.verification_level,
+            ProjectLocation.latitude, ProjectLocation.longitude,
+        )
+        .join(Project, Project.id == ProjectLocation.project_id)
+        .where(condition)
+    )
+    return _apply_filters(query, filters)
+
+
+def _point(row, distance_km: Optional[float] = None) -> Dict[str, Any]:
+    point = {
+        "id": row.id,
+        "name": row.name,
+        "sector": row.sector,
+        "status": row.status,
+        "verification_level": row.verification_level,
+        "latitude": row.latitude,
+        "longitude": row.longitude,
+    }
+    if distance_km is not None:
+        point["distance_km"] = round(float(distance_km), 3)
+    return point
+
+
+def projects_in_bbox(
+    db: Session,
+    bbox: geo.BBox,
+    filters: Optional[Dict[str, Any]] = None,
+    limit: int = 500,
+) -> Dict[str, Any]:
+    """Projects inside a box (west > east wraps the antimeridian), at most `limit`."""
+    rows = db.execute(_points_query(bbox_condition(bbox), filters).order_by(Project.id).limit(limit + 1)).all()
+    return {
+        "items": [_point(row) for row in rows[:limit]],
+        "truncated": len(rows) > limit,
+    }
+
+
+def projects_near(
+    db: Session,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    filters: Optional[Dict[str, Any]] = None,
+    limit: int = 500,
+) -> Dict[str, Any]:
+    """Projects within a great-circle radius, nearest first."""
+    rows = db.execute(_points_query(bbox_condition(geo.radius_bbox(latitude, longitude, radius_km)), filters)).all()
+    if not rows:
+        return {"items": [], "truncated": False}
+    distances = geo.haversine_km(latitude, longitude, [r.latitude for r in rows], [r.longitude for r in rows])
+    inside = [(d, row) for d, row in zip(distances, rows) if d <= radius_km]
+    inside.sort(key=lambda item: (item[0], item[1].id))
+    return {
+        "items": [_point(row, d) for d, row in inside[:limit]],
+        "truncated": len(inside) > limit,
+    }
+
+
+def clusters(
+    db: Session,
+    bbox: geo.BBox,
+    zoom: int,
+    filters: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Group the projects in a viewport into geohash cells sized for the zoom level.
+
+    Returns:
+        precision and one cluster per non-empty cell with its count, centroid,
+        cell bounds and, for single-project cells, the project id
+    """
+    precision = geo.zoom_precision(zoom)
+    cell = func.substr(ProjectLocation.geohash, 1, precision).label("cell")
+    query = (
+        select(
+            cell,
+            func.count().label("count"),
+            func.avg(ProjectLocation.latitude).label("latitude"),
+            func.avg(ProjectLocation.longitude).label("longitude"),
+            func.min(ProjectLocation.project_id).label("project_id"),
+        )
+        .join(Project, Project.id == ProjectLocation.project_id)
+        .where(bbox_condition(bbox))
+        .group_by(cell)
+    )
+    rows = db.execute(_apply_filters(query, filters)).all()
+
+    result: List[Dict[str, Any]] = []
+    for row in rows:
+        south, west, north, east = geo.decode_bbox(row.cell)
+        result.append({
+            "geohash": row.cell,
+            "count": row.count,
+            "latitude": float(row.latitude),
+            "longitude": float(row.longitude),
+            "bounds": [south, west, north, east],
+            "project_id": row.project_id if row.count == 1 else None,
+        })
+    result.sort(key=lambda c: (-c["count"], c["geohash"]))
+    return {"precision": precision, "total": sum(c["count"] for c in result), "clusters": result}
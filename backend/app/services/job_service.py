@@ -0,0 +1,642 @@
+"""Durable in-process background jobs.
+
+Jobs are rows in ``background_jobs``; a ``JobWorker`` started from the app's
+lifespan hook polls for due jobs and runs them on a small thread pool. No
+external broker is involved, and because state lives in the database, jobs
+survive restarts. While a handler runs, a heartbeat thread renews the job's
+lock; a job whose worker died mid-run stops being renewed and is re-queued
+once its lock times out. A worker only records the outcome of a job whose
+lock it still holds.
+
+Usage:
+    @job_handler("risk.score_all", max_attempts=3, concurrency=1)
+    def score_all(db: Session, payload: dict) -> dict:
+        ...
+
+    enqueue(db, "risk.score_all", idempotency_key="risk:nightly:2026-03-02")
+
+    register_cron("nightly-risk", "0 2 * * *", "risk.score_all")
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job import BackgroundJob
+from app.utils.metrics import Samples
+
+logger = logging.getLogger(__name__)
+
+# Retry backoff: base * 2^(attempt - 1), capped, with up to 10% jitter
+RETRY_BACKOFF_BASE_SECONDS = 10
+RETRY_BACKOFF_MAX_SECONDS = 3600
+
+# How many recent job executions the in-memory stats keep
+STATS_WINDOW = 1000
+
+# Terminal job states
+FINISHED_STATUSES = ("succeeded", "dead", "cancelled")
+
+
+class JobSpec(NamedTuple):
+    """Registered job type."""
+    job_type: str
+    handler: Callable[[Session, Dict[str, Any]], Optional[Dict[str, Any]]]
+    max_attempts: int
+    concurrency: Optional[int]  # Max concurrent runs per process; None = unlimited
+
+
+JOB_REGISTRY: Dict[str, JobSpec] = {}
+
+
+def job_handler(job_type: str, max_attempts: int = 5, concurrency: Optional[int] = None):
+    """
+    Decorator registering a function as the handler for a job type.
+
+    The handler receives its own database session and the job payload, and
+    may return a JSON-serializable dict stored as the job result. Raising
+    marks the attempt as failed and schedules a retry with backoff.
+    """
+    def decorator(func: Callable) -> Callable:
+        JOB_REGISTRY[job_type] = JobSpec(job_type, func, max_attempts, concurrency)
+        return func
+    return decorator
+
+
+def enqueue(
+    db: Session,
+    job_type: str,
+    payload: Optional[Dict[str, Any]] = None,
+    run_at: Optional[datetime] = None,
+    idempotency_key: Optional[str] = None,
+    priority: int = 0,
+    max_attempts: Optional[int] = None,
+) -> BackgroundJob:
+    """
+    Add a job to the queue and commit.
+
+    Args:
+        db: Database session (committed by this call)
+        job_type: Registered job type
+        payload: JSON-serializable arguments for the handler
+        run_at: Earliest time to run (naive UTC); defaults to now
+        idempotency_key: If a job with this key exists, it is returned instead
+        priority: Higher values run first
+        max_attempts: Overrides the job type's default
+
+    Returns:
+        The new or existing job
+    """
+    if idempotency_key:
+        existing = db.query(BackgroundJob).filter(
+            BackgroundJob.idempotency_key == idempotency_key
+        ).first()
+        if existing:
+            return existing
+
+    spec = JOB_REGISTRY.get(job_type)
+    job = BackgroundJob(
+        job_type=job_type,
+        payload_json=payload or {},
+        idempotency_key=idempotency_key,
+        priority=priority,
+        max_attempts=max_attempts or (spec.max_attempts if spec else 5),
+        run_at=run_at or datetime.utcnow(),
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Lost a race with another enqueue of the same idempotency key
+        db.rollback()
+        return db.query(BackgroundJob).filter(
+            BackgroundJob.idempotency_key == idempotency_key
+        ).one()
+    db.refresh(job)
+    return job
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next attempt after `attempts` failed attempts."""
+    seconds = min(RETRY_BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), RETRY_BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=seconds * (1 + random.random() * 0.1))
+
+
+class CronSchedule:
+    """
+    Minimal five-field cron expression (minute hour day month weekday), UTC.
+
+    Supports ``*``, ``*/n``, ``a-b``, ``a-b/n`` and comma-separated lists.
+    Weekday 0 is Sunday; 7 is accepted as Sunday too. As in standard cron,
+    when both day of month and weekday are restricted (neither starts with
+    ``*``) a day matches if either does: ``0 9 1 * 1`` fires on the 1st and
+    on every Monday.
+    """
+
+    _RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse(field, low, high) for field, (low, high) in zip(fields, self._RANGES)
+        ]
+        self.weekdays = {0 if d == 7 else d for d in self.weekdays}
+        self._either_day = not fields[2].startswith("*") and not fields[4].startswith("*")
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int) -> Set[int]:
+        values: Set[int] = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_str = part.split("/", 1)
+                step = int(step_str)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(v) for v in part.split("-", 1))
+            else:
+                start = end = int(part)
+            if start < low or end > (7 if high == 6 else high) or step < 1:
+                raise ValueError(f"Cron field out of range: {field!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        in_days = moment.day in self.days
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays
+        return in_days or in_weekdays if self._either_day else in_days and in_weekdays
+
+    def matches(self, moment: datetime) -> bool:
+        return (
+            moment.minute in self.minutes
+            and moment.hour in self.hours
+            and moment.month in self.months
+            and self._day_matches(moment)
+        )
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after `moment`."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # A year of minutes bounds the search for any satisfiable expression
+        for _ in range(366 * 24 * 60):
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+
+class CronSpec(NamedTuple):
+    """Recurring job definition."""
+    name: str
+    schedule: CronSchedule
+    job_type: str
+    payload: Dict[str, Any]
+
+
+CRON_REGISTRY: Dict[str, CronSpec] = {}
+
+
+def register_cron(name: str, expression: str, job_type: str, payload: Optional[Dict[str, Any]] = None):
+    """
+    Run a job type on a cron schedule.
+
+    Each firing is enqueued with the idempotency key ``cron:<name>:<time>``,
+    so several app processes scheduling the same cron produce one job.
+    """
+    CRON_REGISTRY[name] = CronSpec(name, CronSchedule(expression), job_type, payload or {})
+
+
+class JobWorker:
+    """
+    Polls the job table and runs due jobs on a thread pool.
+
+    Usage (see app.main lifespan):
+        job_worker.start()
+        ...
+        job_worker.stop(drain=True, timeout=30)
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        threads: int = 4,
+        poll_interval: float = 1.0,
+        lock_timeout: int = 900,
+        heartbeat_interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.lock_timeout = lock_timeout
+        # Renew well inside the timeout so one slow renewal cannot expire the lock
+        self.heartbeat_interval = heartbeat_interval or lock_timeout / 3
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._wakeup = threading.Event()
+        self._claim_lock = threading.Lock()
+        self._running: Dict[str, int] = {}
+        self._cron_next: Dict[str, datetime] = {}
+
+        self._stats_lock = threading.Lock()
+        self._history: Deque[tuple] = deque(maxlen=STATS_WINDOW)
+        self._totals = {"succeeded": 0, "failed": 0, "dead": 0, "lost": 0}
+        self._started_at: Optional[float] = None
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._threads) and not self._stopping.is_set()
+
+    def start(self) -> None:
+        """Start the worker and scheduler threads."""
+        if self._threads:
+            return
+        self._stopping.clear()
+        self._started_at = time.time()
+        now = datetime.utcnow()
+        self._cron_next = {name: spec.schedule.next_after(now) for name, spec in CRON_REGISTRY.items()}
+
+        self._threads.append(threading.Thread(
+            target=self._scheduler_loop, name="job-scheduler", daemon=True
+        ))
+        for i in range(self.threads):
+            self._threads.append(threading.Thread(
+                target=self._worker_loop, name=f"job-worker-{i}", daemon=True
+            ))
+        for thread in self._threads:
+            thread.start()
+        logger.info("Job worker %s started with %d threads", self.worker_id, self.threads)
+
+    def stop(self, drain: bool = True, timeout: float = 30.0) -> None:
+        """
+        Stop claiming new jobs and wait for running ones to finish.
+
+        Jobs still running after `timeout` keep their lock and are re-queued
+        by the next worker once the lock times out.
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        deadline = time.monotonic() + (timeout if drain else 0)
+        for thread in self._threads:
+            thread.join(timeout=max(deadline - time.monotonic(), 0))
+        still_running = [t.name for t in self._threads if t.is_alive()]
+        if still_running:
+            logger.warning("Job worker stopped with threads still running: %s", still_running)
+        self._threads = []
+
+    def notify(self) -> None:
+        """Wake idle workers, e.g. right after enqueueing."""
+        self._wakeup.set()
+
+    # Scheduling
+
+    def _scheduler_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                with self.session_factory() as db:
+                    self.enqueue_due_crons(db)
+                    self.recover_stale_jobs(db)
+            except Exception:
+                logger.exception("Job scheduler iteration failed")
+            self._stopping.wait(self.poll_interval)
+
+    def enqueue_due_crons(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Enqueue cron firings that are due; returns how many fired."""
+        now = now or datetime.utcnow()
+        fired = 0
+        for name, spec in CRON_REGISTRY.items():
+            next_fire = self._cron_next.get(name) or spec.schedule.next_after(now)
+            while next_fire <= now:
+                enqueue(
+                    db,
+                    spec.job_type,
+                    payload=spec.payload,
+                    run_at=next_fire,
+                    idempotency_key=f"cron:{name}:{next_fire.isoformat()}",
+                )
+                fired += 1
+                next_fire = spec.schedule.next_after(next_fire)
+            self._cron_next[name] = next_fire
+        if fired:
+            self._wakeup.set()
+        return fired
+
+    def recover_stale_jobs(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Re-queue running jobs whose worker stopped renewing the lock."""
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(seconds=self.lock_timeout)
+        stale = db.query(BackgroundJob).filter(
+            BackgroundJob.status == "running",
+            BackgroundJob.locked_at < cutoff,
+        ).all()
+        for job in stale:
+            job.locked_by = None
+            job.locked_at = None
+            job.last_error = "Worker lock expired"
+            job.status = "dead" if job.attempts >= job.max_attempts else "queued"
+            job.run_at = now
+        if stale:
+            db.commit()
+            logger.warning("Recovered %d stale jobs", len(stale))
+        return len(stale)
+
+    # Execution
+
+    def _worker_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                ran = self.run_once()
+            except Exception:
+                logger.exception("Job worker iteration failed")
+                ran = False
+            if not ran:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def run_once(self) -> bool:
+        """Claim and run a single due job. Returns False if none was available."""
+        with self.session_factory() as db:
+            job = self._claim(db)
+            if job is None:
+                return False
+            try:
+                self._execute(db, job)
+            finally:
+                with self._claim_lock:
+                    self._running[job.job_type] -= 1
+        return True
+
+    def _claim(self, db: Session) -> Optional[BackgroundJob]:
+        """Atomically move one due job to running, honouring per-type concurrency."""
+        with self._claim_lock:
+            runnable = [
+                job_type for job_type, spec in JOB_REGISTRY.items()
+                if spec.concurrency is None or self._running.get(job_type, 0) < spec.concurrency
+            ]
+            if not runnable:
+                return None
+
+            now = datetime.utcnow()
+            stmt = (
+                select(BackgroundJob.id)
+                .where(
+                    BackgroundJob.status == "queued",
+                    BackgroundJob.run_at <= now,
+                    BackgroundJob.job_type.in_(runnable),
+                )
+                .order_by(BackgroundJob.priority.desc(), BackgroundJob.run_at, BackgroundJob.id)
+            )
+            claim_values = dict(
+                status="running",
+                locked_by=self.worker_id,
+                locked_at=now,
+                started_at=now,
+                attempts=BackgroundJob.attempts + 1,
+            )
+
+            claimed_id = None
+            if db.get_bind().dialect.name == "postgresql":
+                claimed_id = db.execute(stmt.limit(1).with_for_update(skip_locked=True)).scalar()
+                if claimed_id is not None:
+                    db.execute(
+                        update(BackgroundJob).where(BackgroundJob.id == claimed_id).values(**claim_values)
+                    )
+            else:
+                for candidate_id in db.execute(stmt.limit(10)).scalars().all():
+                    result = db.execute(
+                        update(BackgroundJob)
+                        .where(BackgroundJob.id == candidate_id, BackgroundJob.status == "queued")
+                        .values(**claim_values)
+                        .execution_options(synchronize_session=False)
+                    )
+                    if result.rowcount == 1:
+                        claimed_id = candidate_id
+                        break
+
+            if claimed_id is None:
+                db.rollback()
+                return None
+            db.commit()
+
+            job = db.query(BackgroundJob).filter(BackgroundJob.id == claimed_id).one()
+            self._running[job.job_type] = self._running.get(job.job_type, 0) + 1
+            return job
+
+    def _execute(self, db: Session, job: BackgroundJob) -> None:
+        spec = JOB_REGISTRY[job.job_type]
+        job_id, job_type, attempts, max_attempts = job.id, job.job_type, job.attempts, job.max_attempts
+        queued_for = (job.started_at - job.run_at).total_seconds()
+        started = time.perf_counter()
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job_id, done), name=f"job-heartbeat-{job_id}", daemon=True
+        )
+        heartbeat.start()
+        try:
+            result = spec.handler(db, dict(job.payload_json or {}))
+        except Exception as exc:
+            db.rollback()
+            elapsed = time.perf_counter() - started
+            values = dict(last_error=f"{type(exc).__name__}: {exc}", locked_by=None, locked_at=None)
+            if attempts >= max_attempts:
+                values.update(status="dead", finished_at=datetime.utcnow())
+                outcome = "dead"
+            else:
+                values.update(status="queued", run_at=datetime.utcnow() + retry_delay(attempts))
+                outcome = "failed"
+        else:
+            elapsed = time.perf_counter() - started
+            values = dict(
+                status="succeeded",
+                result_json=result if isinstance(result, dict) else None,
+                last_error=None,
+                locked_by=None,
+                locked_at=None,
+                finished_at=datetime.utcnow(),
+            )
+            outcome = "succeeded"
+        finally:
+            done.set()
+            heartbeat.join()
+
+        if not self._finish(db, job_id, values):
+            logger.error(
+                "Job %s (%s) finished as %s after its lock was taken over; result discarded",
+                job_id, job_type, outcome,
+            )
+            outcome = "lost"
+        elif outcome == "dead":
+            logger.error("Job %s (%s) failed permanently: %s", job_id, job_type, values["last_error"])
+        elif outcome == "failed":
+            logger.warning(
+                "Job %s (%s) failed, retrying at %s: %s", job_id, job_type, values["run_at"], values["last_error"]
+            )
+        self._record(job_type, outcome, queued_for, elapsed)
+
+    def _finish(self, db: Session, job_id: int, values: Dict[str, Any]) -> bool:
+        """Write a job's outcome if this worker still holds its lock."""
+        result = db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job_id, BackgroundJob.locked_by == self.worker_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def _heartbeat(self, job_id: int, done: threading.Event) -> None:
+        """Renew a running job's lock until `done` is set or the lock is lost."""
+        while not done.wait(self.heartbeat_interval):
+            try:
+                with self.session_factory() as db:
+                    renewed = db.execute(
+                        update(BackgroundJob)
+                        .where(
+                            BackgroundJob.id == job_id,
+                            BackgroundJob.locked_by == self.worker_id,
+                            BackgroundJob.status == "running",
+                        )
+                        .values(locked_at=datetime.utcnow())
+                        .execution_options(synchronize_session=False)
+                    ).rowcount
+                    db.commit()
+            except Exception:
+                logger.exception("Renewing the lock of job %s failed", job_id)
+                continue
+            if not renewed:
+                logger.warning("Job %s lost its lock while running", job_id)
+                return
+
+    # Reporting
+
+    def _record(self, job_type: str, outcome: str, queued_for: float, elapsed: float) -> None:
+        with self._stats_lock:
+            self._totals[outcome] += 1
+            self._history.append((time.time(), job_type, outcome, queued_for, elapsed))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        In-process throughput and latency over the most recent executions.
+
+        Returns:
+            Totals since start, jobs/minute over the window, and wait/run-time
+            percentiles per job type (seconds)
+        """
+        with self._stats_lock:
+            history = list(self._history)
+            totals = dict(self._totals)
+            running = {k: v for k, v in self._running.items() if v}
+
+        by_type: Dict[str, Dict[str, List[float]]] = {}
+        for _, job_type, _, queued_for, elapsed in history:
+            entry = by_type.setdefault(job_type, {"wait": [], "run": []})
+            entry["wait"].append(queued_for)
+            entry["run"].append(elapsed)
+
+        window_seconds = (history[-1][0] - history[0][0]) if len(history) > 1 else 0
+        return {
+            "worker_id": self.worker_id,
+            "running": self.is_running,
+            "uptime_seconds": round(time.time() - self._started_at, 1) if self._started_at else 0,
+            "totals": totals,
+            "in_flight": running,
+            "throughput_per_minute": round(len(history) / window_seconds * 60, 2) if window_seconds else None,
+            "by_type": {
+                job_type: {
+                    "executions": len(values["run"]),
+                    "wait_seconds": _summary(values["wait"]),
+                    "run_seconds": _summary(values["run"]),
+                }
+                for job_type, values in by_type.items()
+            },
+        }
+
+
+def _summary(values: List[float]) -> Dict[str, Optional[float]]:
+    ordered = sorted(values)
+    if not ordered:
+        return {"p50": None, "p95": None, "max": None}
+
+    def pct(p: float) -> float:
+        return round(ordered[min(int(p * len(ordered)), len(ordered) - 1)], 4)
+
+    return {"p50": pct(0.5), "p95": pct(0.95), "max": round(ordered[-1], 4)}
+
+
+def queue_stats(db: Session) -> Dict[str, Any]:
+    """Job counts by type and status, plus the age of the oldest due job."""
+    rows = db.query(
+        BackgroundJob.job_type, BackgroundJob.status, func.count(BackgroundJob.id)
+    ).group_by(BackgroundJob.job_type, BackgroundJob.status).all()
+    counts: Dict[str, Dict[str, int]] = {}
+    for job_type, job_status, count in rows:
+        counts.setdefault(job_type, {})[job_status] = count
+
+    now = datetime.utcnow()
+    oldest_due = db.query(func.min(BackgroundJob.run_at)).filter(
+        BackgroundJob.status == "queued",
+        BackgroundJob.run_at <= now,
+    ).scalar()
+    queued_due = db.query(func.count(BackgroundJob.id)).filter(
+        BackgroundJob.status == "queued",
+        BackgroundJob.run_at <= now,
+    ).scalar()
+    return {
+        "counts": counts,
+        "queued_due": queued_due or 0,
+        "oldest_due_seconds": (now - oldest_due).total_seconds() if oldest_due else None,
+    }
+
+
+job_worker = JobWorker(
+    threads=settings.JOB_WORKER_THREADS,
+    poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+    lock_timeout=settings.JOB_LOCK_TIMEOUT_SECONDS,
+)
+
+
+def collect_metrics(db: Session) -> Iterator[Tuple[str, str, str, Samples]]:
+    """Queue depth and worker gauges in the form ``app.utils.metrics`` collectors return."""
+    queue = queue_stats(db)
+    worker = job_worker.stats()
+    yield "job_queue_jobs", "gauge", "Background jobs by type and status.", [
+        ({"type": job_type, "status": job_status}, count)
+        for job_type, by_status in sorted(queue["counts"].items())
+        for job_status, count in sorted(by_status.items())
+    ]
+    yield "job_queue_due", "gauge", "Queued jobs whose run time has passed.", [({}, queue["queued_due"])]
+    yield "job_queue_oldest_due_seconds", "gauge", "How long the oldest due job has waited.", [
+        ({}, queue["oldest_due_seconds"] or 0.0)
+    ]
+    yield "job_worker_in_flight", "gauge", "Jobs this process is running, by type.", [
+        ({"type": job_type}, count) for job_type, count in sorted(worker["in_flight"].items())
+    ]
+    yield "job_worker_executions_total", "counter", "Jobs finished by this process, by outcome.", [
+        ({"outcome": outcome}, count) for outcome, count in sorted(worker["totals"].items())
+    ]
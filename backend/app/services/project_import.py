@@ -0,0 +1,80 @@
+"""Chunked project inserts for ``POST /projects/bulk``.
+
+Each chunk of validated rows is written with one executemany ``INSERT`` and
+committed on its own. Bulk inserts skip the ORM events that maintain the
+search index, project locations, map tiles, facet cache and typeahead, so
+the new rows are read back once (by the uuids assigned here) and handed to
+each service's ``projects_inserted``, inside the same transaction.
+"""
+import uuid
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.organization import Organization
+from app.models.project import Project
+from app.services import facet_service, geo_service, search_service, suggest_service, tile_service
+from app.utils.bulk_import import Row, RowResult
+
+# Columns the derived-state services read from new projects
+_READ_BACK = sorted({"id", "uuid", "name", "latitude", "longitude", *search_service.FIELDS})
+
+
+def _error(loc: List[str], msg: str, type_: str) -> List[dict]:
+    return [{"loc": loc, "msg": msg, "type": type_}]
+
+
+def _insert(db: Session, user_id: int, rows: List[Row]) -> List[RowResult]:
+    now = datetime.utcnow()
+    values = [
+        {**data.model_dump(), "uuid": str(uuid.uuid4()), "created_by": user_id, "created_at": now, "updated_at": now}
+        for _, data in rows
+    ]
+    db.execute(insert(Project), values)
+    uuids = [v["uuid"] for v in values]
+    projects = db.query(*(getattr(Project, name) for name in _READ_BACK)).filter(Project.uuid.in_(uuids)).all()
+    for service in (geo_service, search_service, tile_service, facet_service, suggest_service):
+        service.projects_inserted(db, projects)
+    ids = {p.uuid: p.id for p in projects}
+    return [(line, ids[u]) for (line, _), u in zip(rows, uuids)]
+
+
+def insert_projects(db: Session, user_id: int, rows: List[Row]) -> List[RowResult]:
+    """
+    Insert one chunk of validated ``ProjectCreate`` rows in a single transaction.
+
+    If the chunk is rejected, its rows are retried one per transaction so the
+    report names the rows at fault.
+
+    Returns:
+        (line, new project id) or (line, errors) for every row
+    """
+    sponsor_ids = {data.sponsor_org_id for _, data in rows}
+    known = {org_id for (org_id,) in db.query(Organization.id).filter(Organization.id.in_(sponsor_ids))}
+    results: List[RowResult] = [
+        (line, _error(["sponsor_org_id"], "Organization not found", "not_found"))
+        for line, data in rows if data.sponsor_org_id not in known
+    ]
+    accepted = [(line, data) for line, data in rows if data.sponsor_org_id in known]
+    if not accepted:
+        return results
+
+    try:
+        inserted = _insert(db, user_id, accepted)
+        db.commit()
+        return results + inserted
+    except SQLAlchemyError:
+        db.rollback()
+
+    for row in accepted:
+        try:
+            results += _insert(db, user_id, [row])
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            message = str(getattr(e, "orig", None) or e).splitlines()[0]
+            results.append((row[0], _error([], message, "database_error")))
+    return results
@@ -0,0 +1,353 @@
+"""Columnar in-memory snapshot of the project catalogue.
+
+Dashboard aggregates and filters over ``aip_projects`` are served from one
+NumPy array per column instead of SQL scans. Low-cardinality strings (sector,
+country, status, verification level) are dictionary-encoded as integer codes,
+so filtering is an ``isin`` over int32 codes and grouping is a ``bincount``.
+
+The snapshot is immutable; a refresh builds a new one and swaps the module
+reference, so readers never see a half-applied update. Refreshes are
+incremental: only rows with ``updated_at`` at or after the previous high-water
+mark (minus ``WATERMARK_OVERLAP`` to tolerate late commits) are reloaded and
+upserted by id, and deletions are detected by comparing row counts. A
+background thread refreshes every ``PROJECT_SNAPSHOT_REFRESH_SECONDS``; reads
+also refresh a snapshot older than that when the thread is not running.
+
+Compare against the SQL path with ``python -m benchmarks.bench_snapshot``.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import Float, func, type_coerce
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+CATEGORICAL_COLUMNS = ("sector", "country", "status", "verification_level")
+NUMERIC_COLUMNS = ("investment_usd", "expected_roi_pct", "payback_years", "risk_score")
+SORT_COLUMNS = ("id", "updated_at") + NUMERIC_COLUMNS
+
+WATERMARK_OVERLAP = timedelta(seconds=5)
+
+# Numeric columns are read as floats; Decimal conversion dominates load time otherwise
+_LOADED_COLUMNS = (
+    (Project.id, Project.sponsor_org_id, Project.is_featured, Project.updated_at)
+    + tuple(getattr(Project, c) for c in CATEGORICAL_COLUMNS)
+    + tuple(type_coerce(getattr(Project, c), Float).label(c) for c in NUMERIC_COLUMNS)
+)
+
+
+class Dictionary:
+    """Append-only string <-> integer code mapping; None encodes as -1."""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = list(values)
+        self._codes: Dict[str, int] = {v: i for i, v in enumerate(self.values)}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code(self, value: str) -> Optional[int]:
+        return self._codes.get(value)
+
+    def decode(self, code: int) -> Optional[str]:
+        return None if code < 0 else self.values[code]
+
+    def copy(self) -> "Dictionary":
+        return Dictionary(self.values)
+
+
+_LOADED_NAMES = ("id", "sponsor_org_id", "is_featured", "updated_at") + CATEGORICAL_COLUMNS + NUMERIC_COLUMNS
+
+
+def _encode_rows(rows: Sequence[Any], dictionaries: Dict[str, Dictionary]) -> Dict[str, np.ndarray]:
+    n = len(rows)
+    # Transpose once; per-row attribute access dominates otherwise
+    values = dict(zip(_LOADED_NAMES, zip(*rows))) if rows else {name: () for name in _LOADED_NAMES}
+    columns = {
+        "id": np.fromiter(values["id"], dtype=np.int64, count=n),
+        "sponsor_org_id": np.fromiter((v or 0 for v in values["sponsor_org_id"]), dtype=np.int64, count=n),
+        "is_featured": np.fromiter((bool(v) for v in values["is_featured"]), dtype=bool, count=n),
+        "updated_at": np.array(values["updated_at"], dtype="datetime64[us]"),
+    }
+    for name in CATEGORICAL_COLUMNS:
+        columns[name] = np.fromiter(map(dictionaries[name].encode, values[name]), dtype=np.int32, count=n)
+    for name in NUMERIC_COLUMNS:
+        # None becomes NaN
+        columns[name] = np.array(values[name], dtype=np.float64).reshape(n)
+    return columns
+
+
+class ProjectSnapshot:
+    """Immutable columnar copy of the project catalogue."""
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        dictionaries: Dict[str, Dictionary],
+        watermark: Optional[datetime],
+    ):
+        self.columns = columns
+        self.dictionaries = dictionaries
+        self.watermark = watermark
+        self.refreshed_at = datetime.utcnow()
+
+    @classmethod
+    def build(cls, db: Session) -> "ProjectSnapshot":
+        """Load every project."""
+        rows = db.query(*_LOADED_COLUMNS).order_by(Project.id).all()
+        dictionaries = {name: Dictionary() for name in CATEGORICAL_COLUMNS}
+        columns = _encode_rows(rows, dictionaries)
+        watermark = max((r.updated_at for r in rows), default=None)
+        return cls(columns, dictionaries, watermark)
+
+    @property
+    def size(self) -> int:
+        return int(self.columns["id"].size)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the column arrays and dictionaries."""
+        arrays = sum(a.nbytes for a in self.columns.values())
+        strings = sum(len(v) + 49 for d in self.dictionaries.values() for v in d.values)
+        return arrays + strings
+
+    def refreshed(self, db: Session) -> "ProjectSnapshot":
+        """Return a new snapshot with rows changed since the watermark applied."""
+        if self.watermark is None:
+            return ProjectSnapshot.build(db)
+
+        rows = (
+            db.query(*_LOADED_COLUMNS)
+            .filter(Project.updated_at >= self.watermark - WATERMARK_OVERLAP)
+            .order_by(Project.id)
+            .all()
+        )
+        dictionaries = {name: d.copy() for name, d in self.dictionaries.items()}
+        columns = dict(self.columns)
+        watermark = self.watermark
+
+        if rows:
+            changed = _encode_rows(rows, dictionaries)
+            ids = columns["id"]
+            pos = np.searchsorted(ids, changed["id"])
+            existing = pos < ids.size
+            existing[existing] = ids[pos[existing]] == changed["id"][existing]
+
+            for name in columns:
+                column = columns[name].copy()
+                column[pos[existing]] = changed[name][existing]
+                columns[name] = np.concatenate([column, changed[name][~existing]])
+            if (~existing).any() and (np.diff(columns["id"]) < 0).any():
+                order = np.argsort(columns["id"], kind="stable")
+                columns = {name: column[order] for name, column in columns.items()}
+            watermark = max(watermark, max(r.updated_at for r in rows))
+
+        live = db.query(func.count(Project.id)).scalar()
+        if live != columns["id"].size:
+            live_ids = np.array([r[0] for r in db.query(Project.id)], dtype=np.int64)
+            keep = np.isin(columns["id"], live_ids)
+            columns = {name: column[keep] for name, column in columns.items()}
+
+        return ProjectSnapshot(columns, dictionaries, watermark)
+
+    def mask(
+        self,
+        sector: Optional[Sequence[str]] = None,
+        country: Optional[Sequence[str]] = None,
+        status: Optional[Sequence[str]] = None,
+        verification_level: Optional[Sequence[str]] = None,
+        sponsor_org_id: Optional[int] = None,
+        is_featured: Optional[bool] = None,
+        min_investment_usd: Optional[float] = None,
+        max_investment_usd: Optional[float] = None,
+        min_risk_score: Optional[float] = None,
+        max_risk_score: Optional[float] = None,
+    ) -> np.ndarray:
+        """Boolean row mask for the given filters (lists match any value)."""
+        keep = np.ones(self.size, dtype=bool)
+        for name, values in (("sector", sector), ("country", country), ("status", status),
+                             ("verification_level", verification_level)):
+            if values:
+                codes = [c for c in map(self.dictionaries[name].code, values) if c is not None]
+                keep &= np.isin(self.columns[name], codes)
+        if sponsor_org_id is not None:
+            keep &= self.columns["sponsor_org_id"] == sponsor_org_id
+        if is_featured is not None:
+            keep &= self.columns["is_featured"] == is_featured
+        for name, low, high in (("investment_usd", min_investment_usd, max_investment_usd),
+                                ("risk_score", min_risk_score, max_risk_score)):
+            # NaN compares False, so rows without a value drop out of range filters
+            if low is not None:
+                keep &= self.columns[name] >= low
+            if high is not None:
+                keep &= self.columns[name] <= high
+        return keep
+
+    def aggregate(self, group_by: Optional[str], mask: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Count, investment total/mean and mean ROI and risk per group.
+
+        Args:
+            group_by: One of CATEGORICAL_COLUMNS, or None for a single total
+            mask: Rows to include (see ``mask``)
+
+        Returns:
+            One dict per non-empty group, largest first
+        """
+        if group_by is not None and group_by not in CATEGORICAL_COLUMNS:
+            raise ValueError(f"Cannot group by {group_by}")
+        selected = slice(None) if mask is None else mask
+
+        if group_by is None:
+            groups = np.zeros(self.size, dtype=np.int64)[selected]
+            n_groups = 1
+        else:
+            # Shift codes by one so None (-1) gets bin 0
+            groups = self.columns[group_by][selected].astype(np.int64) + 1
+            n_groups = len(self.dictionaries[group_by]) + 1
+
+        counts = np.bincount(groups, minlength=n_groups)
+        stats = {}
+        for name in ("investment_usd", "expected_roi_pct", "risk_score"):
+            values = self.columns[name][selected]
+            present = ~np.isnan(values)
+            sums = np.bincount(groups, weights=np.where(present, values, 0.0), minlength=n_groups)
+            n = np.bincount(groups, weights=present, minlength=n_groups)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                stats[name] = (sums, sums / n)
+
+        result = []
+        for g in np.flatnonzero(counts):
+            result.append({
+                "key": None if group_by is None else self.dictionaries[group_by].decode(int(g) - 1),
+                "count": int(counts[g]),
+                "investment_usd_total": float(stats["investment_usd"][0][g]),
+                "investment_usd_mean": _optional(stats["investment_usd"][1][g]),
+                "expected_roi_pct_mean": _optional(stats["expected_roi_pct"][1][g]),
+                "risk_score_mean": _optional(stats["risk_score"][1][g]),
+            })
+        result.sort(key=lambda r: (-r["count"], r["key"] or ""))
+        return result
+
+    def select_ids(
+        self,
+        mask: np.ndarray,
+        sort: str = "id",
+        descending: bool = False,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> List[int]:
+        """Ids of matching rows, sorted by a column (missing values last)."""
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort}")
+        rows = np.flatnonzero(mask)
+        keys = self.columns[sort][rows]
+        if keys.dtype.kind == "f":
+            missing = np.isnan(keys)
+            keys = np.where(missing, 0.0, -keys if descending else keys)
+            order = np.lexsort((self.columns["id"][rows], keys, missing))
+        else:
+            order = np.argsort(keys, kind="stable")
+            if descending:
+                order = order[::-1]
+        return self.columns["id"][rows[order[offset:offset + limit]]].tolist()
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+_snapshot: Optional[ProjectSnapshot] = None
+_refresh_lock = threading.Lock()
+
+
+def refresh_snapshot(db: Session) -> ProjectSnapshot:
+    """Apply changes since the last refresh (or build the first snapshot)."""
+    global _snapshot
+    with _refresh_lock:
+        _snapshot = ProjectSnapshot.build(db) if _snapshot is None else _snapshot.refreshed(db)
+        return _snapshot
+
+
+def get_snapshot(db: Session, fresh: bool = False) -> ProjectSnapshot:
+    """
+    The current snapshot, refreshed first if requested, missing, or older than
+    the refresh interval while the background refresher is not running.
+    """
+    snapshot = _snapshot
+    if snapshot is None or fresh:
+        return refresh_snapshot(db)
+    age = (datetime.utcnow() - snapshot.refreshed_at).total_seconds()
+    if not snapshot_refresher.is_running and age > settings.PROJECT_SNAPSHOT_REFRESH_SECONDS:
+        return refresh_snapshot(db)
+    return snapshot
+
+
+def invalidate_snapshot() -> None:
+    """Drop the snapshot; the next read rebuilds it from scratch."""
+    global _snapshot
+    with _refresh_lock:
+        _snapshot = None
+
+
+class SnapshotRefresher:
+    """Daemon thread that refreshes the snapshot on an interval."""
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and not self._stopping.is_set()
+
+    def start(self, interval: float) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._loop, args=(interval,), name="project-snapshot", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _loop(self, interval: float) -> None:
+        while not self._stopping.is_set():
+            started = time.perf_counter()
+            try:
+                with self.session_factory() as db:
+                    snapshot = refresh_snapshot(db)
+                logger.debug(
+                    "Project snapshot refreshed: %d rows, %d bytes in %.1f ms",
+                    snapshot.size, snapshot.nbytes, (time.perf_counter() - started) * 1000,
+                )
+            except Exception:
+                logger.exception("Project snapshot refresh failed")
+            self._stopping.wait(interval)
+
+
+snapshot_refresher = SnapshotRefresher()
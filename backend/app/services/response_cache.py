@@ -0,0 +1,182 @@
+"""In-process cache of serialized read responses with ETag validation.
+
+Hot single-entity reads (a project, its financials, an organization, an
+investor's preferences) keep their serialized JSON body and ETag in an LRU
+keyed by ``(kind, id)``. A hit skips the database and Pydantic entirely; a
+request whose ``If-None-Match`` carries the current ETag gets an empty
+``304 Not Modified``. ETags combine the kind, id, the entity's ``updated_at``
+and a digest of the body, so nested changes (new members, a new risk
+assessment) also produce a new tag.
+
+ORM events on the underlying models queue the affected keys and evict them
+when the writing session commits. Bulk ``insert()``/``update()`` statements
+skip those events, so their callers queue keys with ``projects_changed``. Entries also expire after
+``RESPONSE_CACHE_TTL_SECONDS`` to pick up writes made by other processes.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.investor import InvestorPreferences
+from app.models.organization import Organization, OrgMember
+from app.models.project import Project, ProjectFinancials, ProjectRiskAssessment
+from app.utils.metrics import cache_requests
+
+CacheKey = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    stored_at: float
+
+
+class ResponseCache:
+    """Thread-safe LRU of serialized bodies."""
+
+    def __init__(self):
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every eviction so responses built from older reads are not stored
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.stored_at > settings.RESPONSE_CACHE_TTL_SECONDS:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, body: bytes, etag: str, generation: int) -> CachedResponse:
+        entry = CachedResponse(body, etag, time.monotonic())
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > settings.RESPONSE_CACHE_SIZE:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, keys: Set[Hashable]) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+response_cache = ResponseCache()
+
+
+def make_etag(key: CacheKey, updated_at: Optional[datetime], body: bytes) -> str:
+    kind, entity_id = key
+    digest = hashlib.sha1(f"{updated_at.isoformat() if updated_at else ''}|".encode() + body).hexdigest()
+    return f'"{kind}-{entity_id}-{digest[:16]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header (weak comparison, lists and '*') matches."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in [tag.removeprefix("W/") for tag in tags]
+
+
+def cached_response(
+    request: Request,
+    key: CacheKey,
+    load: Callable[[], Tuple[BaseModel, Optional[datetime]]],
+    cache_control: str,
+) -> Response:
+    """
+    Serve a cached body, a 304, or build, store and serve a fresh one.
+
+    Args:
+        key: (kind, id) the write events evict
+        load: Returns the response model and the entity's updated_at; may raise HTTPException
+        cache_control: Cache-Control header value for this route
+    """
+    entry = response_cache.get(key)
+    cache_requests.inc(cache="responses", result="miss" if entry is None else "hit")
+    if entry is None:
+        generation = response_cache.generation
+        model, updated_at = load()
+        body = model.model_dump_json().encode()
+        entry = response_cache.put(key, body, make_etag(key, updated_at, body), generation)
+
+    headers = {"ETag": entry.etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+# Models whose writes change a cached response, and the keys they affect
+_DEPENDENCIES: Dict[type, Callable[[object], Set[CacheKey]]] = {
+    Project: lambda t: {("project", t.id)},
+    ProjectFinancials: lambda t: {("project", t.project_id), ("financials", t.project_id)},
+    ProjectRiskAssessment: lambda t: {("project", t.project_id)},
+    Organization: lambda t: {("organization", t.id)},
+    OrgMember: lambda t: {("organization", t.org_id)},
+    InvestorPreferences: lambda t: {("preferences", t.org_id)},
+}
+
+
+def _register(model, keys_for: Callable[[object], Set[CacheKey]]) -> None:
+    def _queue(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault("response_cache_keys", set()).update(keys_for(target))
+
+    for name in ("after_insert", "after_update", "after_delete"):
+        event.listen(model, name, _queue)
+
+
+for _model, _keys_for in _DEPENDENCIES.items():
+    _register(_model, _keys_for)
+
+
+def projects_changed(db: Session, project_ids: Iterable[int], financials: bool = False) -> None:
+    """Evict projects (and their financials) when `db` commits a bulk write to them."""
+    keys = db.info.setdefault("response_cache_keys", set())
+    for project_id in project_ids:
+        keys.add(("project", project_id))
+        if financials:
+            keys.add(("financials", project_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_on_commit(session: Session) -> None:
+    keys = session.info.pop("response_cache_keys", None)
+    if keys:
+        response_cache.invalidate(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop("response_cache_keys", None)
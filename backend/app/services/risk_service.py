@@ -0,0 +1,318 @@
+"""Batch risk scoring.
+
+Builds a feature matrix for all projects from ``Project``, ``ProjectFinancials``
+and verification state with a handful of aggregate queries, scores every row
+in vectorized NumPy passes and bulk-inserts ``ProjectRiskAssessment`` rows.
+
+Scores are risk scores: 0 is the lowest risk, 100 the highest.
+
+Each assessment stores the inputs it was computed from plus a hash of them in
+``inputs_json``. A project whose inputs hash matches its latest assessment for
+the current ``MODEL_VERSION`` is skipped. Human overrides are never modified;
+while one exists it remains the project's effective score.
+"""
+import hashlib
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+
+from app.models.document import Document
+from app.models.project import Project, ProjectFinancials, ProjectRiskAssessment
+from app.models.verification import VerificationRequest, VerificationCheck
+from app.services import response_cache
+from app.services.job_service import job_handler, register_cron
+
+MODEL_VERSION = "aip-risk/1.0"
+
+# Projects scored per pass; bounds memory for very large catalogues
+BATCH_SIZE = 2000
+
+CATEGORIES = ["political", "currency", "financial", "execution", "verification"]
+CATEGORY_WEIGHTS = np.array([0.25, 0.15, 0.25, 0.20, 0.15])
+
+# Baseline country priors (0-100, higher is riskier); unknown countries score DEFAULT_COUNTRY_RISK
+COUNTRY_RISK: Dict[str, float] = {
+    "Mauritius": 25, "Botswana": 30, "Namibia": 35, "Rwanda": 40, "Morocco": 40,
+    "South Africa": 45, "Senegal": 45, "Ghana": 50, "Tanzania": 50, "Côte d'Ivoire": 50,
+    "Kenya": 55, "Egypt": 55, "Uganda": 55, "Zambia": 60, "Cameroon": 60,
+    "Nigeria": 65, "Ethiopia": 65, "Mozambique": 65, "Angola": 65, "Zimbabwe": 75,
+    "DRC": 80, "Sudan": 85, "South Sudan": 90, "Somalia": 90,
+}
+DEFAULT_COUNTRY_RISK = 60.0
+
+SECTOR_RISK: Dict[str, float] = {
+    "Telecom": 35, "Water": 40, "Health": 40, "Energy": 45, "Housing": 50,
+    "Transport": 55, "Agriculture": 55, "Mining": 70,
+}
+DEFAULT_SECTOR_RISK = 50.0
+
+HARD_CURRENCIES = {"USD", "EUR", "GBP"}
+
+# Score used for a sub-factor when its input is missing
+MISSING_INPUT_RISK = 65.0
+
+MITIGATIONS: Dict[str, str] = {
+    "political": "Obtain political risk insurance (e.g. MIGA, ATI) and stabilization clauses.",
+    "currency": "Index tariffs to hard currency or hedge via local-currency facilities (e.g. TCX).",
+    "financial": "Stress-test the financial model and strengthen revenue security with take-or-pay terms.",
+    "execution": "Use a fixed-price, date-certain EPC contract with an experienced contractor.",
+    "verification": "Complete outstanding verification checks and upload missing data room documents.",
+}
+MITIGATION_THRESHOLD = 60
+
+LEVELS = ["V0", "V1", "V2", "V3", "V4", "V5"]
+
+
+def _num(value) -> Optional[float]:
+    if value is None:
+        return None
+    return float(value) if isinstance(value, (Decimal, int, float)) else None
+
+
+def _first(*values) -> Optional[float]:
+    """The first value that is present; a real 0 counts as present."""
+    for value in values:
+        number = _num(value)
+        if number is not None:
+            return number
+    return None
+
+
+def _inputs_hash(inputs: Dict[str, Any]) -> str:
+    canonical = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{MODEL_VERSION}|{canonical}".encode()).hexdigest()
+
+
+def load_inputs(db: Session, project_ids: Sequence[int]) -> List[Dict[str, Any]]:
+    """
+    Collect scoring inputs for a batch of projects.
+
+    Returns:
+        One dict of raw inputs per project, in project id order
+    """
+    rows = db.query(
+        Project.id, Project.country, Project.sector, Project.verification_level,
+        Project.investment_usd, Project.expected_roi_pct, Project.payback_years,
+        ProjectFinancials.currency, ProjectFinancials.capex_usd, ProjectFinancials.opex_usd_annual,
+        ProjectFinancials.irr_pct, ProjectFinancials.roi_pct,
+        ProjectFinancials.payback_years.label("fin_payback_years"),
+    ).outerjoin(
+        ProjectFinancials, ProjectFinancials.project_id == Project.id
+    ).filter(Project.id.in_(project_ids)).order_by(Project.id).all()
+
+    failed_checks = dict(db.query(
+        VerificationRequest.project_id, func.count(VerificationCheck.id)
+    ).join(
+        VerificationCheck, VerificationCheck.request_id == VerificationRequest.id
+    ).filter(
+        VerificationRequest.project_id.in_(project_ids),
+        VerificationRequest.status.in_(["pending", "in_review"]),
+        VerificationCheck.status == "failed",
+    ).group_by(VerificationRequest.project_id).all())
+
+    documents = dict(db.query(
+        Document.project_id, func.count(Document.id)
+    ).filter(Document.project_id.in_(project_ids)).group_by(Document.project_id).all())
+
+    inputs = []
+    for row in rows:
+        inputs.append({
+            "project_id": row.id,
+            "country": row.country,
+            "sector": row.sector,
+            "verification_level": row.verification_level,
+            "currency": row.currency,
+            "capex_usd": _first(row.capex_usd, row.investment_usd),
+            "opex_usd_annual": _num(row.opex_usd_annual),
+            "irr_pct": _num(row.irr_pct),
+            "roi_pct": _first(row.roi_pct, row.expected_roi_pct),
+            "payback_years": _first(row.fin_payback_years, row.payback_years),
+            "failed_checks": failed_checks.get(row.id, 0),
+            "documents": documents.get(row.id, 0),
+        })
+    return inputs
+
+
+def _column(inputs: List[Dict[str, Any]], key: str) -> np.ndarray:
+    return np.array([np.nan if i[key] is None else i[key] for i in inputs], dtype=float)
+
+
+def _impute(values: np.ndarray) -> np.ndarray:
+    return np.where(np.isnan(values), MISSING_INPUT_RISK, values)
+
+
+def score_matrix(inputs: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Score a batch of projects.
+
+    Returns:
+        Array of shape (n_projects, len(CATEGORIES)) with category risk scores
+    """
+    country = np.array([COUNTRY_RISK.get(i["country"], DEFAULT_COUNTRY_RISK) for i in inputs], dtype=float)
+    sector = np.array([SECTOR_RISK.get(i["sector"], DEFAULT_SECTOR_RISK) for i in inputs], dtype=float)
+    level = np.array([LEVELS.index(i["verification_level"]) if i["verification_level"] in LEVELS else 0
+                      for i in inputs], dtype=float)
+    currency = np.array([
+        np.nan if not i["currency"] else (25.0 if i["currency"].upper() in HARD_CURRENCIES else 70.0)
+        for i in inputs
+    ], dtype=float)
+    capex = _column(inputs, "capex_usd")
+    opex = _column(inputs, "opex_usd_annual")
+    irr = _column(inputs, "irr_pct")
+    roi = _column(inputs, "roi_pct")
+    payback = _column(inputs, "payback_years")
+    failed = _column(inputs, "failed_checks")
+    documents = _column(inputs, "documents")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Returns: a 25% IRR carries no return risk, 0% the maximum
+        irr_risk = np.clip(100 - irr * 4, 0, 100)
+        irr_risk = np.where(np.isnan(irr_risk), np.clip(100 - roi * 4, 0, 100), irr_risk)
+        payback_risk = np.clip(payback * 6, 0, 100)
+        opex_risk = np.clip(opex / capex * 500, 0, 100)
+        opex_risk[~np.isfinite(opex_risk)] = np.nan
+        size_risk = np.clip((np.log10(capex) - 6) * 20, 0, 100)
+
+    financial = (_impute(irr_risk) * 0.45 + _impute(payback_risk) * 0.35 + _impute(opex_risk) * 0.2)
+    execution = sector * 0.6 + np.where(np.isnan(size_risk), 50.0, size_risk) * 0.4
+    verification = np.clip((5 - level) * 18 + failed * 10 - np.minimum(documents, 20), 0, 100)
+
+    return np.column_stack([country, _impute(currency), financial, execution, verification])
+
+
+def overall_scores(category_scores: np.ndarray) -> np.ndarray:
+    """Weighted overall risk per row, rounded to integers."""
+    return np.rint(category_scores @ CATEGORY_WEIGHTS).astype(int)
+
+
+def _narrative(categories: Dict[str, int], overall: int) -> str:
+    top = sorted(categories.items(), key=lambda kv: kv[1], reverse=True)[:2]
+    band = "high" if overall >= 65 else "moderate" if overall >= 40 else "low"
+    drivers = " and ".join(f"{name} ({score})" for name, score in top)
+    return f"Overall {band} risk ({overall}/100), driven mainly by {drivers}."
+
+
+def score_projects(
+    db: Session,
+    project_ids: Optional[Sequence[int]] = None,
+    force: bool = False,
+    user_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Score projects and write new assessments where inputs changed.
+
+    Args:
+        db: Database session (committed once per batch)
+        project_ids: Limit scoring to these projects; defaults to all
+        force: Write assessments even when inputs are unchanged
+        user_id: Recorded as created_by on new assessments
+
+    Returns:
+        Counts of scored, unchanged and overridden projects
+    """
+    started = time.perf_counter()
+    summary = {"model_version": MODEL_VERSION, "projects": 0, "scored": 0, "unchanged": 0, "overridden": 0}
+
+    id_query = db.query(Project.id).order_by(Project.id)
+    if project_ids is not None:
+        id_query = id_query.filter(Project.id.in_(project_ids))
+    all_ids = [pid for (pid,) in id_query.all()]
+
+    for offset in range(0, len(all_ids), BATCH_SIZE):
+        batch = all_ids[offset:offset + BATCH_SIZE]
+        inputs = load_inputs(db, batch)
+        for item in inputs:
+            item["input_hash"] = _inputs_hash(item)
+
+        # Latest machine assessment per project for this model version
+        latest_ids = db.query(func.max(ProjectRiskAssessment.id)).filter(
+            ProjectRiskAssessment.project_id.in_(batch),
+            ProjectRiskAssessment.model_version == MODEL_VERSION,
+            ProjectRiskAssessment.is_human_override.is_(False),
+        ).group_by(ProjectRiskAssessment.project_id)
+        previous_hash = {
+            project_id: (inputs_json or {}).get("input_hash")
+            for project_id, inputs_json in db.query(
+                ProjectRiskAssessment.project_id, ProjectRiskAssessment.inputs_json
+            ).filter(ProjectRiskAssessment.id.in_(latest_ids)).all()
+        }
+        overridden = {
+            project_id for (project_id,) in db.query(ProjectRiskAssessment.project_id).filter(
+                ProjectRiskAssessment.project_id.in_(batch),
+                ProjectRiskAssessment.is_human_override.is_(True),
+            ).distinct().all()
+        }
+
+        changed = [i for i in inputs if force or previous_hash.get(i["project_id"]) != i["input_hash"]]
+        summary["projects"] += len(inputs)
+        summary["unchanged"] += len(inputs) - len(changed)
+        if not changed:
+            continue
+
+        categories = np.rint(score_matrix(changed)).astype(int)
+        overall = overall_scores(categories)
+        now = datetime.utcnow()
+
+        assessments = []
+        project_scores = []
+        for item, row, score in zip(changed, categories.tolist(), overall.tolist()):
+            category_scores = dict(zip(CATEGORIES, row))
+            mitigations = {name: MITIGATIONS[name] for name, value in category_scores.items()
+                           if value >= MITIGATION_THRESHOLD}
+            assessments.append({
+                "project_id": item["project_id"],
+                "overall_score": score,
+                "category_scores": category_scores,
+                "model_version": MODEL_VERSION,
+                "inputs_json": item,
+                "narrative": _narrative(category_scores, score),
+                "mitigations_json": mitigations or None,
+                "created_by": user_id,
+                "is_human_override": False,
+                "created_at": now,
+            })
+            if item["project_id"] in overridden:
+                summary["overridden"] += 1
+            else:
+                project_scores.append({"id": item["project_id"], "risk_score": score})
+
+        db.execute(insert(ProjectRiskAssessment), assessments)
+        if project_scores:
+            db.execute(update(Project), project_scores)
+        response_cache.projects_changed(db, (a["project_id"] for a in assessments))
+        db.commit()
+        summary["scored"] += len(assessments)
+
+    summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return summary
+
+
+def effective_assessment(db: Session, project_id: int) -> Optional[ProjectRiskAssessment]:
+    """The newest human override if any, otherwise the newest machine assessment."""
+    return db.query(ProjectRiskAssessment).filter(
+        ProjectRiskAssessment.project_id == project_id
+    ).order_by(
+        ProjectRiskAssessment.is_human_override.desc(),
+        ProjectRiskAssessment.created_at.desc(),
+        ProjectRiskAssessment.id.desc(),
+    ).first()
+
+
+@job_handler("risk.score_projects", max_attempts=3, concurrency=1)
+def score_projects_job(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Background job wrapper around score_projects."""
+    return score_projects(
+        db,
+        project_ids=payload.get("project_ids"),
+        force=payload.get("force", False),
+        user_id=payload.get("user_id"),
+    )
+
+
+register_cron("nightly-risk-scoring", "0 2 * * *", "risk.score_projects")
@@ -0,0 +1,315 @@
+"""Meeting scheduling and conflict detection across deal rooms.
+
+Attendees sit in many deal rooms at once, so conflicts are checked against an
+attendee's meetings everywhere, not just in the room being scheduled. Each
+attendee gets an ``IntervalIndex`` over their meetings in the window of
+interest; conflict checks against it are O(log n).
+
+The indexes are not kept between requests. ``MeetingScheduler.load`` runs
+one range query on the indexed ``scheduled_at`` column and then sorts each
+attendee's meetings. Every schedule, update, conflict or free/busy call
+therefore costs O(n log n) in the n meetings in its window, on top of the
+logarithmic lookups.
+"""
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.dealroom import Meeting
+
+# Meetings longer than this are not expected; it bounds how far before a
+# window we look for meetings that may still be running inside it.
+MAX_MEETING_SPAN = timedelta(hours=24)
+
+# Meeting statuses that do not occupy an attendee's calendar
+INACTIVE_MEETING_STATUSES = ("cancelled",)
+
+
+class Interval(NamedTuple):
+    """A busy interval, half-open: [start, end)."""
+    start: datetime
+    end: datetime
+    meeting_id: Optional[int] = None
+    deal_room_id: Optional[int] = None
+    title: Optional[str] = None
+
+
+class IntervalIndex:
+    """
+    Static interval index over one attendee's meetings.
+
+    Intervals are kept sorted by start together with a running maximum of
+    their end times. For a query [start, end) every candidate overlap lies
+    before ``bisect_left(starts, end)``, and the running maximum at that
+    position tells in O(log n) whether any of them reaches past ``start``.
+    Listing overlaps walks backwards from there and stops as soon as the
+    running maximum falls behind ``start``.
+    """
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self._items: List[Interval] = sorted(intervals)
+        self._starts: List[datetime] = [item.start for item in self._items]
+        self._max_end: List[datetime] = []
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, interval: Interval) -> None:
+        """Insert an interval."""
+        insort(self._items, interval)
+        insort(self._starts, interval.start)
+        self._dirty = True
+
+    def remove_meeting(self, meeting_id: int) -> None:
+        """Remove all intervals belonging to a meeting."""
+        self._items = [item for item in self._items if item.meeting_id != meeting_id]
+        self._starts = [item.start for item in self._items]
+        self._dirty = True
+
+    def _running_max_end(self) -> List[datetime]:
+        if self._dirty:
+            self._max_end = []
+            current = None
+            for item in self._items:
+                current = item.end if current is None or item.end > current else current
+                self._max_end.append(current)
+            self._dirty = False
+        return self._max_end
+
+    def has_overlap(self, start: datetime, end: datetime) -> bool:
+        """Check whether any interval overlaps [start, end)."""
+        idx = bisect_left(self._starts, end)
+        if idx == 0:
+            return False
+        return self._running_max_end()[idx - 1] > start
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Interval]:
+        """Return all intervals overlapping [start, end), ordered by start."""
+        max_end = self._running_max_end()
+        found = []
+        i = bisect_left(self._starts, end) - 1
+        while i >= 0 and max_end[i] > start:
+            if self._items[i].end > start:
+                found.append(self._items[i])
+            i -= 1
+        found.reverse()
+        return found
+
+    def busy(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """Return merged busy blocks clipped to [start, end)."""
+        return merge_intervals(
+            (max(item.start, start), min(item.end, end))
+            for item in self.overlapping(start, end)
+        )
+
+
+def merge_intervals(
+    intervals: Iterable[Tuple[datetime, datetime]]
+) -> List[Tuple[datetime, datetime]]:
+    """Merge overlapping or touching (start, end) pairs."""
+    merged: List[Tuple[datetime, datetime]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def as_naive_utc(value: datetime) -> datetime:
+    """Normalize a datetime to the naive-UTC form stored in the database."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def meeting_participants(meeting: Meeting) -> List[int]:
+    """Users whose calendars a meeting occupies: attendees plus the organizer."""
+    participants = set(meeting.attendees or [])
+    if meeting.created_by is not None:
+        participants.add(meeting.created_by)
+    return sorted(participants)
+
+
+def meeting_interval(meeting: Meeting) -> Interval:
+    """Build the busy interval covered by a meeting."""
+    start = as_naive_utc(meeting.scheduled_at)
+    return Interval(
+        start=start,
+        end=start + timedelta(minutes=meeting.duration_minutes or 0),
+        meeting_id=meeting.id,
+        deal_room_id=meeting.deal_room_id,
+        title=meeting.title,
+    )
+
+
+class MeetingScheduler:
+    """
+    Per-attendee interval indexes over meetings in all deal rooms.
+
+    Usage:
+        scheduler = MeetingScheduler.load(db, [4, 7], week_start, week_end)
+        scheduler.conflicts([4, 7], start, end)
+        scheduler.earliest_common_slot([4, 7], timedelta(hours=1), week_start, week_end)
+    """
+
+    def __init__(self):
+        self._indexes: Dict[int, IntervalIndex] = {}
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        attendee_ids: Sequence[int],
+        window_start: datetime,
+        window_end: datetime,
+        exclude_meeting_id: Optional[int] = None,
+    ) -> "MeetingScheduler":
+        """
+        Build indexes for the given attendees from meetings in a time window.
+
+        Args:
+            db: Database session
+            attendee_ids: Users to index
+            window_start: Start of the window of interest
+            window_end: End of the window of interest
+            exclude_meeting_id: Meeting to leave out (e.g. the one being moved)
+
+        Returns:
+            A scheduler covering the window
+        """
+        window_start = as_naive_utc(window_start)
+        window_end = as_naive_utc(window_end)
+        wanted = set(attendee_ids)
+
+        query = db.query(Meeting).filter(
+            Meeting.scheduled_at < window_end,
+            Meeting.scheduled_at >= window_start - MAX_MEETING_SPAN,
+            Meeting.status.notin_(INACTIVE_MEETING_STATUSES),
+        )
+        if exclude_meeting_id is not None:
+            query = query.filter(Meeting.id != exclude_meeting_id)
+
+        intervals: Dict[int, List[Interval]] = {attendee_id: [] for attendee_id in wanted}
+        for meeting in query.all():
+            interval = meeting_interval(meeting)
+            for attendee_id in meeting_participants(meeting):
+                if attendee_id in wanted:
+                    intervals[attendee_id].append(interval)
+
+        # Sorted once per attendee rather than insort per meeting
+        scheduler = cls()
+        for attendee_id, items in intervals.items():
+            scheduler._indexes[attendee_id] = IntervalIndex(items)
+        return scheduler
+
+    def index_for(self, attendee_id: int) -> IntervalIndex:
+        """Get (or create) the index for an attendee."""
+        return self._indexes.setdefault(attendee_id, IntervalIndex())
+
+    def has_conflict(self, attendee_ids: Sequence[int], start: datetime, end: datetime) -> bool:
+        """Check whether any attendee is busy during [start, end)."""
+        start, end = as_naive_utc(start), as_naive_utc(end)
+        return any(self.index_for(a).has_overlap(start, end) for a in attendee_ids)
+
+    def conflicts(
+        self,
+        attendee_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+    ) -> Dict[int, List[Interval]]:
+        """Return the conflicting meetings per attendee for [start, end)."""
+        start, end = as_naive_utc(start), as_naive_utc(end)
+        result = {}
+        for attendee_id in attendee_ids:
+            found = self.index_for(attendee_id).overlapping(start, end)
+            if found:
+                result[attendee_id] = found
+        return result
+
+    def free_busy(
+        self,
+        attendee_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+    ) -> Dict[int, List[Tuple[datetime, datetime]]]:
+        """Return merged busy blocks per attendee within [start, end)."""
+        start, end = as_naive_utc(start), as_naive_utc(end)
+        return {a: self.index_for(a).busy(start, end) for a in attendee_ids}
+
+    def earliest_common_slot(
+        self,
+        attendee_ids: Sequence[int],
+        duration: timedelta,
+        window_start: datetime,
+        window_end: datetime,
+        step_minutes: int = 15,
+        working_hours: Optional[Tuple[int, int]] = None,
+    ) -> Optional[datetime]:
+        """
+        Find the earliest start at which all attendees are free.
+
+        Args:
+            attendee_ids: Users who must all attend
+            duration: Meeting length
+            window_start: Earliest acceptable start
+            window_end: Latest acceptable end
+            step_minutes: Candidate starts are aligned to this many minutes
+            working_hours: Optional (start_hour, end_hour) in UTC the meeting must fit in
+
+        Returns:
+            The slot start, or None if nothing fits in the window
+        """
+        window_start, window_end = as_naive_utc(window_start), as_naive_utc(window_end)
+        busy = merge_intervals(
+            block
+            for attendee_id in attendee_ids
+            for block in self.index_for(attendee_id).busy(window_start, window_end)
+        )
+        busy_starts = [block[0] for block in busy]
+
+        candidate = _align(window_start, step_minutes)
+        while candidate + duration <= window_end:
+            if working_hours is not None:
+                fitted = _fit_working_hours(candidate, duration, working_hours)
+                if fitted != candidate:
+                    candidate = _align(fitted, step_minutes)
+                    continue
+
+            # The only block that can overlap is the last one starting before our end
+            i = bisect_right(busy_starts, candidate + duration - timedelta.resolution) - 1
+            if i >= 0 and busy[i][1] > candidate:
+                candidate = _align(busy[i][1], step_minutes)
+                continue
+            return candidate
+        return None
+
+
+def _align(value: datetime, step_minutes: int) -> datetime:
+    """Round a datetime up to the next multiple of step_minutes."""
+    if step_minutes <= 1:
+        return value
+    floor = value.replace(second=0, microsecond=0)
+    floor -= timedelta(minutes=floor.minute % step_minutes)
+    return floor if floor == value else floor + timedelta(minutes=step_minutes)
+
+
+def _fit_working_hours(
+    candidate: datetime,
+    duration: timedelta,
+    working_hours: Tuple[int, int],
+) -> datetime:
+    """Move a candidate start forward so the meeting fits inside working hours."""
+    start_hour, end_hour = working_hours
+    day = candidate.replace(hour=0, minute=0, second=0, microsecond=0)
+    day_open = day + timedelta(hours=start_hour)
+    day_close = day + timedelta(hours=end_hour)
+    if candidate < day_open:
+        return day_open
+    if candidate + duration > day_close:
+        return day_open + timedelta(days=1)
+    return candidate
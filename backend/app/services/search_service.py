@@ -0,0 +1,490 @@
+"""Full-text project search.
+
+Searches ``name``, ``summary``, ``description``, ``impact_statement`` and
+``sdg_tags`` with field-weighted ranking, highlighting and the same structured
+filters as the project list. The backend follows the database:
+
+- SQLite: an FTS5 virtual table ``project_search`` (rowid = project id),
+  ranked with FTS5's ``bm25()``.
+- PostgreSQL: ``project_search_documents`` holding a weighted ``tsvector``
+  per project under a GIN index, ranked with ``ts_rank_cd`` (Postgres has no
+  built-in BM25).
+- Anything else, or SQLite built without FTS5: ``MemoryIndex``, an in-process
+  inverted index with BM25F scoring.
+
+The index tables are created with the schema (``Base.metadata`` DDL events)
+and kept current by ORM events on ``Project`` inserts, updates and deletes:
+the SQL indexes are written in the same transaction as the project, and the
+in-memory index applies changes once the session commits. Bulk Core writes
+bypass the events; ``projects_inserted`` indexes a bulk insert and
+``rebuild_index`` re-syncs after anything else.
+"""
+import html
+import logging
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import bindparam, column, event, func, literal_column, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, attributes, object_session
+
+from app.core.database import Base
+from app.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+# Indexed fields and their ranking weights
+FIELDS: Tuple[str, ...] = ("name", "summary", "description", "impact_statement", "sdg_tags")
+WEIGHTS: Dict[str, float] = {
+    "name": 10.0,
+    "summary": 3.0,
+    "description": 1.0,
+    "impact_statement": 2.0,
+    "sdg_tags": 4.0,
+}
+# Postgres only has four weight classes
+PG_WEIGHT_CLASSES = {"name": "A", "sdg_tags": "B", "summary": "B", "impact_statement": "C", "description": "D"}
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+SNIPPET_TOKENS = 16
+
+FTS_TABLE = "project_search"
+PG_TABLE = "project_search_documents"
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_QUERY_TERM = re.compile(r"(\w+)(\*?)", re.UNICODE)
+
+_fts = table(FTS_TABLE, column("rowid"), *(column(f) for f in FIELDS))
+_pg = table(PG_TABLE, column("project_id"), column("document"))
+
+
+def parse_query(query: str) -> List[Tuple[str, bool]]:
+    """
+    Split user input into (term, is_prefix) pairs; all terms must match.
+
+    A trailing ``*`` makes a term a prefix match (``solar*``). Everything
+    else that is not a word character is ignored, so user input can never
+    produce FTS5 or tsquery syntax errors.
+
+    Raises:
+        ValueError: If the query contains no words
+    """
+    terms = [(word.lower(), bool(star)) for word, star in _QUERY_TERM.findall(query)]
+    if not terms:
+        raise ValueError("Search query must contain at least one word")
+    return terms
+
+
+def tokenize(text_value: Optional[str]) -> List[str]:
+    return [t.lower() for t in _TOKEN.findall(text_value or "")]
+
+
+def _matches(token: str, terms: Sequence[Tuple[str, bool]]) -> bool:
+    return any(token.startswith(t) if prefix else token == t for t, prefix in terms)
+
+
+def highlight(text_value: Optional[str], terms: Sequence[Tuple[str, bool]]) -> Optional[str]:
+    """
+    Snippet of text around the first match with matched words marked, or None.
+
+    The result is safe HTML: the project's own text is escaped, so the only
+    markup is the ``HIGHLIGHT_START``/``HIGHLIGHT_END`` tags added here.
+    """
+    if not text_value:
+        return None
+    words = list(_TOKEN.finditer(text_value))
+    hits = [i for i, m in enumerate(words) if _matches(m.group().lower(), terms)]
+    if not hits:
+        return None
+    first = max(hits[0] - SNIPPET_TOKENS // 4, 0)
+    last = min(first + SNIPPET_TOKENS, len(words)) - 1
+    start, end = words[first].start(), words[last].end()
+
+    parts = ["…" if start > 0 else ""]
+    cursor = start
+    for i in range(first, last + 1):
+        m = words[i]
+        if i in hits:
+            parts.append(html.escape(text_value[cursor:m.start()]))
+            parts.append(HIGHLIGHT_START + html.escape(m.group()) + HIGHLIGHT_END)
+            cursor = m.end()
+    parts.append(html.escape(text_value[cursor:end]))
+    parts.append("…" if end < len(text_value) else "")
+    return "".join(parts)
+
+
+class MemoryIndex:
+    """
+    In-process inverted index with BM25F ranking.
+
+    Postings map term -> {project id: per-field term frequencies}. Field
+    frequencies are length-normalised and weighted before the BM25
+    saturation, so a word in the name outweighs several in the description.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.loaded = False
+            self._postings: Dict[str, Dict[int, List[int]]] = defaultdict(dict)
+            self._lengths: Dict[int, List[int]] = {}
+            self._terms: Dict[int, Set[str]] = {}
+            self._length_totals = [0] * len(FIELDS)
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, project_id: int, document: Dict[str, Optional[str]]) -> None:
+        with self._lock:
+            self.remove(project_id)
+            lengths = [0] * len(FIELDS)
+            terms = set()
+            for f, field in enumerate(FIELDS):
+                tokens = tokenize(document.get(field))
+                lengths[f] = len(tokens)
+                terms.update(tokens)
+                for token in tokens:
+                    freqs = self._postings[token].setdefault(project_id, [0] * len(FIELDS))
+                    freqs[f] += 1
+            self._lengths[project_id] = lengths
+            self._terms[project_id] = terms
+            self._length_totals = [t + n for t, n in zip(self._length_totals, lengths)]
+
+    def remove(self, project_id: int) -> None:
+        with self._lock:
+            lengths = self._lengths.pop(project_id, None)
+            if lengths is None:
+                return
+            self._length_totals = [t - n for t, n in zip(self._length_totals, lengths)]
+            for token in self._terms.pop(project_id):
+                del self._postings[token][project_id]
+                if not self._postings[token]:
+                    del self._postings[token]
+
+    def _expand(self, term: str, prefix: bool) -> List[str]:
+        if not prefix:
+            return [term] if term in self._postings else []
+        return [t for t in self._postings if t.startswith(term)]
+
+    def search(self, terms: Sequence[Tuple[str, bool]]) -> List[Tuple[int, float]]:
+        """(project id, score) for projects matching every term, best first."""
+        with self._lock:
+            n_docs = len(self._lengths)
+            if not n_docs:
+                return []
+            averages = [max(total / n_docs, 1e-9) for total in self._length_totals]
+            scores: Optional[Dict[int, float]] = None
+            for term, prefix in terms:
+                term_scores: Dict[int, float] = defaultdict(float)
+                for token in self._expand(term, prefix):
+                    postings = self._postings[token]
+                    idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for project_id, freqs in postings.items():
+                        lengths = self._lengths[project_id]
+                        tf = sum(
+                            WEIGHTS[field] * freqs[f] / (1 - self.b + self.b * lengths[f] / averages[f])
+                            for f, field in enumerate(FIELDS) if freqs[f]
+                        )
+                        term_scores[project_id] += idf * tf / (self.k1 + tf)
+                if scores is None:
+                    scores = dict(term_scores)
+                else:
+                    scores = {pid: s + term_scores[pid] for pid, s in scores.items() if pid in term_scores}
+                if not scores:
+                    return []
+            return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+memory_index = MemoryIndex()
+
+_fts5_available: Optional[bool] = None
+
+
+def backend_name(connection: Connection) -> str:
+    """"fts5", "postgres" or "memory" for the connection's database."""
+    global _fts5_available
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        return "postgres"
+    if dialect == "sqlite":
+        if _fts5_available is None:
+            _fts5_available = bool(connection.exec_driver_sql(
+                "SELECT sqlite_compileoption_used('ENABLE_FTS5')"
+            ).scalar())
+        if _fts5_available:
+            return "fts5"
+    return "memory"
+
+
+def _document(project: Any) -> Dict[str, Optional[str]]:
+    return {field: getattr(project, field) for field in FIELDS}
+
+
+def _pg_document_sql() -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('english', coalesce({field}, '')), '{PG_WEIGHT_CLASSES[field]}')"
+        for field in FIELDS
+    )
+
+
+# Schema
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_index(target, connection: Connection, **kw) -> None:
+    backend = backend_name(connection)
+    if backend == "fts5":
+        connection.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{', '.join(FIELDS)}, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    elif backend == "postgres":
+        connection.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {PG_TABLE} ("
+            f"project_id INTEGER PRIMARY KEY REFERENCES aip_projects(id) ON DELETE CASCADE, "
+            f"document TSVECTOR NOT NULL)"
+        )
+        connection.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS ix_{PG_TABLE}_document ON {PG_TABLE} USING GIN (document)"
+        )
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_index(target, connection: Connection, **kw) -> None:
+    backend = backend_name(connection)
+    if backend == "fts5":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif backend == "postgres":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {PG_TABLE}")
+    memory_index.clear()
+
+
+# Incremental maintenance
+
+def _write(connection: Connection, project: Project) -> None:
+    backend = backend_name(connection)
+    if backend == "fts5":
+        connection.execute(_fts.delete().where(_fts.c.rowid == project.id))
+        connection.execute(_fts.insert().values(rowid=project.id, **_document(project)))
+    elif backend == "postgres":
+        connection.execute(
+            text(
+                f"INSERT INTO {PG_TABLE} (project_id, document) "
+                f"SELECT id, {_pg_document_sql()} FROM aip_projects WHERE id = :id "
+                f"ON CONFLICT (project_id) DO UPDATE SET document = EXCLUDED.document"
+            ),
+            {"id": project.id},
+        )
+    else:
+        _queue_memory_change(project, _document(project))
+
+
+def _queue_memory_change(project: Project, document: Optional[Dict[str, Optional[str]]]) -> None:
+    session = object_session(project)
+    if session is not None:
+        session.info.setdefault("search_index_changes", {})[project.id] = document
+
+
+def projects_inserted(db: Session, projects: List[Any]) -> None:
+    """Index projects inserted with a bulk ``insert()`` (rows carrying id and FIELDS)."""
+    if not projects:
+        return
+    connection = db.connection()
+    backend = backend_name(connection)
+    if backend == "fts5":
+        connection.execute(_fts.insert(), [{"rowid": p.id, **_document(p)} for p in projects])
+    elif backend == "postgres":
+        connection.execute(
+            text(
+                f"INSERT INTO {PG_TABLE} (project_id, document) "
+                f"SELECT id, {_pg_document_sql()} FROM aip_projects WHERE id IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"ids": [p.id for p in projects]},
+        )
+    else:
+        changes = db.info.setdefault("search_index_changes", {})
+        for project in projects:
+            changes[project.id] = _document(project)
+
+
+@event.listens_for(Project, "after_insert")
+def _project_inserted(mapper, connection: Connection, target: Project) -> None:
+    _write(connection, target)
+
+
+@event.listens_for(Project, "after_update")
+def _project_updated(mapper, connection: Connection, target: Project) -> None:
+    if any(attributes.get_history(target, field).has_changes() for field in FIELDS):
+        _write(connection, target)
+
+
+@event.listens_for(Project, "after_delete")
+def _project_deleted(mapper, connection: Connection, target: Project) -> None:
+    backend = backend_name(connection)
+    if backend == "fts5":
+        connection.execute(_fts.delete().where(_fts.c.rowid == target.id))
+    elif backend == "postgres":
+        connection.execute(_pg.delete().where(_pg.c.project_id == target.id))
+    else:
+        _queue_memory_change(target, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_memory_changes(session: Session) -> None:
+    changes = session.info.pop("search_index_changes", None)
+    if not changes or not memory_index.loaded:
+        return
+    for project_id, document in changes.items():
+        if document is None:
+            memory_index.remove(project_id)
+        else:
+            memory_index.add(project_id, document)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_memory_changes(session: Session) -> None:
+    session.info.pop("search_index_changes", None)
+
+
+def rebuild_index(db: Session) -> int:
+    """Re-index every project; returns the number indexed."""
+    connection = db.connection()
+    backend = backend_name(connection)
+    if backend == "fts5":
+        connection.execute(_fts.delete())
+        connection.execute(_fts.insert().from_select(
+            ["rowid", *FIELDS], select(Project.id, *(getattr(Project, f) for f in FIELDS))
+        ))
+    elif backend == "postgres":
+        connection.execute(_pg.delete())
+        connection.exec_driver_sql(
+            f"INSERT INTO {PG_TABLE} (project_id, document) SELECT id, {_pg_document_sql()} FROM aip_projects"
+        )
+    else:
+        rows = db.query(Project.id, *(getattr(Project, f) for f in FIELDS)).all()
+        with memory_index._lock:
+            memory_index.clear()
+            for row in rows:
+                memory_index.add(row.id, dict(zip(FIELDS, row[1:])))
+            memory_index.loaded = True
+        return len(rows)
+    db.commit()
+    return db.query(func.count(Project.id)).scalar()
+
+
+def ensure_index(db: Session) -> None:
+    """Rebuild the index if it is out of step with the projects table (e.g. after upgrading)."""
+    backend = backend_name(db.connection())
+    if backend == "memory":
+        if not memory_index.loaded:
+            rebuild_index(db)
+        return
+    index_table = _fts if backend == "fts5" else _pg
+    indexed = db.execute(select(func.count()).select_from(index_table)).scalar()
+    if indexed != db.query(func.count(Project.id)).scalar():
+        logger.info("Rebuilding project search index (%s)", backend)
+        rebuild_index(db)
+
+
+# Querying
+
+def _filtered_projects(filters: Dict[str, Any]):
+    query = select(Project.id)
+    for field in ("sector", "country", "verification_level", "status"):
+        if filters.get(field):
+            query = query.where(getattr(Project, field) == filters[field])
+    return query
+
+
+def search_projects(
+    db: Session,
+    query: str,
+    filters: Optional[Dict[str, Any]] = None,
+    offset: int = 0,
+    limit: int = 20,
+    with_highlights: bool = True,
+) -> Dict[str, Any]:
+    """
+    Ranked full-text search with optional exact-match filters.
+
+    Args:
+        db: Database session
+        query: User search text (see ``parse_query``)
+        filters: sector, country, verification_level and/or status
+        offset, limit: Page of results
+        with_highlights: Include marked-up snippets per matching field
+
+    Returns:
+        total, backend and hits of (project_id, score, highlights), best first
+
+    Raises:
+        ValueError: If the query contains no words
+    """
+    terms = parse_query(query)
+    filters = filters or {}
+    backend = backend_name(db.connection())
+
+    if backend == "memory":
+        ensure_index(db)
+        ranked = memory_index.search(terms)
+        if any(filters.values()) and ranked:
+            allowed = {row[0] for row in db.execute(_filtered_projects(filters))}
+            ranked = [(pid, score) for pid, score in ranked if pid in allowed]
+        total = len(ranked)
+        page = ranked[offset:offset + limit]
+    else:
+        candidates = _filtered_projects(filters)
+        if backend == "fts5":
+            match = " ".join(f'"{term}"' + ("*" if prefix else "") for term, prefix in terms)
+            # bm25() is lower-is-better; negate so higher scores rank first
+            score = -func.bm25(literal_column(FTS_TABLE), *(WEIGHTS[f] for f in FIELDS))
+            matching = (
+                select(_fts.c.rowid.label("project_id"), score.label("score"))
+                .where(text(f"{FTS_TABLE} MATCH :match").bindparams(match=match))
+                .where(_fts.c.rowid.in_(candidates))
+            )
+        else:
+            tsquery = func.to_tsquery(
+                "english", " & ".join(term + (":*" if prefix else "") for term, prefix in terms)
+            )
+            matching = (
+                select(_pg.c.project_id, func.ts_rank_cd(_pg.c.document, tsquery, 32).label("score"))
+                .where(_pg.c.document.op("@@")(tsquery))
+                .where(_pg.c.project_id.in_(candidates))
+            )
+        matching = matching.subquery()
+        total = db.execute(select(func.count()).select_from(matching)).scalar()
+        page = [
+            (row.project_id, float(row.score))
+            for row in db.execute(
+                select(matching).order_by(matching.c.score.desc(), matching.c.project_id)
+                .offset(offset).limit(limit)
+            )
+        ]
+
+    highlights: Dict[int, Dict[str, str]] = {}
+    if with_highlights and page:
+        rows = db.query(Project.id, *(getattr(Project, f) for f in FIELDS)).filter(
+            Project.id.in_([pid for pid, _ in page])
+        )
+        for row in rows:
+            marked = {f: highlight(value, terms) for f, value in zip(FIELDS, row[1:])}
+            highlights[row.id] = {f: snippet for f, snippet in marked.items() if snippet}
+
+    return {
+        "total": total,
+        "backend": backend,
+        "hits": [
+            {"project_id": pid, "score": round(score, 6), "highlights": highlights.get(pid, {})}
+            for pid, score in page
+        ],
+    }
@@ -0,0 +1,383 @@
+"""Monte Carlo financial simulation.
+
+Turns a project's point estimates in ``ProjectFinancials`` into IRR and NPV
+distributions. Uncertain inputs are declared in
+``assumptions_json["distributions"]``; every scenario's cash-flow series is
+built as one row of an (n_scenarios, n_years) matrix, so a 100k-scenario run is
+a handful of NumPy operations rather than a Python loop.
+
+Example ``assumptions_json``::
+
+    {
+        "annual_revenue_usd": 42000000,
+        "construction_years": 2,
+        "operating_years": 20,
+        "discount_rate_pct": 10,
+        "tariff_escalation_pct": 2,
+        "local_revenue_share": 0.6,
+        "distributions": {
+            "capex_multiplier": {"dist": "triangular", "low": 0.95, "mode": 1.0, "high": 1.4},
+            "tariff_change_pct": {"dist": "normal", "mean": 0, "std": 8},
+            "fx_depreciation_pct": {"dist": "normal", "mean": 6, "std": 4},
+            "construction_delay_years": {"dist": "discrete", "values": [0, 1, 2], "probs": [0.6, 0.3, 0.1]}
+        }
+    }
+
+Results are cached in-process by a hash of the inputs. Portfolio runs spread
+projects across a process pool.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.project import ProjectFinancials
+from app.utils import finance
+from app.utils.metrics import cache_requests
+
+# Simulated variables and their values when no distribution is declared
+VARIABLE_DEFAULTS: Dict[str, float] = {
+    "capex_multiplier": 1.0,
+    "opex_multiplier": 1.0,
+    "tariff_change_pct": 0.0,
+    "fx_depreciation_pct": 0.0,
+    "construction_delay_years": 0.0,
+}
+
+MAX_CONSTRUCTION_DELAY_YEARS = 10
+
+# Required parameters of each distribution kind
+DISTRIBUTION_PARAMS: Dict[str, Tuple[str, ...]] = {
+    "fixed": ("value",),
+    "normal": ("mean", "std"),
+    "lognormal": ("mean", "sigma"),
+    "uniform": ("low", "high"),
+    "triangular": ("low", "mode", "high"),
+    "discrete": ("values",),
+}
+
+_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _num(value, default: Optional[float] = None) -> Optional[float]:
+    if value is None:
+        return default
+    return float(value) if isinstance(value, (Decimal, int, float)) else default
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def check_distribution(name: str, spec: Any) -> None:
+    """
+    Validate one distribution declaration (see ``sample``).
+
+    Raises:
+        ValueError: Naming the variable, for a wrong type, unknown kind or missing/non-numeric parameter
+    """
+    if _is_number(spec):
+        return
+    if not isinstance(spec, dict):
+        raise ValueError(f"Distribution for {name} must be a number or an object")
+    kind = spec.get("dist", "fixed")
+    if kind not in DISTRIBUTION_PARAMS:
+        raise ValueError(f"Unknown distribution for {name}: {kind}")
+    missing = [key for key in DISTRIBUTION_PARAMS[kind] if key not in spec]
+    if missing:
+        raise ValueError(f"{kind} distribution for {name} needs {', '.join(missing)}")
+
+    if kind == "discrete":
+        values, probs = spec["values"], spec.get("probs")
+        if not isinstance(values, list) or not values or not all(_is_number(v) for v in values):
+            raise ValueError(f"values of {name} must be a non-empty list of numbers")
+        if probs is not None and (
+            not isinstance(probs, list) or len(probs) != len(values) or not all(_is_number(p) for p in probs)
+        ):
+            raise ValueError(f"probs of {name} must be a list of numbers, one per value")
+        numeric = [key for key in ("min", "max") if key in spec]
+    else:
+        numeric = [key for key in (*DISTRIBUTION_PARAMS[kind], "min", "max") if key in spec]
+    for key in numeric:
+        if not _is_number(spec[key]):
+            raise ValueError(f"{key} of {name} must be a number")
+
+
+def build_spec(financials: ProjectFinancials) -> Dict[str, Any]:
+    """
+    Extract the plain-data inputs for a simulation.
+
+    Raises:
+        ValueError: If capex or revenue cannot be determined, or the assumptions are malformed
+    """
+    if not isinstance(financials.assumptions_json or {}, dict):
+        raise ValueError("assumptions_json must be an object")
+    assumptions = dict(financials.assumptions_json or {})
+    capex = _num(financials.capex_usd)
+    if not capex:
+        raise ValueError("capex_usd is required for simulation")
+    opex = _num(financials.opex_usd_annual, 0.0)
+
+    revenue = _num(assumptions.get("annual_revenue_usd"))
+    if revenue is None:
+        payback = _num(financials.payback_years)
+        if not payback:
+            raise ValueError("assumptions_json.annual_revenue_usd or payback_years is required for simulation")
+        # Simple payback: capex recovered from net operating cash flow
+        revenue = capex / payback + opex
+
+    distributions = assumptions.get("distributions") or {}
+    if not isinstance(distributions, dict):
+        raise ValueError("assumptions_json.distributions must be an object")
+    for name, declaration in distributions.items():
+        check_distribution(name, declaration)
+
+    try:
+        return {
+            "project_id": financials.project_id,
+            "capex_usd": capex,
+            "opex_usd_annual": opex,
+            "annual_revenue_usd": revenue,
+            "construction_years": int(assumptions.get("construction_years", 2)),
+            "operating_years": int(assumptions.get("operating_years", 20)),
+            "discount_rate_pct": float(assumptions.get("discount_rate_pct", 10)),
+            "hurdle_rate_pct": float(assumptions.get("hurdle_rate_pct", assumptions.get("discount_rate_pct", 10))),
+            "tariff_escalation_pct": float(assumptions.get("tariff_escalation_pct", 0)),
+            "opex_escalation_pct": float(assumptions.get("opex_escalation_pct", 0)),
+            "local_revenue_share": float(assumptions.get("local_revenue_share", 0)),
+            "distributions": distributions,
+        }
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid number in assumptions_json: {e}")
+
+
+def spec_hash(spec: Dict[str, Any], n_scenarios: int) -> str:
+    canonical = json.dumps({"spec": spec, "n": n_scenarios}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def sample(spec: Any, n: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw n samples from a distribution declaration.
+
+    Supported: a plain number, or a dict with ``dist`` one of fixed(value),
+    normal(mean, std), lognormal(mean, sigma), uniform(low, high),
+    triangular(low, mode, high), discrete(values, probs). Optional ``min`` and
+    ``max`` clip the samples. ``build_spec`` has already run ``check_distribution``.
+    """
+    if isinstance(spec, (int, float)):
+        return np.full(n, float(spec))
+    kind = spec.get("dist", "fixed")
+    if kind == "fixed":
+        values = np.full(n, float(spec["value"]))
+    elif kind == "normal":
+        values = rng.normal(spec["mean"], spec["std"], n)
+    elif kind == "lognormal":
+        values = rng.lognormal(spec["mean"], spec["sigma"], n)
+    elif kind == "uniform":
+        values = rng.uniform(spec["low"], spec["high"], n)
+    elif kind == "triangular":
+        values = rng.triangular(spec["low"], spec["mode"], spec["high"], n)
+    elif kind == "discrete":
+        values = rng.choice(np.asarray(spec["values"], dtype=float), n, p=spec.get("probs"))
+    else:
+        raise ValueError(f"Unknown distribution: {kind}")
+    if "min" in spec or "max" in spec:
+        values = np.clip(values, spec.get("min", -np.inf), spec.get("max", np.inf))
+    return values
+
+
+def cash_flows(spec: Dict[str, Any], n: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Build one annual cash-flow series per scenario.
+
+    Returns:
+        Array of shape (n, construction_years + max_delay + operating_years)
+    """
+    unknown = set(spec["distributions"]) - set(VARIABLE_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown simulation variables: {sorted(unknown)}")
+    draws = {
+        name: sample(spec["distributions"].get(name, default), n, rng)
+        for name, default in VARIABLE_DEFAULTS.items()
+    }
+
+    build = max(spec["construction_years"], 1)
+    operating = spec["operating_years"]
+    delays = np.clip(np.rint(draws["construction_delay_years"]), 0, MAX_CONSTRUCTION_DELAY_YEARS).astype(int)
+    periods = build + int(delays.max()) + operating
+
+    flows = np.zeros((n, periods))
+    flows[:, :build] = -(spec["capex_usd"] * draws["capex_multiplier"] / build)[:, None]
+
+    year = np.arange(operating)[None, :]
+    share = spec["local_revenue_share"]
+    fx_factor = share * (1 + draws["fx_depreciation_pct"][:, None] / 100) ** -year + (1 - share)
+    revenue = (
+        spec["annual_revenue_usd"]
+        * (1 + draws["tariff_change_pct"][:, None] / 100)
+        * (1 + spec["tariff_escalation_pct"] / 100) ** year
+        * fx_factor
+    )
+    opex = (
+        spec["opex_usd_annual"]
+        * draws["opex_multiplier"][:, None]
+        * (1 + spec["opex_escalation_pct"] / 100) ** year
+    )
+    # Delays push the whole operating period back
+    np.put_along_axis(flows, build + delays[:, None] + year, revenue - opex, axis=1)
+    return flows
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, Optional[float]]:
+    finite = values[np.isfinite(values)]
+    if not finite.size:
+        return {"p10": None, "p50": None, "p90": None, "mean": None}
+    p10, p50, p90 = np.percentile(finite, [10, 50, 90])
+    return {"p10": float(p10), "p50": float(p50), "p90": float(p90), "mean": float(finite.mean())}
+
+
+def run_simulation(spec: Dict[str, Any], n_scenarios: int, seed: int) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    Simulate one project. Top-level so it can run in a worker process.
+
+    Returns:
+        (summary, per-scenario NPV array)
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    flows = cash_flows(spec, n_scenarios, rng)
+    npvs = finance.npv(flows, spec["discount_rate_pct"] / 100)
+    irrs = finance.irr(flows) * 100
+
+    summary = {
+        "project_id": spec["project_id"],
+        "n_scenarios": n_scenarios,
+        "irr_pct": _percentiles(irrs),
+        "npv_usd": _percentiles(npvs),
+        "prob_npv_negative": float((npvs < 0).mean()),
+        "prob_irr_below_hurdle": float((np.nan_to_num(irrs, nan=-np.inf) < spec["hurdle_rate_pct"]).mean()),
+        "irr_undefined_share": float(np.isnan(irrs).mean()),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    return summary, npvs
+
+
+def _cache_get(key: str) -> Optional[Dict[str, Any]]:
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            cache_requests.inc(cache="simulations", result="hit")
+            return _cache[key]
+    cache_requests.inc(cache="simulations", result="miss")
+    return None
+
+
+def _cache_put(key: str, value: Dict[str, Any]) -> None:
+    with _cache_lock:
+        _cache[key] = value
+        _cache.move_to_end(key)
+        while len(_cache) > settings.SIMULATION_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def simulate_project(
+    financials: ProjectFinancials,
+    n_scenarios: int = 100_000,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Simulate IRR/NPV distributions for a project, using the cache when possible.
+
+    The seed defaults to one derived from the inputs hash, so identical
+    assumptions always give identical (and cacheable) results.
+
+    Raises:
+        ValueError: For missing inputs or invalid distribution declarations
+    """
+    spec = build_spec(financials)
+    key = spec_hash(spec, n_scenarios)
+    if seed is not None:
+        key = f"{key}:{seed}"
+
+    cached = _cache_get(key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    summary, _ = run_simulation(spec, n_scenarios, seed if seed is not None else int(key[:8], 16))
+    summary["assumptions_hash"] = key
+    _cache_put(key, summary)
+    return {**summary, "cached": False}
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Shared process pool for portfolio runs."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.SIMULATION_PROCESS_WORKERS or os.cpu_count())
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def simulate_portfolio(
+    financials_list: List[ProjectFinancials],
+    n_scenarios: int = 20_000,
+    use_processes: bool = True,
+) -> Dict[str, Any]:
+    """
+    Simulate several projects and the portfolio's combined NPV.
+
+    Projects are independent, so each is simulated in its own worker process
+    and scenario i of the portfolio is the sum of scenario i of every project.
+
+    Raises:
+        ValueError: For missing inputs or invalid distribution declarations
+    """
+    started = time.perf_counter()
+    specs = []
+    for financials in financials_list:
+        try:
+            specs.append(build_spec(financials))
+        except ValueError as e:
+            raise ValueError(f"Project {financials.project_id}: {e}")
+    seeds = [int(spec_hash(spec, n_scenarios)[:8], 16) for spec in specs]
+
+    if use_processes and len(specs) > 1:
+        pool = get_pool()
+        futures = [pool.submit(run_simulation, spec, n_scenarios, seed) for spec, seed in zip(specs, seeds)]
+        outcomes = [future.result() for future in futures]
+    else:
+        outcomes = [run_simulation(spec, n_scenarios, seed) for spec, seed in zip(specs, seeds)]
+
+    portfolio_npv = np.sum([npvs for _, npvs in outcomes], axis=0) if outcomes else np.zeros(0)
+    return {
+        "n_scenarios": n_scenarios,
+        "projects": [summary for summary, _ in outcomes],
+        "portfolio_npv_usd": _percentiles(portfolio_npv),
+        "prob_portfolio_npv_negative": float((portfolio_npv < 0).mean()) if portfolio_npv.size else None,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -0,0 +1,283 @@
+"""Typeahead suggestions for project and organization names.
+
+Names are normalised (lower case, accents and punctuation stripped) and every
+word-suffix of a name is kept in one sorted list, so "sol" finds both
+"Solar Park" and "Lagos Solar Farm" with a ``bisect`` instead of a
+``LIKE '%sol%'`` scan. When a query word is not a known word (or word prefix)
+it is corrected to the closest vocabulary word by trigram similarity and the
+prefix lookup is repeated, which catches most single typos.
+
+The index lives in process memory. It is built at startup (or on first use)
+and kept current by ORM events on ``Project`` and ``Organization``, applied
+when the writing session commits; ``projects_inserted`` covers bulk inserts.
+"""
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes, object_session
+
+from app.models.organization import Organization
+from app.models.project import Project
+
+KINDS = ("project", "organization")
+_MODELS = {"project": Project, "organization": Organization}
+
+MIN_SIMILARITY = 0.4
+# Prefix matches examined per query before ranking
+SCAN_LIMIT = 200
+
+EntryKey = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class Entry:
+    kind: str
+    id: int
+    name: str
+    normalized: str
+
+
+def normalize(value: Optional[str]) -> str:
+    """Lower-case, strip accents and reduce punctuation to single spaces."""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    cleaned = "".join(
+        c if c.isalnum() else " " for c in decomposed.lower() if not unicodedata.combining(c)
+    )
+    return " ".join(cleaned.split())
+
+
+def trigrams(word: str) -> Set[str]:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """Dice coefficient of two words' trigram sets."""
+    ta, tb = trigrams(a), trigrams(b)
+    return 2 * len(ta & tb) / (len(ta) + len(tb))
+
+
+class SuggestIndex:
+    """Sorted word-suffix keys for prefix lookups plus a trigram index over the vocabulary."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.loaded = False
+            self._entries: Dict[EntryKey, Entry] = {}
+            self._keys: List[Tuple[str, str, int]] = []
+            self._words: Counter = Counter()
+            self._word_trigrams: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _suffixes(normalized: str) -> List[str]:
+        words = normalized.split()
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def add(self, kind: str, entity_id: int, name: Optional[str]) -> None:
+        with self._lock:
+            self.remove(kind, entity_id)
+            normalized = normalize(name)
+            if not normalized:
+                return
+            self._entries[(kind, entity_id)] = Entry(kind, entity_id, name, normalized)
+            for suffix in self._suffixes(normalized):
+                insort(self._keys, (suffix, kind, entity_id))
+            for word in normalized.split():
+                if not self._words[word]:
+                    for gram in trigrams(word):
+                        self._word_trigrams.setdefault(gram, set()).add(word)
+                self._words[word] += 1
+
+    def remove(self, kind: str, entity_id: int) -> None:
+        with self._lock:
+            entry = self._entries.pop((kind, entity_id), None)
+            if entry is None:
+                return
+            for suffix in self._suffixes(entry.normalized):
+                i = bisect_left(self._keys, (suffix, kind, entity_id))
+                if i < len(self._keys) and self._keys[i] == (suffix, kind, entity_id):
+                    del self._keys[i]
+            for word in entry.normalized.split():
+                self._words[word] -= 1
+                if not self._words[word]:
+                    del self._words[word]
+                    for gram in trigrams(word):
+                        words = self._word_trigrams.get(gram)
+                        if words is not None:
+                            words.discard(word)
+                            if not words:
+                                del self._word_trigrams[gram]
+
+    def bulk_load(self, items: Iterable[Tuple[str, int, Optional[str]]]) -> None:
+        """Replace the index contents in one pass (sorting once instead of per insert)."""
+        with self._lock:
+            self.clear()
+            keys = []
+            for kind, entity_id, name in items:
+                normalized = normalize(name)
+                if not normalized:
+                    continue
+                self._entries[(kind, entity_id)] = Entry(kind, entity_id, name, normalized)
+                keys.extend((suffix, kind, entity_id) for suffix in self._suffixes(normalized))
+                self._words.update(normalized.split())
+            keys.sort()
+            self._keys = keys
+            for word in self._words:
+                for gram in trigrams(word):
+                    self._word_trigrams.setdefault(gram, set()).add(word)
+            self.loaded = True
+
+    def _has_prefix(self, prefix: str) -> bool:
+        i = bisect_left(self._keys, (prefix,))
+        return i < len(self._keys) and self._keys[i][0].startswith(prefix)
+
+    def _closest_word(self, word: str, prefix: bool) -> Optional[str]:
+        counts: Counter = Counter()
+        for gram in trigrams(word):
+            counts.update(self._word_trigrams.get(gram, ()))
+        best, best_key = None, (MIN_SIMILARITY, 0)
+        # Only words sharing the most trigrams can be close; skip the long tail
+        for candidate, _ in counts.most_common(50):
+            # Compare a prefix query against the same length of the candidate
+            target = candidate[:len(word) + 1] if prefix else candidate
+            key = (similarity(word, target), self._words[candidate])
+            if key > best_key:
+                best, best_key = candidate, key
+        return best
+
+    def _correct(self, query: str) -> Optional[str]:
+        """Query with unknown words replaced by their closest vocabulary word, or None."""
+        words = query.split()
+        corrected = []
+        for i, word in enumerate(words):
+            last = i == len(words) - 1
+            known = self._has_prefix(word) if last else word in self._words
+            if known or len(word) < 3:
+                corrected.append(word)
+                continue
+            replacement = self._closest_word(word, prefix=last)
+            if replacement is None:
+                return None
+            corrected.append(replacement)
+        result = " ".join(corrected)
+        return result if result != query else None
+
+    def _prefix_matches(self, query: str, kinds: Sequence[str], exclude: Set[EntryKey]) -> List[Tuple[Entry, int]]:
+        found: Dict[EntryKey, int] = {}
+        i = bisect_left(self._keys, (query,))
+        while i < len(self._keys) and len(found) < SCAN_LIMIT:
+            suffix, kind, entity_id = self._keys[i]
+            if not suffix.startswith(query):
+                break
+            key = (kind, entity_id)
+            if kind in kinds and key not in exclude:
+                entry = self._entries[key]
+                # 0 = the name itself starts with the query, 1 = a later word does
+                rank = 0 if len(suffix) == len(entry.normalized) else 1
+                found[key] = min(found.get(key, rank), rank)
+            i += 1
+        return [(self._entries[key], rank) for key, rank in found.items()]
+
+    def suggest(self, query: str, kinds: Sequence[str] = KINDS, limit: int = 10) -> List[Dict[str, object]]:
+        """
+        Best completions for a partial name, prefix matches before typo corrections.
+
+        Returns:
+            Dicts of type, id, name and match ("prefix" or "fuzzy")
+        """
+        normalized = normalize(query)
+        if not normalized:
+            return []
+        with self._lock:
+            ranked = sorted(
+                self._prefix_matches(normalized, kinds, set()),
+                key=lambda m: (m[1], len(m[0].normalized), m[0].normalized, m[0].id),
+            )
+            results = [(entry, "prefix") for entry, _ in ranked[:limit]]
+            if len(results) < limit:
+                corrected = self._correct(normalized)
+                if corrected:
+                    seen = {(e.kind, e.id) for e, _ in results}
+                    fuzzy = sorted(
+                        self._prefix_matches(corrected, kinds, seen),
+                        key=lambda m: (m[1], len(m[0].normalized), m[0].normalized, m[0].id),
+                    )
+                    results.extend((entry, "fuzzy") for entry, _ in fuzzy[:limit - len(results)])
+        return [{"type": e.kind, "id": e.id, "name": e.name, "match": match} for e, match in results]
+
+
+suggest_index = SuggestIndex()
+
+
+def build_index(db: Session) -> int:
+    """Load every project and organization name; returns the entry count."""
+    items = [("project", row.id, row.name) for row in db.query(Project.id, Project.name)]
+    items += [("organization", row.id, row.name) for row in db.query(Organization.id, Organization.name)]
+    suggest_index.bulk_load(items)
+    return len(suggest_index)
+
+
+def ensure_index(db: Session) -> None:
+    if not suggest_index.loaded:
+        build_index(db)
+
+
+def _queue(target, kind: str, name: Optional[str]) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("suggest_changes", {})[(kind, target.id)] = name
+
+
+def projects_inserted(db: Session, projects: Iterable[Any]) -> None:
+    """Add projects inserted with a bulk ``insert()`` once the session commits."""
+    changes = db.info.setdefault("suggest_changes", {})
+    for project in projects:
+        changes[("project", project.id)] = project.name
+
+
+def _register(kind: str, model) -> None:
+    @event.listens_for(model, "after_insert")
+    def _inserted(mapper, connection, target):
+        _queue(target, kind, target.name)
+
+    @event.listens_for(model, "after_update")
+    def _updated(mapper, connection, target):
+        if attributes.get_history(target, "name").has_changes():
+            _queue(target, kind, target.name)
+
+    @event.listens_for(model, "after_delete")
+    def _deleted(mapper, connection, target):
+        _queue(target, kind, None)
+
+
+for _kind, _model in _MODELS.items():
+    _register(_kind, _model)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session) -> None:
+    changes = session.info.pop("suggest_changes", None)
+    if not changes or not suggest_index.loaded:
+        return
+    for (kind, entity_id), name in changes.items():
+        if name is None:
+            suggest_index.remove(kind, entity_id)
+        else:
+            suggest_index.add(kind, entity_id, name)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop("suggest_changes", None)
@@ -0,0 +1,202 @@
+"""Precomputed project map tiles.
+
+Each web-mercator tile ``z/x/y`` holds the located projects inside it,
+clustered on a 64x64 grid and written as compact JSON: every feature is
+``[x, y, count, project_id, status]`` in tile-local units of a 4096 extent,
+with ``project_id`` and ``status`` set only for single-project features.
+Tiles are stored in ``map_tiles`` with an ETag so repeat requests are a
+primary-key read (or a 304), never a spatial query.
+
+ORM events on ``Project`` delete the cached tiles containing a project's old
+and new position, at every zoom, when its coordinates or status change; the
+next request for such a tile rebuilds it (``projects_inserted`` does the same
+for bulk inserts, which skip the events). ``precompute_tiles`` renders the low
+zooms for the whole catalogue in one pass and is run at startup.
+"""
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import and_, delete, event, or_, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, attributes
+
+from app.core.config import settings
+from app.models.geo import MapTile, ProjectLocation
+from app.models.project import Project
+from app.services import geo_service
+from app.utils import geo
+from app.utils.metrics import cache_requests
+
+EXTENT = 4096
+GRID = 64  # cluster buckets per tile side
+
+TileKey = Tuple[int, int, int]
+
+
+def tile_exists(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= settings.MAP_TILE_MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def _features(z: int, x: int, y: int, ids, mx, my, statuses) -> List[List[Any]]:
+    n = 2 ** z
+    px = np.clip(((mx * n - x) * EXTENT).astype(np.int64), 0, EXTENT - 1)
+    py = np.clip(((my * n - y) * EXTENT).astype(np.int64), 0, EXTENT - 1)
+    cell = EXTENT // GRID
+    buckets = (py // cell) * GRID + px // cell
+    order = np.argsort(buckets, kind="stable")
+    _, starts, counts = np.unique(buckets[order], return_index=True, return_counts=True)
+
+    features = []
+    for start, count in zip(starts.tolist(), counts.tolist()):
+        members = order[start:start + count]
+        fx, fy = int(px[members].mean()), int(py[members].mean())
+        if count == 1:
+            i = int(members[0])
+            features.append([fx, fy, 1, int(ids[i]), statuses[i]])
+        else:
+            features.append([fx, fy, count, None, None])
+    features.sort(key=lambda f: (-f[2], f[1], f[0]))
+    return features
+
+
+def _render(z: int, x: int, y: int, features: List[List[Any]]) -> Dict[str, Any]:
+    payload = json.dumps(
+        {"z": z, "x": x, "y": y, "extent": EXTENT, "features": features}, separators=(",", ":")
+    )
+    return {
+        "z": z,
+        "x": x,
+        "y": y,
+        "payload": payload,
+        "etag": hashlib.sha1(payload.encode()).hexdigest()[:16],
+    }
+
+
+def _load_points(db: Session, bbox: Optional[geo.BBox] = None):
+    query = select(
+        ProjectLocation.project_id, ProjectLocation.latitude, ProjectLocation.longitude, Project.status
+    ).join(Project, Project.id == ProjectLocation.project_id)
+    if bbox is not None:
+        query = query.where(geo_service.bbox_condition(bbox))
+    rows = db.execute(query).all()
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    mx, my = geo.mercator([r[1] for r in rows], [r[2] for r in rows])
+    return ids, mx, my, [r[3] for r in rows]
+
+
+def build_tile(db: Session, z: int, x: int, y: int) -> Dict[str, Any]:
+    """Render one tile from the location index."""
+    n = 2 ** z
+    south, west, north, east = geo.tile_bounds(z, x, y)
+    # Edge rows also hold the points beyond the mercator latitude limit
+    bbox = (-90.0 if y == n - 1 else south, west, 90.0 if y == 0 else north, east)
+    ids, mx, my, statuses = _load_points(db, bbox)
+    inside = ((mx * n).astype(np.int64) == x) & ((my * n).astype(np.int64) == y)
+    idx = np.flatnonzero(inside)
+    return _render(z, x, y, _features(z, x, y, ids[idx], mx[idx], my[idx], [statuses[i] for i in idx]))
+
+
+def get_tile(db: Session, z: int, x: int, y: int) -> MapTile:
+    """Cached tile, built and stored on a miss."""
+    tile = db.get(MapTile, (z, x, y))
+    cache_requests.inc(cache="tiles", result="miss" if tile is None else "hit")
+    if tile is not None:
+        return tile
+    tile = MapTile(**build_tile(db, z, x, y))
+    db.add(tile)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request stored it first
+        db.rollback()
+        tile = db.get(MapTile, (z, x, y))
+    return tile
+
+
+def precompute_tiles(db: Session, max_zoom: int) -> int:
+    """
+    Drop every cached tile and render all non-empty tiles up to `max_zoom`.
+
+    Returns:
+        Number of tiles stored
+    """
+    ids, mx, my, statuses = _load_points(db)
+    statuses = np.asarray(statuses, dtype=object)
+    rows = []
+    for z in range(min(max_zoom, settings.MAP_TILE_MAX_ZOOM) + 1):
+        n = 2 ** z
+        keys = (mx * n).astype(np.int64) * n + (my * n).astype(np.int64)
+        order = np.argsort(keys, kind="stable")
+        unique, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+        for key, start, count in zip(unique.tolist(), starts.tolist(), counts.tolist()):
+            x, y = divmod(key, n)
+            idx = order[start:start + count]
+            rows.append(_render(z, x, y, _features(z, x, y, ids[idx], mx[idx], my[idx], statuses[idx].tolist())))
+    db.execute(delete(MapTile))
+    if rows:
+        db.execute(MapTile.__table__.insert(), rows)
+    db.commit()
+    return len(rows)
+
+
+def tiles_for(points: Iterable[Tuple[float, float]]) -> Set[TileKey]:
+    """Keys of the tiles containing each point, at every served zoom."""
+    points = list(points)
+    if not points:
+        return set()
+    mx, my = geo.mercator([p[0] for p in points], [p[1] for p in points])
+    keys = set()
+    for z in range(settings.MAP_TILE_MAX_ZOOM + 1):
+        n = 2 ** z
+        keys.update(zip([z] * len(points), (mx * n).astype(np.int64).tolist(), (my * n).astype(np.int64).tolist()))
+    return keys
+
+
+def _invalidate(connection: Connection, points: Iterable[Tuple[Any, Any]]) -> None:
+    located = [(float(lat), float(lon)) for lat, lon in points if lat is not None and lon is not None]
+    keys = tiles_for(located)
+    if keys:
+        connection.execute(delete(MapTile).where(or_(*(
+            and_(MapTile.z == z, MapTile.x == x, MapTile.y == y) for z, x, y in keys
+        ))))
+
+
+def _previous(target: Project, field: str):
+    history = attributes.get_history(target, field)
+    return history.deleted[0] if history.deleted else getattr(target, field)
+
+
+def _keep_previous(target, value, oldvalue, initiator):
+    return value
+
+
+# Load the old value on assignment to an expired instance, so the tile it left is known
+for _field in ("latitude", "longitude"):
+    event.listen(getattr(Project, _field), "set", _keep_previous, active_history=True, retval=True)
+
+
+def projects_inserted(db: Session, projects: Iterable[Any]) -> None:
+    """Drop the cached tiles covering projects inserted with a bulk ``insert()``."""
+    _invalidate(db.connection(), [(p.latitude, p.longitude) for p in projects])
+
+
+@event.listens_for(Project, "after_insert")
+def _project_inserted(mapper, connection: Connection, target: Project) -> None:
+    _invalidate(connection, [(target.latitude, target.longitude)])
+
+
+@event.listens_for(Project, "after_update")
+def _project_updated(mapper, connection: Connection, target: Project) -> None:
+    if any(attributes.get_history(target, f).has_changes() for f in ("latitude", "longitude", "status")):
+        _invalidate(connection, [
+            (_previous(target, "latitude"), _previous(target, "longitude")),
+            (target.latitude, target.longitude),
+        ])
+
+
+@event.listens_for(Project, "after_delete")
+def _project_deleted(mapper, connection: Connection, target: Project) -> None:
+    _invalidate(connection, [(target.latitude, target.longitude)])
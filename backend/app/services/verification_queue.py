@@ -0,0 +1,302 @@
+"""Verifier work queue.
+
+Pending, unassigned verification requests form a queue ordered by a priority
+computed in SQL from the request's age, its target level and the sponsor's
+tier. Verifiers claim the head of the queue atomically:
+
+- PostgreSQL: ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent verifiers
+  each lock a different row instead of blocking on the same one.
+- SQLite (and anything else): a compare-and-set ``UPDATE ... WHERE
+  assigned_to IS NULL AND status = 'pending'``; SQLite serializes writers, so
+  exactly one claimant sees ``rowcount == 1`` and the others move on to the
+  next candidate.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, literal, select, update
+from sqlalchemy.orm import Session, aliased
+
+from app.models.project import Project
+from app.models.verification import VerificationRequest, VerificationEvent
+
+# Priority points per hour spent waiting
+AGE_WEIGHT_PER_HOUR = 1.0
+
+# Requests for higher levels unlock investment, so they jump the queue a little
+LEVEL_WEIGHTS: Dict[str, float] = {"V1": 0, "V2": 8, "V3": 16, "V4": 24, "V5": 32}
+
+# Sponsor tier is derived from the best verification level among the sponsor's projects
+SPONSOR_TIER_WEIGHTS: Dict[str, float] = {"premier": 24, "established": 12, "standard": 0}
+
+# How many candidates a SQLite claimant tries before re-reading the queue
+CLAIM_BATCH_SIZE = 10
+MAX_CLAIM_ROUNDS = 5
+
+_SponsorProject = aliased(Project)
+
+
+def _age_hours(dialect_name: str):
+    """SQL expression for how long a request has been waiting, in hours."""
+    created_at = VerificationRequest.created_at
+    if dialect_name == "sqlite":
+        return (func.julianday("now") - func.julianday(created_at)) * 24.0
+    if dialect_name == "postgresql":
+        return func.extract("epoch", func.timezone("utc", func.now()) - created_at) / 3600.0
+    return literal(0.0)
+
+
+def _sponsor_best_level():
+    """Correlated subquery: best verification level among the sponsor's projects."""
+    return (
+        select(func.max(_SponsorProject.verification_level))
+        .where(_SponsorProject.sponsor_org_id == Project.sponsor_org_id)
+        .correlate(Project)
+        .scalar_subquery()
+    )
+
+
+def _sponsor_tier(best_level):
+    return case(
+        (best_level >= "V3", literal("premier")),
+        (best_level >= "V1", literal("established")),
+        else_=literal("standard"),
+    )
+
+
+def priority_columns(dialect_name: str) -> Dict[str, Any]:
+    """SQL expressions for age, sponsor tier and overall priority."""
+    age = _age_hours(dialect_name)
+    tier = _sponsor_tier(_sponsor_best_level())
+    level_weight = case(LEVEL_WEIGHTS, value=VerificationRequest.to_level, else_=0)
+    tier_weight = case(SPONSOR_TIER_WEIGHTS, value=tier, else_=0)
+    return {
+        "age_hours": age,
+        "sponsor_tier": tier,
+        "priority": age * AGE_WEIGHT_PER_HOUR + level_weight + tier_weight,
+    }
+
+
+def _queue_select(dialect_name: str, to_level: Optional[str] = None):
+    columns = priority_columns(dialect_name)
+    stmt = (
+        select(
+            VerificationRequest.id,
+            columns["priority"].label("priority"),
+            columns["age_hours"].label("age_hours"),
+            columns["sponsor_tier"].label("sponsor_tier"),
+        )
+        .join(Project, Project.id == VerificationRequest.project_id)
+        .where(
+            VerificationRequest.status == "pending",
+            VerificationRequest.assigned_to.is_(None),
+        )
+        .order_by(columns["priority"].desc(), VerificationRequest.created_at, VerificationRequest.id)
+    )
+    if to_level:
+        stmt = stmt.where(VerificationRequest.to_level == to_level)
+    return stmt
+
+
+def peek_queue(db: Session, limit: int = 50, to_level: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    List the head of the queue without claiming anything.
+
+    Returns:
+        Dicts with the request, its priority, age in hours and sponsor tier
+    """
+    dialect_name = db.get_bind().dialect.name
+    rows = db.execute(_queue_select(dialect_name, to_level).limit(limit)).all()
+    requests = {
+        r.id: r for r in db.query(VerificationRequest).filter(
+            VerificationRequest.id.in_([row.id for row in rows])
+        ).all()
+    } if rows else {}
+    return [
+        {
+            "request": requests[row.id],
+            "priority": round(float(row.priority or 0), 2),
+            "age_hours": round(float(row.age_hours or 0), 2),
+            "sponsor_tier": row.sponsor_tier,
+        }
+        for row in rows
+    ]
+
+
+def claim_next(
+    db: Session,
+    verifier_id: int,
+    verifier_org_id: Optional[int] = None,
+    to_level: Optional[str] = None,
+) -> Optional[VerificationRequest]:
+    """
+    Atomically assign the highest-priority pending request to a verifier.
+
+    Args:
+        db: Database session
+        verifier_id: User claiming the request
+        verifier_org_id: The verifier's organization, recorded as assigned_org_id
+        to_level: Only claim requests for this target level
+
+    Returns:
+        The claimed request, or None if the queue is empty
+    """
+    dialect_name = db.get_bind().dialect.name
+    claimed_id = None
+    priority = None
+
+    if dialect_name == "postgresql":
+        stmt = (
+            _queue_select(dialect_name, to_level)
+            .limit(1)
+            .with_for_update(skip_locked=True, of=VerificationRequest)
+        )
+        row = db.execute(stmt).first()
+        if row is not None:
+            db.execute(
+                update(VerificationRequest)
+                .where(VerificationRequest.id == row.id)
+                .values(
+                    assigned_to=verifier_id,
+                    assigned_org_id=verifier_org_id,
+                    status="in_review",
+                    updated_at=datetime.utcnow(),
+                )
+            )
+            claimed_id, priority = row.id, row.priority
+    else:
+        for _ in range(MAX_CLAIM_ROUNDS):
+            rows = db.execute(_queue_select(dialect_name, to_level).limit(CLAIM_BATCH_SIZE)).all()
+            if not rows:
+                break
+            for row in rows:
+                result = db.execute(
+                    update(VerificationRequest)
+                    .where(
+                        VerificationRequest.id == row.id,
+                        VerificationRequest.status == "pending",
+                        VerificationRequest.assigned_to.is_(None),
+                    )
+                    .values(
+                        assigned_to=verifier_id,
+                        assigned_org_id=verifier_org_id,
+                        status="in_review",
+                        updated_at=datetime.utcnow(),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 1:
+                    claimed_id, priority = row.id, row.priority
+                    break
+            if claimed_id is not None:
+                break
+
+    if claimed_id is None:
+        db.rollback()
+        return None
+
+    verification = db.query(VerificationRequest).filter(
+        VerificationRequest.id == claimed_id
+    ).populate_existing().first()
+    queued_seconds = (datetime.utcnow() - verification.created_at).total_seconds()
+    db.add(VerificationEvent(
+        request_id=claimed_id,
+        event_type="assigned",
+        description=f"Claimed from queue by user {verifier_id}",
+        metadata_json={
+            "queued_seconds": round(queued_seconds, 1),
+            "priority": round(float(priority or 0), 2),
+            "assigned_org_id": verifier_org_id,
+        },
+        created_by=verifier_id,
+    ))
+    db.commit()
+    db.refresh(verification)
+    return verification
+
+
+def release(db: Session, verification: VerificationRequest, user_id: int) -> VerificationRequest:
+    """Return a claimed request to the queue."""
+    verification.assigned_to = None
+    verification.assigned_org_id = None
+    verification.status = "pending"
+    db.add(VerificationEvent(
+        request_id=verification.id,
+        event_type="released",
+        description=f"Released back to queue by user {user_id}",
+        created_by=user_id,
+    ))
+    db.commit()
+    db.refresh(verification)
+    return verification
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def queue_metrics(db: Session, window_days: int = 7) -> Dict[str, Any]:
+    """
+    Queue depth and time-in-queue statistics.
+
+    Args:
+        db: Database session
+        window_days: Look-back window for time-to-claim statistics
+
+    Returns:
+        Depth per target level, waiting-time stats for queued requests and
+        time-to-claim stats for requests claimed within the window
+    """
+    now = datetime.utcnow()
+
+    depth_rows = db.query(
+        VerificationRequest.to_level, func.count(VerificationRequest.id)
+    ).filter(
+        VerificationRequest.status == "pending",
+        VerificationRequest.assigned_to.is_(None),
+    ).group_by(VerificationRequest.to_level).all()
+    depth = {level: count for level, count in depth_rows}
+
+    waiting = sorted(
+        (now - created_at).total_seconds()
+        for (created_at,) in db.query(VerificationRequest.created_at).filter(
+            VerificationRequest.status == "pending",
+            VerificationRequest.assigned_to.is_(None),
+        ).all()
+    )
+
+    claimed = sorted(
+        float((event.metadata_json or {}).get("queued_seconds", 0))
+        for event in db.query(VerificationEvent).filter(
+            VerificationEvent.event_type == "assigned",
+            VerificationEvent.created_at >= now - timedelta(days=window_days),
+        ).all()
+    )
+
+    in_review = db.query(func.count(VerificationRequest.id)).filter(
+        VerificationRequest.status == "in_review"
+    ).scalar()
+
+    return {
+        "depth": sum(depth.values()),
+        "depth_by_level": depth,
+        "in_review": in_review or 0,
+        "waiting_seconds": {
+            "oldest": waiting[-1] if waiting else None,
+            "mean": sum(waiting) / len(waiting) if waiting else None,
+            "p50": _percentile(waiting, 0.5),
+            "p90": _percentile(waiting, 0.9),
+        },
+        "time_to_claim_seconds": {
+            "window_days": window_days,
+            "claimed": len(claimed),
+            "mean": sum(claimed) / len(claimed) if claimed else None,
+            "p50": _percentile(claimed, 0.5),
+            "p90": _percentile(claimed, 0.9),
+        },
+    }
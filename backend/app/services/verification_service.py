@@ -0,0 +1,606 @@
+"""Automated verification checks.
+
+Checks are plug-ins registered with ``register_check``. When a verification
+request is created the applicable checks run concurrently on a shared worker
+pool against a read-only snapshot of the project (``CheckContext``), so they
+never touch the database session. Results are written back in one batch
+together with their ``VerificationEvent`` rows.
+
+Python threads cannot be killed, so a check's timeout is also handed to the
+check: ``ctx.remaining()`` is the time left before its deadline, and checks
+that do I/O must bound every call by it. A check still running after its
+deadline is logged and counted in ``verification_checks_overrun_total``.
+Once half the pool's workers are stuck in such checks, later runs get a
+fresh pool.
+"""
+import copy
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Type
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.document import Document, DocumentVersion
+from app.models.organization import Organization, OrgMember
+from app.models.project import Project, ProjectFinancials
+from app.models.user import User
+from app.models.verification import VerificationRequest, VerificationCheck, VerificationEvent
+from app.services.job_service import job_handler
+from app.utils.metrics import Counter, registry
+
+logger = logging.getLogger(__name__)
+
+checks_overrun = registry.register(Counter(
+    "verification_checks_overrun_total",
+    "Automated checks still running after their timeout, holding a pool worker.", ("check_type",),
+))
+
+AUTOMATION_SOURCE = "aip-auto-checks/1.0"
+
+LEVELS = ["V0", "V1", "V2", "V3", "V4", "V5"]
+
+# Document types that must be present to reach a level (cumulative)
+REQUIRED_DOCUMENT_TYPES: Dict[str, List[str]] = {
+    "V2": ["feasibility_study", "license", "financial_model"],
+    "V3": ["ppa", "esia"],
+    "V4": ["epc_contract", "land_title"],
+}
+
+# Document types a complete data room is expected to cover (cumulative)
+RECOMMENDED_DOCUMENT_TYPES: Dict[str, List[str]] = {
+    "V2": ["feasibility_study", "license", "financial_model", "technical_design", "permit"],
+    "V3": ["ppa", "esia", "insurance", "legal_opinion"],
+    "V4": ["epc_contract", "land_title", "om_contract"],
+}
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+_SDG_RE = re.compile(r"^(?:SDG\s*)?(\d{1,2})$", re.IGNORECASE)
+
+
+def _level_index(level: str) -> int:
+    return LEVELS.index(level) if level in LEVELS else 0
+
+
+def _cumulative(mapping: Dict[str, List[str]], to_level: str) -> List[str]:
+    """Collect the entries of all levels up to and including to_level."""
+    result: List[str] = []
+    for level, values in mapping.items():
+        if _level_index(level) <= _level_index(to_level):
+            result.extend(v for v in values if v not in result)
+    return result
+
+
+class CheckResult(NamedTuple):
+    """Outcome of a single automated check."""
+    status: str  # passed, failed, skipped, pending
+    score: Optional[int] = None
+    notes: Optional[str] = None
+    evidence: Optional[Dict[str, Any]] = None
+
+
+class CheckContext:
+    """
+    Read-only snapshot of everything the checks need.
+
+    Built with a handful of queries before the checks start, so checks can
+    run in worker threads without sharing the request's database session.
+    """
+
+    def __init__(
+        self,
+        request_id: int,
+        to_level: str,
+        project: Dict[str, Any],
+        organization: Optional[Dict[str, Any]],
+        owners: List[Dict[str, Any]],
+        documents: List[Dict[str, Any]],
+        financials: Optional[Dict[str, Any]],
+    ):
+        self.request_id = request_id
+        self.to_level = to_level
+        self.project = project
+        self.organization = organization
+        self.owners = owners
+        self.documents = documents
+        self.financials = financials
+        # time.perf_counter() value by which the running check must finish
+        self.deadline: Optional[float] = None
+
+    def with_deadline(self, deadline: float) -> "CheckContext":
+        """Copy of the snapshot carrying one check's deadline (the data is shared, not copied)."""
+        ctx = copy.copy(self)
+        ctx.deadline = deadline
+        return ctx
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the check's deadline (never negative), or None without one."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.perf_counter(), 0.0)
+
+    @classmethod
+    def load(cls, db: Session, verification: VerificationRequest) -> "CheckContext":
+        """Snapshot the project behind a verification request."""
+        project = db.query(Project).filter(Project.id == verification.project_id).first()
+        org = db.query(Organization).filter(Organization.id == project.sponsor_org_id).first()
+        owners = db.query(User).join(OrgMember, OrgMember.user_id == User.id).filter(
+            OrgMember.org_id == project.sponsor_org_id,
+            OrgMember.is_owner.is_(True),
+        ).all()
+        documents = db.query(Document).filter(Document.project_id == project.id).all()
+
+        # Latest version hash per document, in one query
+        latest_hashes: Dict[int, Optional[str]] = {}
+        latest_numbers: Dict[int, int] = {}
+        if documents:
+            versions = db.query(
+                DocumentVersion.document_id,
+                DocumentVersion.version_number,
+                DocumentVersion.sha256_hash,
+            ).filter(DocumentVersion.document_id.in_([d.id for d in documents])).all()
+            for document_id, number, sha in versions:
+                if number >= latest_numbers.get(document_id, -1):
+                    latest_numbers[document_id] = number
+                    latest_hashes[document_id] = sha
+
+        financials = db.query(ProjectFinancials).filter(
+            ProjectFinancials.project_id == project.id
+        ).first()
+
+        return cls(
+            request_id=verification.id,
+            to_level=verification.to_level,
+            project={
+                "id": project.id,
+                "name": project.name,
+                "sector": project.sector,
+                "country": project.country,
+                "summary": project.summary,
+                "impact_statement": project.impact_statement,
+                "sdg_tags": project.sdg_tags,
+                "investment_usd": project.investment_usd,
+            },
+            organization={
+                "id": org.id,
+                "name": org.name,
+                "org_type": org.org_type,
+                "country_code": org.country_code,
+                "registration_no": org.registration_no,
+                "website": org.website,
+                "address": org.address,
+            } if org else None,
+            owners=[
+                {"id": u.id, "status": u.status, "is_email_verified": u.is_email_verified}
+                for u in owners
+            ],
+            documents=[
+                {
+                    "id": d.id,
+                    "name": d.name,
+                    "doc_type": d.doc_type,
+                    "s3_key": d.s3_key,
+                    "file_size": d.file_size,
+                    "sha256_hash": d.sha256_hash,
+                    "latest_version_hash": latest_hashes.get(d.id),
+                }
+                for d in documents
+            ],
+            financials={
+                "currency": financials.currency,
+                "capex_usd": financials.capex_usd,
+                "opex_usd_annual": financials.opex_usd_annual,
+                "irr_pct": financials.irr_pct,
+                "roi_pct": financials.roi_pct,
+                "payback_years": financials.payback_years,
+                "timeline_json": financials.timeline_json,
+                "assumptions_json": financials.assumptions_json,
+            } if financials else None,
+        )
+
+    def document_types(self) -> set:
+        return {d["doc_type"] for d in self.documents}
+
+
+class VerificationCheckPlugin:
+    """
+    Base class for automated checks.
+
+    Subclasses set ``check_type``/``check_name``, the lowest target level they
+    apply to, and implement ``run``. A check that does I/O must pass
+    ``ctx.remaining()`` as the timeout of every call, since an overrunning
+    check cannot be stopped and keeps its pool worker.
+    """
+    check_type: str = ""
+    check_name: str = ""
+    description: str = ""
+    min_level: str = "V1"
+    timeout_seconds: float = 10.0
+
+    def applies_to(self, to_level: str) -> bool:
+        return _level_index(to_level) >= _level_index(self.min_level)
+
+    def run(self, ctx: CheckContext) -> CheckResult:
+        raise NotImplementedError
+
+
+CHECK_REGISTRY: List[VerificationCheckPlugin] = []
+
+
+def register_check(plugin_cls: Type[VerificationCheckPlugin]) -> Type[VerificationCheckPlugin]:
+    """Class decorator adding a check to the registry."""
+    CHECK_REGISTRY.append(plugin_cls())
+    return plugin_cls
+
+
+def checks_for_level(to_level: str) -> List[VerificationCheckPlugin]:
+    """Get the registered checks that apply to a target level."""
+    return [plugin for plugin in CHECK_REGISTRY if plugin.applies_to(to_level)]
+
+
+@register_check
+class SponsorIdentityCheck(VerificationCheckPlugin):
+    check_type = "identity"
+    check_name = "Sponsor identity"
+    description = "Sponsor organization is registered and owned by verified, active users."
+    min_level = "V1"
+
+    def run(self, ctx: CheckContext) -> CheckResult:
+        org = ctx.organization
+        if not org:
+            return CheckResult("failed", 0, "Sponsor organization not found")
+
+        findings = {
+            "registration_no": bool(org["registration_no"]),
+            "country_code": bool(org["country_code"]),
+            "address": bool(org["address"]),
+            "active_owner": any(o["status"] == "active" for o in ctx.owners),
+            "verified_owner_email": any(o["is_email_verified"] for o in ctx.owners),
+        }
+        score = round(100 * sum(findings.values()) / len(findings))
+        required = findings["registration_no"] and findings["country_code"] and findings["active_owner"]
+        missing = [name for name, ok in findings.items() if not ok]
+        return CheckResult(
+            "passed" if required else "failed",
+            score,
+            f"Missing: {', '.join(missing)}" if missing else "Sponsor identity details complete",
+            findings,
+        )
+
+
+@register_check
+class DocumentHashIntegrityCheck(VerificationCheckPlugin):
+    check_type = "document"
+    check_name = "Document hash integrity"
+    description = "Every document is uploaded with a SHA-256 hash that matches its latest version."
+    min_level = "V2"
+
+    def run(self, ctx: CheckContext) -> CheckResult:
+        if not ctx.documents:
+            return CheckResult("failed", 0, "No documents uploaded")
+
+        problems = []
+        for doc in ctx.documents:
+            sha = (doc["sha256_hash"] or "").lower()
+            if doc["s3_key"] in (None, "", "pending"):
+                problems.append({"document_id": doc["id"], "issue": "not_uploaded"})
+            elif not _SHA256_RE.match(sha):
+                problems.append({"document_id": doc["id"], "issue": "missing_or_malformed_hash"})
+            elif doc["latest_version_hash"] and doc["latest_version_hash"].lower() != sha:
+                problems.append({"document_id": doc["id"], "issue": "hash_mismatch_with_latest_version"})
+
+        total = len(ctx.documents)
+        score = round(100 * (total - len(problems)) / total)
+        return CheckResult(
+            "passed" if not problems else "failed",
+            score,
+            f"{total - len(problems)}/{total} documents intact",
+            {"documents_checked": total, "problems": problems},
+        )
+
+
+@register_check
+class DocumentCompletenessCheck(VerificationCheckPlugin):
+    check_type = "document"
+    check_name = "Document completeness"
+    description = "All document types required for the target level are present."
+    min_level = "V2"
+
+    def run(self, ctx: CheckContext) -> CheckResult:
+        required = _cumulative(REQUIRED_DOCUMENT_TYPES, ctx.to_level)
+        present = ctx.document_types()
+        missing = [t for t in required if t not in present]
+        score = round(100 * (len(required) - len(missing)) / len(required)) if required else 100
+        return CheckResult(
+            "passed" if not missing else "failed",
+            score,
+            f"Missing required documents: {', '.join(missing)}" if missing else "All required documents present",
+            {"required": required, "missing": missing},
+        )
+
+
+@register_check
+class DocumentTypeCoverageCheck(VerificationCheckPlugin):
+    check_type = "document"
+    check_name = "Document type coverage"
+    description = "Share of recommended document types covered by the data room."
+    min_level = "V2"
+    min_coverage = 0.6
+
+    def run(self, ctx: CheckContext) -> CheckResult:
+        recommended = _cumulative(RECOMMENDED_DOCUMENT_TYPES, ctx.to_level)
+        present = ctx.document_types()
+        covered = [t for t in recommended if t in present]
+        coverage = len(covered) / len(recommended) if recommended else 1.0
+        counts: Dict[str, int] = {}
+        for doc in ctx.documents:
+            counts[doc["doc_type"]] = counts.get(doc["doc_type"], 0) + 1
+        return CheckResult(
+            "passed" if coverage >= self.min_coverage else "failed",
+            round(coverage * 100),
+            f"{len(covered)}/{len(recommended)} recommended document types covered",
+            {"covered": covered, "uncovered": [t for t in recommended if t not in present], "counts": counts},
+        )
+
+
+@register_check
+class FinancialConsistencyCheck(VerificationCheckPlugin):
+    check_type = "financial"
+    check_name = "Financial consistency"
+    description = "Financials are present and within plausible ranges."
+    min_level = "V3"
+
+    def run(self, ctx: CheckContext) -> CheckResult:
+        fin = ctx.financials
+        if not fin:
+            return CheckResult("failed", 0, "Project financials not provided")
+
+        issues = []
+        capex = fin["capex_usd"]
+        opex = fin["opex_usd_annual"]
+        irr = fin["irr_pct"]
+        payback = fin["payback_years"]
+        if capex is None or capex <= 0:
+            issues.append("capex_usd must be positive")
+        if opex is not None and capex and opex > capex:
+            issues.append("annual opex exceeds capex")
+        if irr is None:
+            issues.append("irr_pct missing")
+        elif not -50 <= irr <= 100:
+            issues.append("irr_pct outside plausible range (-50..100)")
+        if payback is not None and not 0 < payback <= 50:
+            issues.append("payback_years outside plausible range (0..50]")
+        if not fin["assumptions_json"]:
+            issues.append("assumptions_json missing")
+
+        score = max(0, 100 - 20 * len(issues))
+        return CheckResult(
+            "passed" if not issues else "failed",
+            score,
+            "; ".join(issues) if issues else "Financials consistent",
+            {"issues": issues},
+        )
+
+
+@register_check
+class ESGDisclosureCheck(VerificationCheckPlugin):
+    check_type = "esg"
+    check_name = "ESG disclosure"
+    description = "Impact statement, SDG alignment and environmental assessment are disclosed."
+    min_level = "V3"
+
+    def run(self, ctx: CheckContext) -> CheckResult:
+        tags = [t.strip() for t in (ctx.project["sdg_tags"] or "").split(",") if t.strip()]
+        valid_tags = [t for t in tags if (m := _SDG_RE.match(t)) and 1 <= int(m.group(1)) <= 17]
+        findings = {
+            "impact_statement": bool(ctx.project["impact_statement"]),
+            "sdg_tags": bool(valid_tags),
+            "esia_document": "esia" in ctx.document_types(),
+        }
+        score = round(100 * sum(findings.values()) / len(findings))
+        missing = [name for name, ok in findings.items() if not ok]
+        return CheckResult(
+            "passed" if not missing else "failed",
+            score,
+            f"Missing: {', '.join(missing)}" if missing else "ESG disclosures complete",
+            {**findings, "valid_sdg_tags": valid_tags},
+        )
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Futures of timed-out checks still running on the current pool
+_overrunning: set = set()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for automated checks (created on first use)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.VERIFICATION_CHECK_WORKERS,
+                thread_name_prefix="verification-check",
+            )
+        return _executor
+
+
+def _check_overran(plugin: VerificationCheckPlugin, future, executor: ThreadPoolExecutor) -> None:
+    """Record a timed-out check that is still running; retire the pool once half its workers are stuck."""
+    global _executor
+    checks_overrun.inc(check_type=plugin.check_type or type(plugin).__name__)
+    logger.warning(
+        "Verification check %r is still running after its %gs timeout; its worker stays busy until it returns",
+        plugin.check_name or type(plugin).__name__, plugin.timeout_seconds,
+    )
+    with _executor_lock:
+        if executor is not _executor:
+            return
+        _overrunning.add(future)
+        if len(_overrunning) * 2 < settings.VERIFICATION_CHECK_WORKERS:
+            future.add_done_callback(_overrunning.discard)
+            return
+        stuck = len(_overrunning)
+        _overrunning.clear()
+        _executor = None
+    logger.error("%d verification check workers are stuck; starting a new pool", stuck)
+    # Queued checks still run on the old pool; its threads exit once the stuck checks return
+    executor.shutdown(wait=False)
+
+
+def _timed_run(plugin: VerificationCheckPlugin, ctx: CheckContext):
+    started = time.perf_counter()
+    if ctx.remaining() == 0:
+        # Waited in the queue past the deadline; the caller has already given up
+        raise FutureTimeoutError()
+    result = plugin.run(ctx)
+    return result, time.perf_counter() - started
+
+
+def execute_checks(
+    ctx: CheckContext,
+    plugins: List[VerificationCheckPlugin],
+) -> List[tuple]:
+    """
+    Run checks concurrently, enforcing each check's timeout.
+
+    Each check gets its deadline through ``ctx.remaining()``. Timed-out checks
+    that already started keep running; see ``_check_overran``.
+
+    Args:
+        ctx: Project snapshot
+        plugins: Checks to run
+
+    Returns:
+        List of (plugin, CheckResult, elapsed_seconds) in plugin order
+    """
+    executor = get_executor()
+    submitted = time.perf_counter()
+    futures = [
+        (plugin, executor.submit(_timed_run, plugin, ctx.with_deadline(submitted + plugin.timeout_seconds)))
+        for plugin in plugins
+    ]
+
+    outcomes = []
+    for plugin, future in futures:
+        remaining = plugin.timeout_seconds - (time.perf_counter() - submitted)
+        try:
+            result, elapsed = future.result(timeout=max(remaining, 0))
+        except FutureTimeoutError:
+            if not future.cancel() and not future.done():
+                _check_overran(plugin, future, executor)
+            result = CheckResult(
+                "pending",
+                notes=f"Automated check timed out after {plugin.timeout_seconds:g}s; manual review required",
+            )
+            elapsed = plugin.timeout_seconds
+        except Exception as exc:
+            result = CheckResult(
+                "pending",
+                notes=f"Automated check errored ({type(exc).__name__}: {exc}); manual review required",
+            )
+            elapsed = time.perf_counter() - submitted
+        outcomes.append((plugin, result, elapsed))
+    return outcomes
+
+
+def run_automated_checks(
+    db: Session,
+    verification: VerificationRequest,
+    user_id: Optional[int] = None,
+) -> List[VerificationCheck]:
+    """
+    Run all applicable automated checks for a verification request.
+
+    Existing automated checks with the same name are updated in place, so the
+    runner can be re-triggered. All checks and events are committed together.
+
+    Args:
+        db: Database session
+        verification: The request to check
+        user_id: User who triggered the run (recorded on events)
+
+    Returns:
+        The created or updated VerificationCheck rows
+    """
+    plugins = checks_for_level(verification.to_level)
+    if not plugins:
+        return []
+
+    started = time.perf_counter()
+    ctx = CheckContext.load(db, verification)
+    outcomes = execute_checks(ctx, plugins)
+
+    existing = {
+        check.check_name: check
+        for check in db.query(VerificationCheck).filter(
+            VerificationCheck.request_id == verification.id,
+            VerificationCheck.is_automated.is_(True),
+        ).all()
+    }
+
+    now = datetime.utcnow()
+    checks, events = [], []
+    for plugin, result, elapsed in outcomes:
+        check = existing.get(plugin.check_name) or VerificationCheck(
+            request_id=verification.id,
+            check_type=plugin.check_type,
+            check_name=plugin.check_name,
+            description=plugin.description,
+            is_automated=True,
+        )
+        check.status = result.status
+        check.score = result.score
+        check.notes = result.notes
+        check.evidence_json = result.evidence
+        check.automation_source = AUTOMATION_SOURCE
+        check.checked_at = now
+        checks.append(check)
+
+        events.append(VerificationEvent(
+            request_id=verification.id,
+            event_type="check_completed",
+            description=f"Automated check '{plugin.check_name}': {result.status}",
+            metadata_json={
+                "check_type": plugin.check_type,
+                "status": result.status,
+                "score": result.score,
+                "elapsed_ms": round(elapsed * 1000, 1),
+            },
+            created_by=user_id,
+        ))
+
+    statuses = [result.status for _, result, _ in outcomes]
+    events.append(VerificationEvent(
+        request_id=verification.id,
+        event_type="automated_checks_completed",
+        description=f"{statuses.count('passed')}/{len(statuses)} automated checks passed",
+        metadata_json={
+            "passed": statuses.count("passed"),
+            "failed": statuses.count("failed"),
+            "pending": statuses.count("pending"),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        },
+        created_by=user_id,
+    ))
+
+    db.add_all(checks)
+    db.add_all(events)
+    db.commit()
+    return checks
+
+
+@job_handler("verification.run_checks", max_attempts=3)
+def run_automated_checks_job(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Background job wrapper around run_automated_checks."""
+    verification = db.query(VerificationRequest).filter(
+        VerificationRequest.id == payload["request_id"]
+    ).first()
+    if verification is None:
+        return {"skipped": "verification request not found"}
+    checks = run_automated_checks(db, verification, user_id=payload.get("user_id"))
+    return {"checks": len(checks), "passed": sum(1 for c in checks if c.status == "passed")}
@@ -0,0 +1,273 @@
+"""HTTP response compression and precompressed static files.
+
+``CompressionMiddleware`` negotiates ``Accept-Encoding`` and compresses
+compressible responses (JSON, text, JS, CSS, SVG) of at least
+``minimum_size`` bytes with brotli, when the ``brotli`` package is installed,
+or gzip. Streaming bodies are compressed chunk by chunk and flushed, so
+NDJSON exports still arrive incrementally. Responses that already carry a
+``Content-Encoding`` pass through untouched.
+
+``PrecompressedStaticFiles`` serves ``<file>.br`` / ``<file>.gz`` siblings
+written at build time instead of compressing per request, and marks
+content-hashed assets (``_next/static/...``) as immutable for a year.
+Generate the variants after exporting the frontend:
+
+    python -m app.utils.compression static        (from backend/)
+"""
+import argparse
+import gzip
+import mimetypes
+import os
+import re
+import sys
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript", "application/xml",
+    "application/manifest+json", "image/svg+xml", "text/",
+)
+PRECOMPRESS_SUFFIXES = (".html", ".js", ".mjs", ".css", ".json", ".txt", ".svg", ".xml", ".map", ".ico", ".webmanifest")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+# Next.js puts content-hashed build output under _next/static/
+_HASHED_ASSET = re.compile(r"(^|/)_next/static/|[.-][0-9a-f]{8,}\.[a-z0-9]+$")
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """Parse Accept-Encoding into coding -> q-value."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(header: Optional[str], available: Iterable[str] = None) -> Optional[str]:
+    """Best supported coding the client accepts (brotli preferred on ties), or None."""
+    if not header:
+        return None
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get("*", 0.0)
+    if available is None:
+        available = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class _Compressor:
+    """Incremental gzip or brotli encoder."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # 31 = gzip container
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._br.process(data)
+            return out + self._br.flush() if flush else out
+        out = self._gz.compress(data)
+        return out + self._gz.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.finish()
+        return self._gz.compress(data) + self._gz.flush()
+
+
+class CompressionMiddleware:
+    """Compress large compressible responses with brotli or gzip per Accept-Encoding."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = Headers(raw=start["headers"])
+                if (
+                    "content-encoding" in headers
+                    or start["status"] in (204, 206, 304)
+                    or not is_compressible(headers.get("content-type", ""))
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    # A different representation cannot keep a strong validator
+                    headers["ETag"] = "W/" + etag
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = compressor.finish(body)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start)
+
+            chunk = compressor.compress(body, flush=True) if more_body else compressor.finish(body)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves build-time .br/.gz variants and long-lived caching for hashed assets."""
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        encoding, variant = None, None
+        if status_code == 200:
+            available = [c for c, ext in (("br", ".br"), ("gzip", ".gz")) if os.path.isfile(f"{full_path}{ext}")]
+            encoding = choose_encoding(request_headers.get("accept-encoding"), available)
+            if encoding is not None:
+                variant = f"{full_path}{'.br' if encoding == 'br' else '.gz'}"
+
+        if variant is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+        else:
+            response = FileResponse(
+                variant,
+                status_code=status_code,
+                stat_result=os.stat(variant),
+                media_type=mimetypes.guess_type(str(full_path))[0] or "text/plain",
+                headers={"Content-Encoding": encoding},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                response = NotModifiedResponse(response.headers)
+
+        relative = os.path.relpath(str(full_path), str(self.directory)).replace(os.sep, "/")
+        response.headers["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL if _HASHED_ASSET.search(relative) else REVALIDATE_CACHE_CONTROL
+        )
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+def precompress(directory: str, minimum_size: int = 256, brotli_quality: int = 11) -> List[Tuple[str, int, Dict[str, int]]]:
+    """
+    Write .gz (and .br when brotli is installed) next to every compressible file.
+
+    Variants that are not smaller than the original are skipped; up-to-date
+    variants are left alone.
+
+    Returns:
+        (path, original size, {suffix: compressed size}) for each file processed
+    """
+    results = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if not name.endswith(PRECOMPRESS_SUFFIXES):
+                continue
+            path = os.path.join(root, name)
+            size = os.path.getsize(path)
+            if size < minimum_size:
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            written = {}
+            encoders = [(".gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                encoders.append((".br", lambda d: brotli.compress(d, quality=brotli_quality)))
+            for suffix, encode in encoders:
+                target = path + suffix
+                if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                    written[suffix] = os.path.getsize(target)
+                    continue
+                compressed = encode(data)
+                if len(compressed) >= size:
+                    if os.path.exists(target):
+                        os.remove(target)
+                    continue
+                with open(target, "wb") as f:
+                    f.write(compressed)
+                written[suffix] = len(compressed)
+            results.append((path, size, written))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Precompress static files for PrecompressedStaticFiles.")
+    parser.add_argument("directory")
+    parser.add_argument("--minimum-size", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    if brotli is None:
+        print("brotli is not installed; writing .gz variants only", file=sys.stderr)
+    results = precompress(args.directory, args.minimum_size)
+    original = sum(size for _, size, _ in results)
+    for suffix in (".gz", ".br"):
+        compressed = sum(w.get(suffix, size) for _, size, w in results)
+        if any(suffix in w for _, _, w in results):
+            print(f"{suffix}: {len(results)} files, {original / 1024:.1f} KiB -> {compressed / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
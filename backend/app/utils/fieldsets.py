@@ -0,0 +1,56 @@
+"""Sparse fieldsets for list endpoints.
+
+``?fields=name,sector,country`` limits a list response to the named fields of
+its item schema. The same field list becomes the query's loader options:
+``load_only`` for columns, so unrequested ``Text`` columns are never selected,
+and ``selectinload`` for requested relationships, which are otherwise not
+loaded at all. The id is always included.
+"""
+from typing import List, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, raiseload, selectinload
+
+
+def parse_fields(schema: Type[BaseModel], raw: Optional[str]) -> Optional[List[str]]:
+    """
+    Validate a comma-separated field list against an item schema.
+
+    Returns:
+        Requested fields in schema order with ``id`` first, or None for all fields
+
+    Raises:
+        ValueError: If a name is not a field of the schema
+    """
+    if raw is None or not raw.strip():
+        return None
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = sorted(requested - set(schema.model_fields))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    requested.add("id")
+    return [name for name in schema.model_fields if name in requested]
+
+
+def load_options(model, fields: Optional[List[str]], schema: Optional[Type[BaseModel]] = None) -> list:
+    """
+    Loader options that fetch only `fields` of an ORM model.
+
+    With no field list every column loads; pass the item `schema` to also
+    batch-load the relationships it serializes instead of lazy-loading them
+    once per row.
+    """
+    mapper = inspect(model)
+    if fields is None:
+        if schema is None:
+            return []
+        return [selectinload(getattr(model, name)) for name in schema.model_fields if name in mapper.relationships]
+    columns = [getattr(model, name) for name in fields if name in mapper.column_attrs]
+    relationships = [name for name in fields if name in mapper.relationships]
+    # Anything not requested fails loudly instead of lazy-loading row by row
+    return (
+        [load_only(*columns, raiseload=True)]
+        + [selectinload(getattr(model, name)) for name in relationships]
+        + [raiseload("*")]
+    )
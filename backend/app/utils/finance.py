@@ -0,0 +1,165 @@
+"""Vectorized discounted cash-flow metrics.
+
+All functions take a 2-D array of annual cash flows, one series per row with
+year 0 in column 0, and compute the metric for every row at once. Ragged
+series are zero-padded with ``pad_cash_flows`` (trailing zeros do not change
+any of the metrics).
+"""
+from typing import Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+# IRR search bracket (-99% .. +1000%)
+IRR_LOWER = -0.99
+IRR_UPPER = 10.0
+IRR_TOLERANCE = 1e-10
+IRR_MAX_ITERATIONS = 100
+
+
+def pad_cash_flows(series: Iterable[Sequence[float]]) -> np.ndarray:
+    """Stack ragged cash-flow series into a zero-padded (n, max_len) matrix."""
+    rows = [np.asarray(s, dtype=float) for s in series]
+    width = max((len(r) for r in rows), default=0)
+    flows = np.zeros((len(rows), width))
+    for i, row in enumerate(rows):
+        flows[i, :len(row)] = row
+    return flows
+
+
+def cash_flows_from_timeline(timeline: Optional[dict]) -> Optional[List[float]]:
+    """
+    Extract annual net cash flows from ``ProjectFinancials.timeline_json``.
+
+    Accepts ``{"cash_flows": [-120e6, -40e6, 18e6, ...]}`` (year 0 first) or
+    ``{"cash_flows": [{"year": 0, "amount_usd": -120e6}, ...]}``. Entries for
+    the same year are summed and missing years count as zero.
+
+    Returns:
+        The series, or None if the timeline declares no cash flows
+    """
+    entries = (timeline or {}).get("cash_flows")
+    if not entries:
+        return None
+    if all(isinstance(e, (int, float)) for e in entries):
+        return [float(e) for e in entries]
+
+    by_year: dict = {}
+    for entry in entries:
+        year = int(entry["year"])
+        by_year[year] = by_year.get(year, 0.0) + float(entry["amount_usd"])
+    if min(by_year) < 0:
+        raise ValueError("Cash flow years must be >= 0")
+    return [by_year.get(year, 0.0) for year in range(max(by_year) + 1)]
+
+
+def _discount_factors(rate: ArrayLike, periods: int) -> np.ndarray:
+    """(n or 1, periods) matrix of (1 + rate) ** -t."""
+    rate = np.atleast_1d(np.asarray(rate, dtype=float))
+    return np.exp(-np.outer(np.log1p(rate), np.arange(periods)))
+
+
+def npv(flows: np.ndarray, rate: ArrayLike) -> np.ndarray:
+    """
+    Net present value of each row.
+
+    Args:
+        flows: (n, periods) cash flows
+        rate: Discount rate as a fraction, scalar or one per row
+    """
+    flows = np.atleast_2d(flows)
+    return np.einsum("ij,ij->i", flows, np.broadcast_to(_discount_factors(rate, flows.shape[1]), flows.shape))
+
+
+def irr(flows: np.ndarray, guess: float = 0.1) -> np.ndarray:
+    """
+    Internal rate of return of each row, as a fraction.
+
+    Newton's method converges in a few steps for well-behaved series; any row
+    whose Newton step leaves the current sign-change bracket (or whose
+    derivative vanishes) takes a bisection step instead, so every row with a
+    sign change in [IRR_LOWER, IRR_UPPER] converges.
+
+    Returns:
+        IRR per row; NaN where NPV does not change sign within the bracket
+    """
+    flows = np.atleast_2d(np.asarray(flows, dtype=float))
+    n, periods = flows.shape
+    t = np.arange(periods)
+
+    def value_and_slope(rates, rows):
+        factors = np.exp(-np.outer(np.log1p(rates), t))
+        value = np.einsum("ij,ij->i", flows[rows], factors)
+        slope = -np.einsum("ij,ij->i", flows[rows] * t, factors / (1 + rates)[:, None])
+        return value, slope
+
+    lo = np.full(n, IRR_LOWER)
+    hi = np.full(n, IRR_UPPER)
+    f_lo, _ = value_and_slope(lo, slice(None))
+    f_hi, _ = value_and_slope(hi, slice(None))
+    valid = np.sign(f_lo) * np.sign(f_hi) < 0
+
+    rate = np.where(valid, np.clip(guess, IRR_LOWER, IRR_UPPER), np.nan)
+    active = valid.copy()
+    for _ in range(IRR_MAX_ITERATIONS):
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        r = rate[idx]
+        value, slope = value_and_slope(r, idx)
+
+        # Shrink the bracket around the root using the sign at r
+        below = np.sign(value) == np.sign(f_lo[idx])
+        lo[idx] = np.where(below, r, lo[idx])
+        f_lo[idx] = np.where(below, value, f_lo[idx])
+        hi[idx] = np.where(below, hi[idx], r)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = r - value / slope
+        use_newton = np.isfinite(newton) & (newton > lo[idx]) & (newton < hi[idx])
+        step = np.where(use_newton, newton, (lo[idx] + hi[idx]) / 2)
+
+        done = (np.abs(step - r) < IRR_TOLERANCE) | (value == 0) | (hi[idx] - lo[idx] < IRR_TOLERANCE)
+        rate[idx] = np.where(value == 0, r, step)
+        active[idx[done]] = False
+    return rate
+
+
+def discounted_payback(flows: np.ndarray, rate: ArrayLike = 0.0) -> np.ndarray:
+    """
+    Years until cumulative discounted cash flow turns non-negative for good.
+
+    Interpolates linearly within the crossing year; ``rate=0`` gives simple
+    payback. NaN where the investment is never recovered.
+    """
+    flows = np.atleast_2d(np.asarray(flows, dtype=float))
+    discounted = flows * np.broadcast_to(_discount_factors(rate, flows.shape[1]), flows.shape)
+    cumulative = np.cumsum(discounted, axis=1)
+
+    # Last year the cumulative position is negative; payback happens in the year after
+    negative = cumulative < 0
+    has_negative = negative.any(axis=1)
+    last_negative = flows.shape[1] - 1 - np.argmax(negative[:, ::-1], axis=1)
+    recovered = has_negative & (last_negative < flows.shape[1] - 1)
+
+    rows = np.arange(flows.shape[0])
+    crossing = np.minimum(last_negative + 1, flows.shape[1] - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = -cumulative[rows, last_negative] / discounted[rows, crossing]
+    payback = np.where(recovered, last_negative + fraction, np.nan)
+    return np.where(has_negative, payback, 0.0)
+
+
+def roi(flows: np.ndarray) -> np.ndarray:
+    """Undiscounted return on investment: net cash / total outflows, as a fraction."""
+    flows = np.atleast_2d(np.asarray(flows, dtype=float))
+    invested = -np.where(flows < 0, flows, 0).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(invested > 0, flows.sum(axis=1) / invested, np.nan)
+
+
+def to_optional(values: np.ndarray, scale: float = 1.0, digits: int = 2) -> List[Optional[float]]:
+    """Convert an array to rounded floats, with None for NaN (for JSON and DB writes)."""
+    return [None if not np.isfinite(v) else round(float(v) * scale, digits) for v in values]
+
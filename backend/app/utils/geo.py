@@ -0,0 +1,156 @@
+"""Geohash and great-circle helpers.
+
+Geohashes interleave longitude and latitude bits and encode them in base 32,
+so points in the same cell share a string prefix and a bounding box can be
+covered by a handful of prefix ranges over an ordinary B-tree index.
+"""
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_KM = 6371.0088
+MAX_PRECISION = 9  # ~5 m cells
+
+BBox = Tuple[float, float, float, float]  # south, west, north, east
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) in degrees of a geohash cell at this precision."""
+    bits = 5 * precision
+    lon_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def encode(latitude: float, longitude: float, precision: int = MAX_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bit = 0
+    value = 0
+    even = True  # even bits refine longitude
+    while len(chars) < precision:
+        rng, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if coordinate >= mid:
+            value = value * 2 + 1
+            rng[0] = mid
+        else:
+            value *= 2
+            rng[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(BASE32[value])
+            bit = value = 0
+    return "".join(chars)
+
+
+def decode_bbox(geohash: str) -> BBox:
+    """Bounds of a geohash cell."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if value >> shift & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def split_antimeridian(bbox: BBox) -> List[BBox]:
+    """A box whose west edge is east of its east edge wraps the 180th meridian."""
+    south, west, north, east = bbox
+    if west <= east:
+        return [bbox]
+    return [(south, west, north, 180.0), (south, -180.0, north, east)]
+
+
+def covering_cells(bbox: BBox, max_cells: int = 32) -> List[str]:
+    """
+    Geohash prefixes whose cells together cover the box.
+
+    Uses the finest precision that needs at most `max_cells` cells, so the
+    covering is tight for small viewports and coarse for continents.
+    """
+    cells: List[str] = []
+    for south, west, north, east in split_antimeridian(bbox):
+        south, north = max(south, -90.0), min(north, 90.0)
+        for precision in range(MAX_PRECISION, 0, -1):
+            height, width = cell_size(precision)
+            rows = math.floor((north + 90) / height) - math.floor((south + 90) / height) + 1
+            cols = math.floor((east + 180) / width) - math.floor((west + 180) / width) + 1
+            if rows * cols <= max_cells or precision == 1:
+                break
+        first_row = math.floor((south + 90) / height)
+        first_col = math.floor((west + 180) / width)
+        for row in range(first_row, first_row + rows):
+            for col in range(first_col, first_col + cols):
+                lat = min(-90 + (row + 0.5) * height, 90.0)
+                lon = min(-180 + (col + 0.5) * width, 180.0)
+                cells.append(encode(lat, lon, precision))
+    return sorted(set(cells))
+
+
+def radius_bbox(latitude: float, longitude: float, radius_km: float) -> BBox:
+    """Smallest lat/lon box containing a circle (whole longitude range near the poles)."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    south, north = latitude - dlat, latitude + dlat
+    if south <= -90 or north >= 90:
+        return max(south, -90.0), -180.0, min(north, 90.0), 180.0
+    dlon = math.degrees(math.asin(min(math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude)), 1)))
+    west, east = longitude - dlon, longitude + dlon
+    if dlon >= 180:
+        return south, -180.0, north, 180.0
+    # Wrap into [-180, 180]; a wrapped box has west > east
+    west = (west + 180) % 360 - 180
+    east = (east + 180) % 360 - 180
+    return south, west, north, east
+
+
+def haversine_km(latitude: float, longitude: float, latitudes, longitudes) -> np.ndarray:
+    """Great-circle distances from one point to many."""
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = np.radians(np.asarray(latitudes, dtype=float)), np.radians(np.asarray(longitudes, dtype=float))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+# Geohash precision per web-map zoom level (0-20) giving cells roughly 32-128 px wide
+_ZOOM_PRECISION = [1, 1, 2, 2, 2, 3, 3, 4, 4, 4, 5, 5, 6, 6, 6, 7, 7, 8, 8, 8, 9]
+
+
+def zoom_precision(zoom: int) -> int:
+    """Geohash precision for clustering at a web-map zoom level."""
+    return _ZOOM_PRECISION[max(0, min(zoom, len(_ZOOM_PRECISION) - 1))]
+
+
+# Web-mercator tiles (the z/x/y scheme used by slippy maps)
+MERCATOR_MAX_LATITUDE = 85.0511287798
+
+
+def mercator(latitudes, longitudes) -> Tuple[np.ndarray, np.ndarray]:
+    """Normalised web-mercator coordinates in [0, 1), y growing southwards."""
+    lat = np.radians(np.clip(np.asarray(latitudes, dtype=float), -MERCATOR_MAX_LATITUDE, MERCATOR_MAX_LATITUDE))
+    mx = (np.asarray(longitudes, dtype=float) + 180.0) / 360.0
+    my = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / math.pi) / 2.0
+    edge = np.nextafter(1.0, 0.0)
+    return np.clip(mx, 0.0, edge), np.clip(my, 0.0, edge)
+
+
+def tile_bounds(z: int, x: int, y: int) -> BBox:
+    """Lat/lon bounds of a tile."""
+    n = 2 ** z
+
+    def latitude(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return latitude(y + 1), x / n * 360.0 - 180.0, latitude(y), (x + 1) / n * 360.0 - 180.0
@@ -0,0 +1,276 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms are plain dicts behind a lock, updated inline
+(a dict lookup and an add per observation). ``MetricsMiddleware`` records
+request counts and latency per route template. Values that already live
+elsewhere (pool, threadpool, job queue) are read by collectors when
+``/metrics`` is scraped. ``render`` returns the text for that response:
+
+    # HELP http_requests_total HTTP requests by route and status.
+    # TYPE http_requests_total counter
+    http_requests_total{method="GET",route="/projects/",status="200"} 42
+
+Nothing is pushed anywhere, so the numbers can be read in tests straight
+from the metric objects or the rendered text.
+"""
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy.pool import QueuePool
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (labels, value) rows of one metric
+Samples = List[Tuple[Dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic count per label set."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(dict(zip(self.labelnames, k)))} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Bucketed observations (cumulative ``_bucket``, ``_sum`` and ``_count``) per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return sum(state[0]) if state else 0
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1])) for k, v in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                le = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+# Collectors return (name, type, help, samples) for values read at scrape time
+Collector = Callable[[], Iterable[Tuple[str, str, str, Samples]]]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+        self.collectors: List[Collector] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Collector) -> None:
+        self.collectors.append(collector)
+
+    def render(self, extra: Iterable[Collector] = ()) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines += metric.header() + metric.lines()
+        for collector in [*self.collectors, *extra]:
+            for name, kind, help, samples in collector():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                lines += [f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"),
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route, to the end of the response body.",
+    ("method", "route"),
+))
+cache_requests = registry.register(Counter(
+    "cache_requests_total", "In-process cache lookups by cache and result (hit or miss).", ("cache", "result"),
+))
+db_pool_wait = registry.register(Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled database connection.", ("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+))
+
+
+def _cache_ratios():
+    hits: Dict[str, float] = {}
+    totals: Dict[str, float] = {}
+    with cache_requests._lock:
+        for (cache, result), n in cache_requests._values.items():
+            totals[cache] = totals.get(cache, 0.0) + n
+            if result == "hit":
+                hits[cache] = hits.get(cache, 0.0) + n
+    yield (
+        "cache_hit_ratio", "gauge", "Share of cache lookups that hit, since process start.",
+        [({"cache": cache}, hits.get(cache, 0.0) / total) for cache, total in sorted(totals.items()) if total],
+    )
+
+
+registry.add_collector(_cache_ratios)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records checkout wait time in ``db_pool_wait_seconds``."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait.observe(time.perf_counter() - started, pool=getattr(self, "metrics_name", "default"))
+
+
+def pool_collector(engine, name: str = "default") -> Collector:
+    """
+    Size, checked-out and overflow gauges for an engine's QueuePool.
+
+    A plain QueuePool is switched to ``TimedQueuePool`` here, so engines built
+    without it (the legacy app's, whose package cannot import this module)
+    report checkout waits too. ``recreate()`` builds the replacement pool from
+    ``__class__``, so the timing survives ``engine.dispose()``.
+    """
+    pool = engine.pool
+    if type(pool) is QueuePool:
+        pool.__class__ = TimedQueuePool
+    pool.metrics_name = name
+
+    def collect():
+        if not isinstance(pool, QueuePool):
+            return
+        labels = {"pool": name}
+        yield "db_pool_size", "gauge", "Configured pool size.", [(labels, pool.size())]
+        yield "db_pool_checked_out", "gauge", "Connections currently checked out.", [(labels, pool.checkedout())]
+        yield "db_pool_overflow", "gauge", "Connections open beyond the pool size.", [(labels, max(pool.overflow(), 0))]
+
+    return collect
+
+
+def threadpool_collector():
+    """Starlette's sync-endpoint threadpool (anyio's default limiter); call from the event loop."""
+    import anyio.to_thread
+
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    yield "threadpool_threads_busy", "gauge", "Worker threads running sync endpoints and dependencies.", [
+        ({}, limiter.borrowed_tokens)
+    ]
+    yield "threadpool_threads_limit", "gauge", "Maximum worker threads.", [({}, limiter.total_tokens)]
+    yield "threadpool_waiting", "gauge", "Tasks waiting for a worker thread.", [
+        ({}, limiter.statistics().tasks_waiting)
+    ]
+
+
+def metrics_response(extra: Iterable[Collector] = ()) -> Response:
+    """The /metrics response for the process registry plus request-time collectors."""
+    return Response(registry.render(extra), media_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """Count requests and time them per route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            # Unmatched paths share one label so scanners cannot blow up the series count
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests.inc(method=method, route=template, status=str(status_code))
+            http_request_duration.observe(time.perf_counter() - started, method=method, route=template)
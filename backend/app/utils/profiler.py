@@ -0,0 +1,172 @@
+"""On-demand statistical stack sampler producing collapsed (folded) stacks.
+
+While a ``StackSampler`` runs, a daemon thread reads every thread's current
+frame with ``sys._current_frames()`` each ``interval`` seconds and counts the
+stacks. Nothing is installed in the profiled threads (no ``sys.setprofile``
+or tracing), and when no sampler is running there is no thread and no hook,
+so an idle process pays nothing.
+
+Output is one line per distinct stack, root first, with the thread name as the
+root frame and the sample count at the end. ``flamegraph.pl``, speedscope and
+inferno read it as-is:
+
+    MainThread;run_forever (asyncio/base_events.py:593);select (python3.11/selectors.py:451) 812
+    AnyIO worker thread;...;list_projects (routers/projects.py:212) 37
+
+Only one sampler runs at a time (``SamplerBusy`` otherwise), so concurrent
+requests cannot stack up sampling threads.
+
+``ProfilerMiddleware`` profiles single requests that send ``X-Profile: 1``
+and pass the ``authorize`` check. The response carries ``X-Profile-Id``. The
+folded stacks are kept in memory (the last ``keep`` profiles) and read back
+with ``get_profile``. Every thread is sampled during the request, so stacks
+from concurrent requests appear as well.
+"""
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_busy = threading.Lock()
+_labels: Dict[object, str] = {}
+
+
+class SamplerBusy(RuntimeError):
+    """Another profile is already running."""
+
+
+def _frame_label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        short = "/".join(code.co_filename.replace(os.sep, "/").split("/")[-2:])
+        label = f"{code.co_name} ({short}:{code.co_firstlineno})".replace(";", ":")
+        _labels[code] = label
+    return label
+
+
+def collapse(counts: Counter) -> str:
+    """Folded-stack text, most sampled stacks first."""
+    return "".join(f"{stack} {n}\n" for stack, n in counts.most_common())
+
+
+class StackSampler:
+    """Sample all threads' stacks every `interval` seconds between ``start`` and ``stop``."""
+
+    def __init__(self, interval: float = 0.005, exclude: Iterable[int] = ()):
+        self.interval = interval
+        self.exclude = set(exclude)
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StackSampler":
+        """
+        Raises:
+            SamplerBusy: If another sampler is running
+        """
+        if not _busy.acquire(blocking=False):
+            raise SamplerBusy("A profile is already running")
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            _busy.release()
+        return self.counts
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.is_set():
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or ident in self.exclude:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}").replace(";", ":"))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+            self._stop.wait(self.interval)
+
+
+def sample(seconds: float, interval: float = 0.005) -> Counter:
+    """
+    Sample every other thread for `seconds`; blocks the calling thread meanwhile.
+
+    Raises:
+        SamplerBusy: If another sampler is running
+    """
+    sampler = StackSampler(interval, exclude=[threading.get_ident()]).start()
+    try:
+        time.sleep(seconds)
+    finally:
+        sampler.stop()
+    return sampler.counts
+
+
+_profiles: "OrderedDict[str, str]" = OrderedDict()
+_profiles_lock = threading.Lock()
+_profile_ids = itertools.count(1)
+
+
+def get_profile(profile_id: str) -> Optional[str]:
+    """Folded stacks of a finished per-request profile, if still kept."""
+    with _profiles_lock:
+        return _profiles.get(profile_id)
+
+
+class ProfilerMiddleware:
+    """Profile requests sending ``X-Profile: 1`` whose headers pass `authorize`."""
+
+    def __init__(self, app: ASGIApp, authorize: Callable[[Headers], bool], interval: float = 0.005, keep: int = 20):
+        self.app = app
+        self.authorize = authorize
+        self.interval = interval
+        self.keep = keep
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if headers.get("x-profile") != "1" or not self.authorize(headers):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            sampler = StackSampler(self.interval).start()
+        except SamplerBusy:
+            sampler = None
+        profile_id = f"{int(time.time())}-{next(_profile_ids)}"
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if sampler is not None:
+                    headers["X-Profile-Id"] = profile_id
+                else:
+                    headers["X-Profile"] = "busy"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if sampler is not None:
+                text = collapse(sampler.stop())
+                with _profiles_lock:
+                    _profiles[profile_id] = text
+                    while len(_profiles) > self.keep:
+                        _profiles.popitem(last=False)
@@ -0,0 +1,192 @@
+"""Per-request SQL statement counts, database time and N+1 detection.
+
+Engine-level ``before/after_cursor_execute`` listeners (registered on the
+``Engine`` class, so every engine in the process is covered) record into the
+``QueryStats`` of the current context. ``QueryStatsMiddleware`` opens one per
+HTTP request; it is carried into threadpool endpoints and streamed bodies with
+the request's ``contextvars``. Outside a tracked context the listeners return
+immediately.
+
+Statements are grouped by shape (the SQL text with ``IN``/``VALUES``
+parameter lists collapsed), so the same query issued once per row of a list
+shows up as one shape with a high count: the usual N+1 signature.
+
+Per request the middleware:
+
+- adds ``X-DB-Queries``, ``X-DB-Time-Ms`` and ``X-DB-Duplicates`` headers
+  when ``expose_headers`` is set (development);
+- logs ``method route status queries= db_ms= duplicates=`` to the
+  ``app.sql`` logger, with the numbers also in ``extra["sql"]`` for JSON
+  formatters, at WARNING once a shape repeats ``n_plus_one_threshold`` times;
+- hands the stats to observers registered with ``add_observer`` (the test
+  suite's query-budget plugin).
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("app.sql")
+
+_PARAM_LIST = re.compile(r"\((?:\s*(?:\?|%s|:\w+|\$\d+)\s*,)+\s*(?:\?|%s|:\w+|\$\d+)\s*\)")
+_VALUES_ROWS = re.compile(r"(VALUES \(\?\))(?:, \(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """SQL text with whitespace normalised and parameter lists collapsed to ``(?)``."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PARAM_LIST.sub("(?)", shape)
+    return _VALUES_ROWS.sub(r"\1", shape)
+
+
+class QueryStats:
+    """Statements executed in one request (or other tracked unit of work)."""
+
+    __slots__ = ("count", "duration", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.duration += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """Statements that repeated an earlier shape."""
+        return sum(n - 1 for n in self.shapes.values() if n > 1)
+
+    def repeated(self, min_count: int = 2) -> List[Tuple[str, int]]:
+        """Shapes issued at least `min_count` times, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= min_count]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_scope: ContextVar[Optional[Scope]] = ContextVar("query_stats_scope", default=None)
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def current_route() -> Optional[str]:
+    """``METHOD /route/{template}`` of the request executing in this context, if any."""
+    scope = _scope.get()
+    return f"{scope['method']} {route_template(scope)}" if scope is not None else None
+
+
+@contextmanager
+def track() -> Iterator[QueryStats]:
+    """Count statements executed in this context (and threads it hands work to)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_stats_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_stats_started")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context) -> None:
+    started = context.connection.info.get("query_stats_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+Observer = Callable[[str, str, int, QueryStats], None]
+_observers: List[Observer] = []
+
+
+def add_observer(observer: Observer) -> None:
+    """Call ``observer(method, route, status, stats)`` after every tracked request."""
+    _observers.append(observer)
+
+
+def remove_observer(observer: Observer) -> None:
+    _observers.remove(observer)
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template (``/projects/{project_id}``), else the raw path."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+
+class QueryStatsMiddleware:
+    """Track the SQL issued by each HTTP request; see the module docstring."""
+
+    def __init__(self, app: ASGIApp, expose_headers: bool = False, n_plus_one_threshold: int = 10):
+        self.app = app
+        self.expose_headers = expose_headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.expose_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.count)
+                    headers["X-DB-Time-Ms"] = f"{stats.duration * 1000:.1f}"
+                    headers["X-DB-Duplicates"] = str(stats.duplicates)
+            await send(message)
+
+        scope_token = _scope.set(scope)
+        with track() as stats:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                _scope.reset(scope_token)
+                self._report(scope, status_code, stats)
+
+    def _report(self, scope: Scope, status_code: int, stats: QueryStats) -> None:
+        method, route = scope["method"], route_template(scope)
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        level = logging.WARNING if repeated else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(
+                level,
+                "%s %s %s queries=%d db_ms=%.1f duplicates=%d%s",
+                method, route, status_code, stats.count, stats.duration * 1000, stats.duplicates,
+                f" repeated={repeated[0][1]}x {repeated[0][0][:200]!r}" if repeated else "",
+                extra={"sql": {
+                    "method": method, "route": route, "status": status_code, "queries": stats.count,
+                    "db_ms": round(stats.duration * 1000, 3), "duplicates": stats.duplicates,
+                    "repeated": repeated[:5],
+                }},
+            )
+        for observer in list(_observers):
+            observer(method, route, status_code, stats)
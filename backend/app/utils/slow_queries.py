@@ -0,0 +1,214 @@
+"""Slow-query log with EXPLAIN capture, aggregated by statement fingerprint.
+
+Engine-level cursor listeners (every engine in the process) time each
+statement once ``configure`` has set a threshold. Until then they return
+immediately. A statement at or over the threshold is:
+
+- logged to ``app.sql.slow`` at WARNING, with the normalised SQL
+  (``query_stats.statement_shape``), the bound-parameter shape (types, not
+  values), the calling route and the fingerprint. The numbers are also in
+  ``extra["slow_query"]``.
+- folded into an in-process report keyed by fingerprint: count, total, mean
+  and max time, the parameter shape, the routes it came from, and the plan.
+
+The plan is captured the first time a fingerprint is slow. The statement is
+re-run under ``EXPLAIN QUERY PLAN`` (SQLite) or ``EXPLAIN`` (other dialects,
+never ``ANALYZE``) with the same parameters, on a raw cursor of the same
+connection. That cursor bypasses these listeners. On PostgreSQL it runs inside
+a savepoint, so a failed EXPLAIN cannot abort the caller's transaction. Only
+single-execution SELECT/WITH/UPDATE/DELETE statements are explained.
+
+``top`` returns the report, slowest shapes first. The report keeps
+``max_shapes`` fingerprints; when a new one arrives, the shape with the
+least total time is dropped.
+"""
+import hashlib
+import logging
+import threading
+import time
+from itertools import groupby
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.query_stats import current_route, statement_shape
+
+logger = logging.getLogger("app.sql.slow")
+
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+_SORT_KEYS = {
+    "total": lambda e: e.total,
+    "max": lambda e: e.max,
+    "mean": lambda e: e.total / e.count,
+    "count": lambda e: e.count,
+}
+
+
+def fingerprint(shape: str) -> str:
+    return hashlib.sha1(shape.encode()).hexdigest()[:16]
+
+
+def _type_names(values) -> str:
+    # Runs of one type (IN lists) collapse to "int x 50"
+    runs = [(name, len(list(group))) for name, group in groupby(type(v).__name__ for v in values)]
+    return ", ".join(name if n == 1 else f"{name} x {n}" for name, n in runs)
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Types of the bound parameters, e.g. ``(int, str)`` or ``{name: str}``; never the values."""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {parameter_shape(rows[0]) if rows else '()'}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    return f"({_type_names(parameters or ())})"
+
+
+class SlowQuery:
+    """Aggregate of the slow executions of one statement fingerprint."""
+
+    __slots__ = ("fingerprint", "statement", "parameters", "count", "total", "max", "last_seen", "routes", "plan")
+
+    def __init__(self, fingerprint: str, statement: str, parameters: str):
+        self.fingerprint = fingerprint
+        self.statement = statement
+        self.parameters = parameters
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last_seen = 0.0
+        self.routes: Dict[str, int] = {}
+        self.plan: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "statement": self.statement,
+            "parameters": self.parameters,
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "last_seen": self.last_seen,
+            "routes": dict(sorted(self.routes.items(), key=lambda item: -item[1])),
+            "plan": self.plan,
+        }
+
+
+_threshold: Optional[float] = None
+_explain = True
+_max_shapes = 200
+_report: Dict[str, SlowQuery] = {}
+_lock = threading.Lock()
+
+
+def configure(threshold_seconds: Optional[float], explain: bool = True, max_shapes: int = 200) -> None:
+    """Log statements taking at least `threshold_seconds`; None (or <= 0) turns the log off."""
+    global _threshold, _explain, _max_shapes
+    _threshold = threshold_seconds if threshold_seconds and threshold_seconds > 0 else None
+    _explain = explain
+    _max_shapes = max_shapes
+
+
+def reset() -> None:
+    with _lock:
+        _report.clear()
+
+
+def top(limit: int = 20, sort: str = "total") -> List[Dict[str, Any]]:
+    """
+    The report's `limit` slowest shapes by total, max or mean time, or count.
+
+    Raises:
+        ValueError: For an unknown sort key
+    """
+    if sort not in _SORT_KEYS:
+        raise ValueError(f"Unknown sort {sort!r}; use one of {', '.join(_SORT_KEYS)}")
+    with _lock:
+        entries = sorted(_report.values(), key=_SORT_KEYS[sort], reverse=True)[:limit]
+        return [entry.as_dict() for entry in entries]
+
+
+def explain(conn, statement: str, parameters: Any) -> str:
+    """The database's plan for a statement, as text."""
+    dialect = conn.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if dialect == "postgresql":
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception:
+            if dialect == "postgresql":
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        if dialect == "postgresql":
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+    # SQLite rows are (id, parent, notused, detail); other dialects return one text column
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _threshold is not None:
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("slow_query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if _threshold is None or elapsed < _threshold:
+        return
+    _record(conn, statement, parameters, executemany, elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context) -> None:
+    started = context.connection.info.get("slow_query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def _record(conn, statement: str, parameters: Any, executemany: bool, elapsed: float) -> None:
+    shape = statement_shape(statement)
+    key = fingerprint(shape)
+    route = current_route() or "-"
+    params = parameter_shape(parameters, executemany)
+
+    with _lock:
+        entry = _report.get(key)
+        if entry is None:
+            if len(_report) >= _max_shapes:
+                del _report[min(_report.values(), key=lambda e: e.total).fingerprint]
+            entry = _report[key] = SlowQuery(key, shape, params)
+        entry.count += 1
+        entry.total += elapsed
+        entry.max = max(entry.max, elapsed)
+        entry.last_seen = time.time()
+        entry.routes[route] = entry.routes.get(route, 0) + 1
+        needs_plan = entry.plan is None
+
+    plan = None
+    if needs_plan and _explain and not executemany and shape.lstrip().upper().startswith(_EXPLAINABLE):
+        try:
+            plan = explain(conn, statement, parameters)
+        except Exception as e:
+            plan = f"EXPLAIN failed: {e}"
+        entry.plan = plan
+
+    logger.warning(
+        "slow query %.1f ms route=%s fingerprint=%s params=%s: %s",
+        elapsed * 1000, route, key, params, shape[:500],
+        extra={"slow_query": {
+            "fingerprint": key, "ms": round(elapsed * 1000, 3), "route": route,
+            "statement": shape, "parameters": params, "plan": plan,
+        }},
+    )
@@ -0,0 +1,135 @@
+"""Benchmark response serialization for a 100-item project list page.
+
+Loads one page of projects (with financials and risk assessments) from a
+throwaway SQLite database, then measures the CPU time to turn it into JSON
+bytes the way FastAPI does by default (validate into the response model, dump
+in JSON mode, ``json.dumps``) against the trusted fast path
+(``trusted_dump`` + orjson, and + stdlib json when orjson is missing).
+Finally it times query plus serialization for the full page against a
+``fields=`` card projection.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization --items 100 --repeat 200
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import responses
+from app.core.database import Base
+from app.models.project import Project, ProjectFinancials, ProjectRiskAssessment
+from app.schemas.project import ProjectListResponse, ProjectResponse
+from app.utils.fieldsets import load_options, parse_fields
+
+CARD_FIELDS = "name,sector,country,investment_usd,verification_level"
+
+SECTORS = ["Energy", "Transport", "Water", "Ports", "Rail"]
+COUNTRIES = ["Nigeria", "Kenya", "Ghana", "South Africa", "Egypt"]
+
+
+def seed(session, items, rng):
+    for i in range(items):
+        project = Project(
+            sponsor_org_id=1, name=f"Project {i}", sector=SECTORS[i % len(SECTORS)],
+            country=COUNTRIES[i % len(COUNTRIES)], summary="Utility-scale infrastructure " * 4,
+            latitude=Decimal(f"{rng.uniform(-30, 30):.7f}"), longitude=Decimal(f"{rng.uniform(-15, 45):.7f}"),
+            investment_usd=Decimal(f"{rng.lognormal(18, 1):.2f}"), expected_roi_pct=Decimal("12.50"),
+            payback_years=Decimal("7.5"), capacity_value=Decimal("150.000"), risk_score=int(rng.integers(0, 100)),
+            sdg_tags="SDG7,SDG9,SDG13", description="Project narrative. " * 150,
+            impact_statement="Expected impact. " * 40, created_at=datetime.utcnow(), updated_at=datetime.utcnow(),
+        )
+        session.add(project)
+        session.flush()
+        session.add(ProjectFinancials(
+            project_id=project.id, currency="USD", capex_usd=Decimal("125000000.00"),
+            opex_usd_annual=Decimal("2500000.00"), irr_pct=Decimal("14.20"), roi_pct=Decimal("12.50"),
+            timeline_json={"construction_years": 2, "operating_years": 25},
+            assumptions_json={"discount_rate_pct": 10, "tariff": [0.12, 0.13, 0.14]},
+        ))
+        session.add(ProjectRiskAssessment(
+            project_id=project.id, overall_score=55, category_scores={"political": 60, "currency": 45},
+            model_version="v1", inputs_json={"country": project.country}, narrative="Moderate risk.",
+        ))
+    session.commit()
+
+
+def default_path(payload):
+    # What FastAPI does with response_model: validate from attributes, dump in JSON mode, json.dumps
+    model = ProjectListResponse.model_validate(payload, from_attributes=True)
+    return json.dumps(model.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(payload):
+    return responses.dumps(responses.trusted_dump(ProjectListResponse, payload))
+
+
+def cpu_ms(fn, payload, repeat):
+    fn(payload)
+    started = time.process_time()
+    for _ in range(repeat):
+        body = fn(payload)
+    return (time.process_time() - started) / repeat * 1000, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=[
+        Project.__table__, ProjectFinancials.__table__, ProjectRiskAssessment.__table__,
+    ])
+    session = sessionmaker(bind=engine)()
+    seed(session, args.items, np.random.default_rng(7))
+
+    items = (
+        session.query(Project)
+        .options(selectinload(Project.financials), selectinload(Project.risk_assessments))
+        .order_by(Project.id)
+        .all()
+    )
+    payload = {"items": items, "total": len(items), "page": 1, "page_size": len(items), "pages": 1}
+
+    default_ms, default_body = cpu_ms(default_path, payload, args.repeat)
+    print(f"{len(items)} items, {len(default_body) / 1024:.1f} KiB of JSON")
+    print(f"  {'fastapi default (validate + dump + json)':<42} {default_ms:8.3f} ms")
+
+    variants = [("trusted_dump + json", None)]
+    if responses.orjson is not None:
+        variants.insert(0, ("trusted_dump + orjson", responses.orjson))
+    saved = responses.orjson
+    try:
+        for label, encoder in variants:
+            responses.orjson = encoder
+            ms, body = cpu_ms(fast_path, payload, args.repeat)
+            assert json.loads(body) == json.loads(default_body), "fast path output differs"
+            print(f"  {label:<42} {ms:8.3f} ms  ({default_ms / ms:.1f}x)")
+    finally:
+        responses.orjson = saved
+
+    def page(fields):
+        session.expunge_all()
+        selected = parse_fields(ProjectResponse, fields)
+        rows = session.query(Project).options(*load_options(Project, selected)).order_by(Project.id).all()
+        return responses.dumps([responses.trusted_dump(ProjectResponse, row, selected) for row in rows])
+
+    print(f"query + serialization (lazy relationships, as in list_projects); card: fields={CARD_FIELDS}")
+    for label, fields in (("all fields", None), ("card fields", CARD_FIELDS)):
+        started = time.perf_counter()
+        for _ in range(max(args.repeat // 10, 1)):
+            body = page(fields)
+        ms = (time.perf_counter() - started) / max(args.repeat // 10, 1) * 1000
+        print(f"  {label:<42} {ms:8.3f} ms  {len(body) / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
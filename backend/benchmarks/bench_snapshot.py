@@ -0,0 +1,128 @@
+"""Benchmark the columnar project snapshot against SQL aggregates and filters.
+
+Seeds a throwaway SQLite database (in memory unless --url is given) with
+synthetic projects, then times the same dashboard queries both ways and
+reports the snapshot's memory footprint and incremental refresh cost.
+
+Usage (from backend/):
+    python -m benchmarks.bench_snapshot --projects 100000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine, func, insert, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.project import Project
+from app.services.project_snapshot import ProjectSnapshot
+
+SECTORS = ["Energy", "Transport", "Water", "Ports", "Rail", "Roads", "Mining", "Agriculture", "Health", "Telecom"]
+COUNTRIES = ["Nigeria", "Kenya", "Ghana", "South Africa", "Egypt", "Ethiopia", "Senegal", "Tanzania",
+             "Morocco", "Rwanda", "Uganda", "Zambia", "Angola", "Cameroon", "Ivory Coast"]
+STATUSES = ["draft", "submitted", "active", "archived"]
+LEVELS = ["V0", "V1", "V2", "V3", "V4", "V5"]
+
+
+def seed(session, projects, rng):
+    # Spread writes over the past so the refresh watermark is realistic
+    start = datetime.utcnow() - timedelta(seconds=projects + 60)
+    rows = [
+        {
+            "uuid": f"bench-{i}",
+            "sponsor_org_id": int(rng.integers(1, 500)),
+            "name": f"Project {i}",
+            "sector": SECTORS[rng.integers(len(SECTORS))],
+            "country": COUNTRIES[rng.integers(len(COUNTRIES))],
+            "status": STATUSES[rng.integers(len(STATUSES))],
+            "verification_level": LEVELS[rng.integers(len(LEVELS))],
+            "investment_usd": float(rng.lognormal(18, 1)),
+            "expected_roi_pct": float(rng.normal(12, 4)),
+            "risk_score": int(rng.integers(0, 101)),
+            "is_featured": False,
+            "created_at": start + timedelta(seconds=i),
+            "updated_at": start + timedelta(seconds=i),
+        }
+        for i in range(projects)
+    ]
+    for offset in range(0, len(rows), 10_000):
+        session.execute(insert(Project), rows[offset:offset + 10_000])
+    session.commit()
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100_000)
+    parser.add_argument("--updates", type=int, default=1_000, help="Rows changed before the incremental refresh")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--url", default="sqlite://")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=[Project.__table__])
+    session = sessionmaker(bind=engine)()
+    rng = np.random.default_rng(7)
+    seed(session, args.projects, rng)
+
+    build_ms, snapshot = timed(lambda: ProjectSnapshot.build(session), 1)
+
+    def sql_aggregate():
+        return session.query(
+            Project.sector, func.count(Project.id), func.sum(Project.investment_usd),
+            func.avg(Project.expected_roi_pct), func.avg(Project.risk_score),
+        ).filter(
+            Project.status.in_(["active", "submitted"]), Project.country.in_(["Nigeria", "Kenya", "Ghana"])
+        ).group_by(Project.sector).all()
+
+    def snapshot_aggregate():
+        mask = snapshot.mask(status=["active", "submitted"], country=["Nigeria", "Kenya", "Ghana"])
+        return snapshot.aggregate("sector", mask)
+
+    def sql_filter():
+        return [r[0] for r in session.query(Project.id).filter(
+            Project.sector == "Energy", Project.risk_score <= 40, Project.investment_usd >= 50e6,
+        ).order_by(Project.investment_usd.desc()).limit(100)]
+
+    def snapshot_filter():
+        mask = snapshot.mask(sector=["Energy"], max_risk_score=40, min_investment_usd=50e6)
+        return snapshot.select_ids(mask, sort="investment_usd", descending=True, limit=100)
+
+    sql_agg_ms, sql_groups = timed(sql_aggregate, args.repeat)
+    snap_agg_ms, snap_groups = timed(snapshot_aggregate, args.repeat)
+    sql_filter_ms, sql_ids = timed(sql_filter, args.repeat)
+    snap_filter_ms, snap_ids = timed(snapshot_filter, args.repeat)
+
+    changed = rng.choice(np.arange(1, args.projects + 1), size=min(args.updates, args.projects), replace=False)
+    session.execute(update(Project), [
+        {"id": int(i), "status": "archived", "updated_at": datetime.utcnow()} for i in changed
+    ])
+    session.commit()
+    refresh_ms, refreshed = timed(lambda: snapshot.refreshed(session), 1)
+
+    print(f"{args.projects} projects ({engine.dialect.name})")
+    print(f"  snapshot memory:     {snapshot.nbytes / 1024 / 1024:9.2f} MiB")
+    print(f"  full build:          {build_ms:9.1f} ms")
+    print(f"  incremental refresh: {refresh_ms:9.1f} ms  ({len(changed)} changed rows)")
+    print(f"  aggregate  SQL:      {sql_agg_ms:9.2f} ms")
+    print(f"  aggregate  snapshot: {snap_agg_ms:9.2f} ms  ({sql_agg_ms / snap_agg_ms:.0f}x)")
+    print(f"  filter     SQL:      {sql_filter_ms:9.2f} ms")
+    print(f"  filter     snapshot: {snap_filter_ms:9.2f} ms  ({sql_filter_ms / snap_filter_ms:.0f}x)")
+    print(f"  same groups: {sorted(r[0] for r in sql_groups) == sorted(g['key'] for g in snap_groups)}"
+          f"  same ids: {sql_ids == snap_ids}"
+          f"  refresh applied: {refreshed.mask(status=['archived']).sum() >= len(changed)}")
+
+
+if __name__ == "__main__":
+    main()
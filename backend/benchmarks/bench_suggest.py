@@ -0,0 +1,98 @@
+"""Benchmark typeahead suggestion latency at catalogue scale.
+
+Builds a SuggestIndex over synthetic project and organization names and
+replays typed prefixes (a share of them with typos), reporting latency
+percentiles against a LIKE '%q%'-style substring scan.
+
+Usage (from backend/):
+    python -m benchmarks.bench_suggest --entities 100000 --queries 5000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.suggest_service import SuggestIndex, normalize
+
+PLACES = ["Lagos", "Abuja", "Kano", "Nairobi", "Mombasa", "Kisumu", "Accra", "Kumasi", "Dakar", "Thiès",
+          "Addis Ababa", "Dar es Salaam", "Kampala", "Kigali", "Lusaka", "Luanda", "Douala", "Abidjan",
+          "Casablanca", "Tangier", "Cairo", "Alexandria", "Johannesburg", "Durban", "Maputo", "Harare"]
+ASSETS = ["Solar Farm", "Wind Park", "Water Works", "Port Expansion", "Ring Road", "Light Rail", "Toll Bridge",
+          "Hydro Dam", "Grid Upgrade", "Desalination Plant", "Fibre Backbone", "Teaching Hospital",
+          "Irrigation Scheme", "Cold Chain Hub", "Bus Rapid Transit", "Waste-to-Energy Plant"]
+ORG_WORDS = ["Capital", "Partners", "Infrastructure", "Holdings", "Development", "Bank", "Fund", "Energy",
+             "Ventures", "Group", "Finance", "Investments"]
+
+
+def make_names(entities, rng):
+    names = []
+    for i in range(entities):
+        if i % 5 == 0:
+            words = rng.choice(ORG_WORDS, size=2, replace=False)
+            names.append(("organization", i, f"{PLACES[i % len(PLACES)]} {words[0]} {words[1]} {i}"))
+        else:
+            phase = "" if i % 3 else f" Phase {i % 7 + 1}"
+            names.append(("project", i, f"{rng.choice(PLACES)} {rng.choice(ASSETS)}{phase} {i}"))
+    return names
+
+
+def make_queries(names, count, typo_share, rng):
+    queries = []
+    for _ in range(count):
+        words = normalize(names[rng.integers(len(names))][2]).split()
+        start = rng.integers(len(words))
+        query = " ".join(words[start:start + 2])[: rng.integers(1, 12)]
+        if rng.random() < typo_share and len(query) > 4:
+            i = rng.integers(1, len(query) - 1)
+            query = query[:i] + query[i + 1:]
+        queries.append(query)
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=5_000)
+    parser.add_argument("--typos", type=float, default=0.2, help="Share of queries with a dropped letter")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    names = make_names(args.entities, rng)
+    queries = make_queries(names, args.queries, args.typos, rng)
+
+    index = SuggestIndex()
+    started = time.perf_counter()
+    index.bulk_load(names)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        index.suggest(query, limit=10)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    lowered = [normalize(name) for _, _, name in names]
+    scan = []
+    for query in queries[:200]:
+        started = time.perf_counter()
+        q = normalize(query)
+        [name for name in lowered if q in name][:10]
+        scan.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    index.add("project", args.entities + 1, "Kigali Innovation City")
+    index.remove("project", 3)
+    update_ms = (time.perf_counter() - started) * 1000
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{args.entities} entities, {len(queries)} queries ({args.typos:.0%} with typos)")
+    print(f"  build:          {build_ms:9.1f} ms  ({len(index)} entries)")
+    print(f"  suggest p50:    {p50:9.3f} ms")
+    print(f"  suggest p95:    {p95:9.3f} ms")
+    print(f"  suggest p99:    {p99:9.3f} ms")
+    print(f"  substring scan: {np.median(scan):9.3f} ms median")
+    print(f"  add + remove:   {update_ms:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 # main.py
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from fastapi import FastAPI
 from backend.models import Base
 from backend.routers.projects import router as projects_router
@@ -9,28 +12,44 @@ from backend.routers.data_rooms import router as data_rooms_router
 from backend.routers.analytics import router as analytics_router
 from backend.routers.events import router as events_router
 from backend.routers.auth import router as auth_router
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from backend.database import engine
+from backend.database import engine, SessionLocal
+from backend.rollups import ensure_rollups
 from pathlib import Path
-from fastapi.staticfiles import StaticFiles
+from app.utils.compression import CompressionMiddleware, PrecompressedStaticFiles
+from app.utils.metrics import MetricsMiddleware, metrics_response, pool_collector, registry, threadpool_collector
+from app.utils.query_stats import QueryStatsMiddleware
 
 # Create FastAPI app first
 app = FastAPI(title="AIP API", version="1.0")
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+app.add_middleware(QueryStatsMiddleware, expose_headers=os.getenv("ENVIRONMENT", "development") == "development")
+app.add_middleware(MetricsMiddleware)
+registry.add_collector(pool_collector(engine, "legacy"))
 
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Async so reading the threadpool does not itself occupy a worker thread
+    threadpool = list(threadpool_collector())
+    return metrics_response([lambda: threadpool])
+
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        ensure_rollups(db)
+    finally:
+        db.close()
 
 # Mount static files after app is created
 _static_dir = Path(__file__).parent / "static"
 if _static_dir.exists():
-    app.mount("/static", StaticFiles(directory=str(_static_dir), html=True), name="frontend")
+    # Serves .br/.gz variants written by `python -m app.utils.compression static`
+    app.mount("/static", PrecompressedStaticFiles(directory=str(_static_dir), html=True), name="frontend")
 
 
 app.include_router(projects_router)
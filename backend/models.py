@@ -1,5 +1,5 @@
 # models.py
-from sqlalchemy import Column, Integer, String, Float, Date, Enum as SQLEnum, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Float, Date, Enum as SQLEnum, ForeignKey, Boolean, DateTime, UniqueConstraint
 from sqlalchemy.orm import relationship
 from backend.database import Base
 from enum import Enum as PyEnum
@@ -141,6 +141,26 @@ class AnalyticReport(Base):
     created_at = Column(DateTime, default=datetime.datetime.now)
 
 
+class AnalyticsRollup(Base):
+    """Pre-aggregated project totals per (sector, stage, country, verification level) cell.
+
+    Maintained incrementally by backend.rollups on project and verification writes.
+    """
+    __tablename__ = "analytics_rollups"
+    __table_args__ = (UniqueConstraint("sector", "stage", "country", "verification_level"),)
+
+    id = Column(Integer, primary_key=True)
+    sector = Column(String, nullable=False)
+    stage = Column(String, nullable=False)
+    country = Column(String, nullable=False)
+    verification_level = Column(String, nullable=False)
+    project_count = Column(Integer, nullable=False, default=0)
+    capex_total = Column(Float, nullable=False, default=0.0)
+    funding_gap_total = Column(Float, nullable=False, default=0.0)
+    funding_gap_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+
 class Event(Base):
     __tablename__ = "events"
 
@@ -0,0 +1,344 @@
+"""
+backend.rollups
+
+Incrementally maintained portfolio rollups for the /analytics router.
+
+Every project contributes to exactly one ``analytics_rollups`` cell, keyed by
+(sector, stage, country, verification level), where the verification level is
+that of the project's most recent verification. ORM events on Project and
+Verification apply the deltas inside the same flush as the write, so the
+rollups commit (or roll back) together with the data. Reads group a few
+thousand cells at most, however many projects there are.
+
+Bulk Core writes (``query.update()``, ``insert()`` with parameter lists)
+bypass the ORM events; call ``rebuild_rollups`` after those, or
+``add_new_projects`` after a bulk insert of new projects.
+"""
+from __future__ import annotations
+
+import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, attributes
+
+from backend import models
+
+UNKNOWN = "Unknown"
+UNVERIFIED = "Unverified"
+
+DIMENSIONS = ("sector", "stage", "country", "verification_level")
+
+_rollups = models.AnalyticsRollup.__table__
+_projects = models.Project.__table__
+_verifications = models.Verification.__table__
+
+Cell = Tuple[str, str, str, str]
+
+
+def _label(value: Any) -> str:
+    if value is None:
+        return UNKNOWN
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def _amounts(capex: Optional[float], funding_gap: Optional[float]) -> Tuple[float, float, int]:
+    gap = funding_gap or 0.0
+    return capex or 0.0, gap, 1 if gap > 0 else 0
+
+
+def _apply(connection: Connection, cell: Cell, sign: int, capex: Optional[float], funding_gap: Optional[float]) -> None:
+    """Add (sign=1) or remove (sign=-1) one project's contribution to a cell."""
+    capex, gap, gap_count = _amounts(capex, funding_gap)
+    _add(connection, cell, sign, sign * capex, sign * gap, sign * gap_count)
+
+
+def _add(connection: Connection, cell: Cell, count: int, capex: float, gap: float, gap_count: int) -> None:
+    sector, stage, country, level = cell
+    result = connection.execute(
+        update(_rollups)
+        .where(
+            _rollups.c.sector == sector,
+            _rollups.c.stage == stage,
+            _rollups.c.country == country,
+            _rollups.c.verification_level == level,
+        )
+        .values(
+            project_count=_rollups.c.project_count + count,
+            capex_total=_rollups.c.capex_total + capex,
+            funding_gap_total=_rollups.c.funding_gap_total + gap,
+            funding_gap_count=_rollups.c.funding_gap_count + gap_count,
+            updated_at=datetime.datetime.utcnow(),
+        )
+    )
+    if result.rowcount == 0:
+        connection.execute(
+            insert(_rollups).values(
+                sector=sector,
+                stage=stage,
+                country=country,
+                verification_level=level,
+                project_count=count,
+                capex_total=capex,
+                funding_gap_total=gap,
+                funding_gap_count=gap_count,
+                updated_at=datetime.datetime.utcnow(),
+            )
+        )
+
+
+def add_new_projects(connection: Connection, projects: List[Dict[str, Any]]) -> None:
+    """
+    Count projects inserted with a bulk ``insert()`` (one UPDATE per cell).
+
+    New projects have no verifications yet, so they all land in Unverified cells.
+    """
+    cells: Dict[Cell, List[float]] = {}
+    for project in projects:
+        cell = (_label(project.get("sector")), _label(project.get("stage")), _label(project.get("country")), UNVERIFIED)
+        capex, gap, gap_count = _amounts(project.get("estimated_capex"), project.get("funding_gap"))
+        totals = cells.setdefault(cell, [0, 0.0, 0.0, 0])
+        totals[0] += 1
+        totals[1] += capex
+        totals[2] += gap
+        totals[3] += gap_count
+    for cell, totals in cells.items():
+        _add(connection, cell, *totals)
+
+
+def _latest_level(connection: Connection, project_id: int, before_id: Optional[int] = None) -> str:
+    """Level of a project's most recent verification (optionally older than before_id)."""
+    query = select(_verifications.c.level).where(_verifications.c.project_id == project_id)
+    if before_id is not None:
+        query = query.where(_verifications.c.id < before_id)
+    level = connection.execute(query.order_by(_verifications.c.id.desc()).limit(1)).scalar()
+    return _label(level) if level is not None else UNVERIFIED
+
+
+def _has_newer(connection: Connection, project_id: int, verification_id: int) -> bool:
+    """True if the project has a verification newer than verification_id."""
+    newer = connection.execute(
+        select(func.count()).select_from(_verifications).where(
+            _verifications.c.project_id == project_id,
+            _verifications.c.id > verification_id,
+        )
+    ).scalar()
+    return bool(newer)
+
+
+def _move_level(connection: Connection, project_id: Optional[int], old_level: str, new_level: str) -> None:
+    if project_id is None or old_level == new_level:
+        return
+    project = connection.execute(
+        select(
+            _projects.c.sector, _projects.c.stage, _projects.c.country,
+            _projects.c.estimated_capex, _projects.c.funding_gap,
+        ).where(_projects.c.id == project_id)
+    ).first()
+    if project is None:
+        return
+    key = (_label(project.sector), _label(project.stage), _label(project.country))
+    _apply(connection, key + (old_level,), -1, project.estimated_capex, project.funding_gap)
+    _apply(connection, key + (new_level,), 1, project.estimated_capex, project.funding_gap)
+
+
+def _old_value(target: Any, name: str) -> Any:
+    history = attributes.get_history(target, name)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, name)
+
+
+@event.listens_for(models.Project, "after_insert")
+def _project_inserted(mapper, connection, target: models.Project) -> None:
+    cell = (_label(target.sector), _label(target.stage), _label(target.country), _latest_level(connection, target.id))
+    _apply(connection, cell, 1, target.estimated_capex, target.funding_gap)
+
+
+@event.listens_for(models.Project, "after_update")
+def _project_updated(mapper, connection, target: models.Project) -> None:
+    tracked = ("sector", "stage", "country", "estimated_capex", "funding_gap")
+    if not any(attributes.get_history(target, name).has_changes() for name in tracked):
+        return
+    level = _latest_level(connection, target.id)
+    old = {name: _old_value(target, name) for name in tracked}
+    _apply(
+        connection,
+        (_label(old["sector"]), _label(old["stage"]), _label(old["country"]), level),
+        -1, old["estimated_capex"], old["funding_gap"],
+    )
+    _apply(
+        connection,
+        (_label(target.sector), _label(target.stage), _label(target.country), level),
+        1, target.estimated_capex, target.funding_gap,
+    )
+
+
+@event.listens_for(models.Project, "after_delete")
+def _project_deleted(mapper, connection, target: models.Project) -> None:
+    old = {name: _old_value(target, name) for name in ("sector", "stage", "country", "estimated_capex", "funding_gap")}
+    cell = (_label(old["sector"]), _label(old["stage"]), _label(old["country"]), _latest_level(connection, target.id))
+    _apply(connection, cell, -1, old["estimated_capex"], old["funding_gap"])
+
+
+@event.listens_for(models.Verification, "after_insert")
+def _verification_inserted(mapper, connection, target: models.Verification) -> None:
+    if target.project_id is None or _has_newer(connection, target.project_id, target.id):
+        return
+    previous = _latest_level(connection, target.project_id, before_id=target.id)
+    _move_level(connection, target.project_id, previous, _label(target.level))
+
+
+@event.listens_for(models.Verification, "after_update")
+def _verification_updated(mapper, connection, target: models.Verification) -> None:
+    level_history = attributes.get_history(target, "level")
+    project_history = attributes.get_history(target, "project_id")
+    if not (level_history.has_changes() or project_history.has_changes()):
+        return
+    old_project_id = _old_value(target, "project_id")
+    old_level = _label(_old_value(target, "level"))
+    if old_project_id != target.project_id:
+        # Re-derive both projects' levels from what is now in the table
+        if old_project_id is not None and not _has_newer(connection, old_project_id, target.id):
+            _move_level(connection, old_project_id, old_level, _latest_level(connection, old_project_id))
+        if target.project_id is not None and not _has_newer(connection, target.project_id, target.id):
+            previous = _latest_level(connection, target.project_id, before_id=target.id)
+            _move_level(connection, target.project_id, previous, _label(target.level))
+    elif not _has_newer(connection, target.project_id, target.id):
+        _move_level(connection, target.project_id, old_level, _label(target.level))
+
+
+@event.listens_for(models.Verification, "after_delete")
+def _verification_deleted(mapper, connection, target: models.Verification) -> None:
+    project_id = _old_value(target, "project_id")
+    if project_id is None or _has_newer(connection, project_id, target.id):
+        return
+    _move_level(connection, project_id, _label(_old_value(target, "level")), _latest_level(connection, project_id))
+
+
+def rebuild_rollups(db: Session) -> int:
+    """
+    Recompute every rollup cell from the projects table.
+
+    Used to backfill existing databases and after bulk writes that bypass the
+    ORM events.
+
+    Returns:
+        Number of non-empty cells written
+    """
+    latest = (
+        select(_verifications.c.project_id, func.max(_verifications.c.id).label("verification_id"))
+        .group_by(_verifications.c.project_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(
+            _projects.c.sector,
+            _projects.c.stage,
+            _projects.c.country,
+            _verifications.c.level,
+            _projects.c.estimated_capex,
+            _projects.c.funding_gap,
+        )
+        .select_from(_projects)
+        .outerjoin(latest, latest.c.project_id == _projects.c.id)
+        .outerjoin(_verifications, _verifications.c.id == latest.c.verification_id)
+    )
+
+    cells: Dict[Cell, List[float]] = {}
+    for row in rows:
+        cell = (
+            _label(row.sector), _label(row.stage), _label(row.country),
+            _label(row.level) if row.level is not None else UNVERIFIED,
+        )
+        capex, gap, gap_count = _amounts(row.estimated_capex, row.funding_gap)
+        totals = cells.setdefault(cell, [0, 0.0, 0.0, 0])
+        totals[0] += 1
+        totals[1] += capex
+        totals[2] += gap
+        totals[3] += gap_count
+
+    now = datetime.datetime.utcnow()
+    db.execute(_rollups.delete())
+    if cells:
+        db.execute(insert(_rollups), [
+            {
+                "sector": sector, "stage": stage, "country": country, "verification_level": level,
+                "project_count": count, "capex_total": capex, "funding_gap_total": gap,
+                "funding_gap_count": gap_count, "updated_at": now,
+            }
+            for (sector, stage, country, level), (count, capex, gap, gap_count) in cells.items()
+        ])
+    db.commit()
+    return len(cells)
+
+
+def ensure_rollups(db: Session) -> None:
+    """Backfill the rollups if they are empty but projects exist (e.g. after upgrading)."""
+    has_rollups = db.execute(select(_rollups.c.id).limit(1)).first() is not None
+    has_projects = db.execute(select(_projects.c.id).limit(1)).first() is not None
+    if has_projects and not has_rollups:
+        rebuild_rollups(db)
+
+
+def query_rollups(
+    db: Session,
+    dimension: str,
+    sector: Optional[str] = None,
+    stage: Optional[str] = None,
+    country: Optional[str] = None,
+    verification_level: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Group the rollup cells by one dimension, optionally filtered on the others.
+
+    Filter values are the enum values as stored (e.g. "Energy", "Concept",
+    "V1: Sponsor Identity Verified", or "Unverified").
+
+    Raises:
+        ValueError: If dimension is not one of DIMENSIONS
+    """
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Invalid dimension: {dimension}")
+
+    filters = []
+    for name, value in (("sector", sector), ("stage", stage), ("country", country),
+                        ("verification_level", verification_level)):
+        if value is not None:
+            filters.append(_rollups.c[name] == value)
+
+    key = _rollups.c[dimension]
+    count = func.sum(_rollups.c.project_count)
+    rows = db.execute(
+        select(
+            key.label("key"),
+            count.label("project_count"),
+            func.sum(_rollups.c.capex_total).label("capex_total"),
+            func.sum(_rollups.c.funding_gap_total).label("funding_gap_total"),
+            func.sum(_rollups.c.funding_gap_count).label("funding_gap_count"),
+        )
+        .where(*filters)
+        .group_by(key)
+        .having(count > 0)
+        .order_by(func.sum(_rollups.c.capex_total).desc(), key)
+    ).all()
+
+    groups = [
+        {
+            "key": row.key,
+            "project_count": int(row.project_count),
+            "capex_total": float(row.capex_total or 0),
+            "funding_gap_total": float(row.funding_gap_total or 0),
+            "funding_gap_count": int(row.funding_gap_count or 0),
+        }
+        for row in rows
+    ]
+    totals = {
+        "key": "total",
+        "project_count": sum(g["project_count"] for g in groups),
+        "capex_total": sum(g["capex_total"] for g in groups),
+        "funding_gap_total": sum(g["funding_gap_total"] for g in groups),
+        "funding_gap_count": sum(g["funding_gap_count"] for g in groups),
+    }
+    return {"dimension": dimension, "groups": groups, "totals": totals}
@@ -1,9 +1,9 @@
 # routers/analytics.py
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from backend.schemas import AnalyticReport, AnalyticReportCreate
+from backend.schemas import AnalyticReport, AnalyticReportCreate, AnalyticsRollups
 from backend.database import get_db
-from backend import models
+from backend import models, rollups
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
@@ -19,6 +19,30 @@ def _get_sector_enum(sector_str: str) -> models.Sector:
         raise HTTPException(status_code=422, detail=f"Invalid sector: {sector_str}")
 
 
+def _get_stage_enum(stage_str: str) -> models.ProjectStage:
+    """Convert stage string to enum."""
+    for s in models.ProjectStage:
+        if s.value == stage_str:
+            return s
+    try:
+        return models.ProjectStage[stage_str.upper()]
+    except KeyError:
+        raise HTTPException(status_code=422, detail=f"Invalid stage: {stage_str}")
+
+
+def _get_level_label(level_str: str) -> str:
+    """Convert verification level string to its stored label."""
+    if level_str == rollups.UNVERIFIED:
+        return level_str
+    for lvl in models.VerificationLevel:
+        if lvl.value == level_str:
+            return lvl.value
+    try:
+        return models.VerificationLevel[level_str.upper().replace(" ", "_").replace(":", "")].value
+    except KeyError:
+        raise HTTPException(status_code=422, detail=f"Invalid verification level: {level_str}")
+
+
 def _serialize_report(report: AnalyticReportCreate) -> dict:
     """Convert Pydantic model to dict with proper enum types."""
     data = report.model_dump()
@@ -53,6 +77,33 @@ def create(report: AnalyticReportCreate, db: Session = Depends(get_db)):
     return _deserialize_report(db_report)
 
 
+@router.get("/rollups", response_model=AnalyticsRollups)
+def read_rollups(
+    dimension: str = "sector",
+    sector: str = None,
+    stage: str = None,
+    country: str = None,
+    verification_level: str = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Pipeline value, funding gaps and project counts grouped by one dimension.
+
+    dimension is one of sector, stage, country or verification_level; the other
+    parameters filter the projects included. Served from pre-aggregated rollups.
+    """
+    if dimension not in rollups.DIMENSIONS:
+        raise HTTPException(status_code=422, detail=f"Invalid dimension: {dimension}")
+    return rollups.query_rollups(
+        db,
+        dimension,
+        sector=_get_sector_enum(sector).value if sector else None,
+        stage=_get_stage_enum(stage).value if stage else None,
+        country=country,
+        verification_level=_get_level_label(verification_level) if verification_level else None,
+    )
+
+
 @router.get("/{report_id}", response_model=AnalyticReport)
 def read(report_id: int, db: Session = Depends(get_db)):
     """Get an analytic report by ID."""
@@ -1,14 +1,22 @@
 # routers/projects.py
 import json
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from typing import List
 from backend.schemas import Project, ProjectCreate
 from backend.database import get_db
-from backend import models
+from backend import models, rollups
+from app.utils import bulk_import
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+# Rows per transaction for POST /projects/bulk, and upload bytes kept in memory before spooling to disk
+BULK_CHUNK_SIZE = 500
+BULK_SPOOL_BYTES = 8 * 1024 * 1024
+
 
 def _get_sector_enum(sector_str: str) -> models.Sector:
     """Convert sector string to enum."""
@@ -91,6 +99,75 @@ def create(project: ProjectCreate, db: Session = Depends(get_db)):
     return _deserialize_project(db_project)
 
 
+def _insert(db: Session, accepted: List[tuple]) -> List[bulk_import.RowResult]:
+    values = [data for _, data in accepted]
+    # Ordered RETURNING maps ids back to rows; it is one multi-row INSERT on
+    # PostgreSQL, while SQLite (no insert sentinel) runs it row by row in the
+    # same transaction
+    ids = db.scalars(
+        insert(models.Project).returning(models.Project.id, sort_by_parameter_order=True), values
+    ).all()
+    # The bulk insert skips the ORM events that maintain the analytics rollups
+    rollups.add_new_projects(db.connection(), values)
+    return [(line, project_id) for (line, _), project_id in zip(accepted, ids)]
+
+
+def _insert_projects(db: Session, rows: List[bulk_import.Row]) -> List[bulk_import.RowResult]:
+    """
+    Insert one chunk of validated rows with a single executemany.
+
+    If the chunk is rejected, its rows are retried one per transaction so the
+    report names the rows at fault.
+    """
+    results: List[bulk_import.RowResult] = []
+    accepted = []
+    for line, project in rows:
+        try:
+            accepted.append((line, _serialize_project(project)))
+        except HTTPException as e:
+            results.append((line, [{"loc": [], "msg": e.detail, "type": "enum"}]))
+    if not accepted:
+        return results
+
+    try:
+        inserted = _insert(db, accepted)
+        db.commit()
+        return results + inserted
+    except SQLAlchemyError:
+        db.rollback()
+
+    for row in accepted:
+        try:
+            results += _insert(db, [row])
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            message = str(getattr(e, "orig", None) or e).splitlines()[0]
+            results.append((row[0], [{"loc": [], "msg": message, "type": "database_error"}]))
+    return results
+
+
+@router.post("/bulk", response_class=StreamingResponse)
+async def bulk_create(request: Request, db: Session = Depends(get_db)):
+    """Import projects from a CSV (text/csv) or NDJSON (application/x-ndjson) body; streams per-row results."""
+    try:
+        fmt, charset = bulk_import.import_format(request.headers.get("content-type"))
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    upload = await bulk_import.spool(request.stream(), BULK_SPOOL_BYTES)
+    try:
+        records = bulk_import.open_records(upload, fmt, charset, ProjectCreate)
+    except ValueError as e:
+        upload.close()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def report():
+        with upload:
+            yield from bulk_import.run_import(records, lambda rows: _insert_projects(db, rows), BULK_CHUNK_SIZE)
+
+    return StreamingResponse(report(), media_type="application/x-ndjson")
+
+
 @router.get("/{project_id}", response_model=Project)
 def read(project_id: int, db: Session = Depends(get_db)):
     """Get a project by ID."""
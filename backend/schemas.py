@@ -152,6 +152,20 @@ class AnalyticReport(AnalyticReportBase):
         from_attributes = True
 
 
+class RollupGroup(BaseModel):
+    key: str
+    project_count: int
+    capex_total: float
+    funding_gap_total: float
+    funding_gap_count: int
+
+
+class AnalyticsRollups(BaseModel):
+    dimension: str
+    groups: List[RollupGroup]
+    totals: RollupGroup
+
+
 class EventBase(BaseModel):
     name: str
     description: str
@@ -8,6 +8,18 @@ from fastapi.testclient import TestClient
 from backend.database import Base, get_db
 from backend.main import app
 
+# The platform package (backend/app) is importable once backend.main has put
+# the backend directory on sys.path.
+from app.core.database import Base as PlatformBase, get_db as platform_get_db
+from app.core.security import get_password_hash
+from app.main import app as platform_app
+from app.models.user import User as PlatformUser
+from app.models.organization import Organization, OrgMember
+from app.services.response_cache import response_cache
+
+# Per-route SQL statement budgets for API requests
+pytest_plugins = ["tests.query_budget"]
+
 
 # Use in-memory SQLite for tests
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -19,6 +31,13 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+platform_engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+PlatformSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=platform_engine)
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -96,3 +115,103 @@ def created_investor(client, sample_investor_data):
     """Create and return an investor."""
     response = client.post("/investors/", json=sample_investor_data)
     return response.json()
+
+
+@pytest.fixture(scope="function")
+def platform_db():
+    """Create a fresh platform (app package) database session for each test."""
+    PlatformBase.metadata.create_all(bind=platform_engine)
+    session = PlatformSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        PlatformBase.metadata.drop_all(bind=platform_engine)
+        # Cached responses are keyed by id, which the next test's database reuses
+        response_cache.clear()
+
+
+@pytest.fixture(scope="function")
+def platform_client(platform_db):
+    """Create a test client for the platform app with overridden database dependency."""
+    def override_get_db():
+        try:
+            yield platform_db
+        finally:
+            pass
+
+    platform_app.dependency_overrides[platform_get_db] = override_get_db
+
+    test_client = TestClient(platform_app)
+    yield test_client
+
+    platform_app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def platform_user(platform_db):
+    """Create an active platform user who owns a sponsor organization."""
+    user = PlatformUser(
+        email="sponsor@example.com",
+        password_hash=get_password_hash("securepassword123"),
+        full_name="Test Sponsor",
+    )
+    platform_db.add(user)
+    platform_db.flush()
+
+    org = Organization(name="Test Sponsor Org", org_type="sponsor", created_by=user.id)
+    platform_db.add(org)
+    platform_db.flush()
+
+    platform_db.add(OrgMember(org_id=org.id, user_id=user.id, role="sponsor", is_owner=True))
+    platform_db.commit()
+    return user
+
+
+@pytest.fixture
+def platform_auth_headers(platform_client, platform_user):
+    """Authorization headers for platform_user."""
+    response = platform_client.post(
+        "/auth/login",
+        json={"email": "sponsor@example.com", "password": "securepassword123"},
+    )
+    token = response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+# Accounts for role_headers: role -> (email, organization name, organization type)
+ROLE_ACCOUNTS = {
+    "admin": ("admin@example.com", "Platform Ops", "admin"),
+    "verifier": ("verifier@example.com", "Independent Verifiers Ltd", "verifier"),
+}
+
+
+@pytest.fixture
+def role_headers(platform_client, platform_db):
+    """Log in as a member holding a role (a ROLE_ACCOUNTS key) in its own organization; returns its headers."""
+    def login(role):
+        email, org_name, org_type = ROLE_ACCOUNTS[role]
+        user = PlatformUser(email=email, password_hash=get_password_hash("securepassword123"))
+        platform_db.add(user)
+        platform_db.flush()
+        org = Organization(name=org_name, org_type=org_type)
+        platform_db.add(org)
+        platform_db.flush()
+        platform_db.add(OrgMember(org_id=org.id, user_id=user.id, role=role))
+        platform_db.commit()
+        response = platform_client.post("/auth/login", json={"email": email, "password": "securepassword123"})
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return login
+
+
+@pytest.fixture
+def admin_headers(role_headers):
+    """Authorization headers for a platform admin."""
+    return role_headers("admin")
+
+
+@pytest.fixture
+def verifier_headers(role_headers):
+    """Authorization headers for a user with the verifier role."""
+    return role_headers("verifier")
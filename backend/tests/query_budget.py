@@ -0,0 +1,72 @@
+# tests/query_budget.py
+"""
+Pytest plugin failing tests whose API requests issue too many SQL statements.
+
+Every request a test makes through a TestClient is counted by
+QueryStatsMiddleware (app.utils.query_stats). After the test body runs, each
+request is checked against a budget: the test's
+``@pytest.mark.query_budget(n)`` marker if present, else ROUTE_BUDGETS for its
+route, else DEFAULT_BUDGET. A failure lists the statement shapes that
+repeated, which is usually the N+1 to fix.
+
+    @pytest.mark.query_budget(3)                       # every request in the test
+    @pytest.mark.query_budget(2, route="GET /projects/{project_id}")
+"""
+import pytest
+
+from app.utils.query_stats import add_observer, remove_observer
+
+# Statements per request, including authentication lookups
+DEFAULT_BUDGET = 30
+ROUTE_BUDGETS = {
+    "GET /projects/": 6,
+    "GET /projects/{project_id}": 3,
+    "GET /projects/{project_id}/financials": 3,
+    "GET /projects/search": 6,
+    "GET /projects/geo/bbox": 2,
+    "GET /projects/geo/nearby": 2,
+    "GET /projects/geo/clusters": 2,
+    "GET /projects/tiles/{z}/{x}/{y}": 4,
+    "GET /organizations/": 3,
+    "GET /organizations/{org_id}": 3,
+    "GET /search/suggest": 2,
+    "POST /projects/": 6,
+    "POST /organizations/": 6,
+}
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "query_budget(limit, route=None): maximum SQL statements per request (optionally for one route)"
+    )
+
+
+def _budget(item, route):
+    for marker in item.iter_markers("query_budget"):
+        marked_route = marker.kwargs.get("route")
+        if marked_route is None or marked_route == route:
+            return marker.args[0]
+    return ROUTE_BUDGETS.get(route, DEFAULT_BUDGET)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    requests = []
+
+    def observer(method, route, status, stats):
+        requests.append((f"{method} {route}", stats.count, stats.repeated()))
+
+    add_observer(observer)
+    try:
+        result = yield
+    finally:
+        remove_observer(observer)
+
+    over = [(route, count, repeated) for route, count, repeated in requests if count > _budget(item, route)]
+    if over:
+        lines = []
+        for route, count, repeated in over:
+            lines.append(f"{route}: {count} SQL statements (budget {_budget(item, route)})")
+            lines += [f"    {n}x {shape[:160]}" for shape, n in repeated[:5]]
+        pytest.fail("Query budget exceeded:\n" + "\n".join(lines), pytrace=False)
+    return result
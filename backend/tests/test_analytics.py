@@ -257,3 +257,75 @@ class TestReportDataIntegrity:
         data = response.json()
         assert "created_at" in data
         assert data["created_at"] is not None
+
+
+class TestAnalyticsRollups:
+    """Tests for incrementally maintained portfolio rollups."""
+
+    def _create_project(self, client, sample_project_data, **overrides):
+        response = client.post("/projects/", json={**sample_project_data, **overrides})
+        assert response.status_code == 200
+        return response.json()["id"]
+
+    def _groups(self, client, query):
+        response = client.get(f"/analytics/rollups?{query}")
+        assert response.status_code == 200
+        return {g["key"]: g for g in response.json()["groups"]}, response.json()["totals"]
+
+    def test_rollups_track_project_writes(self, client, sample_project_data):
+        """Test pipeline value and funding gap totals by sector and country."""
+        self._create_project(client, sample_project_data)
+        self._create_project(client, sample_project_data, sector="Water", estimated_capex=10000000.0, funding_gap=None)
+        self._create_project(client, sample_project_data, country="Kenya", stage="Concept")
+
+        groups, totals = self._groups(client, "dimension=sector")
+        assert groups["Energy"]["project_count"] == 2
+        assert groups["Energy"]["capex_total"] == 100000000.0
+        assert groups["Energy"]["funding_gap_total"] == 60000000.0
+        assert groups["Water"]["funding_gap_count"] == 0
+        assert totals["project_count"] == 3
+
+        groups, _ = self._groups(client, "dimension=stage&country=Nigeria")
+        assert set(groups) == {"Feasibility"}
+        assert groups["Feasibility"]["project_count"] == 2
+
+    def test_verification_level_distribution(self, client, sample_project_data):
+        """Test that each project counts once, at its latest verification level."""
+        first = self._create_project(client, sample_project_data)
+        self._create_project(client, sample_project_data)
+        client.post("/verifications/", json={"project_id": first, "level": "V0: Submitted"})
+        client.post("/verifications/", json={"project_id": first, "level": "V2: Documents Verified"})
+
+        groups, totals = self._groups(client, "dimension=verification_level")
+        assert {k: g["project_count"] for k, g in groups.items()} == {
+            "V2: Documents Verified": 1, "Unverified": 1,
+        }
+        assert totals["project_count"] == 2
+
+        groups, _ = self._groups(client, "dimension=sector&verification_level=V2: Documents Verified")
+        assert groups["Energy"]["capex_total"] == 50000000.0
+
+    def test_rollups_follow_updates_and_rebuild(self, client, db_session, sample_project_data):
+        """Test ORM updates move projects between cells and rebuild agrees."""
+        from backend import models, rollups
+
+        project_id = self._create_project(client, sample_project_data)
+        project = db_session.get(models.Project, project_id)
+        project.stage = models.ProjectStage.CONSTRUCTION
+        project.funding_gap = 5000000.0
+        db_session.commit()
+
+        incremental = rollups.query_rollups(db_session, "stage")
+        assert [(g["key"], g["funding_gap_total"]) for g in incremental["groups"]] == [("Construction", 5000000.0)]
+        rollups.rebuild_rollups(db_session)
+        assert rollups.query_rollups(db_session, "stage") == incremental
+
+        db_session.delete(project)
+        db_session.commit()
+        assert rollups.query_rollups(db_session, "stage")["groups"] == []
+
+    def test_invalid_filters(self, client):
+        """Test validation of dimension and enum filters."""
+        assert client.get("/analytics/rollups?dimension=region").status_code == 422
+        assert client.get("/analytics/rollups?sector=Space").status_code == 422
+        assert client.get("/analytics/rollups?verification_level=V9").status_code == 422
@@ -0,0 +1,197 @@
+# tests/test_bulk_import.py
+"""
+Tests for bulk project import (CSV and NDJSON).
+"""
+import json
+
+import pytest
+from sqlalchemy import event, text
+
+from app.core.config import settings
+from app.models.project import Project
+from backend import models
+from backend.routers import projects as legacy_projects
+
+
+def _results(response):
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    return lines[:-1], lines[-1]["summary"]
+
+
+@pytest.fixture
+def org_id(platform_user):
+    return platform_user.org_memberships[0].org_id
+
+
+@pytest.fixture
+def count_inserts(platform_db):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO aip_projects"):
+            statements.append(statement)
+
+    engine = platform_db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestPlatformBulkImport:
+    """Tests for POST /projects/bulk."""
+
+    def test_csv_import(self, platform_client, platform_auth_headers, platform_db, org_id):
+        """Test that valid rows are created and invalid rows reported by line."""
+        body = (
+            "sponsor_org_id,name,sector,country,latitude,longitude,investment_usd\n"
+            f"{org_id},Lagos Solar Farm,Energy,Nigeria,6.5244,3.3792,50000000\n"
+            f"{org_id},,Water,Kenya,,,\n"
+            f'{org_id},"Kano Grid, Phase 2",Energy,Nigeria,,,not-a-number\n'
+            f"{org_id},Mombasa Port Expansion,Transport,Kenya,,,\n"
+        )
+        response = platform_client.post(
+            "/projects/bulk", content=body, headers={**platform_auth_headers, "Content-Type": "text/csv"}
+        )
+        assert response.status_code == 200
+        results, summary = _results(response)
+        assert summary == {"rows": 4, "created": 2, "failed": 2}
+        assert [(r["line"], r["status"]) for r in results] == [
+            (2, "created"), (3, "error"), (4, "error"), (5, "created"),
+        ]
+        assert results[1]["errors"][0]["loc"] == ["name"]
+        assert results[2]["errors"][0]["loc"] == ["investment_usd"]
+
+        project = platform_db.get(Project, results[0]["id"])
+        assert project.name == "Lagos Solar Farm"
+        assert project.created_by is not None
+        assert platform_db.get(Project, results[3]["id"]).latitude is None
+
+    def test_ndjson_import(self, platform_client, platform_auth_headers, org_id):
+        """Test NDJSON bodies, including malformed lines and unknown keys."""
+        lines = [
+            json.dumps({"sponsor_org_id": org_id, "name": "Nairobi Water Works", "sector": "Water"}),
+            "{not json",
+            json.dumps({"sponsor_org_id": org_id, "name": "Accra Metro", "sector": "Transport", "colour": "red"}),
+            json.dumps({"sponsor_org_id": 99999, "name": "Orphan", "sector": "Energy"}),
+        ]
+        response = platform_client.post(
+            "/projects/bulk", content="\n".join(lines) + "\n",
+            headers={**platform_auth_headers, "Content-Type": "application/x-ndjson"},
+        )
+        results, summary = _results(response)
+        assert summary == {"rows": 4, "created": 1, "failed": 3}
+        assert [r["status"] for r in results] == ["created", "error", "error", "error"]
+        assert results[1]["errors"][0]["type"] == "json_invalid"
+        assert results[2]["errors"] == [{"loc": ["colour"], "msg": "Unknown field", "type": "extra_forbidden"}]
+        assert results[3]["errors"][0]["loc"] == ["sponsor_org_id"]
+
+    def test_chunks_are_batched(self, platform_client, platform_auth_headers, org_id, count_inserts, monkeypatch):
+        """Test that each chunk is one INSERT, not one per row."""
+        monkeypatch.setattr(settings, "BULK_IMPORT_CHUNK_SIZE", 4)
+        body = "sponsor_org_id,name,sector\n" + "".join(f"{org_id},Project {i},Energy\n" for i in range(10))
+        response = platform_client.post(
+            "/projects/bulk", content=body, headers={**platform_auth_headers, "Content-Type": "text/csv"}
+        )
+        results, summary = _results(response)
+        assert summary["created"] == 10
+        assert len({r["id"] for r in results}) == 10
+        assert len(count_inserts) == 3
+
+    def test_derived_state_is_maintained(self, platform_client, platform_auth_headers, org_id):
+        """Test that imported projects are searchable and on the map."""
+        body = f"sponsor_org_id,name,sector,latitude,longitude\n{org_id},Kisumu Lakeside Solar,Energy,-0.0917,34.768\n"
+        platform_client.post("/projects/bulk", content=body, headers={**platform_auth_headers, "Content-Type": "text/csv"})
+
+        assert platform_client.get("/projects/search?q=lakeside").json()["total"] == 1
+        data = platform_client.get("/projects/geo/bbox?south=-1&west=34&north=1&east=35").json()
+        assert [p["name"] for p in data["items"]] == ["Kisumu Lakeside Solar"]
+
+    def test_bad_header(self, platform_client, platform_auth_headers):
+        """Test that unknown or missing columns are rejected before importing."""
+        headers = {**platform_auth_headers, "Content-Type": "text/csv"}
+        response = platform_client.post("/projects/bulk", content="name,sector,colour\n", headers=headers)
+        assert response.status_code == 400
+        assert "colour" in response.json()["detail"]
+        response = platform_client.post("/projects/bulk", content="name,sector\n", headers=headers)
+        assert response.status_code == 400
+        assert "sponsor_org_id" in response.json()["detail"]
+
+    def test_unsupported_type(self, platform_client, platform_auth_headers):
+        response = platform_client.post(
+            "/projects/bulk", content="[]", headers={**platform_auth_headers, "Content-Type": "application/json"}
+        )
+        assert response.status_code == 415
+        for charset in ("bogus", "base64"):
+            response = platform_client.post(
+                "/projects/bulk", content="name\n",
+                headers={**platform_auth_headers, "Content-Type": f"text/csv; charset={charset}"},
+            )
+            assert response.status_code == 415
+            assert charset in response.json()["detail"]
+
+    def test_requires_auth(self, platform_client):
+        response = platform_client.post("/projects/bulk", content="", headers={"Content-Type": "text/csv"})
+        assert response.status_code == 401
+
+
+class TestLegacyBulkImport:
+    """Tests for POST /projects/bulk on the legacy API."""
+
+    def test_csv_import(self, client, db_session):
+        """Test enum conversion, JSON cells and rollup maintenance."""
+        body = (
+            "name,sector,country,stage,estimated_capex,funding_gap,revenue_model,attachments\n"
+            'Lagos Solar Farm,Energy,Nigeria,Feasibility,50000000,30000000,PPA,"{""teaser"": ""t.pdf""}"\n'
+            "Kano Grid,Fusion,Nigeria,Feasibility,1000,,PPA,\n"
+            "Accra Metro,Transport,Ghana,Concept,80000000,,Availability,\n"
+        )
+        response = client.post("/projects/bulk", content=body, headers={"Content-Type": "text/csv"})
+        results, summary = _results(response)
+        assert summary == {"rows": 3, "created": 2, "failed": 1}
+        assert "Invalid sector" in results[1]["errors"][0]["msg"]
+
+        project = client.get(f"/projects/{results[0]['id']}").json()
+        assert project["stage"] == "Feasibility"
+        assert project["attachments"] == {"teaser": "t.pdf"}
+
+        rollup = db_session.query(models.AnalyticsRollup).filter_by(sector="Energy", country="Nigeria").one()
+        assert (rollup.project_count, rollup.funding_gap_count) == (1, 1)
+        assert rollup.verification_level == "Unverified"
+
+    def test_unknown_charset(self, client):
+        response = client.post("/projects/bulk", content="name\n", headers={"Content-Type": "text/csv; charset=bogus"})
+        assert response.status_code == 415
+
+    def test_chunks_are_batched(self, client, monkeypatch):
+        monkeypatch.setattr(legacy_projects, "BULK_CHUNK_SIZE", 2)
+        lines = [
+            json.dumps({"name": f"Project {i}", "sector": "Energy", "country": "Kenya", "stage": "Concept",
+                        "estimated_capex": 1000.0, "revenue_model": "PPA"})
+            for i in range(5)
+        ]
+        response = client.post("/projects/bulk", content="\n".join(lines), headers={"Content-Type": "application/x-ndjson"})
+        results, summary = _results(response)
+        assert summary["created"] == 5
+        assert len(client.get("/projects/").json()) == 5
+
+    def test_rejected_row_does_not_fail_its_chunk(self, client, db_session):
+        """Test that a row the database rejects is retried alone and reported, and the rest are created."""
+        db_session.execute(text(
+            "CREATE TRIGGER reject_broken BEFORE INSERT ON projects WHEN NEW.name = 'Broken' "
+            "BEGIN SELECT RAISE(ABORT, 'rejected by trigger'); END"
+        ))
+        db_session.commit()
+        lines = [
+            json.dumps({"name": name, "sector": "Energy", "country": "Kenya", "stage": "Concept",
+                        "estimated_capex": 1000.0, "revenue_model": "PPA"})
+            for name in ("Turkana Wind", "Broken", "Olkaria Geothermal")
+        ]
+        response = client.post("/projects/bulk", content="\n".join(lines), headers={"Content-Type": "application/x-ndjson"})
+        results, summary = _results(response)
+        assert summary == {"rows": 3, "created": 2, "failed": 1}
+        assert results[1]["errors"] == [{"loc": [], "msg": "rejected by trigger", "type": "database_error"}]
+        assert sorted(p["name"] for p in client.get("/projects/").json()) == ["Olkaria Geothermal", "Turkana Wind"]
+
+        rollup = db_session.query(models.AnalyticsRollup).filter_by(sector="Energy", country="Kenya").one()
+        assert rollup.project_count == 2
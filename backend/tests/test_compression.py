@@ -0,0 +1,135 @@
+# tests/test_compression.py
+"""
+Tests for response compression and precompressed static files.
+"""
+import gzip
+import zlib
+
+import anyio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.models.project import Project
+from app.utils import compression
+from app.utils.compression import CompressionMiddleware, PrecompressedStaticFiles, choose_encoding, precompress
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+@pytest.fixture
+def projects(platform_db, platform_user):
+    org_id = platform_user.org_memberships[0].org_id
+    platform_db.add_all(
+        Project(sponsor_org_id=org_id, name=f"Project {i}", sector="Energy", summary="Solar " * 20) for i in range(10)
+    )
+    platform_db.commit()
+
+
+class TestNegotiation:
+    """Tests for Accept-Encoding parsing."""
+
+    def test_choose_encoding(self):
+        """Test q-values, wildcards and refusals."""
+        assert choose_encoding("gzip, deflate", ("br", "gzip")) == "gzip"
+        assert choose_encoding("br;q=1.0, gzip;q=0.8", ("br", "gzip")) == "br"
+        assert choose_encoding("gzip;q=0.5, br;q=0.9", ("gzip",)) == "gzip"
+        assert choose_encoding("*", ("br", "gzip")) == "br"
+        assert choose_encoding("gzip;q=0, identity", ("gzip",)) is None
+        assert choose_encoding(None) is None
+
+
+class TestCompressionMiddleware:
+    """Tests for API response compression."""
+
+    def test_large_json_is_compressed(self, platform_client, projects):
+        """Test that a project list is gzipped and small responses are not."""
+        response = platform_client.get("/projects/", headers=GZIP)
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json()["total"] == 10
+
+        small = platform_client.get("/health", headers=GZIP)
+        assert "content-encoding" not in small.headers
+
+        plain = platform_client.get("/projects/", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+
+    def test_etag_is_weakened_and_still_matches(self, platform_client, projects, platform_db):
+        """Test conditional requests against a compressed cached response."""
+        project_id = platform_db.query(Project.id).first()[0]
+        project = platform_db.get(Project, project_id)
+        project.description = "Long description " * 100
+        platform_db.commit()
+
+        first = platform_client.get(f"/projects/{project_id}", headers=GZIP)
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["etag"].startswith('W/"project-')
+        again = platform_client.get(f"/projects/{project_id}", headers={**GZIP, "If-None-Match": first.headers["etag"]})
+        assert again.status_code == 304
+
+    def test_streaming_bodies_are_flushed_per_chunk(self):
+        """Test that each streamed chunk is decodable as soon as it is sent."""
+        rows = [f'{{"row": {i}}}\n'.encode() for i in range(3)]
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200,
+                        "headers": [(b"content-type", b"application/x-ndjson")]})
+            for i, row in enumerate(rows):
+                await send({"type": "http.response.body", "body": row, "more_body": i < len(rows) - 1})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        anyio.run(CompressionMiddleware(app, minimum_size=10), scope, None, send)
+
+        headers = dict(sent[0]["headers"])
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+        decoder = zlib.decompressobj(31)
+        assert [decoder.decompress(m["body"]) for m in sent[1:]] == rows
+
+
+class TestPrecompressedStatic:
+    """Tests for build-time compressed static assets."""
+
+    @pytest.fixture
+    def static_client(self, tmp_path):
+        chunk = tmp_path / "_next" / "static" / "chunks"
+        chunk.mkdir(parents=True)
+        (chunk / "main-3f2a9c1b.js").write_text("console.log('hello');\n" * 200)
+        (tmp_path / "index.html").write_text("<html>" + "<p>Projects</p>" * 100 + "</html>")
+        (tmp_path / "tiny.txt").write_text("hi")
+        results = precompress(str(tmp_path))
+        app = FastAPI()
+        app.mount("/static", PrecompressedStaticFiles(directory=str(tmp_path), html=True), name="static")
+        return TestClient(app), tmp_path, results
+
+    def test_precompress_writes_variants(self, static_client):
+        """Test that compressible files get smaller .gz siblings and tiny files are skipped."""
+        _, root, results = static_client
+        assert (root / "index.html.gz").exists()
+        assert not (root / "tiny.txt.gz").exists()
+        assert gzip.decompress((root / "index.html.gz").read_bytes()) == (root / "index.html").read_bytes()
+        assert all(sizes[".gz"] < size for _, size, sizes in results)
+
+    def test_serves_variant_with_cache_headers(self, static_client):
+        """Test encoding negotiation and immutable caching for hashed assets."""
+        client, root, _ = static_client
+        response = client.get("/static/_next/static/chunks/main-3f2a9c1b.js", headers=GZIP)
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"].startswith("text/javascript")
+        assert response.headers["cache-control"] == compression.IMMUTABLE_CACHE_CONTROL
+        assert response.text == (root / "_next/static/chunks/main-3f2a9c1b.js").read_text()
+
+        page = client.get("/static/", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in page.headers
+        assert page.headers["cache-control"] == compression.REVALIDATE_CACHE_CONTROL
+        assert page.headers["vary"] == "Accept-Encoding"
+
+        revalidated = client.get("/static/index.html", headers={**GZIP, "If-None-Match": client.get(
+            "/static/index.html", headers=GZIP).headers["etag"]})
+        assert revalidated.status_code == 304
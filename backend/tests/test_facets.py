@@ -0,0 +1,90 @@
+# tests/test_facets.py
+"""
+Tests for project browser facet counts.
+"""
+import pytest
+from sqlalchemy import event
+
+from app.models.project import Project
+from app.services import facet_service
+
+
+@pytest.fixture(autouse=True)
+def clear_facet_cache():
+    facet_service.clear_cache()
+    yield
+    facet_service.clear_cache()
+
+
+@pytest.fixture
+def projects(platform_db, platform_user):
+    org_id = platform_user.org_memberships[0].org_id
+    items = [
+        Project(sponsor_org_id=org_id, name="Lagos Solar Farm", sector="Energy", country="Nigeria", status="active"),
+        Project(sponsor_org_id=org_id, name="Kano Grid Upgrade", sector="Energy", country="Nigeria"),
+        Project(sponsor_org_id=org_id, name="Nairobi Water Works", sector="Water", country="Kenya", status="active"),
+        Project(sponsor_org_id=org_id, name="Mombasa Port Expansion", sector="Transport", country="Kenya",
+                verification_level="V2"),
+    ]
+    platform_db.add_all(items)
+    platform_db.commit()
+    return items
+
+
+def _counts(facet):
+    return {entry["value"]: entry["count"] for entry in facet}
+
+
+class TestFacets:
+    """Tests for GET /projects/?facets=true."""
+
+    def test_counts_for_current_filters(self, platform_client, projects):
+        """Test that every facet is counted under the active filters."""
+        data = platform_client.get("/projects/?facets=true").json()
+        assert data["total"] == 4
+        assert _counts(data["facets"]["sector"]) == {"Energy": 2, "Water": 1, "Transport": 1}
+        assert data["facets"]["sector"][0] == {"value": "Energy", "count": 2}
+        assert _counts(data["facets"]["status"]) == {"active": 2, "draft": 2}
+        assert _counts(data["facets"]["verification_level"]) == {"V0": 3, "V2": 1}
+
+        data = platform_client.get("/projects/?facets=true&country=Kenya").json()
+        assert data["total"] == 2
+        assert _counts(data["facets"]["sector"]) == {"Water": 1, "Transport": 1}
+        assert _counts(data["facets"]["country"]) == {"Kenya": 2}
+
+    def test_omitted_by_default(self, platform_client, projects):
+        """Test that plain listings are unchanged."""
+        data = platform_client.get("/projects/").json()
+        assert data["facets"] is None
+        assert data["total"] == 4
+
+    def test_single_query_and_cache(self, platform_db, projects):
+        """Test that all facets come from one statement and repeats hit the cache."""
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = platform_db.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            query = platform_db.query(Project).filter(Project.sector == "Energy")
+            first = facet_service.get_facets(query, ("Energy",))
+            assert len(statements) == 1
+            assert facet_service.get_facets(query, ("Energy",)) is first
+            assert len(statements) == 1
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        assert first["total"] == 2
+
+    def test_project_writes_invalidate(self, platform_client, platform_db, projects):
+        """Test that committed project changes are reflected immediately."""
+        platform_client.get("/projects/?facets=true")
+        projects[1].status = "active"
+        platform_db.delete(projects[3])
+        platform_db.commit()
+
+        data = platform_client.get("/projects/?facets=true").json()
+        assert data["total"] == 3
+        assert _counts(data["facets"]["status"]) == {"active": 3}
+        assert "Transport" not in _counts(data["facets"]["sector"])
@@ -0,0 +1,77 @@
+# tests/test_fieldsets.py
+"""
+Tests for sparse fieldsets on list endpoints.
+"""
+import pytest
+from sqlalchemy import event
+
+from app.models.project import Project, ProjectFinancials
+
+
+@pytest.fixture
+def projects(platform_db, platform_user):
+    org_id = platform_user.org_memberships[0].org_id
+    items = [
+        Project(sponsor_org_id=org_id, name=f"Project {i}", sector="Energy", country="Kenya",
+                description="Long narrative " * 200, impact_statement="Impact " * 100)
+        for i in range(5)
+    ]
+    platform_db.add_all(items)
+    platform_db.flush()
+    platform_db.add_all(ProjectFinancials(project_id=p.id, currency="USD") for p in items)
+    platform_db.commit()
+    # Start from an empty identity map so the endpoint's loads are observable
+    platform_db.expunge_all()
+    return items
+
+
+@pytest.fixture
+def statements(platform_db):
+    """SQL statements executed while the test runs."""
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    engine = platform_db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+class TestProjectFields:
+    """Tests for GET /projects/?fields=..."""
+
+    def test_limits_select_and_payload(self, platform_client, projects, statements):
+        """Test that only requested columns are selected and returned."""
+        full = platform_client.get("/projects/")
+        statements.clear()
+
+        sparse = platform_client.get("/projects/?fields=name,sector,country,investment_usd,verification_level")
+        assert sparse.status_code == 200
+        item = sparse.json()["items"][0]
+        assert set(item) == {"id", "name", "sector", "country", "investment_usd", "verification_level"}
+        assert sparse.json()["total"] == 5
+        assert len(sparse.content) * 10 < len(full.content)
+
+        selects = [s for s in statements if "FROM aip_projects" in s and "count(" not in s]
+        assert selects and all("description" not in s and "impact_statement" not in s for s in selects)
+        assert not any("project_financials" in s for s in statements)
+
+    def test_relationships_loaded_in_one_query(self, platform_client, projects, statements):
+        """Test that a requested relationship is batch-loaded rather than per row."""
+        response = platform_client.get("/projects/?fields=name,financials")
+        assert all(item["financials"]["currency"] == "USD" for item in response.json()["items"])
+        assert len([s for s in statements if "FROM project_financials" in s]) == 1
+
+    def test_unknown_field(self, platform_client, projects):
+        """Test that unknown field names are rejected."""
+        response = platform_client.get("/projects/?fields=name,password_hash")
+        assert response.status_code == 400
+        assert "password_hash" in response.json()["detail"]
+
+
+def test_organization_fields(platform_client, platform_user):
+    """Test sparse fieldsets on GET /organizations/."""
+    data = platform_client.get("/organizations/?fields=name,org_type").json()
+    assert data == [{"id": platform_user.org_memberships[0].org_id, "name": "Test Sponsor Org", "org_type": "sponsor"}]
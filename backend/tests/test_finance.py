@@ -0,0 +1,123 @@
+# tests/test_finance.py
+"""
+Tests for vectorized financial metrics and the batch recompute endpoint.
+"""
+import numpy as np
+import pytest
+
+from app.models.project import Project, ProjectFinancials
+from app.utils import finance
+
+
+class TestFinanceUtils:
+    """Tests for app.utils.finance."""
+
+    def test_irr_zeroes_npv(self):
+        """Test that IRR solves NPV = 0 for mixed series in one call."""
+        flows = finance.pad_cash_flows([
+            [-100] + [15] * 20,
+            [-100, -50] + [30] * 10,
+            [-1000, 100, 2000],
+            [-100] + [1] * 5,
+        ])
+        irr = finance.irr(flows)
+        assert np.allclose(finance.npv(flows, irr), 0, atol=1e-6)
+        assert irr[0] == pytest.approx(0.13887, abs=1e-4)
+        assert irr[3] < 0
+
+    def test_irr_undefined_without_sign_change(self):
+        """Test that all-positive or all-negative series have no IRR."""
+        irr = finance.irr(np.array([[10.0, 10.0, 10.0], [-10.0, -10.0, 0.0]]))
+        assert np.isnan(irr).all()
+
+    def test_payback_and_roi(self):
+        """Test simple and discounted payback and ROI."""
+        flows = np.array([[-100.0, 50.0, 50.0, 50.0], [-100.0, 10.0, 10.0, 10.0]])
+        assert finance.discounted_payback(flows)[0] == pytest.approx(2.0)
+        assert finance.discounted_payback(flows, 0.1)[0] == pytest.approx(2 + (100 - 50 / 1.1 - 50 / 1.21) / (50 / 1.331))
+        assert np.isnan(finance.discounted_payback(flows)[1])
+        assert finance.roi(flows).tolist() == pytest.approx([0.5, -0.7])
+
+    def test_cash_flows_from_timeline(self):
+        """Test both timeline formats."""
+        assert finance.cash_flows_from_timeline({"cash_flows": [-5, 2, 4]}) == [-5.0, 2.0, 4.0]
+        assert finance.cash_flows_from_timeline({"cash_flows": [
+            {"year": 0, "amount_usd": -5}, {"year": 2, "amount_usd": 4}, {"year": 0, "amount_usd": -1},
+        ]}) == [-6.0, 0.0, 4.0]
+        assert finance.cash_flows_from_timeline({"phases": []}) is None
+
+
+class TestRecomputeEndpoint:
+    """Tests for POST /projects/financials/recompute."""
+
+    def test_recompute_many_projects(self, platform_client, platform_db, platform_user, verifier_headers):
+        """Test recomputing metrics for a thousand projects in one call."""
+        org_id = platform_user.org_memberships[0].org_id
+        for i in range(1000):
+            project = Project(sponsor_org_id=org_id, name=f"Project {i}", sector="Energy")
+            platform_db.add(project)
+            platform_db.flush()
+            platform_db.add(ProjectFinancials(
+                project_id=project.id,
+                irr_pct=99,  # stale user-entered value
+                timeline_json={"cash_flows": [-100, -50] + [20 + i % 10] * 15} if i else {},
+                assumptions_json={"discount_rate_pct": 8},
+            ))
+        platform_db.commit()
+
+        response = platform_client.post("/projects/financials/recompute", json={}, headers=verifier_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["updated"] == 999
+        assert len(data["skipped_project_ids"]) == 1
+        assert data["results"][0]["discount_rate_pct"] == 8
+
+        financials = platform_db.query(ProjectFinancials).filter(
+            ProjectFinancials.project_id == data["results"][0]["project_id"]
+        ).one()
+        platform_db.refresh(financials)
+        assert float(financials.irr_pct) == pytest.approx(data["results"][0]["irr_pct"])
+        assert float(financials.irr_pct) < 99
+        assert financials.project.payback_years is not None
+
+    def test_dry_run_does_not_write(self, platform_client, platform_db, platform_user, verifier_headers):
+        """Test that dry runs leave stored values alone."""
+        org_id = platform_user.org_memberships[0].org_id
+        project = Project(sponsor_org_id=org_id, name="Dry", sector="Energy")
+        platform_db.add(project)
+        platform_db.flush()
+        platform_db.add(ProjectFinancials(project_id=project.id, irr_pct=99,
+                                          timeline_json={"cash_flows": [-100, 60, 60]}))
+        platform_db.commit()
+
+        response = platform_client.post(
+            "/projects/financials/recompute", json={"dry_run": True}, headers=verifier_headers
+        )
+        assert response.json()["updated"] == 0
+        assert response.json()["results"][0]["irr_pct"] == pytest.approx(13.07, abs=0.01)
+        platform_db.expire_all()
+        assert float(platform_db.query(ProjectFinancials).one().irr_pct) == 99
+
+    def test_malformed_discount_rate_skips_project(self, platform_client, platform_db, platform_user, verifier_headers):
+        """Test that a bad discount rate or assumptions_json skips that project, not the batch."""
+        org_id = platform_user.org_memberships[0].org_id
+        ids = []
+        for assumptions in ({"discount_rate_pct": "10%"}, ["not", "a", "dict"], {"discount_rate_pct": 12}):
+            project = Project(sponsor_org_id=org_id, name="Rate", sector="Energy")
+            platform_db.add(project)
+            platform_db.flush()
+            platform_db.add(ProjectFinancials(project_id=project.id, assumptions_json=assumptions,
+                                              timeline_json={"cash_flows": [-100, 60, 60]}))
+            ids.append(project.id)
+        platform_db.commit()
+
+        response = platform_client.post("/projects/financials/recompute", json={}, headers=verifier_headers)
+        assert response.status_code == 200
+        assert response.json()["skipped_project_ids"] == ids[:2]
+        assert response.json()["updated"] == 1
+        assert response.json()["results"][0]["discount_rate_pct"] == 12
+
+    def test_requires_permission(self, platform_client, platform_auth_headers):
+        """Test that sponsors cannot recompute all projects."""
+        response = platform_client.post("/projects/financials/recompute", headers=platform_auth_headers)
+        assert response.status_code == 403
@@ -0,0 +1,150 @@
+# tests/test_fx.py
+"""
+Tests for FX normalization.
+"""
+import io
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.models.fx import FxRate
+from app.models.project import Project, ProjectFinancials
+from app.services import fx_service
+
+
+RATES_CSV = """date,currency,usd_per_unit
+2026-01-02,KES,0.0077
+2026-01-05,KES,0.0076
+2026-01-06,KES,0.0075
+2026-01-02,NGN,0.00065
+2026-01-06,NGN,0.00062
+2026-01-02,EUR,1.10
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_cache():
+    fx_service.invalidate_cache()
+    yield
+    fx_service.invalidate_cache()
+
+
+@pytest.fixture
+def rates(platform_db):
+    fx_service.load_csv(platform_db, io.StringIO(RATES_CSV), "test")
+    return fx_service.get_rate_table(platform_db)
+
+
+class TestRateTable:
+    """Tests for the in-memory rate index."""
+
+    def test_carries_rates_forward(self, rates):
+        """Test that a date uses the latest rate on or before it."""
+        usd = rates.convert(
+            [1000, 1000, 1000, 1000],
+            "KES",
+            [date(2026, 1, 2), date(2026, 1, 4), date(2026, 1, 6), date(2026, 3, 1)],
+        )
+        assert usd.tolist() == pytest.approx([7.7, 7.7, 7.5, 7.5])
+
+    def test_vectorized_mixed_currencies(self, rates):
+        """Test converting a large mixed array in one call."""
+        n = 100_000
+        currencies = np.array(["KES", "NGN", "USD", "EUR"] * (n // 4))
+        amounts = np.full(n, 100.0)
+        usd = rates.convert(amounts, currencies, date(2026, 1, 6))
+        assert usd[:4].tolist() == pytest.approx([0.75, 0.062, 100, 110])
+
+    def test_cross_rates_and_unknown_currencies(self, rates):
+        """Test conversion to a non-USD target and unknown currency handling."""
+        assert rates.convert([110], "USD", date(2026, 1, 2), to_currency="EUR")[0] == pytest.approx(100)
+        with pytest.raises(fx_service.UnknownCurrencyError):
+            rates.convert([1], "ZAR")
+        assert np.isnan(rates.convert([1, 1], ["ZAR", "USD"], strict=False)[0])
+
+    def test_import_upserts(self, platform_db, rates):
+        """Test that re-importing updates changed rates only."""
+        result = fx_service.load_csv(
+            platform_db, io.StringIO("date,currency,rate\n2026-01-02,KES,0.0080\n2026-01-05,KES,0.0076\n")
+        )
+        assert result == {"inserted": 0, "updated": 1, "unchanged": 1}
+        assert platform_db.query(FxRate).count() == 6
+
+    def test_sql_capex_matches_rate_table(self, platform_db, platform_user, rates):
+        """Test that the SQL capex expression picks the same rates as the in-memory table."""
+        org_id = platform_user.org_memberships[0].org_id
+        cases = [("KES", 1000), ("kes", 1000), ("NGN", 1000), (None, 1000), ("ZAR", 1000), ("EUR", None)]
+        for currency, capex in cases:
+            project = Project(sponsor_org_id=org_id, name=f"P {currency}", sector="Energy")
+            platform_db.add(project)
+            platform_db.flush()
+            platform_db.add(ProjectFinancials(project_id=project.id, capex_usd=capex, currency=currency))
+        platform_db.commit()
+
+        for on in (date(2025, 12, 1), date(2026, 1, 4), date(2026, 3, 1)):
+            rows = platform_db.query(
+                ProjectFinancials.capex_usd, ProjectFinancials.currency, fx_service.capex_usd_expression(on)
+            ).order_by(ProjectFinancials.id).all()
+            expected = rates.convert([r[0] for r in rows], [r[1] for r in rows], on, strict=False)
+            actual = np.array([np.nan if r[2] is None else float(r[2]) for r in rows])
+            np.testing.assert_allclose(actual, expected)
+
+    def test_malformed_csv(self, platform_db):
+        """Test that bad rows report their line number."""
+        with pytest.raises(ValueError, match="Line 3"):
+            fx_service.load_csv(platform_db, io.StringIO("date,currency,usd_per_unit\n2026-01-02,KES,1\nx,KES,1\n"))
+
+
+class TestFxEndpoints:
+    """Tests for FX API."""
+
+    def test_import_and_convert(self, platform_client, admin_headers, platform_auth_headers):
+        """Test CSV import and batch conversion."""
+        response = platform_client.post(
+            "/fx/rates/import", content=RATES_CSV,
+            headers={**admin_headers, "Content-Type": "text/csv"},
+        )
+        assert response.status_code == 200
+        assert response.json()["inserted"] == 6
+
+        currencies = platform_client.get("/fx/currencies").json()
+        assert {c["currency"] for c in currencies} == {"EUR", "KES", "NGN"}
+
+        converted = platform_client.post("/fx/convert", json={
+            "items": [
+                {"amount": 1000, "currency": "KES", "rate_date": "2026-01-05"},
+                {"amount": None, "currency": "NGN"},
+            ],
+        }, headers=platform_auth_headers)
+        assert converted.json() == {"to_currency": "USD", "amounts": [7.6, None]}
+
+        history = platform_client.get("/fx/rates?currency=kes&start=2026-01-05").json()
+        assert [r["rate_date"] for r in history] == ["2026-01-06", "2026-01-05"]
+
+    def test_import_requires_manage_system(self, platform_client, platform_auth_headers):
+        """Test that only admins can import rates."""
+        response = platform_client.post(
+            "/fx/rates/import", content=RATES_CSV,
+            headers={**platform_auth_headers, "Content-Type": "text/csv"},
+        )
+        assert response.status_code == 403
+
+    def test_project_capex_filter_normalizes_currency(self, platform_client, platform_db, platform_user, rates):
+        """Test that capex filters compare local-currency financials in USD."""
+        org_id = platform_user.org_memberships[0].org_id
+        for name, capex, currency in [
+            ("Nairobi BRT", 20_000_000_000, "KES"),  # ~150M USD
+            ("Lagos Rail", 20_000_000_000, "NGN"),   # ~12M USD
+            ("Dakar Port", 90_000_000, "USD"),
+        ]:
+            project = Project(sponsor_org_id=org_id, name=name, sector="Transport")
+            platform_db.add(project)
+            platform_db.flush()
+            platform_db.add(ProjectFinancials(project_id=project.id, capex_usd=capex, currency=currency))
+        platform_db.commit()
+
+        response = platform_client.get("/projects/?min_capex_usd=50000000")
+        assert sorted(p["name"] for p in response.json()["items"]) == ["Dakar Port", "Nairobi BRT"]
+        response = platform_client.get("/projects/?max_capex_usd=50000000&sector=Transport")
+        assert [p["name"] for p in response.json()["items"]] == ["Lagos Rail"]
@@ -0,0 +1,114 @@
+# tests/test_geo.py
+"""
+Tests for the geohash index and map endpoints.
+"""
+import pytest
+
+from app.models.geo import ProjectLocation
+from app.models.project import Project
+from app.services import geo_service
+from app.utils import geo
+
+
+@pytest.fixture
+def located_projects(platform_db, platform_user):
+    org_id = platform_user.org_memberships[0].org_id
+    items = [
+        Project(sponsor_org_id=org_id, name="Mombasa Port Expansion", sector="Transport",
+                country="Kenya", latitude=-4.04, longitude=39.67),
+        Project(sponsor_org_id=org_id, name="Malindi Solar", sector="Energy",
+                country="Kenya", latitude=-3.22, longitude=40.12),
+        Project(sponsor_org_id=org_id, name="Nairobi Water Works", sector="Water",
+                country="Kenya", latitude=-1.29, longitude=36.82),
+        Project(sponsor_org_id=org_id, name="Lagos Solar Farm", sector="Energy",
+                country="Nigeria", latitude=6.52, longitude=3.38),
+        Project(sponsor_org_id=org_id, name="Fiji Wind", sector="Energy",
+                country="Fiji", latitude=-17.7, longitude=178.9),
+        Project(sponsor_org_id=org_id, name="Samoa Grid", sector="Energy",
+                country="Samoa", latitude=-13.8, longitude=-171.8),
+        Project(sponsor_org_id=org_id, name="Unlocated Study", sector="Energy"),
+    ]
+    platform_db.add_all(items)
+    platform_db.commit()
+    return items
+
+
+class TestGeohash:
+    """Tests for the geohash helpers."""
+
+    def test_encode_and_decode(self):
+        """Test the reference geohash and that a point lies in its decoded cell."""
+        assert geo.encode(42.6, -5.6, 5) == "ezs42"
+        south, west, north, east = geo.decode_bbox("ezs42")
+        assert south <= 42.6 <= north and west <= -5.6 <= east
+
+    def test_covering_cells_contain_box_points(self):
+        """Test that every point of a box falls under one of its covering prefixes."""
+        bbox = (-5.0, 38.0, -2.0, 41.0)
+        cells = geo.covering_cells(bbox)
+        assert len(cells) <= 32
+        for lat in (-5.0, -3.5, -2.0):
+            for lon in (38.0, 39.5, 41.0):
+                assert any(geo.encode(lat, lon).startswith(c) for c in cells)
+
+
+class TestGeoEndpoints:
+    """Tests for GET /projects/geo/*."""
+
+    def test_nearby_sorted_by_distance(self, platform_client, located_projects):
+        """Test the radius query from Mombasa port."""
+        response = platform_client.get("/projects/geo/nearby?lat=-4.07&lon=39.66&radius_km=200")
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [i["name"] for i in items] == ["Mombasa Port Expansion", "Malindi Solar"]
+        assert items[0]["distance_km"] < items[1]["distance_km"] < 200
+
+    def test_bbox_with_filters_and_antimeridian(self, platform_client, located_projects):
+        """Test viewport queries, including one crossing the 180th meridian."""
+        data = platform_client.get("/projects/geo/bbox?south=-5&west=35&north=0&east=41").json()
+        assert {i["name"] for i in data["items"]} == {
+            "Mombasa Port Expansion", "Malindi Solar", "Nairobi Water Works"
+        }
+        data = platform_client.get(
+            "/projects/geo/bbox?south=-5&west=35&north=0&east=41&sector=Energy"
+        ).json()
+        assert [i["name"] for i in data["items"]] == ["Malindi Solar"]
+
+        data = platform_client.get("/projects/geo/bbox?south=-20&west=170&north=-10&east=-170").json()
+        assert {i["name"] for i in data["items"]} == {"Fiji Wind", "Samoa Grid"}
+
+        data = platform_client.get("/projects/geo/bbox?south=-90&west=-180&north=90&east=180&limit=2").json()
+        assert len(data["items"]) == 2 and data["truncated"] is True
+
+        assert platform_client.get("/projects/geo/bbox?south=5&west=0&north=0&east=1").status_code == 400
+
+    def test_clusters_by_zoom(self, platform_client, located_projects):
+        """Test that low zooms merge nearby projects and high zooms split them."""
+        world = "south=-90&west=-180&north=90&east=180"
+        data = platform_client.get(f"/projects/geo/clusters?zoom=1&{world}").json()
+        assert data["precision"] == 1
+        assert data["total"] == 6
+        assert data["clusters"][0]["count"] == 3  # the Kenyan coast and Nairobi share a cell
+        assert data["clusters"][0]["project_id"] is None
+
+        data = platform_client.get(f"/projects/geo/clusters?zoom=12&{world}").json()
+        assert len(data["clusters"]) == 6
+        assert all(c["project_id"] is not None for c in data["clusters"])
+
+    def test_index_follows_project_changes(self, platform_client, platform_db, located_projects):
+        """Test that moves, removals and deletes update the location table."""
+        located_projects[3].latitude, located_projects[3].longitude = -3.9, 39.7
+        located_projects[1].latitude = None
+        platform_db.delete(located_projects[2])
+        platform_db.commit()
+
+        items = platform_client.get("/projects/geo/nearby?lat=-4.07&lon=39.66&radius_km=200").json()["items"]
+        assert [i["name"] for i in items] == ["Mombasa Port Expansion", "Lagos Solar Farm"]
+        assert platform_db.query(ProjectLocation).count() == 4
+
+    def test_rebuild_after_bulk_writes(self, platform_db, located_projects):
+        """Test that ensure_locations re-syncs a stale table."""
+        platform_db.query(ProjectLocation).delete()
+        platform_db.commit()
+        geo_service.ensure_locations(platform_db)
+        assert platform_db.query(ProjectLocation).count() == 6
@@ -0,0 +1,314 @@
+# tests/test_jobs.py
+"""
+Tests for the background job system.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base as PlatformBase
+from app.models.job import BackgroundJob
+from app.services import job_service
+from app.services.job_service import CronSchedule, JobWorker, enqueue, job_handler, register_cron
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory over a file-backed SQLite database shared by worker threads."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    PlatformBase.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def registry():
+    """Isolate job and cron registrations made by a test."""
+    jobs = dict(job_service.JOB_REGISTRY)
+    crons = dict(job_service.CRON_REGISTRY)
+    job_service.JOB_REGISTRY.clear()
+    job_service.CRON_REGISTRY.clear()
+    yield job_service.JOB_REGISTRY
+    job_service.JOB_REGISTRY.clear()
+    job_service.JOB_REGISTRY.update(jobs)
+    job_service.CRON_REGISTRY.clear()
+    job_service.CRON_REGISTRY.update(crons)
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestEnqueue:
+    """Tests for enqueueing jobs."""
+
+    def test_idempotency_key_deduplicates(self, session_factory, registry):
+        """Test that enqueueing the same key twice returns the first job."""
+        with session_factory() as db:
+            first = enqueue(db, "reports.build", {"id": 1}, idempotency_key="reports:1")
+            second = enqueue(db, "reports.build", {"id": 2}, idempotency_key="reports:1")
+            assert first.id == second.id
+            assert db.query(BackgroundJob).count() == 1
+
+    def test_retry_delay_grows_and_caps(self):
+        """Test exponential backoff."""
+        assert job_service.retry_delay(1).total_seconds() < job_service.retry_delay(3).total_seconds()
+        assert job_service.retry_delay(30).total_seconds() <= job_service.RETRY_BACKOFF_MAX_SECONDS * 1.1
+
+
+class TestWorker:
+    """Tests for claiming and executing jobs."""
+
+    def test_runs_jobs_and_records_results(self, session_factory, registry):
+        """Test that every job runs exactly once across worker threads."""
+        seen = []
+        lock = threading.Lock()
+
+        @job_handler("math.square")
+        def square(db, payload):
+            with lock:
+                seen.append(payload["n"])
+            return {"value": payload["n"] ** 2}
+
+        with session_factory() as db:
+            for n in range(40):
+                enqueue(db, "math.square", {"n": n})
+
+        worker = JobWorker(session_factory, threads=4, poll_interval=0.05)
+        worker.start()
+        try:
+            assert _wait_for(lambda: len(seen) == 40)
+            with session_factory() as db:
+                assert _wait_for(lambda: db.query(BackgroundJob).filter(
+                    BackgroundJob.status == "succeeded").count() == 40)
+                job = db.query(BackgroundJob).filter(BackgroundJob.payload_json["n"].as_integer() == 7).one()
+                assert job.result_json == {"value": 49}
+                assert job.attempts == 1
+        finally:
+            worker.stop(timeout=5)
+
+        assert sorted(seen) == list(range(40))
+        assert worker.stats()["totals"]["succeeded"] == 40
+
+    def test_failure_retries_then_dies(self, session_factory, registry):
+        """Test that failures back off and the job is dead after max_attempts."""
+        @job_handler("flaky", max_attempts=2)
+        def flaky(db, payload):
+            raise RuntimeError("remote unavailable")
+
+        worker = JobWorker(session_factory, threads=1)
+        with session_factory() as db:
+            job = enqueue(db, "flaky")
+            assert worker.run_once()
+
+            db.refresh(job)
+            assert job.status == "queued"
+            assert job.run_at > datetime.utcnow()
+            assert "remote unavailable" in job.last_error
+
+            # Not due yet
+            assert not worker.run_once()
+            job.run_at = datetime.utcnow()
+            db.commit()
+            assert worker.run_once()
+
+            db.refresh(job)
+            assert job.status == "dead"
+            assert job.attempts == 2
+
+    def test_per_type_concurrency_limit(self, session_factory, registry):
+        """Test that a type limited to one concurrent run never overlaps."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        @job_handler("exclusive", concurrency=1)
+        def exclusive(db, payload):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+
+        with session_factory() as db:
+            for _ in range(6):
+                enqueue(db, "exclusive")
+
+        worker = JobWorker(session_factory, threads=4, poll_interval=0.02)
+        worker.start()
+        try:
+            assert _wait_for(lambda: len(peak) == 6)
+        finally:
+            worker.stop(timeout=5)
+        assert max(peak) == 1
+
+    def test_unregistered_types_are_left_queued(self, session_factory, registry):
+        """Test that a worker only claims job types it can run."""
+        worker = JobWorker(session_factory)
+        with session_factory() as db:
+            enqueue(db, "other.service.job")
+            assert not worker.run_once()
+            assert db.query(BackgroundJob).one().status == "queued"
+
+    def test_stale_jobs_are_recovered(self, session_factory, registry):
+        """Test that a job whose worker died is re-queued after the lock timeout."""
+        worker = JobWorker(session_factory, lock_timeout=60)
+        with session_factory() as db:
+            job = enqueue(db, "anything")
+            job.status = "running"
+            job.attempts = 1
+            job.locked_by = "dead-host:1"
+            job.locked_at = datetime.utcnow() - timedelta(minutes=5)
+            db.commit()
+
+            assert worker.recover_stale_jobs(db) == 1
+            db.refresh(job)
+            assert job.status == "queued"
+            assert job.locked_by is None
+
+    def test_long_running_job_keeps_its_lock(self, session_factory, registry):
+        """Test that the heartbeat stops a healthy job outliving the lock timeout from being recovered."""
+        @job_handler("long")
+        def long(db, payload):
+            time.sleep(2.5)
+            return {"done": True}
+
+        with session_factory() as db:
+            job = enqueue(db, "long")
+
+        worker = JobWorker(session_factory, threads=1, poll_interval=0.02, lock_timeout=1)
+        worker.start()
+        try:
+            assert _wait_for(lambda: worker.stats()["in_flight"])
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline:
+                with session_factory() as db:
+                    assert worker.recover_stale_jobs(db) == 0
+                time.sleep(0.2)
+        finally:
+            worker.stop(drain=True, timeout=5)
+
+        with session_factory() as db:
+            job = db.get(BackgroundJob, job.id)
+            assert job.status == "succeeded"
+            assert job.attempts == 1
+
+    def test_outcome_is_dropped_after_losing_the_lock(self, session_factory, registry):
+        """Test that a run whose lock was taken over does not overwrite the new run's state."""
+        @job_handler("overtaken")
+        def overtaken(db, payload):
+            # Recovered and re-claimed elsewhere while this run was still going
+            with session_factory() as other:
+                job = other.query(BackgroundJob).one()
+                job.locked_by = "other-host:1"
+                job.locked_at = datetime.utcnow()
+                other.commit()
+            return {"done": True}
+
+        worker = JobWorker(session_factory, threads=1)
+        with session_factory() as db:
+            job = enqueue(db, "overtaken")
+            assert worker.run_once()
+            db.refresh(job)
+            assert job.status == "running"
+            assert job.locked_by == "other-host:1"
+            assert job.result_json is None
+        assert worker.stats()["totals"]["lost"] == 1
+
+    def test_stop_drains_running_jobs(self, session_factory, registry):
+        """Test that stop waits for in-flight jobs to finish."""
+        @job_handler("slow")
+        def slow(db, payload):
+            time.sleep(0.3)
+
+        with session_factory() as db:
+            enqueue(db, "slow")
+
+        worker = JobWorker(session_factory, threads=1, poll_interval=0.02)
+        worker.start()
+        assert _wait_for(lambda: worker.stats()["in_flight"])
+        worker.stop(drain=True, timeout=5)
+
+        with session_factory() as db:
+            assert db.query(BackgroundJob).one().status == "succeeded"
+
+
+class TestCron:
+    """Tests for cron scheduling."""
+
+    def test_schedule_parsing(self):
+        """Test next-fire computation."""
+        schedule = CronSchedule("*/15 2 * * 1-5")
+        assert schedule.next_after(datetime(2026, 3, 2, 2, 14)) == datetime(2026, 3, 2, 2, 15)
+        # Friday 02:45 -> Monday 02:00
+        assert schedule.next_after(datetime(2026, 3, 6, 2, 45)) == datetime(2026, 3, 9, 2, 0)
+        with pytest.raises(ValueError):
+            CronSchedule("* * *")
+
+    def test_day_of_month_or_weekday(self):
+        """Test that a restricted day of month and weekday fire on either, as in standard cron."""
+        schedule = CronSchedule("0 9 1 * 1")
+        # Sunday 2026-03-01 is the 1st, then Mondays
+        assert schedule.next_after(datetime(2026, 2, 28, 12, 0)) == datetime(2026, 3, 1, 9, 0)
+        assert schedule.next_after(datetime(2026, 3, 1, 9, 0)) == datetime(2026, 3, 2, 9, 0)
+        assert schedule.matches(datetime(2026, 3, 9, 9, 0))
+        assert not schedule.matches(datetime(2026, 3, 10, 9, 0))
+        # A '*' (or '*/n') day field leaves the weekday alone in charge
+        assert not CronSchedule("0 9 */2 * 1").matches(datetime(2026, 3, 1, 9, 0))
+
+    def test_cron_enqueues_once_per_slot(self, session_factory, registry):
+        """Test that two schedulers firing the same slot produce one job."""
+        register_cron("nightly", "0 2 * * *", "reports.nightly", {"scope": "all"})
+        now = datetime(2026, 3, 2, 2, 0, 30)
+        first, second = JobWorker(session_factory), JobWorker(session_factory)
+        first._cron_next = {"nightly": datetime(2026, 3, 2, 2, 0)}
+        second._cron_next = {"nightly": datetime(2026, 3, 2, 2, 0)}
+
+        with session_factory() as db:
+            assert first.enqueue_due_crons(db, now) == 1
+            second.enqueue_due_crons(db, now)
+            job = db.query(BackgroundJob).one()
+            assert job.idempotency_key == "cron:nightly:2026-03-02T02:00:00"
+            assert job.payload_json == {"scope": "all"}
+        assert first._cron_next["nightly"] == datetime(2026, 3, 3, 2, 0)
+
+
+class TestAdminEndpoints:
+    """Tests for job admin API."""
+
+    def test_stats_and_retry(self, platform_client, platform_db, admin_headers):
+        """Test job stats and retrying a dead job."""
+        dead = BackgroundJob(job_type="reports.build", status="dead", attempts=5, last_error="boom")
+        platform_db.add_all([dead, BackgroundJob(job_type="reports.build")])
+        platform_db.commit()
+
+        stats = platform_client.get("/admin/jobs/stats", headers=admin_headers)
+        assert stats.status_code == 200
+        assert stats.json()["queue"]["counts"] == {"reports.build": {"dead": 1, "queued": 1}}
+        assert stats.json()["queue"]["queued_due"] == 1
+
+        retried = platform_client.post(f"/admin/jobs/{dead.id}/retry", headers=admin_headers)
+        assert retried.status_code == 200
+        assert retried.json()["status"] == "queued"
+        assert retried.json()["attempts"] == 0
+
+        listed = platform_client.get("/admin/jobs?status_filter=queued", headers=admin_headers)
+        assert len(listed.json()) == 2
+
+    def test_requires_manage_system(self, platform_client, platform_auth_headers):
+        """Test that non-admins cannot see job stats."""
+        response = platform_client.get("/admin/jobs/stats", headers=platform_auth_headers)
+        assert response.status_code == 403
@@ -0,0 +1,111 @@
+# tests/test_metrics.py
+"""
+Tests for the in-process /metrics endpoint.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.models.project import Project
+from app.utils import metrics
+from app.utils.metrics import Counter, Histogram, MetricsMiddleware, TimedQueuePool
+
+
+def _sample(body: str, line_start: str) -> float:
+    """Value of the first exposition line starting with `line_start`."""
+    for line in body.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_start!r} not in metrics output")
+
+
+class TestMetrics:
+    """Tests for metric types, request instrumentation and the endpoint."""
+
+    def test_counter_and_histogram_exposition(self):
+        counter = Counter("things_total", "Things.", ("kind",))
+        counter.inc(kind="a")
+        counter.inc(2, kind='say "hi"')
+        histogram = Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            histogram.observe(value)
+
+        lines = counter.lines() + histogram.lines()
+        assert 'things_total{kind="a"} 1' in lines
+        assert 'things_total{kind="say \\"hi\\""} 2' in lines
+        assert lines[-5:] == [
+            'latency_seconds_bucket{le="0.1"} 1',
+            'latency_seconds_bucket{le="1"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_sum 4.05",
+            "latency_seconds_count 4",
+        ]
+
+    def test_middleware_labels_by_route_template(self):
+        """Test that requests are counted per route template, with unmatched paths pooled."""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/widgets/{widget_id}")
+        def widget(widget_id: int):
+            return {"id": widget_id}
+
+        before = metrics.http_requests.value(method="GET", route="/widgets/{widget_id}", status="200")
+        unmatched = metrics.http_requests.value(method="GET", route="unmatched", status="404")
+        timed = metrics.http_request_duration.count(method="GET", route="/widgets/{widget_id}")
+        client = TestClient(app)
+        client.get("/widgets/1")
+        client.get("/widgets/2")
+        client.get("/scanner/probe.php")
+
+        assert metrics.http_requests.value(method="GET", route="/widgets/{widget_id}", status="200") == before + 2
+        assert metrics.http_requests.value(method="GET", route="unmatched", status="404") == unmatched + 1
+        assert metrics.http_request_duration.count(method="GET", route="/widgets/{widget_id}") == timed + 2
+
+    @pytest.mark.parametrize("poolclass", [TimedQueuePool, QueuePool])
+    def test_timed_pool(self, tmp_path, poolclass):
+        """Test pool gauges and checkout wait time on a QueuePool engine, timed or not when created."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=poolclass, pool_size=2)
+        collect = metrics.pool_collector(engine, "test")
+        waits = metrics.db_pool_wait.count(pool="test")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            gauges = {name: samples for name, _, _, samples in collect()}
+            assert gauges["db_pool_checked_out"] == [({"pool": "test"}, 1)]
+            assert gauges["db_pool_size"] == [({"pool": "test"}, 2)]
+        assert metrics.db_pool_wait.count(pool="test") == waits + 1
+        engine.dispose()
+
+    def test_legacy_database_imports_without_platform(self):
+        """Test that the legacy database module does not need the platform package on sys.path."""
+        repo_root = Path(__file__).resolve().parents[2]
+        result = subprocess.run(
+            [sys.executable, "-c", "import backend.database"], cwd=repo_root, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_metrics_endpoint(self, platform_client, platform_db, platform_user, platform_auth_headers):
+        """Test the endpoint reports requests, cache ratios, threadpool and job queue."""
+        project = Project(sponsor_org_id=platform_user.org_memberships[0].org_id, name="Measured", sector="Energy")
+        platform_db.add(project)
+        platform_db.commit()
+        for _ in range(2):
+            assert platform_client.get(f"/projects/{project.id}", headers=platform_auth_headers).status_code == 200
+
+        response = platform_client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert _sample(body, 'http_requests_total{method="GET",route="/projects/{project_id}",status="200"}') >= 2
+        assert _sample(body, 'http_request_duration_seconds_count{method="GET",route="/projects/{project_id}"}') >= 2
+        assert 0 < _sample(body, 'cache_hit_ratio{cache="responses"}') < 1
+        assert _sample(body, "threadpool_threads_limit") >= 1
+        assert _sample(body, "threadpool_threads_busy") >= 0
+        assert _sample(body, "job_queue_due") == 0
+        assert "# TYPE job_worker_executions_total counter" in body
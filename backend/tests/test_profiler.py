@@ -0,0 +1,77 @@
+# tests/test_profiler.py
+"""
+Tests for the on-demand stack sampler.
+"""
+import threading
+
+import pytest
+
+from app.utils import profiler
+
+
+def _spin_until(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestStackSampler:
+    """Tests for sampling and the collapsed-stack format."""
+
+    def test_samples_other_threads(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=_spin_until, args=(stop,), name="spinner")
+        worker.start()
+        try:
+            counts = profiler.sample(0.1, interval=0.002)
+        finally:
+            stop.set()
+            worker.join()
+
+        spinner = [stack for stack in counts if stack.startswith("spinner;")]
+        assert spinner
+        assert any("_spin_until (tests/test_profiler.py:" in stack for stack in spinner)
+        # The calling thread sleeps through the profile and is left out
+        assert not any("test_samples_other_threads" in stack for stack in counts)
+
+        line = profiler.collapse(counts).splitlines()[0]
+        stack, n = line.rsplit(" ", 1)
+        assert counts[stack] == int(n)
+
+    def test_one_sampler_at_a_time(self):
+        sampler = profiler.StackSampler(0.01).start()
+        try:
+            with pytest.raises(profiler.SamplerBusy):
+                profiler.StackSampler(0.01).start()
+        finally:
+            sampler.stop()
+        profiler.StackSampler(0.01).start().stop()
+
+
+class TestProfileEndpoints:
+    """Tests for /admin/profile and the X-Profile request header."""
+
+    def test_profile_process(self, platform_client, admin_headers):
+        response = platform_client.get("/admin/profile?seconds=0.05&interval_ms=2", headers=admin_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.headers["content-disposition"].endswith('.folded"')
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in response.text.splitlines())
+
+    def test_profile_requires_admin(self, platform_client, platform_auth_headers, admin_headers):
+        assert platform_client.get("/admin/profile?seconds=0.05", headers=platform_auth_headers).status_code == 403
+        assert platform_client.get("/admin/profile?seconds=3600", headers=admin_headers).status_code == 422
+
+    def test_profile_request_header(self, platform_client, platform_auth_headers, admin_headers):
+        """Test that only admins get a per-request profile, read back by id."""
+        profiled = platform_client.get("/projects/", headers={**admin_headers, "X-Profile": "1"})
+        assert profiled.status_code == 200
+        profile_id = profiled.headers["X-Profile-Id"]
+
+        response = platform_client.get(f"/admin/profiles/{profile_id}", headers=admin_headers)
+        assert response.status_code == 200
+        assert platform_client.get(f"/admin/profiles/{profile_id}", headers=platform_auth_headers).status_code == 403
+        assert platform_client.get("/admin/profiles/0-0", headers=admin_headers).status_code == 404
+
+        plain = platform_client.get("/projects/", headers={**platform_auth_headers, "X-Profile": "1"})
+        assert plain.status_code == 200
+        assert "X-Profile-Id" not in plain.headers
@@ -0,0 +1,108 @@
+# tests/test_project_snapshot.py
+"""
+Tests for the columnar project snapshot and the analytics endpoints it serves.
+"""
+import numpy as np
+import pytest
+
+from app.models.project import Project
+from app.services import project_snapshot
+
+
+@pytest.fixture(autouse=True)
+def fresh_snapshot():
+    project_snapshot.invalidate_snapshot()
+    yield
+    project_snapshot.invalidate_snapshot()
+
+
+@pytest.fixture
+def catalogue(platform_db, platform_user):
+    org_id = platform_user.org_memberships[0].org_id
+    specs = [
+        ("Lagos Solar", "Energy", "Nigeria", "active", 100, 40),
+        ("Abuja Grid", "Energy", "Nigeria", "draft", 300, 70),
+        ("Nairobi BRT", "Transport", "Kenya", "active", 200, None),
+        ("Mombasa Port", "Transport", "Kenya", "active", None, 55),
+        ("Accra Water", "Water", None, "submitted", 50, 30),
+    ]
+    projects = []
+    for name, sector, country, status, investment, risk in specs:
+        projects.append(Project(
+            sponsor_org_id=org_id, name=name, sector=sector, country=country, status=status,
+            investment_usd=investment, risk_score=risk,
+        ))
+    platform_db.add_all(projects)
+    platform_db.commit()
+    return projects
+
+
+class TestProjectSnapshot:
+    """Tests for snapshot building, refresh and vectorized queries."""
+
+    def test_aggregate_matches_data(self, platform_db, catalogue):
+        """Test grouped aggregates, filters and missing values."""
+        snapshot = project_snapshot.refresh_snapshot(platform_db)
+        groups = {g["key"]: g for g in snapshot.aggregate("sector", snapshot.mask())}
+        assert groups["Energy"]["count"] == 2
+        assert groups["Energy"]["investment_usd_total"] == 400
+        assert groups["Energy"]["risk_score_mean"] == 55
+        assert groups["Transport"]["investment_usd_mean"] == 200
+        assert groups["Transport"]["expected_roi_pct_mean"] is None
+
+        by_country = {g["key"]: g["count"] for g in snapshot.aggregate("country", snapshot.mask(status=["active"]))}
+        assert by_country == {"Nigeria": 1, "Kenya": 2}
+        assert snapshot.mask(sector=["Unknown"]).sum() == 0
+        assert snapshot.mask(min_investment_usd=100, max_risk_score=60).sum() == 1
+
+    def test_incremental_refresh_matches_full_build(self, platform_db, platform_user, catalogue):
+        """Test that updates, inserts and deletes are applied incrementally."""
+        snapshot = project_snapshot.refresh_snapshot(platform_db)
+        catalogue[0].sector = "Water"
+        catalogue[2].investment_usd = 250
+        platform_db.delete(catalogue[3])
+        platform_db.add(Project(sponsor_org_id=platform_user.org_memberships[0].org_id,
+                                name="Dakar Rail", sector="Rail", country="Senegal", investment_usd=75))
+        platform_db.commit()
+
+        refreshed = project_snapshot.refresh_snapshot(platform_db)
+        rebuilt = project_snapshot.ProjectSnapshot.build(platform_db)
+        assert snapshot.size == 5 and refreshed.size == 5
+        assert refreshed.aggregate("sector") == rebuilt.aggregate("sector")
+        assert np.array_equal(refreshed.columns["id"], rebuilt.columns["id"])
+        assert np.allclose(refreshed.columns["investment_usd"], rebuilt.columns["investment_usd"], equal_nan=True)
+
+    def test_select_ids_sorts_missing_last(self, platform_db, catalogue):
+        """Test sorted id selection."""
+        snapshot = project_snapshot.refresh_snapshot(platform_db)
+        ids = snapshot.select_ids(snapshot.mask(), sort="investment_usd", descending=True)
+        assert ids == [catalogue[i].id for i in (1, 2, 0, 4, 3)]
+
+
+class TestAnalyticsEndpoints:
+    """Tests for /projects/analytics/*."""
+
+    def test_aggregate_endpoint(self, platform_client, catalogue):
+        """Test grouping with comma-separated filters."""
+        response = platform_client.get("/projects/analytics/aggregate?group_by=status&sector=Energy,Water")
+        assert response.status_code == 200
+        data = response.json()
+        assert {g["key"]: g["count"] for g in data["groups"]} == {"draft": 1, "active": 1, "submitted": 1}
+        assert data["totals"]["investment_usd_total"] == 450
+        assert data["snapshot"]["rows"] == 5
+
+    def test_filter_endpoint_sees_fresh_writes(self, platform_client, platform_db, catalogue):
+        """Test that fresh=true applies changes made since the last refresh."""
+        assert platform_client.get("/projects/analytics/filter?country=Kenya").json()["total"] == 2
+        catalogue[4].country = "Kenya"
+        platform_db.commit()
+
+        data = platform_client.get(
+            "/projects/analytics/filter?country=Kenya&sort=risk_score&fresh=true"
+        ).json()
+        assert data["total"] == 3
+        assert data["ids"] == [catalogue[4].id, catalogue[3].id, catalogue[2].id]
+
+    def test_rejects_unknown_group(self, platform_client):
+        """Test validation of group_by."""
+        assert platform_client.get("/projects/analytics/aggregate?group_by=name").status_code == 422
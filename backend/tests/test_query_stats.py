@@ -0,0 +1,97 @@
+# tests/test_query_stats.py
+"""
+Tests for per-request SQL instrumentation.
+"""
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.models.project import Project
+from app.utils import query_stats
+from app.utils.query_stats import QueryStatsMiddleware, statement_shape
+
+
+@pytest.fixture
+def instrumented_app(platform_db):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, expose_headers=True, n_plus_one_threshold=3)
+
+    @app.get("/items/{count}")
+    def items(count: int):
+        for i in range(count):
+            platform_db.execute(text("SELECT :i"), {"i": i})
+        return {"ok": True}
+
+    return app
+
+
+class TestQueryStats:
+    """Tests for statement counting and N+1 detection."""
+
+    def test_statement_shape(self):
+        assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (?)"
+        assert statement_shape("SELECT *\n  FROM t WHERE id IN (%(p1)s)") == "SELECT * FROM t WHERE id IN (%(p1)s)"
+        assert statement_shape("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?)"
+
+    def test_track(self, platform_db, platform_user):
+        """Test that only statements inside the tracked context are counted."""
+        with query_stats.track() as stats:
+            platform_db.query(Project).all()
+            platform_db.query(Project).filter(Project.id == 1).all()
+            platform_db.query(Project).filter(Project.id == 2).all()
+        platform_db.query(Project).all()
+        assert stats.count == 3
+        assert stats.duplicates == 1
+        assert stats.repeated()[0][1] == 2
+        assert stats.duration > 0
+
+    def test_headers_log_and_observers(self, instrumented_app, caplog):
+        """Test that a request reports its statements in headers, the log and to observers."""
+        seen = []
+        observer = lambda method, route, status, stats: seen.append((method, route, status, stats.count))
+        query_stats.add_observer(observer)
+        try:
+            with caplog.at_level(logging.INFO, logger="app.sql"):
+                client = TestClient(instrumented_app)
+                few = client.get("/items/2")
+                many = client.get("/items/5")
+        finally:
+            query_stats.remove_observer(observer)
+
+        assert few.headers["X-DB-Queries"] == "2"
+        assert few.headers["X-DB-Duplicates"] == "1"
+        assert float(few.headers["X-DB-Time-Ms"]) >= 0
+        assert many.headers["X-DB-Queries"] == "5"
+        assert seen == [("GET", "/items/{count}", 200, 2), ("GET", "/items/{count}", 200, 5)]
+
+        records = [r for r in caplog.records if r.name == "app.sql"]
+        assert [r.levelno for r in records] == [logging.INFO, logging.WARNING]
+        assert records[1].sql["queries"] == 5
+        assert records[1].sql["repeated"] == [("SELECT ?", 5)]
+        assert "repeated=5x" in records[1].getMessage()
+
+    @pytest.mark.query_budget(3, route="GET /projects/{project_id}")
+    def test_project_read_budget(self, platform_client, platform_db, platform_user):
+        """Test a route-specific budget marker on a single-project read."""
+        project = Project(sponsor_org_id=platform_user.org_memberships[0].org_id, name="Budgeted", sector="Energy")
+        platform_db.add(project)
+        platform_db.commit()
+        assert platform_client.get(f"/projects/{project.id}").status_code == 200
+
+    def test_list_batches_relationships(self, platform_client, platform_db, platform_user):
+        """Test that the full project list loads relationships per page, not per row."""
+        org_id = platform_user.org_memberships[0].org_id
+        platform_db.add_all([Project(sponsor_org_id=org_id, name=f"P{i}", sector="Energy") for i in range(8)])
+        platform_db.commit()
+        seen = []
+        observer = lambda method, route, status, stats: seen.append(stats)
+        query_stats.add_observer(observer)
+        try:
+            platform_client.get("/projects/")
+        finally:
+            query_stats.remove_observer(observer)
+        assert seen[0].count <= 4
+        assert seen[0].duplicates == 0
@@ -0,0 +1,155 @@
+# tests/test_response_cache.py
+"""
+Tests for cached single-entity reads with ETags.
+"""
+import pytest
+from sqlalchemy import event
+
+from app.models.investor import InvestorPreferences
+from app.models.project import Project, ProjectFinancials
+from app.models.user import User
+from app.models.organization import OrgMember
+from app.services import financial_metrics, risk_service
+from app.services.response_cache import etag_matches, response_cache
+
+
+@pytest.fixture
+def project(platform_db, platform_user):
+    item = Project(sponsor_org_id=platform_user.org_memberships[0].org_id, name="Lagos Solar Farm", sector="Energy")
+    platform_db.add(item)
+    platform_db.commit()
+    return item
+
+
+@pytest.fixture
+def statements(platform_db):
+    """SQL statements executed while the test runs."""
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    engine = platform_db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+class TestProjectReads:
+    """Tests for GET /projects/{id} and /projects/{id}/financials."""
+
+    def test_hit_skips_database_and_revalidates(self, platform_client, project, statements):
+        """Test that repeat reads come from the cache and If-None-Match gets a 304."""
+        first = platform_client.get(f"/projects/{project.id}")
+        assert first.status_code == 200
+        assert first.json()["name"] == "Lagos Solar Farm"
+        etag = first.headers["etag"]
+        assert etag.startswith(f'"project-{project.id}-')
+        assert first.headers["cache-control"] == "public, max-age=30"
+
+        statements.clear()
+        second = platform_client.get(f"/projects/{project.id}")
+        assert second.content == first.content
+        assert statements == []
+
+        not_modified = platform_client.get(f"/projects/{project.id}", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+
+    def test_writes_invalidate(self, platform_client, platform_db, project):
+        """Test that committed changes to the project or its financials give a new body and ETag."""
+        etag = platform_client.get(f"/projects/{project.id}").headers["etag"]
+
+        project.name = "Lagos Solar Park"
+        platform_db.commit()
+        response = platform_client.get(f"/projects/{project.id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["name"] == "Lagos Solar Park"
+        etag = response.headers["etag"]
+
+        assert platform_client.get(f"/projects/{project.id}/financials").status_code == 404
+        platform_db.add(ProjectFinancials(project_id=project.id, currency="USD", capex_usd=1_000_000))
+        platform_db.commit()
+        assert platform_client.get(f"/projects/{project.id}/financials").json()["currency"] == "USD"
+        response = platform_client.get(f"/projects/{project.id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["financials"]["currency"] == "USD"
+
+    def test_rollback_keeps_cache(self, platform_client, platform_db, project):
+        """Test that uncommitted changes never reach the cache."""
+        etag = platform_client.get(f"/projects/{project.id}").headers["etag"]
+        project.name = "Discarded"
+        platform_db.flush()
+        platform_db.rollback()
+        assert platform_client.get(f"/projects/{project.id}").headers["etag"] == etag
+        assert len(response_cache) == 1
+
+
+class TestBulkWrites:
+    """Tests for services that write with bulk update(), bypassing mapper events."""
+
+    def test_risk_scoring_evicts(self, platform_client, platform_db, project):
+        etag = platform_client.get(f"/projects/{project.id}").headers["etag"]
+        assert platform_client.get(f"/projects/{project.id}").json()["risk_score"] is None
+
+        risk_service.score_projects(platform_db)
+        response = platform_client.get(f"/projects/{project.id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["risk_score"] is not None
+
+    def test_recompute_evicts(self, platform_client, platform_db, project):
+        platform_db.add(ProjectFinancials(project_id=project.id, irr_pct=99,
+                                          timeline_json={"cash_flows": [-100, 60, 60]}))
+        platform_db.commit()
+        assert float(platform_client.get(f"/projects/{project.id}/financials").json()["irr_pct"]) == 99
+        etag = platform_client.get(f"/projects/{project.id}").headers["etag"]
+
+        financial_metrics.recompute_financials(platform_db)
+        financials = platform_client.get(f"/projects/{project.id}/financials").json()
+        assert float(financials["irr_pct"]) == pytest.approx(13.07, abs=0.01)
+        response = platform_client.get(f"/projects/{project.id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["payback_years"] is not None
+
+
+class TestOrganizationAndPreferences:
+    """Tests for GET /organizations/{id} and /investors/preferences/{org_id}."""
+
+    def test_new_member_changes_etag(self, platform_client, platform_db, platform_user):
+        """Test that nested members are part of the cached organization response."""
+        org_id = platform_user.org_memberships[0].org_id
+        first = platform_client.get(f"/organizations/{org_id}")
+        assert first.headers["cache-control"] == "public, max-age=300"
+
+        other = User(email="cfo@example.com", password_hash="x", full_name="CFO")
+        platform_db.add(other)
+        platform_db.flush()
+        platform_db.add(OrgMember(org_id=org_id, user_id=other.id, role="sponsor"))
+        platform_db.commit()
+
+        second = platform_client.get(f"/organizations/{org_id}", headers={"If-None-Match": first.headers["etag"]})
+        assert second.status_code == 200
+        assert len(second.json()["members"]) == 2
+
+    def test_preferences_are_private(self, platform_client, platform_db, platform_user, platform_auth_headers):
+        """Test conditional reads of investor preferences."""
+        org_id = platform_user.org_memberships[0].org_id
+        platform_db.add(InvestorPreferences(org_id=org_id, sectors="Energy"))
+        platform_db.commit()
+
+        url = f"/investors/preferences/{org_id}"
+        assert platform_client.get(url).status_code in (401, 403)
+        first = platform_client.get(url, headers=platform_auth_headers)
+        assert first.json()["sectors"] == "Energy"
+        assert first.headers["cache-control"] == "private, no-cache"
+        headers = {**platform_auth_headers, "If-None-Match": first.headers["etag"]}
+        assert platform_client.get(url, headers=headers).status_code == 304
+
+
+def test_etag_matching():
+    """Test weak, listed and wildcard If-None-Match values."""
+    assert etag_matches('W/"a", "b"', '"b"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"a"')
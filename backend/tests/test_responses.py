@@ -0,0 +1,74 @@
+# tests/test_responses.py
+"""
+Tests for the trusted fast JSON response path.
+"""
+import json
+from decimal import Decimal
+
+import pytest
+
+from app.core import responses
+from app.models.project import Project, ProjectFinancials, ProjectRiskAssessment
+from app.schemas.project import ProjectListResponse, ProjectResponse
+
+
+@pytest.fixture
+def project(platform_db, platform_user):
+    item = Project(
+        sponsor_org_id=platform_user.org_memberships[0].org_id, name="Lagos Solar Farm", sector="Energy",
+        latitude=Decimal("6.5244000"), longitude=Decimal("3.3792000"), investment_usd=Decimal("125000000.50"),
+    )
+    platform_db.add(item)
+    platform_db.flush()
+    platform_db.add(ProjectFinancials(project_id=item.id, currency="NGN", capex_usd=Decimal("1.25"),
+                                      assumptions_json={"rate": 0.1, "years": [1, 2]}))
+    platform_db.add(ProjectRiskAssessment(project_id=item.id, overall_score=42, category_scores={"fx": 60},
+                                          model_version="v1", inputs_json={}))
+    platform_db.commit()
+    return item
+
+
+class TestTrustedDump:
+    """Tests for trusted_dump and FastJSONResponse encoding."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_matches_pydantic_json(self, project, use_orjson, monkeypatch):
+        """Test that the fast path produces the same JSON as response-model validation."""
+        if not use_orjson:
+            monkeypatch.setattr(responses, "orjson", None)
+        elif responses.orjson is None:
+            pytest.skip("orjson not installed")
+
+        fast = json.loads(responses.dumps(responses.trusted_dump(ProjectResponse, project)))
+        expected = json.loads(ProjectResponse.model_validate(project).model_dump_json())
+        assert fast == expected
+        assert fast["investment_usd"] == "125000000.50"
+        assert fast["financials"]["assumptions_json"] == {"rate": 0.1, "years": [1, 2]}
+        assert fast["risk_assessments"][0]["overall_score"] == 42
+
+    def test_dict_input_and_defaults(self, project):
+        """Test wrapping ORM items in a dict, with omitted optional fields defaulted."""
+        data = responses.trusted_dump(ProjectListResponse, {"items": [project], "total": 1, "page": 1,
+                                                            "page_size": 20, "pages": 1})
+        assert data["facets"] is None
+        assert data["items"][0]["name"] == "Lagos Solar Farm"
+
+
+class TestListEndpoints:
+    """Tests for list endpoints on the fast path."""
+
+    def test_project_list(self, platform_client, project):
+        """Test the project list payload."""
+        response = platform_client.get("/projects/")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["total"] == 1
+        assert data["items"][0]["latitude"] == "6.5244000"
+        assert data["items"][0]["financials"]["currency"] == "NGN"
+
+    def test_organization_list(self, platform_client, platform_user):
+        """Test the organization list payload, including nested members."""
+        data = platform_client.get("/organizations/").json()
+        assert [org["name"] for org in data] == ["Test Sponsor Org"]
+        assert data[0]["members"][0]["is_owner"] is True
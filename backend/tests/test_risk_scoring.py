@@ -0,0 +1,136 @@
+# tests/test_risk_scoring.py
+"""
+Tests for batch risk scoring.
+"""
+import pytest
+
+from app.models.project import Project, ProjectFinancials, ProjectRiskAssessment
+from app.services import risk_service
+
+
+@pytest.fixture
+def scored_projects(platform_db, platform_user):
+    """Three projects with varying financials and verification levels."""
+    org_id = platform_user.org_memberships[0].org_id
+    specs = [
+        ("Solar Mauritius", "Mauritius", "Energy", "V4", {"currency": "USD", "irr_pct": 18, "payback_years": 6}),
+        ("Toll Road DRC", "DRC", "Transport", "V0", {"currency": "CDF", "irr_pct": 6, "payback_years": 15}),
+        ("Water Kenya", "Kenya", "Water", "V2", None),
+    ]
+    projects = []
+    for name, country, sector, level, financials in specs:
+        project = Project(sponsor_org_id=org_id, name=name, country=country, sector=sector,
+                          verification_level=level)
+        platform_db.add(project)
+        platform_db.flush()
+        if financials:
+            platform_db.add(ProjectFinancials(project_id=project.id, capex_usd=250_000_000, **financials))
+        projects.append(project)
+    platform_db.commit()
+    return projects
+
+
+class TestScoringEngine:
+    """Tests for the vectorized scoring engine."""
+
+    def test_scores_all_projects(self, platform_db, scored_projects):
+        """Test that every project gets an assessment and a cached risk score."""
+        summary = risk_service.score_projects(platform_db)
+        assert summary["projects"] == summary["scored"] == 3
+
+        low, high, unknown = scored_projects
+        for project in scored_projects:
+            platform_db.refresh(project)
+            assert 0 <= project.risk_score <= 100
+        assert low.risk_score < unknown.risk_score < high.risk_score
+
+        assessment = platform_db.query(ProjectRiskAssessment).filter(
+            ProjectRiskAssessment.project_id == high.id
+        ).one()
+        assert set(assessment.category_scores) == set(risk_service.CATEGORIES)
+        assert assessment.model_version == risk_service.MODEL_VERSION
+        assert assessment.inputs_json["input_hash"]
+        assert "currency" in assessment.mitigations_json
+
+    def test_unchanged_inputs_are_skipped(self, platform_db, scored_projects):
+        """Test that only projects with changed inputs are re-scored."""
+        risk_service.score_projects(platform_db)
+        summary = risk_service.score_projects(platform_db)
+        assert summary["scored"] == 0
+        assert summary["unchanged"] == 3
+
+        financials = platform_db.query(ProjectFinancials).filter(
+            ProjectFinancials.project_id == scored_projects[0].id
+        ).one()
+        financials.irr_pct = 9
+        platform_db.commit()
+
+        summary = risk_service.score_projects(platform_db)
+        assert summary["scored"] == 1
+        assert platform_db.query(ProjectRiskAssessment).count() == 4
+
+    def test_human_override_is_kept(self, platform_db, platform_user, scored_projects):
+        """Test that re-scoring never replaces a human override."""
+        project = scored_projects[1]
+        platform_db.add(ProjectRiskAssessment(
+            project_id=project.id, overall_score=42, category_scores={"political": 50},
+            model_version="analyst", inputs_json={}, is_human_override=True,
+            override_reason="Sovereign guarantee in place", created_by=platform_user.id,
+        ))
+        project.risk_score = 42
+        platform_db.commit()
+
+        summary = risk_service.score_projects(platform_db, force=True)
+        assert summary["overridden"] == 1
+        platform_db.refresh(project)
+        assert project.risk_score == 42
+        assert risk_service.effective_assessment(platform_db, project.id).is_human_override
+
+    def test_zero_inputs_are_not_replaced(self, platform_db, platform_user):
+        """Test that a stored 0 is used rather than falling back to the project-level column."""
+        project = Project(sponsor_org_id=platform_user.org_memberships[0].org_id, name="Zero", sector="Energy",
+                          investment_usd=9_000_000, expected_roi_pct=20, payback_years=8)
+        platform_db.add(project)
+        platform_db.flush()
+        platform_db.add(ProjectFinancials(project_id=project.id, capex_usd=0, roi_pct=0, payback_years=0))
+        platform_db.commit()
+
+        [inputs] = risk_service.load_inputs(platform_db, [project.id])
+        assert (inputs["capex_usd"], inputs["roi_pct"], inputs["payback_years"]) == (0, 0, 0)
+
+    def test_score_matrix_directions(self):
+        """Test that better fundamentals produce lower risk per category."""
+        base = {
+            "project_id": 1, "country": "Kenya", "sector": "Energy", "verification_level": "V1",
+            "currency": "USD", "capex_usd": 1e8, "opex_usd_annual": 2e6, "irr_pct": 10.0,
+            "roi_pct": None, "payback_years": 10.0, "failed_checks": 0, "documents": 5,
+        }
+        better = dict(base, irr_pct=20.0, payback_years=5.0, verification_level="V4", documents=15)
+        scores = risk_service.score_matrix([base, better])
+        financial = risk_service.CATEGORIES.index("financial")
+        verification = risk_service.CATEGORIES.index("verification")
+        assert scores[1, financial] < scores[0, financial]
+        assert scores[1, verification] < scores[0, verification]
+        assert scores[0, 0] == scores[1, 0]
+
+
+class TestRiskEndpoints:
+    """Tests for risk API."""
+
+    def test_score_and_get(self, platform_client, scored_projects, verifier_headers):
+        """Test triggering scoring and reading the effective assessment."""
+        response = platform_client.post(
+            "/projects/risk/score", json={"project_ids": [scored_projects[0].id]}, headers=verifier_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["scored"] == 1
+
+        assessment = platform_client.get(f"/projects/{scored_projects[0].id}/risk")
+        assert assessment.status_code == 200
+        assert assessment.json()["is_human_override"] is False
+        assert platform_client.get(f"/projects/{scored_projects[1].id}/risk").status_code == 404
+
+    def test_scoring_requires_permission(self, platform_client, platform_auth_headers):
+        """Test that sponsors cannot trigger batch scoring."""
+        response = platform_client.post("/projects/risk/score", headers=platform_auth_headers)
+        assert response.status_code == 403
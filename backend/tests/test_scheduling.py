@@ -0,0 +1,236 @@
+# tests/test_scheduling.py
+"""
+Tests for meeting conflict detection across deal rooms.
+"""
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+from app.models.project import Project
+from app.models.dealroom import DealRoom, Meeting
+from app.services.scheduling_service import IntervalIndex, Interval, MeetingScheduler
+
+
+MONDAY = datetime(2026, 3, 2, 9, 0)
+
+
+def _interval(start_hour, end_hour, meeting_id=None):
+    return Interval(MONDAY.replace(hour=start_hour), MONDAY.replace(hour=end_hour), meeting_id)
+
+
+class TestIntervalIndex:
+    """Tests for the interval index."""
+
+    def test_overlap_detection(self):
+        """Test that only genuinely overlapping intervals are reported."""
+        index = IntervalIndex([_interval(9, 10, 1), _interval(11, 12, 2), _interval(10, 17, 3)])
+        assert index.has_overlap(MONDAY.replace(hour=12), MONDAY.replace(hour=13))
+        found = index.overlapping(MONDAY.replace(hour=11, minute=30), MONDAY.replace(hour=12))
+        assert [i.meeting_id for i in found] == [3, 2]
+
+    def test_half_open_boundaries(self):
+        """Test that back-to-back meetings do not conflict."""
+        index = IntervalIndex([_interval(9, 10, 1)])
+        assert not index.has_overlap(MONDAY.replace(hour=10), MONDAY.replace(hour=11))
+        assert not index.has_overlap(MONDAY.replace(hour=8), MONDAY.replace(hour=9))
+
+    def test_long_interval_found_behind_short_ones(self):
+        """Test that a long early interval is found even when later ones end sooner."""
+        index = IntervalIndex([_interval(1, 20, 1)] + [_interval(h, h + 1, h) for h in range(2, 8)])
+        found = index.overlapping(MONDAY.replace(hour=18), MONDAY.replace(hour=19))
+        assert [i.meeting_id for i in found] == [1]
+
+    def test_add_and_remove(self):
+        """Test incremental updates."""
+        index = IntervalIndex()
+        index.add(_interval(9, 10, 1))
+        assert index.has_overlap(MONDAY, MONDAY.replace(hour=9, minute=30))
+        index.remove_meeting(1)
+        assert len(index) == 0
+        assert not index.has_overlap(MONDAY, MONDAY.replace(hour=9, minute=30))
+
+    def test_busy_blocks_are_merged(self):
+        """Test merging of overlapping busy intervals."""
+        index = IntervalIndex([_interval(9, 11), _interval(10, 12), _interval(14, 15)])
+        busy = index.busy(MONDAY.replace(hour=0), MONDAY.replace(hour=23))
+        assert busy == [
+            (MONDAY.replace(hour=9), MONDAY.replace(hour=12)),
+            (MONDAY.replace(hour=14), MONDAY.replace(hour=15)),
+        ]
+
+
+class TestEarliestCommonSlot:
+    """Tests for the common free slot search."""
+
+    def test_skips_busy_blocks_of_all_attendees(self):
+        """Test that the slot avoids every attendee's meetings."""
+        scheduler = MeetingScheduler()
+        scheduler.index_for(1).add(_interval(9, 10))
+        scheduler.index_for(2).add(_interval(10, 11))
+        slot = scheduler.earliest_common_slot(
+            [1, 2], timedelta(hours=1), MONDAY, MONDAY + timedelta(days=1)
+        )
+        assert slot == MONDAY.replace(hour=11)
+
+    def test_respects_working_hours(self):
+        """Test that slots outside working hours are moved to the next day."""
+        scheduler = MeetingScheduler()
+        scheduler.index_for(1).add(Interval(MONDAY, MONDAY.replace(hour=17)))
+        slot = scheduler.earliest_common_slot(
+            [1], timedelta(hours=1), MONDAY, MONDAY + timedelta(days=3), working_hours=(9, 17)
+        )
+        assert slot == (MONDAY + timedelta(days=1)).replace(hour=9)
+
+    def test_no_slot_in_window(self):
+        """Test that None is returned when the window is full."""
+        scheduler = MeetingScheduler()
+        scheduler.index_for(1).add(Interval(MONDAY, MONDAY + timedelta(hours=8)))
+        slot = scheduler.earliest_common_slot(
+            [1], timedelta(hours=1), MONDAY, MONDAY + timedelta(hours=8)
+        )
+        assert slot is None
+
+
+@pytest.fixture
+def two_deal_rooms(platform_db, platform_user):
+    """Two deal rooms on the same project, plus a meeting in the first."""
+    org_id = platform_user.org_memberships[0].org_id
+    project = Project(sponsor_org_id=org_id, name="Mombasa Port Expansion", sector="Ports")
+    platform_db.add(project)
+    platform_db.flush()
+    rooms = [
+        DealRoom(project_id=project.id, investor_org_id=org_id, sponsor_org_id=org_id)
+        for _ in range(2)
+    ]
+    platform_db.add_all(rooms)
+    platform_db.flush()
+    platform_db.add(Meeting(
+        deal_room_id=rooms[0].id,
+        title="Site visit debrief",
+        scheduled_at=MONDAY,
+        duration_minutes=60,
+        attendees=[platform_user.id, 99],
+        created_by=platform_user.id,
+    ))
+    platform_db.commit()
+    return rooms
+
+
+class TestMeetingSchedulerLoad:
+    """Tests for building the per-attendee indexes from the database."""
+
+    def test_window_query_uses_scheduled_at_index(self, platform_db, platform_user, two_deal_rooms):
+        """Test that loading a window range-scans the scheduled_at index and indexes overlapping meetings."""
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "FROM deal_room_meetings" in statement:
+                statements.append((statement, parameters))
+
+        engine = platform_db.get_bind()
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            scheduler = MeetingScheduler.load(
+                platform_db, [platform_user.id, 99], MONDAY, MONDAY + timedelta(hours=2)
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert scheduler.has_conflict([99], MONDAY, MONDAY + timedelta(minutes=30))
+        [(statement, parameters)] = statements
+        plan = platform_db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+        assert "ix_deal_room_meetings_scheduled_at" in " ".join(str(row[-1]) for row in plan)
+
+
+class TestMeetingConflictEndpoints:
+    """Tests for conflict checks on the deal room meeting endpoints."""
+
+    def test_schedule_conflicting_meeting_in_other_room(
+        self, platform_client, platform_auth_headers, platform_user, two_deal_rooms
+    ):
+        """Test that a clash in another deal room is rejected with 409."""
+        response = platform_client.post(
+            f"/dealrooms/{two_deal_rooms[1].id}/meetings",
+            json={"title": "Term sheet call", "scheduled_at": "2026-03-02T09:30:00", "attendees": [99]},
+            headers=platform_auth_headers,
+        )
+        assert response.status_code == 409
+        conflicts = response.json()["detail"]["conflicts"]
+        assert {c["attendee_id"] for c in conflicts} == {99, platform_user.id}
+
+    def test_schedule_with_allow_conflicts(self, platform_client, platform_auth_headers, two_deal_rooms):
+        """Test that conflicts can be explicitly overridden."""
+        response = platform_client.post(
+            f"/dealrooms/{two_deal_rooms[1].id}/meetings?allow_conflicts=true",
+            json={"title": "Term sheet call", "scheduled_at": "2026-03-02T09:30:00", "attendees": [99]},
+            headers=platform_auth_headers,
+        )
+        assert response.status_code == 200
+
+    def test_reschedule_does_not_conflict_with_itself(
+        self, platform_client, platform_auth_headers, two_deal_rooms, platform_db
+    ):
+        """Test that moving a meeting ignores its own previous slot."""
+        meeting = platform_db.query(Meeting).first()
+        response = platform_client.put(
+            f"/dealrooms/{two_deal_rooms[0].id}/meetings/{meeting.id}",
+            json={"scheduled_at": "2026-03-02T09:30:00"},
+            headers=platform_auth_headers,
+        )
+        assert response.status_code == 200
+
+    def test_adding_busy_attendee_conflicts(
+        self, platform_client, platform_auth_headers, two_deal_rooms, platform_db, platform_user
+    ):
+        """Test that an update is checked against the new attendee list, not the stored one."""
+        meeting = Meeting(
+            deal_room_id=two_deal_rooms[1].id, title="Lender call", scheduled_at=MONDAY + timedelta(hours=3),
+            duration_minutes=60, attendees=[42], created_by=42,
+        )
+        platform_db.add(meeting)
+        platform_db.commit()
+        url = f"/dealrooms/{two_deal_rooms[1].id}/meetings/{meeting.id}"
+
+        response = platform_client.put(
+            url, json={"scheduled_at": "2026-03-02T09:30:00", "attendees": [99]}, headers=platform_auth_headers
+        )
+        assert response.status_code == 409
+        assert {c["attendee_id"] for c in response.json()["detail"]["conflicts"]} == {99}
+
+        response = platform_client.put(url, json={"attendees": [platform_user.id]}, headers=platform_auth_headers)
+        assert response.status_code == 200
+        response = platform_client.put(
+            url, json={"scheduled_at": "2026-03-02T09:00:00"}, headers=platform_auth_headers
+        )
+        assert response.status_code == 409
+
+    def test_duration_is_bounded(self, platform_client, platform_auth_headers, two_deal_rooms, platform_db):
+        """Test that durations outside 1 minute to 24 hours are rejected."""
+        url = f"/dealrooms/{two_deal_rooms[1].id}/meetings"
+        for minutes in (0, 1441):
+            response = platform_client.post(
+                url, json={"title": "Call", "scheduled_at": "2026-03-09T09:00:00", "duration_minutes": minutes},
+                headers=platform_auth_headers,
+            )
+            assert response.status_code == 422
+        meeting = platform_db.query(Meeting).first()
+        response = platform_client.put(
+            f"/dealrooms/{two_deal_rooms[0].id}/meetings/{meeting.id}",
+            json={"duration_minutes": 2000}, headers=platform_auth_headers,
+        )
+        assert response.status_code == 422
+
+    def test_free_busy_and_suggestion(self, platform_client, platform_auth_headers, two_deal_rooms):
+        """Test free/busy lookup and earliest common slot."""
+        params = {"attendees": [99], "start": "2026-03-02T09:00:00", "end": "2026-03-03T09:00:00"}
+        response = platform_client.get(
+            "/dealrooms/meetings/free-busy", params=params, headers=platform_auth_headers
+        )
+        assert response.status_code == 200
+        busy = response.json()["attendees"][0]["busy"]
+        assert busy == [{"start": "2026-03-02T09:00:00", "end": "2026-03-02T10:00:00"}]
+
+        response = platform_client.get(
+            "/dealrooms/meetings/suggest-slot", params=params, headers=platform_auth_headers
+        )
+        assert response.json()["scheduled_at"] == "2026-03-02T10:00:00"
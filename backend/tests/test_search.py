@@ -0,0 +1,122 @@
+# tests/test_search.py
+"""
+Tests for full-text project search.
+"""
+import pytest
+
+from app.models.project import Project
+from app.services import search_service
+
+
+@pytest.fixture
+def projects(platform_db, platform_user):
+    org_id = platform_user.org_memberships[0].org_id
+    items = [
+        Project(sponsor_org_id=org_id, name="Lagos Solar Farm", sector="Energy", country="Nigeria",
+                summary="Utility-scale solar PV with battery storage", sdg_tags="SDG7,SDG13"),
+        Project(sponsor_org_id=org_id, name="Kano Grid Upgrade", sector="Energy", country="Nigeria",
+                description="Transmission works that will connect several solar plants in the north."),
+        Project(sponsor_org_id=org_id, name="Nairobi Water Works", sector="Water", country="Kenya",
+                impact_statement="Clean water for 2 million residents, pumps powered by solar."),
+        Project(sponsor_org_id=org_id, name="Mombasa Port Expansion", sector="Transport", country="Kenya",
+                summary="New container berths"),
+    ]
+    platform_db.add_all(items)
+    platform_db.commit()
+    return items
+
+
+class TestSearchEndpoint:
+    """Tests for GET /projects/search."""
+
+    def test_highlights_escape_project_text(self, platform_client, platform_db, platform_user):
+        """Test that highlight snippets are safe HTML whatever the sponsor wrote."""
+        platform_db.add(Project(
+            sponsor_org_id=platform_user.org_memberships[0].org_id, name="Hydro <b>Dam</b> Works", sector="Energy",
+            description='Run-of-river hydro <script>alert("x")</script> & <img src=x onerror=alert(1)> hydro',
+        ))
+        platform_db.commit()
+
+        highlights = platform_client.get("/projects/search?q=hydro").json()["items"][0]["highlights"]
+        assert highlights["name"] == "<mark>Hydro</mark> &lt;b&gt;Dam&lt;/b&gt; Works"
+        description = highlights["description"]
+        assert "<script>" not in description and "<img" not in description
+        assert "&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt; &amp; &lt;img" in description
+        assert description.count("<mark>hydro</mark>") == 2
+
+    def test_ranks_and_highlights(self, platform_client, projects):
+        """Test that name matches outrank description matches and snippets are marked."""
+        response = platform_client.get("/projects/search?q=solar")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["backend"] == "fts5"
+        assert data["total"] == 3
+        assert data["items"][0]["project"]["name"] == "Lagos Solar Farm"
+        assert data["items"][0]["highlights"]["name"] == "Lagos <mark>Solar</mark> Farm"
+        assert "<mark>solar</mark>" in data["items"][-1]["highlights"].get("description", "") + \
+            data["items"][-1]["highlights"].get("impact_statement", "")
+        scores = [item["score"] for item in data["items"]]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_structured_filters_and_prefix(self, platform_client, projects):
+        """Test combining text with exact filters and prefix terms."""
+        data = platform_client.get("/projects/search?q=solar&country=Kenya").json()
+        assert [item["project"]["name"] for item in data["items"]] == ["Nairobi Water Works"]
+
+        data = platform_client.get("/projects/search?q=contain*").json()
+        assert [item["project"]["name"] for item in data["items"]] == ["Mombasa Port Expansion"]
+
+        data = platform_client.get("/projects/search?q=solar storage").json()
+        assert data["total"] == 1
+
+    def test_index_follows_updates_and_deletes(self, platform_client, platform_db, projects):
+        """Test incremental index maintenance."""
+        projects[3].summary = "Solar-powered cranes at the container terminal"
+        platform_db.delete(projects[0])
+        platform_db.commit()
+
+        names = [i["project"]["name"] for i in platform_client.get("/projects/search?q=solar").json()["items"]]
+        assert "Lagos Solar Farm" not in names
+        assert "Mombasa Port Expansion" in names
+        assert platform_client.get("/projects/search?q=berths").json()["total"] == 0
+
+    def test_rejects_queries_without_words(self, platform_client):
+        """Test that punctuation-only queries are a client error."""
+        assert platform_client.get('/projects/search?q="*"').status_code == 400
+
+
+class TestMemoryIndex:
+    """Tests for the pure-Python fallback index."""
+
+    def test_bm25_ranking_and_removal(self):
+        """Test field weighting, AND semantics and removal."""
+        index = search_service.MemoryIndex()
+        index.add(1, {"name": "Solar park", "description": "Energy for the grid"})
+        index.add(2, {"name": "Grid link", "description": "Connects a solar park and a wind farm"})
+        index.add(3, {"name": "Wind farm"})
+
+        ranked = index.search(search_service.parse_query("solar"))
+        assert [pid for pid, _ in ranked] == [1, 2]
+        assert [pid for pid, _ in index.search(search_service.parse_query("wind farm"))] == [3, 2]
+        assert index.search(search_service.parse_query("solar wind")) != []
+
+        index.remove(2)
+        assert [pid for pid, _ in index.search(search_service.parse_query("solar"))] == [1]
+        assert index.search(search_service.parse_query("connects")) == []
+
+    def test_memory_backend_end_to_end(self, platform_db, platform_user, projects, monkeypatch):
+        """Test the fallback backend, including changes applied on commit."""
+        monkeypatch.setattr(search_service, "backend_name", lambda connection: "memory")
+        monkeypatch.setattr(search_service, "memory_index", search_service.MemoryIndex())
+
+        result = search_service.search_projects(platform_db, "solar", filters={"sector": "Energy"})
+        assert result["backend"] == "memory"
+        assert [hit["project_id"] for hit in result["hits"]] == [projects[0].id, projects[1].id]
+
+        platform_db.add(Project(sponsor_org_id=platform_user.org_memberships[0].org_id,
+                                name="Solar Mini-grids", sector="Energy"))
+        projects[0].name = "Lagos Power Farm"
+        platform_db.commit()
+        hits = search_service.search_projects(platform_db, "solar", filters={"sector": "Energy"})["hits"]
+        assert len(hits) == 3
+        assert hits[0]["highlights"]["name"] == "<mark>Solar</mark> Mini-grids"
@@ -0,0 +1,167 @@
+# tests/test_simulation.py
+"""
+Tests for Monte Carlo financial simulation.
+"""
+import time
+
+import pytest
+
+from app.models.project import Project, ProjectFinancials
+from app.services import simulation_service
+
+
+ASSUMPTIONS = {
+    "annual_revenue_usd": 30_000_000,
+    "construction_years": 2,
+    "operating_years": 20,
+    "discount_rate_pct": 10,
+    "local_revenue_share": 0.5,
+    "distributions": {
+        "capex_multiplier": {"dist": "triangular", "low": 0.95, "mode": 1.0, "high": 1.5},
+        "tariff_change_pct": {"dist": "normal", "mean": 0, "std": 10},
+        "fx_depreciation_pct": {"dist": "normal", "mean": 5, "std": 3, "min": 0},
+        "construction_delay_years": {"dist": "discrete", "values": [0, 1, 2], "probs": [0.6, 0.3, 0.1]},
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_simulation_cache():
+    simulation_service.clear_cache()
+    yield
+    simulation_service.clear_cache()
+
+
+@pytest.fixture
+def project_financials(platform_db, platform_user):
+    """Two projects with simulation assumptions."""
+    org_id = platform_user.org_memberships[0].org_id
+    rows = []
+    for name, capex in [("Geothermal Olkaria VI", 150_000_000), ("Hydro Ruzizi III", 200_000_000)]:
+        project = Project(sponsor_org_id=org_id, name=name, sector="Energy")
+        platform_db.add(project)
+        platform_db.flush()
+        financials = ProjectFinancials(
+            project_id=project.id, capex_usd=capex, opex_usd_annual=4_000_000, assumptions_json=ASSUMPTIONS
+        )
+        platform_db.add(financials)
+        rows.append(financials)
+    platform_db.commit()
+    return rows
+
+
+class TestSimulationEngine:
+    """Tests for the vectorized simulation."""
+
+    def test_fixed_inputs_collapse_distribution(self, project_financials):
+        """Test that without distributions every scenario is identical."""
+        financials = project_financials[0]
+        financials.assumptions_json = {k: v for k, v in ASSUMPTIONS.items() if k != "distributions"}
+        result = simulation_service.simulate_project(financials, n_scenarios=2_000)
+        assert result["irr_pct"]["p10"] == pytest.approx(result["irr_pct"]["p90"])
+        assert result["npv_usd"]["p10"] == pytest.approx(result["npv_usd"]["p90"])
+
+    def test_uncertainty_widens_and_orders_percentiles(self, project_financials):
+        """Test that declared distributions produce P10 < P50 < P90."""
+        result = simulation_service.simulate_project(project_financials[0], n_scenarios=100_000)
+        irr = result["irr_pct"]
+        assert irr["p10"] < irr["p50"] < irr["p90"]
+        assert 0 < result["prob_npv_negative"] < 1
+        assert result["n_scenarios"] == 100_000
+
+    def test_results_are_cached_by_assumptions(self, project_financials):
+        """Test that identical inputs hit the cache and changed inputs miss it."""
+        financials = project_financials[0]
+        first = simulation_service.simulate_project(financials, n_scenarios=10_000)
+        second = simulation_service.simulate_project(financials, n_scenarios=10_000)
+        assert not first["cached"] and second["cached"]
+        assert first["irr_pct"] == second["irr_pct"]
+
+        financials.opex_usd_annual = 6_000_000
+        third = simulation_service.simulate_project(financials, n_scenarios=10_000)
+        assert not third["cached"]
+        assert third["assumptions_hash"] != first["assumptions_hash"]
+
+    def test_portfolio_in_process_pool(self, project_financials):
+        """Test that portfolio runs in worker processes match in-process runs."""
+        try:
+            pooled = simulation_service.simulate_portfolio(project_financials, n_scenarios=5_000)
+        finally:
+            simulation_service.shutdown_pool()
+        serial = simulation_service.simulate_portfolio(project_financials, n_scenarios=5_000, use_processes=False)
+        assert [p["irr_pct"] for p in pooled["projects"]] == [p["irr_pct"] for p in serial["projects"]]
+        assert pooled["portfolio_npv_usd"] == serial["portfolio_npv_usd"]
+
+
+class TestSimulationEndpoints:
+    """Tests for simulation API."""
+
+    def test_simulate_project(self, platform_client, platform_auth_headers, project_financials):
+        """Test 100k scenarios through the API."""
+        started = time.perf_counter()
+        response = platform_client.post(
+            f"/projects/{project_financials[0].project_id}/financials/simulate",
+            json={"n_scenarios": 100_000},
+            headers=platform_auth_headers,
+        )
+        assert time.perf_counter() - started < 10
+        assert response.status_code == 200
+        assert response.json()["irr_pct"]["p50"] is not None
+
+    def test_invalid_distribution(self, platform_client, platform_auth_headers, project_financials, platform_db):
+        """Test that unknown variables are rejected."""
+        financials = project_financials[0]
+        financials.assumptions_json = {**ASSUMPTIONS, "distributions": {"rainfall": 3}}
+        platform_db.commit()
+        response = platform_client.post(
+            f"/projects/{financials.project_id}/financials/simulate", headers=platform_auth_headers
+        )
+        assert response.status_code == 400
+        assert "rainfall" in response.json()["detail"]
+
+    @pytest.mark.parametrize("declaration, message", [
+        ({"dist": "normal", "mean": 5}, "needs std"),
+        ("abc", "must be a number or an object"),
+        ({"dist": "uniform", "low": "0.9", "high": 1.1}, "low of capex_multiplier"),
+        ({"dist": "discrete", "values": [0, 1], "probs": [1]}, "one per value"),
+        ({"dist": "gamma", "shape": 2}, "Unknown distribution"),
+    ])
+    def test_malformed_distribution(
+        self, platform_client, platform_auth_headers, project_financials, platform_db, declaration, message
+    ):
+        """Test that malformed declarations are a 400 naming the problem, for one project and a portfolio."""
+        financials = project_financials[0]
+        financials.assumptions_json = {**ASSUMPTIONS, "distributions": {"capex_multiplier": declaration}}
+        platform_db.commit()
+        response = platform_client.post(
+            f"/projects/{financials.project_id}/financials/simulate", headers=platform_auth_headers
+        )
+        assert response.status_code == 400
+        assert message in response.json()["detail"]
+
+        response = platform_client.post(
+            "/projects/financials/simulate-portfolio",
+            json={"project_ids": [f.project_id for f in project_financials], "n_scenarios": 1_000},
+            headers=platform_auth_headers,
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith(f"Project {financials.project_id}: ")
+
+    def test_portfolio_endpoint(self, platform_client, platform_auth_headers, project_financials):
+        """Test portfolio simulation and missing financials."""
+        ids = [f.project_id for f in project_financials]
+        response = platform_client.post(
+            "/projects/financials/simulate-portfolio",
+            json={"project_ids": ids, "n_scenarios": 2_000},
+            headers=platform_auth_headers,
+        )
+        simulation_service.shutdown_pool()
+        assert response.status_code == 200
+        assert len(response.json()["projects"]) == 2
+
+        missing = platform_client.post(
+            "/projects/financials/simulate-portfolio",
+            json={"project_ids": ids + [9999]},
+            headers=platform_auth_headers,
+        )
+        assert missing.status_code == 404
@@ -0,0 +1,74 @@
+# tests/test_slow_queries.py
+"""
+Tests for the slow-query log and its admin report.
+"""
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.utils import slow_queries
+from app.utils.slow_queries import parameter_shape
+
+
+@pytest.fixture
+def log_everything():
+    """Treat every statement as slow for the duration of a test."""
+    slow_queries.reset()
+    slow_queries.configure(1e-9)
+    yield
+    slow_queries.configure(
+        settings.SLOW_QUERY_THRESHOLD_MS / 1000,
+        explain=settings.SLOW_QUERY_EXPLAIN,
+        max_shapes=settings.SLOW_QUERY_MAX_SHAPES,
+    )
+    slow_queries.reset()
+
+
+class TestSlowQueryLog:
+    """Tests for fingerprinting, EXPLAIN capture and the report."""
+
+    def test_parameter_shape(self):
+        assert parameter_shape((1, 2, 3, "a", None)) == "(int x 3, str, NoneType)"
+        assert parameter_shape({"name": "x", "limit": 5}) == "{name: str, limit: int}"
+        assert parameter_shape([(1, "x"), (2, "y")], executemany=True) == "2 x (int, str)"
+
+    def test_logs_and_explains(self, platform_db, log_everything, caplog):
+        with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+            for project_id in (1, 2):
+                platform_db.execute(
+                    text("SELECT id FROM verification_requests WHERE project_id = :p"), {"p": project_id}
+                ).all()
+
+        [entry] = [e for e in slow_queries.top(sort="count") if "verification_requests" in e["statement"]]
+        assert entry["count"] == 2
+        assert entry["parameters"] == "(int)"
+        assert entry["routes"] == {"-": 2}
+        assert "ix_verification_requests_project_id" in entry["plan"]
+
+        records = [r for r in caplog.records if r.slow_query["fingerprint"] == entry["fingerprint"]]
+        assert len(records) == 2
+        # The plan is captured once per fingerprint
+        assert records[0].slow_query["plan"] == entry["plan"]
+        assert records[1].slow_query["plan"] is None
+
+    def test_threshold(self, platform_db, log_everything):
+        slow_queries.configure(60.0)
+        platform_db.execute(text("SELECT 1")).all()
+        assert slow_queries.top() == []
+
+    def test_admin_report(self, platform_client, platform_auth_headers, admin_headers, log_everything):
+        """Test the report names the calling route and the index used by request listings."""
+        response = platform_client.get("/verifications/?status_filter=pending", headers=platform_auth_headers)
+        assert response.status_code == 200
+
+        report = platform_client.get("/admin/slow-queries?limit=200&sort=max", headers=admin_headers)
+        assert report.status_code == 200
+        [listing] = [e for e in report.json() if e["statement"].startswith("SELECT verification_requests.")]
+        assert listing["routes"] == {"GET /verifications/": 1}
+        assert "ix_verification_requests_status_created_at" in listing["plan"]
+
+        assert platform_client.get("/admin/slow-queries?sort=bogus", headers=admin_headers).status_code == 400
+        assert platform_client.get("/admin/slow-queries", headers=platform_auth_headers).status_code == 403
+        assert platform_client.delete("/admin/slow-queries", headers=admin_headers).status_code == 204
@@ -0,0 +1,90 @@
+# tests/test_suggest.py
+"""
+Tests for typeahead suggestions.
+"""
+import pytest
+
+from app.models.organization import Organization
+from app.models.project import Project
+from app.services import suggest_service
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    suggest_service.suggest_index.clear()
+    yield
+    suggest_service.suggest_index.clear()
+
+
+@pytest.fixture
+def names(platform_db, platform_user):
+    org_id = platform_user.org_memberships[0].org_id
+    platform_db.add_all([
+        Project(sponsor_org_id=org_id, name="Lagos Solar Farm", sector="Energy"),
+        Project(sponsor_org_id=org_id, name="Solar Mini-grids Programme", sector="Energy"),
+        Project(sponsor_org_id=org_id, name="Nairobi Water Works", sector="Water"),
+        Organization(name="Société Générale Côte d'Ivoire", org_type="investor"),
+    ])
+    platform_db.commit()
+
+
+class TestSuggestIndex:
+    """Tests for the in-memory index."""
+
+    def test_prefix_ranking(self):
+        """Test that names starting with the query come before later-word matches."""
+        index = suggest_service.SuggestIndex()
+        index.bulk_load([("project", 1, "Lagos Solar Farm"), ("project", 2, "Solar Park"),
+                         ("organization", 3, "Solaris Capital")])
+        assert [s["id"] for s in index.suggest("sol")] == [2, 3, 1]
+        assert [s["id"] for s in index.suggest("sol", kinds=("organization",))] == [3]
+        assert [s["id"] for s in index.suggest("lagos so")] == [1]
+
+    def test_typo_correction(self):
+        """Test trigram fallback for misspelled words."""
+        index = suggest_service.SuggestIndex()
+        index.bulk_load([("project", 1, "Nairobi Water Works"), ("project", 2, "Mombasa Port")])
+        suggestions = index.suggest("nairbi wat")
+        assert [(s["id"], s["match"]) for s in suggestions] == [(1, "fuzzy")]
+        assert index.suggest("mombsa")[0]["name"] == "Mombasa Port"
+        assert index.suggest("zzzzzz") == []
+
+    def test_add_and_remove(self):
+        """Test incremental updates keep keys and vocabulary consistent."""
+        index = suggest_service.SuggestIndex()
+        index.add("project", 1, "Kano Grid")
+        index.add("project", 1, "Kano Substation")
+        assert index.suggest("grid") == []
+        assert index.suggest("kano sub")[0]["id"] == 1
+        index.remove("project", 1)
+        assert len(index) == 0 and index.suggest("kano") == []
+
+
+class TestSuggestEndpoint:
+    """Tests for GET /search/suggest."""
+
+    def test_suggests_projects_and_organizations(self, platform_client, names):
+        """Test mixed results and accent-insensitive matching."""
+        data = platform_client.get("/search/suggest?q=sol").json()
+        assert [s["name"] for s in data["suggestions"]] == ["Solar Mini-grids Programme", "Lagos Solar Farm"]
+
+        data = platform_client.get("/search/suggest?q=societe gen&types=organization").json()
+        assert data["suggestions"][0]["name"] == "Société Générale Côte d'Ivoire"
+        assert platform_client.get("/search/suggest?q=sol&types=user").status_code == 422
+
+    def test_follows_writes(self, platform_client, platform_db, platform_user, names):
+        """Test that committed inserts, renames and deletes update the index."""
+        assert platform_client.get("/search/suggest?q=kumasi").json()["suggestions"] == []
+        project = Project(sponsor_org_id=platform_user.org_memberships[0].org_id,
+                          name="Kumasi Ring Road", sector="Transport")
+        platform_db.add(project)
+        platform_db.commit()
+        assert platform_client.get("/search/suggest?q=kumasi").json()["suggestions"][0]["id"] == project.id
+
+        project.name = "Kumasi Outer Ring Road"
+        platform_db.commit()
+        assert platform_client.get("/search/suggest?q=kumasi out").json()["suggestions"][0]["id"] == project.id
+
+        platform_db.delete(project)
+        platform_db.commit()
+        assert platform_client.get("/search/suggest?q=kumasi").json()["suggestions"] == []
@@ -0,0 +1,93 @@
+# tests/test_tiles.py
+"""
+Tests for precomputed project map tiles.
+"""
+import pytest
+
+from app.models.geo import MapTile
+from app.models.project import Project
+from app.services import tile_service
+
+
+@pytest.fixture
+def located_projects(platform_db, platform_user):
+    org_id = platform_user.org_memberships[0].org_id
+    items = [
+        Project(sponsor_org_id=org_id, name="Mombasa Port Expansion", sector="Transport",
+                latitude=-4.04, longitude=39.67, status="active"),
+        Project(sponsor_org_id=org_id, name="Malindi Solar", sector="Energy",
+                latitude=-3.22, longitude=40.12, status="draft"),
+        Project(sponsor_org_id=org_id, name="Lagos Solar Farm", sector="Energy",
+                latitude=6.52, longitude=3.38, status="active"),
+    ]
+    platform_db.add_all(items)
+    platform_db.commit()
+    return items
+
+
+class TestTileEndpoint:
+    """Tests for GET /projects/tiles/{z}/{x}/{y}."""
+
+    def test_clusters_at_low_zoom_and_points_at_high_zoom(self, platform_client, located_projects):
+        """Test that nearby projects merge into one feature until zoomed in."""
+        response = platform_client.get("/projects/tiles/0/0/0")
+        assert response.status_code == 200
+        tile = response.json()
+        assert tile["extent"] == tile_service.EXTENT
+        assert sorted(f[2] for f in tile["features"]) == [1, 2]
+
+        # At zoom 8 Mombasa and Malindi share a tile but are separate features
+        tile = platform_client.get("/projects/tiles/8/156/130").json()
+        assert sorted(f[3] for f in tile["features"]) == [located_projects[0].id, located_projects[1].id]
+
+        tile = platform_client.get("/projects/tiles/9/312/261").json()
+        assert [f[3:] for f in tile["features"]] == [[located_projects[0].id, "active"]]
+        x, y = tile["features"][0][:2]
+        assert 0 <= x < tile_service.EXTENT and 0 <= y < tile_service.EXTENT
+
+    def test_etag_and_not_modified(self, platform_client, located_projects):
+        """Test conditional requests against the cached tile."""
+        first = platform_client.get("/projects/tiles/1/1/1")
+        etag = first.headers["etag"]
+        assert "max-age" in first.headers["cache-control"]
+
+        cached = platform_client.get("/projects/tiles/1/1/1", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+
+    def test_status_change_invalidates_tiles(self, platform_client, platform_db, located_projects):
+        """Test that a status change rebuilds the tiles holding the project."""
+        etag = platform_client.get("/projects/tiles/9/312/261").headers["etag"]
+        assert platform_db.query(MapTile).filter_by(z=9, x=312, y=261).count() == 1
+
+        located_projects[0].status = "archived"
+        platform_db.commit()
+        assert platform_db.query(MapTile).filter_by(z=9, x=312, y=261).count() == 0
+
+        response = platform_client.get("/projects/tiles/9/312/261", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["features"][0][4] == "archived"
+
+    def test_moving_a_project_updates_both_tiles(self, platform_client, platform_db, located_projects):
+        """Test that the old and new positions are both invalidated."""
+        platform_client.get("/projects/tiles/9/312/261")
+        located_projects[0].latitude, located_projects[0].longitude = 6.5, 3.4
+        platform_db.commit()
+        assert platform_client.get("/projects/tiles/9/312/261").json()["features"] == []
+        assert platform_client.get("/projects/tiles/0/0/0").json()["features"][0][2] == 2
+
+    def test_out_of_range_tiles(self, platform_client):
+        """Test that tiles outside the grid are not found."""
+        assert platform_client.get("/projects/tiles/2/4/0").status_code == 404
+        assert platform_client.get("/projects/tiles/30/0/0").status_code == 404
+
+
+class TestPrecompute:
+    """Tests for bulk tile rendering."""
+
+    def test_precompute_matches_lazy_build(self, platform_db, located_projects):
+        """Test that bulk-rendered tiles equal tiles built one at a time."""
+        stored = tile_service.precompute_tiles(platform_db, 4)
+        assert stored == platform_db.query(MapTile).count()
+        for tile in platform_db.query(MapTile):
+            assert tile.payload == tile_service.build_tile(platform_db, tile.z, tile.x, tile.y)["payload"]
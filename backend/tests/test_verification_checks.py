@@ -0,0 +1,216 @@
+# tests/test_verification_checks.py
+"""
+Tests for the automated verification check runner.
+"""
+import hashlib
+import threading
+import time
+import pytest
+
+from app.models.project import Project
+from app.models.document import Document, DocumentVersion
+from app.models.verification import VerificationCheck, VerificationEvent
+from app.services import verification_service
+from app.services.verification_service import (
+    CheckContext, CheckResult, VerificationCheckPlugin, execute_checks,
+)
+
+
+DOC_TYPES = ["feasibility_study", "license", "financial_model", "technical_design", "permit"]
+
+
+@pytest.fixture
+def project_with_documents(platform_db, platform_user):
+    """A project with 40 uploaded, hashed documents."""
+    org = platform_user.org_memberships[0].organization
+    org.registration_no = "RC-123456"
+    org.country_code = "KE"
+    project = Project(sponsor_org_id=org.id, name="Lake Turkana Wind II", sector="Energy")
+    platform_db.add(project)
+    platform_db.flush()
+
+    for i in range(40):
+        sha = hashlib.sha256(f"doc-{i}".encode()).hexdigest()
+        doc = Document(
+            project_id=project.id,
+            name=f"Document {i}",
+            doc_type=DOC_TYPES[i % len(DOC_TYPES)],
+            s3_key=f"projects/{project.id}/doc-{i}.pdf",
+            sha256_hash=sha,
+            uploaded_by=platform_user.id,
+        )
+        platform_db.add(doc)
+        platform_db.flush()
+        platform_db.add(DocumentVersion(
+            document_id=doc.id, version_number=1, s3_key=doc.s3_key, sha256_hash=sha
+        ))
+    platform_db.commit()
+    return project
+
+
+class TestAutomatedChecksOnCreate:
+    """Tests for checks triggered by creating a verification request."""
+
+    def test_v2_document_verification(
+        self, platform_client, platform_auth_headers, project_with_documents, platform_db
+    ):
+        """Test that a V2 request over 40 documents is checked within seconds."""
+        started = time.perf_counter()
+        response = platform_client.post(
+            "/verifications/",
+            json={"project_id": project_with_documents.id, "to_level": "V2"},
+            headers=platform_auth_headers,
+        )
+        assert time.perf_counter() - started < 5
+        assert response.status_code == 201
+
+        checks = {c["check_name"]: c for c in response.json()["checks"]}
+        assert checks["Sponsor identity"]["status"] == "passed"
+        assert checks["Document hash integrity"]["status"] == "passed"
+        assert checks["Document completeness"]["status"] == "passed"
+        assert checks["Document type coverage"]["score"] == 100
+        assert all(c["is_automated"] for c in checks.values())
+        assert "Financial consistency" not in checks
+
+        events = platform_db.query(VerificationEvent).filter(
+            VerificationEvent.event_type == "check_completed"
+        ).count()
+        assert events == len(checks)
+
+    def test_hash_mismatch_fails_integrity(
+        self, platform_client, platform_auth_headers, project_with_documents, platform_db
+    ):
+        """Test that a document whose hash differs from its latest version fails."""
+        doc = platform_db.query(Document).first()
+        doc.sha256_hash = "0" * 64
+        platform_db.commit()
+
+        response = platform_client.post(
+            "/verifications/",
+            json={"project_id": project_with_documents.id, "to_level": "V2"},
+            headers=platform_auth_headers,
+        )
+        checks = {c["check_name"]: c for c in response.json()["checks"]}
+        integrity = checks["Document hash integrity"]
+        assert integrity["status"] == "failed"
+        assert integrity["evidence_json"]["problems"] == [
+            {"document_id": doc.id, "issue": "hash_mismatch_with_latest_version"}
+        ]
+
+    def test_rerun_updates_checks_in_place(
+        self, platform_client, platform_auth_headers, project_with_documents, platform_db
+    ):
+        """Test that re-running does not duplicate automated checks."""
+        created = platform_client.post(
+            "/verifications/",
+            json={"project_id": project_with_documents.id, "to_level": "V3"},
+            headers=platform_auth_headers,
+        ).json()
+        response = platform_client.post(
+            f"/verifications/{created['id']}/checks/run", headers=platform_auth_headers
+        )
+        assert response.status_code == 200
+        assert len(response.json()) == len(created["checks"])
+        assert platform_db.query(VerificationCheck).count() == len(created["checks"])
+
+
+class TestCheckExecution:
+    """Tests for concurrent execution and timeouts."""
+
+    def test_checks_run_concurrently_with_timeouts(self):
+        """Test that a slow check times out without delaying the others."""
+        class SlowCheck(VerificationCheckPlugin):
+            check_name = "Slow"
+            timeout_seconds = 0.2
+
+            def run(self, ctx):
+                time.sleep(1)
+                return CheckResult("passed")
+
+        class QuickCheck(VerificationCheckPlugin):
+            check_name = "Quick"
+
+            def run(self, ctx):
+                time.sleep(0.1)
+                return CheckResult("passed", 100)
+
+        class BrokenCheck(VerificationCheckPlugin):
+            check_name = "Broken"
+
+            def run(self, ctx):
+                raise ValueError("upstream registry unavailable")
+
+        ctx = CheckContext(1, "V2", {}, None, [], [], None)
+        started = time.perf_counter()
+        outcomes = execute_checks(ctx, [SlowCheck(), QuickCheck(), QuickCheck(), BrokenCheck()])
+        assert time.perf_counter() - started < 0.9
+
+        results = [result for _, result, _ in outcomes]
+        assert results[0].status == "pending"
+        assert "timed out" in results[0].notes
+        assert results[1].status == results[2].status == "passed"
+        assert results[3].status == "pending"
+        assert "upstream registry unavailable" in results[3].notes
+
+    def test_checks_get_their_deadline(self):
+        """Test that a check bounding its I/O by ctx.remaining() returns by its deadline."""
+        seen = []
+
+        class PollingCheck(VerificationCheckPlugin):
+            check_name = "Polling"
+            timeout_seconds = 0.3
+
+            def run(self, ctx):
+                seen.append(ctx.remaining())
+                if not threading.Event().wait(ctx.remaining()):
+                    raise TimeoutError("registry did not answer")
+                return CheckResult("passed")
+
+        ctx = CheckContext(1, "V2", {}, None, [], [], None)
+        started = time.perf_counter()
+        [(_, result, _)] = execute_checks(ctx, [PollingCheck()])
+        assert result.status == "pending"
+        assert 0 < seen[0] <= 0.3
+        assert ctx.remaining() is None
+        # The worker is free again shortly after the deadline
+        verification_service.get_executor().submit(lambda: None).result(timeout=0.5)
+        assert time.perf_counter() - started < 1
+
+    def test_stuck_workers_are_counted_and_the_pool_replaced(self, monkeypatch, caplog):
+        """Test that overrunning checks are reported and half the pool stuck retires it."""
+        monkeypatch.setattr(verification_service.settings, "VERIFICATION_CHECK_WORKERS", 4)
+        monkeypatch.setattr(verification_service, "_executor", None)
+        monkeypatch.setattr(verification_service, "_overrunning", set())
+        release = threading.Event()
+
+        class HungCheck(VerificationCheckPlugin):
+            check_type = "hung"
+            check_name = "Hung"
+            timeout_seconds = 0.1
+
+            def run(self, ctx):
+                release.wait(10)
+                return CheckResult("passed")
+
+        ctx = CheckContext(1, "V2", {}, None, [], [], None)
+        before = verification_service.checks_overrun.value(check_type="hung")
+        try:
+            pool = verification_service.get_executor()
+            execute_checks(ctx, [HungCheck()])
+            assert verification_service.get_executor() is pool
+            assert "still running after its 0.1s timeout" in caplog.text
+
+            execute_checks(ctx, [HungCheck()])
+            assert verification_service.checks_overrun.value(check_type="hung") == before + 2
+            assert "2 verification check workers are stuck" in caplog.text
+            assert verification_service.get_executor() is not pool
+        finally:
+            release.set()
+            verification_service.get_executor().shutdown()
+
+    def test_registry_filters_by_level(self):
+        """Test that checks only apply from their minimum level."""
+        v1 = {p.check_type for p in verification_service.checks_for_level("V1")}
+        v3 = {p.check_type for p in verification_service.checks_for_level("V3")}
+        assert v1 == {"identity"}
+        assert v3 == {"identity", "document", "financial", "esg"}
@@ -0,0 +1,160 @@
+# tests/test_verification_queue.py
+"""
+Tests for the verifier work queue.
+"""
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base as PlatformBase
+from app.models.organization import Organization
+from app.models.project import Project
+from app.models.verification import VerificationRequest, VerificationEvent
+from app.services import verification_queue
+
+
+def _seed_requests(session, sponsor_user_id, org_id, specs):
+    """Create one project and request per (to_level, age_hours) spec."""
+    requests = []
+    for to_level, age_hours in specs:
+        project = Project(sponsor_org_id=org_id, name=f"Project {to_level} {age_hours}h", sector="Energy")
+        session.add(project)
+        session.flush()
+        request = VerificationRequest(
+            project_id=project.id,
+            from_level="V0",
+            to_level=to_level,
+            requested_by=sponsor_user_id,
+            created_at=datetime.utcnow() - timedelta(hours=age_hours),
+        )
+        session.add(request)
+        requests.append(request)
+    session.commit()
+    return requests
+
+
+class TestQueueEndpoints:
+    """Tests for queue API."""
+
+    def test_priority_combines_age_and_level(self, platform_client, platform_db, platform_user, verifier_headers):
+        """Test that older and higher-level requests come first."""
+        org_id = platform_user.org_memberships[0].org_id
+        requests = _seed_requests(platform_db, platform_user.id, org_id, [
+            ("V1", 1), ("V3", 1), ("V1", 40),
+        ])
+
+        response = platform_client.get("/verifications/queue", headers=verifier_headers)
+        assert response.status_code == 200
+        order = [item["request"]["id"] for item in response.json()]
+        assert order == [requests[2].id, requests[1].id, requests[0].id]
+        assert response.json()[0]["age_hours"] == pytest.approx(40, abs=0.1)
+
+    def test_sponsor_tier_raises_priority(self, platform_client, platform_db, platform_user, verifier_headers):
+        """Test that sponsors with verified projects are prioritized."""
+        org_id = platform_user.org_memberships[0].org_id
+        other_org = Organization(name="New Sponsor", org_type="sponsor")
+        platform_db.add(other_org)
+        platform_db.flush()
+        newcomer = _seed_requests(platform_db, platform_user.id, other_org.id, [("V2", 2)])[0]
+        established = _seed_requests(platform_db, platform_user.id, org_id, [("V2", 2)])[0]
+        platform_db.add(Project(sponsor_org_id=org_id, name="Operating plant", sector="Energy",
+                                verification_level="V3"))
+        platform_db.commit()
+
+        items = platform_client.get("/verifications/queue", headers=verifier_headers).json()
+        assert [i["request"]["id"] for i in items] == [established.id, newcomer.id]
+        assert [i["sponsor_tier"] for i in items] == ["premier", "standard"]
+
+    def test_claim_assigns_and_records_event(self, platform_client, platform_db, platform_user, verifier_headers):
+        """Test claiming the head of the queue."""
+        org_id = platform_user.org_memberships[0].org_id
+        requests = _seed_requests(platform_db, platform_user.id, org_id, [("V1", 1), ("V1", 5)])
+
+        response = platform_client.post("/verifications/queue/claim", headers=verifier_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == requests[1].id
+        assert data["status"] == "in_review"
+        assert data["assigned_to"] is not None
+        assert data["assigned_org_id"] is not None
+
+        event = platform_db.query(VerificationEvent).filter(VerificationEvent.event_type == "assigned").one()
+        assert event.metadata_json["queued_seconds"] == pytest.approx(5 * 3600, rel=0.01)
+
+        second = platform_client.post("/verifications/queue/claim", headers=verifier_headers)
+        assert second.json()["id"] == requests[0].id
+        empty = platform_client.post("/verifications/queue/claim", headers=verifier_headers)
+        assert empty.status_code == 204
+
+    def test_release_returns_request_to_queue(self, platform_client, platform_db, platform_user, verifier_headers):
+        """Test releasing a claimed request."""
+        org_id = platform_user.org_memberships[0].org_id
+        _seed_requests(platform_db, platform_user.id, org_id, [("V1", 1)])
+        claimed = platform_client.post("/verifications/queue/claim", headers=verifier_headers).json()
+
+        response = platform_client.post(f"/verifications/{claimed['id']}/release", headers=verifier_headers)
+        assert response.status_code == 200
+        assert response.json()["status"] == "pending"
+        assert response.json()["assigned_to"] is None
+
+    def test_metrics(self, platform_client, platform_db, platform_user, verifier_headers):
+        """Test queue depth and time-in-queue metrics."""
+        org_id = platform_user.org_memberships[0].org_id
+        _seed_requests(platform_db, platform_user.id, org_id, [("V1", 1), ("V2", 3), ("V2", 10)])
+        platform_client.post("/verifications/queue/claim", headers=verifier_headers)
+
+        metrics = platform_client.get("/verifications/queue/metrics", headers=verifier_headers).json()
+        assert metrics["depth"] == 2
+        assert metrics["depth_by_level"] == {"V1": 1, "V2": 1}
+        assert metrics["in_review"] == 1
+        assert metrics["waiting_seconds"]["oldest"] == pytest.approx(3 * 3600, rel=0.01)
+        assert metrics["time_to_claim_seconds"]["claimed"] == 1
+
+    def test_queue_requires_verifier_permission(self, platform_client, platform_auth_headers):
+        """Test that sponsors cannot claim from the queue."""
+        response = platform_client.post("/verifications/queue/claim", headers=platform_auth_headers)
+        assert response.status_code == 403
+
+
+class TestConcurrentClaims:
+    """Tests that concurrent verifiers never claim the same request."""
+
+    def test_no_double_claims(self, tmp_path):
+        """Test claiming from many threads against a file-backed SQLite database."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'queue.db'}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        PlatformBase.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        with Session() as session:
+            org = Organization(name="Sponsor", org_type="sponsor")
+            session.add(org)
+            session.flush()
+            _seed_requests(session, 1, org.id, [("V1", hours) for hours in range(30)])
+
+        claims = []
+        lock = threading.Lock()
+
+        def worker(verifier_id):
+            with Session() as session:
+                while True:
+                    claimed = verification_queue.claim_next(session, verifier_id)
+                    if claimed is None:
+                        return
+                    with lock:
+                        claims.append(claimed.id)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(1, 7)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+        assert len(claims) == 30
+        assert len(set(claims)) == 30